@@ -9,12 +9,17 @@ import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from dsstar.agents.analyzer import budgets, master_bench, partitions
 from dsstar.agents.analyzer.master_manager import ensure_master, master_version_id
+from dsstar.agents.analyzer.record_store import RecordStore
 from dsstar.agents.analyzer.signature import compute_signature, probe_sample
+from dsstar.agents.analyzer.sqlite_store import build_store
 from dsstar.llm.base import LLMClient
 from dsstar.prompts import master_patch_prompt, override_prompt, promote_judge_prompt
+from dsstar.runtime_paths import package_pythonpath, shared_cache_dir
 from dsstar.tools.describe_files import describe_files
-from dsstar.tools.log_utils import log, write_json, write_text
+from dsstar.tools.log_utils import log, write_text
+from dsstar.tools.zip_describe import BUDGET_ENV as ZIP_BUDGET_ENV
 from dsstar.tools.text_utils import extract_python_code
 
 
@@ -34,6 +39,8 @@ def _file_type(path: Path) -> str:
         ".sqlite3": "sqlite",
         ".parquet": "parquet",
         ".json": "json",
+        ".jsonl": "json",
+        ".ndjson": "json",
         ".zip": "zip",
     }.get(suffix, "unknown")
 
@@ -110,14 +117,36 @@ def _heuristic_fallback(path: Path) -> Dict[str, Any]:
     return describe_files([str(path)]).get("files", {}).get(str(path), {})
 
 
-def _execute_script(script_path: Path, timeout_sec: int = 25) -> Dict[str, Any]:
+def _decode(output: Any) -> str:
+    if isinstance(output, bytes):
+        return output.decode("utf-8", errors="replace")
+    return output or ""
+
+
+def _execute_script(script_path: Path, timeout_sec: float = 25, extra_env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
     start = time.perf_counter()
-    proc = subprocess.run(
-        [os.environ.get("PYTHON", "python"), str(script_path)],
-        capture_output=True,
-        text=True,
-        timeout=timeout_sec,
-    )
+    # The master describer may import stdlib-only helpers such as dsstar.tools.json_stream.
+    env = dict(os.environ)
+    env["PYTHONPATH"] = package_pythonpath()
+    env.update(extra_env or {})
+    try:
+        proc = subprocess.run(
+            [os.environ.get("PYTHON", "python"), str(script_path)],
+            capture_output=True,
+            text=True,
+            timeout=timeout_sec,
+            env=env,
+        )
+    except subprocess.TimeoutExpired as exc:
+        # Keep whatever the describer printed before it was killed.
+        partial = _decode(exc.stdout).rstrip()
+        return {
+            "exit_code": -9,
+            "stdout": (partial + "\n" if partial else "") + f"PARTIAL=describer timed out after {timeout_sec}s",
+            "stderr": _decode(exc.stderr) + f"describer timed out after {timeout_sec}s\n",
+            "runtime_ms": int((time.perf_counter() - start) * 1000),
+            "timed_out": True,
+        }
     runtime_ms = int((time.perf_counter() - start) * 1000)
     return {
         "exit_code": int(proc.returncode),
@@ -198,6 +227,38 @@ def _extract_json(text: str) -> Dict[str, Any]:
     return {}
 
 
+def _describe_sample(
+    path: Path,
+    file_id: str,
+    run_dir: Path,
+    master_used_path: Path,
+    throughput: Dict[str, float],
+    describer_env: Optional[Dict[str, str]],
+) -> Optional[Dict[str, Any]]:
+    """Re-run the describer on the leading lines of a file whose full description timed out."""
+    if path.suffix.lower() not in budgets.SAMPLEABLE_SUFFIXES:
+        return None
+    sample_path = run_dir / ".dsstar" / "desc_samples" / f"{_safe_name(file_id)}{path.suffix.lower()}"
+    coverage = budgets.write_sample(path, sample_path)
+    wrapper_path = run_dir / ".dsstar" / "desc_scripts" / f"{_safe_name(file_id)}_sample.py"
+    _build_wrapper(wrapper_path, sample_path, master_used_path, None)
+    budget_sec = budgets.sample_budget(_file_type(path), throughput)
+    exec_info = _execute_script(wrapper_path, timeout_sec=budget_sec, extra_env=describer_env)
+    exec_info["budget_sec"] = budget_sec
+    if not _failed_exec(exec_info):
+        # The description must name the real input, never the sample copy.
+        stdout = str(exec_info["stdout"]).strip()
+        for alias in (str(sample_path.resolve()), str(sample_path)):
+            stdout = stdout.replace(alias, str(path))
+        exec_info["stdout"] = (
+            f"{stdout}\n"
+            f"PARTIAL=full description timed out; values above describe the first "
+            f"{coverage['sample_bytes']} bytes ({coverage['fraction']:.2%}) of the file\n"
+            f"ESTIMATED_TOTAL_LINES={coverage['estimated_lines']}"
+        )
+    return exec_info
+
+
 def _process_file(
     path: Path,
     run_dir: Path,
@@ -207,6 +268,9 @@ def _process_file(
     fallback_facts: Dict[str, Any],
     client: Optional[LLMClient],
     fail_fix_budget: Dict[str, int],
+    describer_env: Optional[Dict[str, str]] = None,
+    history: Optional[List[Dict[str, Any]]] = None,
+    throughput: Optional[Dict[str, float]] = None,
 ) -> Dict[str, Any]:
     rel = _rel_str(path)
     stat = path.stat()
@@ -222,13 +286,25 @@ def _process_file(
 
     wrapper_path = scripts_dir / f"{_safe_name(file_id)}.py"
     wrapper_source = _build_wrapper(wrapper_path, path, master_used_path, None)
-    exec_info = _execute_script(wrapper_path)
+    budget_sec = budgets.time_budget(_file_type(path), size, history, throughput)
+    exec_info = _execute_script(wrapper_path, timeout_sec=budget_sec, extra_env=describer_env)
+    timings = [budgets.timing_entry("full", exec_info, budget_sec, size)]
 
     status = "master_ok"
     override_path: Optional[Path] = None
     promote_decision: Optional[Dict[str, Any]] = None
 
-    if _failed_exec(exec_info):
+    if exec_info.get("timed_out"):
+        # Overrides would hit the same wall; describe a sample instead and keep
+        # the partial output when even that is not possible.
+        log(f"Analyzer: describer timed out on {rel} after {budget_sec}s, retrying on a sample")
+        status = "partial"
+        sampled = _describe_sample(path, file_id, run_dir, master_used_path, throughput or {}, describer_env)
+        if sampled is not None:
+            timings.append(budgets.timing_entry("sample", sampled, sampled.pop("budget_sec"), min(size, budgets.SAMPLE_BYTES)))
+            if not _failed_exec(sampled):
+                status, exec_info = "sampled", sampled
+    elif _failed_exec(exec_info):
         status = "failed"
         if client is not None and fail_fix_budget["remaining"] > 0:
             fail_fix_budget["remaining"] -= 1
@@ -247,7 +323,7 @@ def _process_file(
                 override_source = extract_python_code(client.complete(prompt))
                 write_text(override_path, override_source)
                 _build_wrapper(wrapper_path, path, master_used_path, override_path)
-                exec_info = _execute_script(wrapper_path)
+                exec_info = _execute_script(wrapper_path, timeout_sec=budget_sec, extra_env=describer_env)
                 if not _failed_exec(exec_info):
                     status = "override_ok"
                     log(f"Analyzer LLM call: promote_judge ({rel})")
@@ -271,6 +347,8 @@ def _process_file(
 
     stdout = str(exec_info.get("stdout", "")).strip()
     description_text = stdout if (not _failed_exec(exec_info) and stdout) else json.dumps(fallback_facts, ensure_ascii=False)
+    if status == "partial":
+        description_text = f"{description_text}\n{stdout}"
 
     return {
         "file_path": rel,
@@ -288,11 +366,147 @@ def _process_file(
         "size": size,
         "sha256": sha,
         "fallback_facts": fallback_facts,
+        "time_budget_sec": budget_sec,
+        "timings": [*(history or []), *timings][-budgets.MAX_TIMINGS :],
         "desc_script": {"path": str(wrapper_path.relative_to(run_dir))},
         "desc_exec": exec_info,
     }
 
 
+def _history(existing: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """A file's earlier timings, each with the file size it was measured on."""
+    if not existing:
+        return []
+    # Timings stored before sizes were recorded belong to the record's own version of the file;
+    # a partitioned table's were measured on one shard, so its average shard stands in.
+    size = existing.get("size")
+    partition = existing.get("partition")
+    if isinstance(partition, dict) and partition.get("shard_count"):
+        size = int(partition.get("total_size") or 0) // int(partition["shard_count"])
+    return [{"size_bytes": size, **timing} for timing in existing.get("timings") or []]
+
+
+def _reusable(existing: Optional[Dict[str, Any]]) -> bool:
+    # Sampled and partial descriptions are retried in full (with a larger budget) on the next run.
+    return bool(
+        existing
+        and existing.get("status") not in {"sampled", "partial"}
+        and isinstance(existing.get("exec"), dict)
+        and int(existing["exec"].get("exit_code", 1)) == 0
+        and str(existing["exec"].get("stdout", "")).strip()
+    )
+
+
+def _partition_file_id(group: partitions.PartitionGroup, summary: Dict[str, Any]) -> str:
+    rel_root = _rel_str(group.root)
+    return f"{rel_root}/{summary['shard_glob']}::partitioned:{summary['shard_count']}:{summary['fingerprint'][:16]}"
+
+
+def _process_partition(
+    group: partitions.PartitionGroup,
+    summary: Dict[str, Any],
+    run_dir: Path,
+    master_used_path: Path,
+    current_master_text: str,
+    client: Optional[LLMClient],
+    fail_fix_budget: Dict[str, int],
+    describer_env: Optional[Dict[str, str]] = None,
+    history: Optional[List[Dict[str, Any]]] = None,
+    throughput: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
+    # Only one representative shard goes through the describer, so analysis time
+    # and description size do not grow with the number of partitions.
+    representative = group.shards[0][0]
+    record = _process_file(
+        path=representative,
+        run_dir=run_dir,
+        master_used_path=master_used_path,
+        current_master_text=current_master_text,
+        signature=compute_signature(representative),
+        fallback_facts=_heuristic_fallback(representative),
+        client=client,
+        fail_fix_budget=fail_fix_budget,
+        describer_env=describer_env,
+        history=history,
+        throughput=throughput,
+    )
+    record.update(
+        {
+            "file_path": _rel_str(group.root),
+            "file_id": _partition_file_id(group, summary),
+            "description_text": partitions.describe_text(
+                summary, str(representative.resolve().relative_to(group.root)), record["description_text"]
+            ),
+            "file_type": "partitioned",
+            "shard_file_type": _file_type(representative),
+            "representative_shard": _rel_str(representative),
+            "mtime": summary["latest_mtime"],
+            "size": summary["total_size"],
+            "sha256": summary["fingerprint"],
+            "partition": summary,
+        }
+    )
+    return record
+
+
+def _attach_sqlite_store(store: RecordStore, extra: Dict[str, Any], files: List[Path], run_dir: Path) -> None:
+    try:
+        facts = build_store(files, shared_cache_dir(run_dir))
+    except Exception as exc:  # pylint: disable=broad-except
+        extra.setdefault("warnings", []).append(f"SQLite store failed: {exc}")
+        return
+    if facts is None:
+        return
+    extra["sqlite_store"] = facts
+    tables_by_source: Dict[str, List[str]] = {}
+    for table in facts.get("tables", []):
+        tables_by_source.setdefault(str(table.get("source")), []).append(str(table.get("table")))
+    updated: List[Dict[str, Any]] = []
+    for record in store.records():
+        tables = tables_by_source.get(str(Path(str(record.get("file_path", ""))).resolve()))
+        if tables and record.get("sqlite_tables") != tables:
+            record["sqlite_tables"] = tables
+            updated.append(record)
+    for record in updated:
+        store.put(record)
+
+
+def _master_patch_rejection(
+    check: Dict[str, Any],
+    current_master: Path,
+    candidate_master: Path,
+    run_dir: Path,
+    file_id: str,
+    bench: bool,
+) -> Optional[str]:
+    """Why a patched master must not be promoted, or None when it may be."""
+    if _failed_exec(check):
+        return "patched master still fails on the file it was written for"
+    if not bench:
+        return None
+    log("Analyzer: benchmarking patched master against the current one")
+    report = master_bench.gate(
+        current_master,
+        candidate_master,
+        cache_dir=shared_cache_dir(run_dir),
+        work_dir=run_dir / ".dsstar",
+        report_path=run_dir / ".dsstar" / "master_bench" / f"{_safe_name(file_id)}.json",
+    )
+    for flag in report["flags"]:
+        log(f"Analyzer: patched master flagged: {flag}")
+    return "; ".join(report["reasons"]) or None
+
+
+def _open_store(run_dir: Path, descriptions_path: Path) -> RecordStore:
+    store = RecordStore(run_dir / ".dsstar" / "descriptions.jsonl")
+    if len(store) == 0 and descriptions_path.exists():
+        # Seed from a descriptions.json written before the incremental store existed.
+        for file_id, record in _load_existing(descriptions_path).get("records", {}).items():
+            if isinstance(record, dict):
+                store.put({**record, "file_id": record.get("file_id") or file_id})
+    return store
+
+
 def run(
     files: List[str],
     run_dir: Path,
@@ -301,13 +515,33 @@ def run(
     refresh_master: bool = False,
     cluster_mode: bool = True,
     max_failures_to_fix_per_run: int = 5,
+    sqlite_store: bool = False,
+    partition_detection: bool = True,
+    zip_budget_mb: Optional[float] = None,
+    bench_master_patches: bool = True,
 ) -> Dict[str, Any]:
-    """Analyze files by executing deterministic wrappers around a persistent master describer."""
+    """Analyze files by executing deterministic wrappers around a persistent master describer.
+
+    With `partition_detection`, shards of a partitioned dataset (`key=value/` or
+    date directories, `part-0000.csv` siblings) are described as one logical table.
+    `zip_budget_mb` caps how much member data zip inputs may stream while described.
+    Each describer run gets a size- and type-aware time budget that adapts to the
+    timings stored with earlier records; a file that exceeds it is re-described
+    from a sample and marked `PARTIAL`. With `bench_master_patches`, an LLM master
+    patch is promoted only if it keeps the synthetic benchmark corpus passing
+    without slowing it down (see `master_bench`).
+    """
     log("Analyzer: building executable file descriptions")
     descriptions_path = run_dir / "descriptions.json"
-    payload = _load_existing(descriptions_path)
-    records: Dict[str, Any] = payload.setdefault("records", {})
-    warnings: List[str] = payload.setdefault("warnings", [])
+    store = _open_store(run_dir, descriptions_path)
+    if len(store):
+        log(f"Analyzer: resuming with {len(store)} stored description(s)")
+    warnings: List[str] = []
+    describer_env: Dict[str, str] = {}
+    if zip_budget_mb is not None:
+        describer_env[ZIP_BUDGET_ENV] = str(zip_budget_mb)
+
+    throughput = budgets.observed_throughput(store.records())
 
     master_path = ensure_master(client=client, refresh_master=refresh_master)
     master_text = master_path.read_text(encoding="utf-8")
@@ -315,10 +549,6 @@ def run(
     run_master_path.parent.mkdir(parents=True, exist_ok=True)
     write_text(run_master_path, master_text)
 
-    existing_by_rel: Dict[str, Dict[str, Any]] = {
-        str(v.get("file_path")): v for v in records.values() if isinstance(v, dict) and v.get("file_path")
-    }
-
     valid_files: List[Path] = []
     fallbacks: Dict[str, Dict[str, Any]] = {}
     signatures: Dict[str, str] = {}
@@ -329,36 +559,58 @@ def run(
         if not path.exists():
             warnings.append(f"Missing file: {raw}")
             continue
-        rel = _rel_str(path)
         valid_files.append(path)
+
+    budget = {"remaining": max_failures_to_fix_per_run}
+
+    single_files = valid_files
+    if partition_detection:
+        partition_groups, single_files = partitions.detect_partitions(valid_files)
+        for group in partition_groups:
+            summary = partitions.summarize(group)
+            file_id = _partition_file_id(group, summary)
+            log(f"Analyzer: {summary['shard_count']} shards under {_rel_str(group.root)} described as one table")
+            existing = store.get(file_id)
+            if not force and _reusable(existing):
+                continue
+            store.put(
+                _process_partition(
+                    group,
+                    summary,
+                    run_dir,
+                    run_master_path,
+                    master_text,
+                    client,
+                    budget,
+                    describer_env,
+                    history=_history(existing),
+                    throughput=throughput,
+                )
+            )
+
+    for path in single_files:
+        rel = _rel_str(path)
         fallbacks[rel] = _heuristic_fallback(path)
         sig = compute_signature(path)
         signatures[rel] = sig
         groups.setdefault(sig, []).append(path)
 
-    budget = {"remaining": max_failures_to_fix_per_run}
-
     ordered: List[Path] = []
     if cluster_mode:
         for sig in sorted(groups.keys()):
             members = groups[sig]
             ordered.extend([members[0], *members[1:]])
     else:
-        ordered = valid_files
+        ordered = single_files
 
     for path in ordered:
         rel = _rel_str(path)
         stat = path.stat()
         file_id = f"{rel}::{int(stat.st_mtime)}:{int(stat.st_size)}"
-        existing = records.get(file_id) or existing_by_rel.get(rel)
-        if (
-            existing
-            and not force
-            and isinstance(existing.get("exec"), dict)
-            and int(existing["exec"].get("exit_code", 1)) == 0
-            and str(existing["exec"].get("stdout", "")).strip()
-        ):
-            records[file_id] = existing
+        existing = store.get(file_id) or store.latest_for_path(rel)
+        if not force and _reusable(existing):
+            if file_id not in store:
+                store.put({**existing, "file_id": file_id})
             continue
 
         record = _process_file(
@@ -370,8 +622,11 @@ def run(
             fallback_facts=fallbacks[rel],
             client=client,
             fail_fix_budget=budget,
+            describer_env=describer_env,
+            history=_history(existing),
+            throughput=throughput,
         )
-        records[file_id] = record
+        store.put(record)
 
         decision = record.get("promote_decision") or {}
         if record.get("status") == "override_ok" and bool(decision.get("promote")) and client is not None:
@@ -387,20 +642,38 @@ def run(
                 try:
                     patched = extract_python_code(client.complete(patch_prompt))
                     if patched.strip():
-                        write_text(master_path, patched)
-                        write_text(run_master_path, patched)
-                        master_text = patched
+                        candidate_path = run_dir / ".dsstar" / "describe_master_candidate.py"
+                        write_text(candidate_path, patched)
                         no_override_wrapper = run_dir / ".dsstar" / "desc_scripts" / f"{_safe_name(record['file_id'])}_master_only.py"
-                        _build_wrapper(no_override_wrapper, path, run_master_path, None)
-                        check = _execute_script(no_override_wrapper)
-                        if not _failed_exec(check):
+                        _build_wrapper(no_override_wrapper, path, candidate_path, None)
+                        check = _execute_script(
+                            no_override_wrapper, timeout_sec=record["time_budget_sec"], extra_env=describer_env
+                        )
+                        rejection = _master_patch_rejection(
+                            check, run_master_path, candidate_path, run_dir, record["file_id"], bench_master_patches
+                        )
+                        if rejection:
+                            warnings.append(f"Master patch for {rel} rejected: {rejection}")
+                            record["master_patch_rejected"] = rejection
+                            store.put(record)
+                        else:
+                            write_text(master_path, patched)
+                            write_text(run_master_path, patched)
+                            master_text = patched
+                            _build_wrapper(no_override_wrapper, path, run_master_path, None)
                             record["status"] = "master_ok"
-                            record["override_path"] = record.get("override_path")
                             record["exec"] = check
                             record["description_text"] = str(check.get("stdout", "")).strip()
                             record["master_version_id"] = master_version_id(master_text)
+                            store.put(record)
                 except Exception as exc:  # pylint: disable=broad-except
                     warnings.append(f"Master patch failed for {rel}: {exc}")
 
-    write_json(descriptions_path, payload)
-    return payload
+    extra: Dict[str, Any] = {"warnings": warnings}
+    if sqlite_store:
+        # Shards stay out of the store; their logical table is described above.
+        _attach_sqlite_store(store, extra, single_files, run_dir)
+
+    store.compact()
+    store.export(descriptions_path, extra)
+    return store.to_payload(extra)
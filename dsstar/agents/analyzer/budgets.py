@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+# Per-file time budgets for describer wrappers. A budget starts from a fixed
+# startup allowance plus the file size over an assumed describer throughput for
+# its type; throughput observed in earlier runs (kept in the record store) replaces
+# the assumption, and a file's own timings replace both, scaled by how much the
+# file grew or shrank since. A file that timed out gets twice its previous budget
+# the next time it is described in full.
+
+MIN_SEC = 5.0
+MAX_SEC = 600.0
+STARTUP_SEC = 5.0
+SAFETY = 3.0
+MAX_TIMINGS = 8
+SAMPLE_BYTES = 8 * 1024 * 1024
+SAMPLEABLE_SUFFIXES = {".csv", ".tsv", ".jsonl", ".ndjson", ".txt"}
+_MIN_THROUGHPUT_BYTES = 1024 * 1024
+_MB = 1024 * 1024
+
+# Conservative MB/s for a describer that reads the whole file once.
+DEFAULT_MB_PER_SEC: Dict[str, float] = {
+    "csv": 30.0,
+    "tsv": 30.0,
+    "json": 15.0,
+    "xlsx": 4.0,
+    "sqlite": 40.0,
+    "parquet": 150.0,
+    "zip": 20.0,
+    "partitioned": 30.0,
+    "unknown": 30.0,
+}
+
+
+def _clamp(seconds: float) -> float:
+    return round(min(max(seconds, MIN_SEC), MAX_SEC), 1)
+
+
+def observed_throughput(records: Iterable[Dict[str, Any]]) -> Dict[str, float]:
+    """Median MB/s per file type over completed full-mode describer runs in `records`."""
+    rates: Dict[str, List[float]] = {}
+    for record in records:
+        size = int(record.get("size") or 0)
+        if size < _MIN_THROUGHPUT_BYTES:
+            continue  # interpreter startup dominates small files
+        for timing in record.get("timings") or []:
+            if timing.get("mode") != "full" or timing.get("timed_out") or not timing.get("runtime_ms"):
+                continue
+            file_type = str(record.get("shard_file_type") or record.get("file_type") or "unknown")
+            described = int(timing.get("size_bytes") or size)
+            rates.setdefault(file_type, []).append((described / _MB) / (int(timing["runtime_ms"]) / 1000.0))
+    return {file_type: sorted(values)[len(values) // 2] for file_type, values in rates.items()}
+
+
+def time_budget(
+    file_type: str,
+    size_bytes: int,
+    history: Optional[List[Dict[str, Any]]] = None,
+    throughput: Optional[Dict[str, float]] = None,
+) -> float:
+    """Seconds a full description of a `size_bytes` file of `file_type` may take."""
+    rate = (throughput or {}).get(file_type) or DEFAULT_MB_PER_SEC.get(file_type, DEFAULT_MB_PER_SEC["unknown"])
+    budget = STARTUP_SEC + SAFETY * (size_bytes / _MB) / rate
+    full = [timing for timing in history or [] if timing.get("mode") == "full"]
+    if full:
+        last = full[-1]
+        previous_size = int(last.get("size_bytes") or 0)
+        # Timings of an older version of the file only say something relative to its size then.
+        ratio = size_bytes / previous_size if previous_size and size_bytes else 1.0
+        if last.get("timed_out"):
+            budget = max(budget, 2.0 * float(last.get("budget_sec") or 0.0) * ratio)
+        else:
+            budget = STARTUP_SEC + SAFETY * int(last.get("runtime_ms") or 0) / 1000.0 * ratio
+    return _clamp(budget)
+
+
+def sample_budget(file_type: str, throughput: Optional[Dict[str, float]] = None) -> float:
+    """Budget for the sampling-mode retry, which only sees `SAMPLE_BYTES` of the file."""
+    return time_budget(file_type, SAMPLE_BYTES, throughput=throughput)
+
+
+def timing_entry(mode: str, exec_info: Dict[str, Any], budget_sec: float, size_bytes: int = 0) -> Dict[str, Any]:
+    return {
+        "mode": mode,
+        "size_bytes": size_bytes,
+        "runtime_ms": int(exec_info.get("runtime_ms", 0)),
+        "budget_sec": budget_sec,
+        "timed_out": bool(exec_info.get("timed_out")),
+        "at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
+    }
+
+
+def write_sample(path: Path, sample_path: Path, max_bytes: Optional[int] = None) -> Dict[str, Any]:
+    """Copy the leading whole lines of a line-oriented file; returns what the sample covers."""
+    with path.open("rb") as handle:
+        head = handle.read(max_bytes or SAMPLE_BYTES)
+        complete = not handle.read(1)
+    if not complete and b"\n" in head:
+        head = head[: head.rfind(b"\n") + 1]
+    sample_path.parent.mkdir(parents=True, exist_ok=True)
+    sample_path.write_bytes(head)
+    size = path.stat().st_size
+    lines = head.count(b"\n") + (0 if head.endswith(b"\n") or not head else 1)
+    return {
+        "sample_bytes": len(head),
+        "sample_lines": lines,
+        "estimated_lines": lines if complete else int(lines * size / max(len(head), 1)),
+        "fraction": round(len(head) / max(size, 1), 4),
+    }
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import subprocess
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from dsstar.runtime_paths import package_pythonpath
+from dsstar.tools.log_utils import write_json, write_text
+
+# Benchmark gate for master describer patches. A deterministic synthetic corpus
+# (CSV, TSV, JSON, JSONL, XLSX and SQLite at several sizes) is generated once per
+# cache dir; the current and the candidate master each describe every corpus file
+# in a fresh interpreter that reports describe time and peak RSS. A candidate is
+# rejected when it breaks a file the current master handles or when its total
+# describe time grows past `max_slowdown`; memory growth is only flagged.
+
+CORPUS_VERSION = 1
+SIZES: Dict[str, int] = {"small": 200, "medium": 50_000, "large": 500_000}
+DEFAULT_SIZES = ("small", "medium")
+KINDS = ("csv", "tsv", "json", "jsonl", "xlsx", "sqlite")
+MAX_SLOWDOWN = 1.5
+SLOWDOWN_SLACK_SEC = 0.25
+MAX_MEMORY_GROWTH = 2.0
+MEMORY_SLACK_MB = 32.0
+FILE_TIMEOUT_SEC = 60.0
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_DOC_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+_RUNNER = '''import importlib.util
+import json
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def _rss_mb():
+    # VmHWM starts fresh at exec; ru_maxrss would still hold the parent's peak on Linux.
+    try:
+        with open("/proc/self/status", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+spec = importlib.util.spec_from_file_location("bench_master", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+before = _rss_mb()
+start = time.perf_counter()
+text = str(module.describe_file(sys.argv[2]) or "")
+elapsed = time.perf_counter() - start
+print(json.dumps({"sec": elapsed, "rss_before_mb": before, "rss_peak_mb": _rss_mb(), "output": text[:2000]}))
+'''
+
+
+def _row(idx: int) -> List[str]:
+    return [str(idx), f"name_{idx % 97}", f"{(idx * 7919) % 100000 / 100:.2f}", f"2024-{idx % 12 + 1:02d}-{idx % 28 + 1:02d}"]
+
+
+_HEADER = ["id", "name", "amount", "day"]
+
+
+def _write_delimited(path: Path, rows: int, delimiter: str) -> None:
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        handle.write(delimiter.join(_HEADER) + "\n")
+        for idx in range(rows):
+            handle.write(delimiter.join(_row(idx)) + "\n")
+
+
+def _record(idx: int) -> Dict[str, Any]:
+    values = _row(idx)
+    return {"id": idx, "name": values[1], "amount": float(values[2]), "day": values[3], "tags": [f"t{idx % 5}"]}
+
+
+def _write_json(path: Path, rows: int, lines: bool) -> None:
+    with path.open("w", encoding="utf-8") as handle:
+        if lines:
+            for idx in range(rows):
+                handle.write(json.dumps(_record(idx)) + "\n")
+            return
+        handle.write('{"source": "bench", "records": [')
+        for idx in range(rows):
+            handle.write(("," if idx else "") + json.dumps(_record(idx)))
+        handle.write("]}")
+
+
+def _cell(ref: str, value: str, numeric: bool) -> str:
+    if numeric:
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    return f'<c r="{ref}" t="inlineStr"><is><t>{value}</t></is></c>'
+
+
+def _write_xlsx(path: Path, rows: int) -> None:
+    columns = "ABCD"
+    body: List[str] = ["".join(_cell(f"{col}1", name, False) for col, name in zip(columns, _HEADER))]
+    for idx in range(rows):
+        values = _row(idx)
+        body.append(
+            "".join(_cell(f"{col}{idx + 2}", value, pos in {0, 2}) for pos, (col, value) in enumerate(zip(columns, values)))
+        )
+    sheet = (
+        f'<worksheet xmlns="{_MAIN_NS}"><dimension ref="A1:D{rows + 1}"/><sheetData>'
+        + "".join(f'<row r="{idx}">{cells}</row>' for idx, cells in enumerate(body, start=1))
+        + "</sheetData></worksheet>"
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(
+            "[Content_Types].xml",
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/worksheets/sheet1.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/></Types>',
+        )
+        archive.writestr(
+            "_rels/.rels",
+            f'<Relationships xmlns="{_PKG_REL_NS}"><Relationship Id="rId1" '
+            f'Type="{_DOC_REL_NS}/officeDocument" Target="xl/workbook.xml"/></Relationships>',
+        )
+        archive.writestr(
+            "xl/workbook.xml",
+            f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_DOC_REL_NS}"><sheets>'
+            '<sheet name="Data" sheetId="1" r:id="rId1"/></sheets></workbook>',
+        )
+        archive.writestr(
+            "xl/_rels/workbook.xml.rels",
+            f'<Relationships xmlns="{_PKG_REL_NS}"><Relationship Id="rId1" '
+            f'Type="{_DOC_REL_NS}/worksheet" Target="worksheets/sheet1.xml"/></Relationships>',
+        )
+        archive.writestr("xl/worksheets/sheet1.xml", sheet)
+
+
+def _write_sqlite(path: Path, rows: int) -> None:
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("CREATE TABLE sales (id INTEGER PRIMARY KEY, name TEXT, amount REAL, day TEXT)")
+        conn.executemany("INSERT INTO sales VALUES (?, ?, ?, ?)", (_row(idx) for idx in range(rows)))
+        conn.execute("CREATE INDEX idx_sales_day ON sales(day)")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+_WRITERS = {
+    "csv": lambda path, rows: _write_delimited(path, rows, ","),
+    "tsv": lambda path, rows: _write_delimited(path, rows, "\t"),
+    "json": lambda path, rows: _write_json(path, rows, lines=False),
+    "jsonl": lambda path, rows: _write_json(path, rows, lines=True),
+    "xlsx": _write_xlsx,
+    "sqlite": _write_sqlite,
+}
+
+
+def build_corpus(cache_dir: Path, sizes: Sequence[str] = DEFAULT_SIZES) -> List[Path]:
+    """Generate (once) and return the benchmark corpus under `cache_dir/master_bench/v<N>`."""
+    corpus_dir = cache_dir / "master_bench" / f"v{CORPUS_VERSION}"
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+    paths: List[Path] = []
+    for size in sizes:
+        for kind in KINDS:
+            path = corpus_dir / f"{size}.{kind}"
+            if not path.exists():
+                partial = path.with_name(f".{path.name}.tmp")
+                partial.unlink(missing_ok=True)
+                _WRITERS[kind](partial, SIZES[size])
+                partial.replace(path)
+            paths.append(path)
+    return paths
+
+
+def _describe_once(runner: Path, master_path: Path, path: Path, timeout_sec: float) -> Dict[str, Any]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = package_pythonpath()
+    entry: Dict[str, Any] = {"file": path.name, "size": path.stat().st_size}
+    try:
+        proc = subprocess.run(
+            [os.environ.get("PYTHON", "python"), str(runner), str(master_path), str(path)],
+            capture_output=True,
+            text=True,
+            timeout=timeout_sec,
+            env=env,
+        )
+    except subprocess.TimeoutExpired:
+        return {**entry, "ok": False, "error": f"timed out after {timeout_sec}s"}
+    try:
+        measured = json.loads(proc.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        return {**entry, "ok": False, "error": (proc.stderr.strip().splitlines() or ["no output"])[-1][:300]}
+    output = str(measured.pop("output", "")).strip()
+    ok = bool(output) and "FAILED TO DESCRIBE" not in output
+    return {**entry, **measured, "ok": ok, "error": None if ok else output[:300] or "empty output"}
+
+
+def _summarize(master_path: Path, files: List[Dict[str, Any]]) -> Dict[str, Any]:
+    passed = [entry for entry in files if entry["ok"]]
+    total_sec = sum(float(entry["sec"]) for entry in passed)
+    total_mb = sum(int(entry["size"]) for entry in passed) / (1024 * 1024)
+    growth = [
+        float(entry["rss_peak_mb"]) - float(entry["rss_before_mb"])
+        for entry in passed
+        if entry.get("rss_peak_mb") is not None and entry.get("rss_before_mb") is not None
+    ]
+    return {
+        "master": str(master_path),
+        "files": files,
+        "passed": [entry["file"] for entry in passed],
+        "failed": [entry["file"] for entry in files if not entry["ok"]],
+        "total_sec": round(total_sec, 4),
+        "files_per_sec": round(len(passed) / total_sec, 2) if total_sec else None,
+        "mb_per_sec": round(total_mb / total_sec, 2) if total_sec else None,
+        "peak_memory_growth_mb": round(max(growth), 1) if growth else None,
+    }
+
+
+def benchmark(
+    master_paths: Sequence[Path],
+    corpus: Sequence[Path],
+    work_dir: Path,
+    timeout_sec: float = FILE_TIMEOUT_SEC,
+) -> List[Dict[str, Any]]:
+    """Describe every corpus file with each master; returns one summary per master.
+
+    Masters run file by file in turn so machine load drifts affect all of them alike.
+    """
+    runner = work_dir / "master_bench_runner.py"
+    write_text(runner, _RUNNER)
+    results: List[List[Dict[str, Any]]] = [[] for _ in master_paths]
+    for path in corpus:
+        for idx, master_path in enumerate(master_paths):
+            results[idx].append(_describe_once(runner, master_path, path, timeout_sec))
+    return [_summarize(master_path, files) for master_path, files in zip(master_paths, results)]
+
+
+def compare(
+    baseline: Dict[str, Any],
+    candidate: Dict[str, Any],
+    max_slowdown: float = MAX_SLOWDOWN,
+    max_memory_growth: float = MAX_MEMORY_GROWTH,
+) -> Dict[str, Any]:
+    reasons: List[str] = []
+    flags: List[str] = []
+    broken = sorted(set(baseline["passed"]) - set(candidate["passed"]))
+    if broken:
+        reasons.append("breaks previously described files: " + ", ".join(broken))
+    # Time is compared over files both masters describe, with slack so that
+    # interpreter jitter on tiny totals cannot reject a patch.
+    common = set(baseline["passed"]) & set(candidate["passed"])
+    base_sec = sum(float(e["sec"]) for e in baseline["files"] if e["file"] in common)
+    cand_sec = sum(float(e["sec"]) for e in candidate["files"] if e["file"] in common)
+    if cand_sec > base_sec * max_slowdown + SLOWDOWN_SLACK_SEC:
+        reasons.append(f"describe time {cand_sec:.2f}s vs {base_sec:.2f}s exceeds {max_slowdown}x")
+    base_mem = baseline.get("peak_memory_growth_mb")
+    cand_mem = candidate.get("peak_memory_growth_mb")
+    if base_mem is not None and cand_mem is not None and cand_mem > base_mem * max_memory_growth + MEMORY_SLACK_MB:
+        flags.append(f"peak memory growth {cand_mem} MB vs {base_mem} MB")
+    return {"accepted": not reasons, "reasons": reasons, "flags": flags}
+
+
+def gate(
+    current_master: Path,
+    candidate_master: Path,
+    cache_dir: Path,
+    work_dir: Path,
+    report_path: Optional[Path] = None,
+    sizes: Optional[Sequence[str]] = None,
+) -> Dict[str, Any]:
+    """Benchmark `candidate_master` against `current_master` and decide whether it may be promoted."""
+    corpus = build_corpus(cache_dir, sizes or DEFAULT_SIZES)
+    baseline, candidate = benchmark([current_master, candidate_master], corpus, work_dir)
+    report = {**compare(baseline, candidate), "baseline": baseline, "candidate": candidate}
+    if report_path is not None:
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        write_json(report_path, report)
+    return report
@@ -34,9 +34,14 @@ def describe_file(path: str) -> str:
             if rows:
                 lines.append("COLUMNS=" + ",".join(rows[0]))
                 lines.append("ROW_COUNT=" + str(max(len(rows) - 1, 0)))
-        elif ext in {".json"}:
-            payload = json.loads(p.read_text(encoding="utf-8", errors="replace"))
-            lines.append("JSON_TYPE=" + type(payload).__name__)
+        elif ext in {".json", ".jsonl", ".ndjson"}:
+            try:
+                from dsstar.tools.json_stream import scan_json, summary_lines
+
+                lines.extend(summary_lines(scan_json(p)))
+            except ImportError:
+                with p.open("r", encoding="utf-8", errors="replace") as handle:
+                    lines.append("JSON_HEAD=" + handle.read(800).replace("\\n", " "))
         elif ext in {".db", ".sqlite", ".sqlite3"}:
             conn = sqlite3.connect(str(p))
             cur = conn.cursor()
@@ -45,8 +50,8 @@ def describe_file(path: str) -> str:
             lines.append("TABLES=" + ",".join(tables))
         else:
             snippet = p.read_text(encoding="utf-8", errors="replace")[:400]
-            lines.append("SNIPPET=" + snippet.replace("\n", " "))
-        return "\n".join(lines)
+            lines.append("SNIPPET=" + snippet.replace("\\n", " "))
+        return "\\n".join(lines)
     except Exception as exc:
         return f"FAILED TO DESCRIBE: {exc}"
 '''
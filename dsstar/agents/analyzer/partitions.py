@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import importlib.util
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+_HIVE_RE = re.compile(r"^([A-Za-z_][\w.-]*)=(.*)$")
+_DATE_DIR_RE = re.compile(r"^\d{4}-\d{2}(-\d{2})?$")
+_SHARD_NAME_RE = re.compile(r"^(part|shard|chunk)[-_]?\d+", re.IGNORECASE)
+_DIGITS_RE = re.compile(r"\d+")
+_COUNT_CHUNK = 1024 * 1024
+_SAMPLE_SHARDS = 3
+_WORKERS = 8
+
+
+@dataclass
+class PartitionGroup:
+    root: Path
+    suffix: str
+    keys: List[str]
+    shards: List[Tuple[Path, Dict[str, str]]] = field(default_factory=list)
+    # Shard basename with digit runs as `*` (e.g. `part-*.csv`); shards of one table share it.
+    name_glob: str = ""
+
+
+def _partition_segments(path: Path, input_root: Path) -> Optional[Tuple[Path, List[str], Dict[str, str]]]:
+    """Split `path` into dataset root and partition values when its parents below `input_root` form a partition layout."""
+    try:
+        parents = list(path.parent.relative_to(input_root).parts)
+    except ValueError:
+        return None
+    root_idx: Optional[int] = None
+    keys: List[str] = []
+    values: Dict[str, str] = {}
+    for idx, segment in enumerate(parents):
+        hive = _HIVE_RE.match(segment)
+        if hive:
+            key, value = hive.group(1), hive.group(2)
+        elif _DATE_DIR_RE.match(segment):
+            key, value = "date" if "date" not in values else f"date_{len(keys) + 1}", segment
+        elif root_idx is not None:
+            # A plain directory below a partition directory: not a clean layout.
+            return None
+        else:
+            continue
+        if root_idx is None:
+            root_idx = idx
+        keys.append(key)
+        values[key] = value
+    if root_idx is None:
+        return None
+    return input_root.joinpath(*parents[:root_idx]), keys, values
+
+
+def _schema(path: Path) -> Tuple[str, List[str]]:
+    """Delimiter and header names of a delimited-text shard; ("", []) for other formats or unreadable files."""
+    if path.suffix.lower() not in {".csv", ".tsv", ".txt"}:
+        return "", []
+    try:
+        with path.open("r", encoding="utf-8", errors="replace", newline="") as handle:
+            first = handle.readline()
+    except OSError:
+        return "", []
+    if not first.strip():
+        return "", []
+    delimiter = "\t" if path.suffix.lower() == ".tsv" or first.count("\t") > first.count(",") else ","
+    return delimiter, [name.strip() for name in next(csv.reader([first], delimiter=delimiter), [])]
+
+
+def _header(path: Path) -> List[str]:
+    return _schema(path)[1]
+
+
+def _compatible(left: Tuple[str, List[str]], right: Tuple[str, List[str]]) -> bool:
+    # Shards of one table may gain or lose columns over time, but one schema must contain the other.
+    if left[0] != right[0]:
+        return False
+    left_columns, right_columns = set(left[1]), set(right[1])
+    return left_columns <= right_columns or right_columns <= left_columns
+
+
+def detect_partitions(
+    paths: Sequence[Path], min_shards: int = 2, input_root: Optional[Path] = None
+) -> Tuple[List[PartitionGroup], List[Path]]:
+    """Group shard files of partitioned datasets; everything else is returned unchanged.
+
+    Recognized layouts below `input_root` (default: the inputs' common directory):
+    Hive-style `key=value/` directories, date directories (`2024-01-01/`), and
+    `part-0000.csv`-style shards sharing one directory. Shards are only grouped
+    when they also share a basename pattern and compatible headers.
+    """
+    resolved = [path.resolve() for path in paths]
+    if input_root is None and resolved:
+        input_root = Path(os.path.commonpath([str(path.parent) for path in resolved]))
+    buckets: Dict[Tuple[str, Tuple[str, ...], str], List[Tuple[Path, Dict[str, str]]]] = {}
+    layouts: Dict[Tuple[str, Tuple[str, ...], str], Tuple[Path, List[str]]] = {}
+    singles: List[Path] = []
+    for path, absolute in zip(paths, resolved):
+        layout = _partition_segments(absolute, input_root.resolve()) if input_root is not None else None
+        if layout is None and _SHARD_NAME_RE.match(path.name):
+            layout = (absolute.parent, [], {})
+        if layout is None:
+            singles.append(path)
+            continue
+        root, keys, values = layout
+        bucket_key = (str(root), tuple(keys), _DIGITS_RE.sub("*", path.name))
+        layouts.setdefault(bucket_key, (root, list(keys)))
+        buckets.setdefault(bucket_key, []).append((path, values))
+
+    groups: List[PartitionGroup] = []
+    for bucket_key, shards in buckets.items():
+        root, keys = layouts[bucket_key]
+        # Same layout and name pattern can still hold unrelated tables; split them by header.
+        clusters: List[Tuple[Tuple[str, List[str]], List[Tuple[Path, Dict[str, str]]]]] = []
+        for shard in shards:
+            schema = _schema(shard[0])
+            for idx, (cluster_schema, members) in enumerate(clusters):
+                if _compatible(cluster_schema, schema):
+                    members.append(shard)
+                    if len(schema[1]) > len(cluster_schema[1]):
+                        clusters[idx] = (schema, members)
+                    break
+            else:
+                clusters.append((schema, [shard]))
+        for _, members in clusters:
+            if len(members) < min_shards:
+                singles.extend(path for path, _ in members)
+                continue
+            members.sort(key=lambda item: str(item[0]))
+            suffix = members[0][0].suffix.lower()
+            groups.append(PartitionGroup(root=root, suffix=suffix, keys=keys, shards=members, name_glob=bucket_key[2]))
+    return groups, singles
+
+
+def fast_row_count(path: Path) -> Optional[int]:
+    """Data rows without parsing: newline count for text shards, footer metadata for Parquet."""
+    suffix = path.suffix.lower()
+    if suffix == ".parquet":
+        if importlib.util.find_spec("pyarrow") is None:
+            return None
+        import pyarrow.parquet as pq  # type: ignore
+
+        try:
+            return int(pq.ParquetFile(str(path)).metadata.num_rows)
+        except Exception:  # pylint: disable=broad-except
+            return None
+    if suffix not in {".csv", ".tsv", ".txt", ".jsonl", ".ndjson"}:
+        return None
+    lines = 0
+    last = b"\n"
+    try:
+        with path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(_COUNT_CHUNK), b""):
+                lines += chunk.count(b"\n")
+                last = chunk[-1:]
+    except OSError:
+        return None
+    if last != b"\n":
+        lines += 1
+    header_lines = 0 if suffix in {".jsonl", ".ndjson"} else 1
+    return max(0, lines - header_lines)
+
+
+def _key_range(values: List[str]) -> Dict[str, Any]:
+    distinct = sorted(set(values))
+    numeric: Optional[List[float]] = None
+    try:
+        numeric = [float(value) for value in distinct]
+    except ValueError:
+        numeric = None
+    if numeric is not None:
+        return {"distinct": len(distinct), "min": min(numeric), "max": max(numeric)}
+    return {"distinct": len(distinct), "min": distinct[0], "max": distinct[-1]}
+
+
+def summarize(group: PartitionGroup) -> Dict[str, Any]:
+    """Logical-table facts for a partition group: union schema, key ranges, row totals, sample shards."""
+    shard_paths = [path for path, _ in group.shards]
+
+    def probe(path: Path) -> Tuple[List[str], Optional[int], int, int]:
+        stat = path.stat()
+        return _header(path), fast_row_count(path), int(stat.st_size), int(stat.st_mtime)
+
+    with ThreadPoolExecutor(max_workers=_WORKERS) as pool:
+        probes = list(pool.map(probe, shard_paths))
+
+    columns: List[str] = []
+    present: Dict[str, int] = {}
+    for header, _, _, _ in probes:
+        for name in header:
+            if name not in present:
+                columns.append(name)
+                present[name] = 0
+            present[name] += 1
+    counts = [rows for _, rows, _, _ in probes]
+    picks = sorted({0, len(shard_paths) // 2, len(shard_paths) - 1})[:_SAMPLE_SHARDS]
+    digest = hashlib.sha256()
+    for path, (_, _, size, mtime) in zip(shard_paths, probes):
+        digest.update(f"{path.resolve()}:{mtime}:{size}\n".encode("utf-8"))
+
+    return {
+        "root": str(group.root),
+        "shard_suffix": group.suffix,
+        "shard_glob": "/".join(["*"] * len(group.keys) + [group.name_glob or f"*{group.suffix}"]),
+        "shard_count": len(shard_paths),
+        "partition_keys": {
+            key: _key_range([values[key] for _, values in group.shards if key in values]) for key in group.keys
+        },
+        "columns": columns,
+        "columns_missing_in_shards": {
+            name: len(shard_paths) - count for name, count in present.items() if count < len(shard_paths)
+        },
+        "total_rows": sum(c for c in counts if c is not None) if any(c is not None for c in counts) else None,
+        "rows_counted_shards": sum(1 for c in counts if c is not None),
+        "total_size": sum(size for _, _, size, _ in probes),
+        "latest_mtime": max(mtime for _, _, _, mtime in probes),
+        "sample_shards": [str(shard_paths[idx].resolve().relative_to(group.root)) for idx in picks],
+        "fingerprint": digest.hexdigest(),
+    }
+
+
+def describe_text(summary: Dict[str, Any], representative: str, representative_text: str) -> str:
+    lines = [
+        f"LOGICAL TABLE (partitioned dataset): {summary['root']}",
+        f"shards: {summary['shard_count']} x {summary['shard_glob']}, total_size: {summary['total_size']} bytes, "
+        f"total_rows: {summary['total_rows'] if summary['total_rows'] is not None else 'unknown'}",
+    ]
+    for key, info in summary["partition_keys"].items():
+        lines.append(f"partition_key {key}: {info['min']} .. {info['max']} ({info['distinct']} distinct)")
+    if summary["columns"]:
+        lines.append(f"columns (union): {', '.join(summary['columns'])}")
+    for name, missing in summary["columns_missing_in_shards"].items():
+        lines.append(f"column {name} missing in {missing} shard(s)")
+    lines.append(f"sample_shards: {', '.join(summary['sample_shards'])}")
+    lines.append("Read all shards (e.g. glob the root and concat, adding partition keys from the path); "
+                 "filter on partition keys by selecting directories before reading.")
+    lines.append(f"--- representative shard: {representative} ---")
+    lines.append(representative_text)
+    return "\n".join(lines)
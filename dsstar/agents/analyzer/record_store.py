@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# Append-only JSONL of analyzer records. Each line is one complete record written
+# with a single write + fsync; the last line for a file_id wins. Only the
+# file_id -> byte offset index lives in memory, so a crashed analysis keeps every
+# record written before the crash and the next run resumes from there.
+
+_COMPACT_MIN_LINES = 256
+
+
+def _compact_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    # `desc_exec` and `desc_script` mirror `exec` and `wrapper_path`; storing them
+    # twice would double every describer stdout on disk.
+    slim = dict(record)
+    if slim.get("desc_exec") is slim.get("exec") or slim.get("desc_exec") == slim.get("exec"):
+        slim.pop("desc_exec", None)
+    if slim.get("desc_script") == {"path": slim.get("wrapper_path")}:
+        slim.pop("desc_script", None)
+    return slim
+
+
+def _inflate(record: Dict[str, Any]) -> Dict[str, Any]:
+    if "exec" in record and "desc_exec" not in record:
+        record["desc_exec"] = record["exec"]
+    if record.get("wrapper_path") and "desc_script" not in record:
+        record["desc_script"] = {"path": record["wrapper_path"]}
+    return record
+
+
+class RecordStore:
+    """Analyzer records keyed by file_id, persisted one line at a time."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._offsets: Dict[str, int] = {}
+        self._by_rel: Dict[str, str] = {}
+        self._lines = 0
+        self._scan()
+
+    def _scan(self) -> None:
+        if not self.path.exists():
+            return
+        good_end = 0
+        with self.path.open("rb") as handle:
+            while True:
+                offset = handle.tell()
+                line = handle.readline()
+                if not line:
+                    break
+                if not line.endswith(b"\n"):
+                    break  # torn final append from an interrupted run
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                good_end = handle.tell()
+                self._index(record, offset)
+        if good_end < self.path.stat().st_size:
+            with self.path.open("r+b") as handle:
+                handle.truncate(good_end)
+
+    def _index(self, record: Dict[str, Any], offset: int) -> None:
+        file_id = str(record.get("file_id", ""))
+        self._offsets[file_id] = offset
+        if record.get("file_path"):
+            self._by_rel[str(record["file_path"])] = file_id
+        self._lines += 1
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, file_id: object) -> bool:
+        return file_id in self._offsets
+
+    def file_ids(self) -> List[str]:
+        return list(self._offsets)
+
+    def _read_at(self, offset: int) -> Dict[str, Any]:
+        with self.path.open("rb") as handle:
+            handle.seek(offset)
+            return _inflate(json.loads(handle.readline()))
+
+    def get(self, file_id: str) -> Optional[Dict[str, Any]]:
+        offset = self._offsets.get(file_id)
+        return None if offset is None else self._read_at(offset)
+
+    def latest_for_path(self, rel: str) -> Optional[Dict[str, Any]]:
+        file_id = self._by_rel.get(rel)
+        return None if file_id is None else self.get(file_id)
+
+    def put(self, record: Dict[str, Any]) -> None:
+        line = (json.dumps(_compact_record(record), ensure_ascii=False) + "\n").encode("utf-8")
+        with self.path.open("ab") as handle:
+            offset = handle.tell()
+            handle.write(line)
+            handle.flush()
+            os.fsync(handle.fileno())
+        self._index(record, offset)
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Latest version of every record, in first-seen order, read one at a time."""
+        if not self._offsets:
+            return
+        with self.path.open("rb") as handle:
+            for offset in list(self._offsets.values()):
+                handle.seek(offset)
+                yield _inflate(json.loads(handle.readline()))
+
+    def compact(self) -> None:
+        """Rewrite the log without superseded lines once they dominate it."""
+        if self._lines < _COMPACT_MIN_LINES or self._lines < 2 * len(self._offsets):
+            return
+        tmp_path = self.path.with_suffix(".jsonl.tmp")
+        offsets: Dict[str, int] = {}
+        with tmp_path.open("wb") as out:
+            for record in self.records():
+                offsets[str(record.get("file_id", ""))] = out.tell()
+                out.write((json.dumps(_compact_record(record), ensure_ascii=False) + "\n").encode("utf-8"))
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_path, self.path)
+        self._offsets = offsets
+        self._lines = len(offsets)
+
+    def export(self, path: Path, extra: Dict[str, Any]) -> None:
+        """Stream the store into the `descriptions.json` layout ({"version", "records", ...})."""
+        tmp_path = path.with_suffix(".json.tmp")
+        with tmp_path.open("w", encoding="utf-8") as out:
+            out.write('{\n  "version": 3,\n  "records": {')
+            for idx, record in enumerate(self.records()):
+                body = json.dumps(record, indent=2).replace("\n", "\n    ")
+                out.write(f'{"," if idx else ""}\n    {json.dumps(str(record.get("file_id", "")))}: {body}')
+            out.write("\n  }")
+            for key, value in extra.items():
+                out.write(f",\n  {json.dumps(key)}: " + json.dumps(value, indent=2).replace("\n", "\n  "))
+            out.write("\n}\n")
+        os.replace(tmp_path, path)
+
+    def to_payload(self, extra: Dict[str, Any]) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"version": 3, "records": {}}
+        for record in self.records():
+            payload["records"][str(record.get("file_id", ""))] = record
+        payload.update(extra)
+        return payload
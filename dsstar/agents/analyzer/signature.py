@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import csv
-import sqlite3
+import zipfile
 from pathlib import Path
 from typing import Dict, List
 
+from dsstar.tools.sqlite_inspect import connect_readonly
+from dsstar.tools.xlsx_stream import inspect_xlsx
+
 
 def _size_bucket(size: int) -> str:
     if size < 10_000:
@@ -46,16 +49,13 @@ def _guess_delimiter(lines: List[str]) -> str:
 def _excel_probe(path: Path) -> Dict[str, str]:
     meta: Dict[str, str] = {"sheet_count": "0", "first_sheet": "none", "first_row_cells": "0"}
     try:
-        from openpyxl import load_workbook  # type: ignore
-
-        wb = load_workbook(path, read_only=True, data_only=True)
-        names = list(wb.sheetnames)
-        meta["sheet_count"] = str(len(names))
-        if names:
-            meta["first_sheet"] = names[0]
-            ws = wb[names[0]]
-            first_row = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
-            meta["first_row_cells"] = str(len([v for v in first_row if v is not None]))
+        summary = inspect_xlsx(path)
+        sheets = summary["sheets"]
+        meta["sheet_count"] = str(len(sheets))
+        if sheets:
+            meta["first_sheet"] = str(sheets[0]["name"])
+            meta["first_row_cells"] = str(len([v for v in sheets[0].get("header", []) if v != ""]))
+            meta["first_sheet_rows"] = str(sheets[0].get("rows"))
     except Exception:
         pass
     return meta
@@ -64,7 +64,7 @@ def _excel_probe(path: Path) -> Dict[str, str]:
 def _sqlite_probe(path: Path) -> Dict[str, str]:
     meta: Dict[str, str] = {"tables": "none"}
     try:
-        conn = sqlite3.connect(str(path))
+        conn = connect_readonly(path)
         cur = conn.cursor()
         rows = cur.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name LIMIT 5").fetchall()
         conn.close()
@@ -80,7 +80,7 @@ def compute_signature(path: Path) -> str:
     size_bucket = _size_bucket(path.stat().st_size)
     parts = [f"ext={suffix}", f"size={size_bucket}"]
 
-    if suffix in {".csv", ".tsv", ".txt", ".json"}:
+    if suffix in {".csv", ".tsv", ".txt", ".json", ".jsonl", ".ndjson"}:
         lines = _first_non_empty_lines(path)
         delim = _guess_delimiter(lines)
         header = lines[0][:120] if lines else "none"
@@ -103,7 +103,7 @@ def compute_signature(path: Path) -> str:
 
 def probe_sample(path: Path, max_lines: int = 50) -> str:
     suffix = path.suffix.lower()
-    if suffix in {".csv", ".tsv", ".txt", ".json"}:
+    if suffix in {".csv", ".tsv", ".txt", ".json", ".jsonl", ".ndjson"}:
         try:
             lines: List[str] = []
             with path.open("r", encoding="utf-8", errors="replace") as handle:
@@ -118,4 +118,10 @@ def probe_sample(path: Path, max_lines: int = 50) -> str:
         return str(_excel_probe(path))
     if suffix in {".db", ".sqlite", ".sqlite3"}:
         return str(_sqlite_probe(path))
+    if suffix == ".zip":
+        try:
+            with zipfile.ZipFile(path) as archive:
+                return "\n".join(f"{info.filename} {info.file_size}" for info in archive.infolist()[:max_lines])
+        except Exception as exc:
+            return f"zip_probe_failed: {exc}"
     return f"file_size={path.stat().st_size}"
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from dsstar.tools.log_utils import log, write_json
+
+# Bump when table layout or type inference changes so cached stores are rebuilt.
+_STORE_VERSION = 2
+_BATCH_ROWS = 5000
+_TYPE_SAMPLE_ROWS = 1000
+_MAX_INDEXES_PER_TABLE = 6
+_TABULAR_SUFFIXES = {".csv", ".tsv", ".xlsx", ".xlsm"}
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?(Z|[+-]\d{2}:?\d{2})?$")
+_KEY_NAME_RE = re.compile(r"(^id$|_id$|^id_|key$|^code$|_code$|^sku$|^uuid$)", re.IGNORECASE)
+_DATE_NAME_RE = re.compile(r"(date|time|day|month|year|_at$|^ts$|timestamp)", re.IGNORECASE)
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _table_name(stem: str, taken: Dict[str, int]) -> str:
+    base = re.sub(r"\W+", "_", stem).strip("_").lower() or "table"
+    if base[0].isdigit():
+        base = f"t_{base}"
+    count = taken.get(base, 0)
+    taken[base] = count + 1
+    return base if count == 0 else f"{base}_{count + 1}"
+
+
+def _column_names(header: Sequence[Any]) -> List[str]:
+    names: List[str] = []
+    seen: Dict[str, int] = {}
+    for idx, raw in enumerate(header):
+        name = str(raw).strip() if raw is not None and str(raw).strip() else f"col_{idx + 1}"
+        key = name.lower()
+        if key in seen:
+            seen[key] += 1
+            name = f"{name}_{seen[key]}"
+        else:
+            seen[key] = 1
+        names.append(name)
+    return names
+
+
+def _infer_type(values: List[str]) -> Tuple[str, bool]:
+    """SQLite affinity for a column sample, plus whether it holds ISO dates."""
+    present = [v for v in values if v != ""]
+    if not present:
+        return "TEXT", False
+    try:
+        for value in present:
+            int(value)
+        return "INTEGER", False
+    except ValueError:
+        pass
+    try:
+        for value in present:
+            float(value)
+        return "REAL", False
+    except ValueError:
+        pass
+    return "TEXT", all(_DATE_RE.match(value) for value in present)
+
+
+def _convert(value: str, affinity: str) -> Any:
+    """`value` stored under `affinity`; ValueError when it does not fit a numeric column."""
+    if value == "":
+        return None
+    if affinity == "INTEGER":
+        return int(value)
+    if affinity == "REAL":
+        return float(value)
+    return value
+
+
+def _widen(conn: sqlite3.Connection, table: str, columns: List[str], affinities: List[str], idx: int) -> None:
+    """Rebuild `table` with column `idx` as TEXT (SQLite cannot alter a column's type in place)."""
+    affinities[idx] = "TEXT"
+    old = f"{table}__narrow"
+    conn.execute(f"ALTER TABLE {_quote(table)} RENAME TO {_quote(old)}")
+    column_sql = ", ".join(f"{_quote(name)} {affinity}" for name, affinity in zip(columns, affinities))
+    conn.execute(f"CREATE TABLE {_quote(table)} ({column_sql})")
+    select_sql = ", ".join(
+        f"CAST({_quote(name)} AS TEXT)" if pos == idx else _quote(name) for pos, name in enumerate(columns)
+    )
+    conn.execute(f"INSERT INTO {_quote(table)} SELECT {select_sql} FROM {_quote(old)}")
+    conn.execute(f"DROP TABLE {_quote(old)}")
+
+
+def _csv_sheets(path: Path) -> Iterator[Tuple[str, Iterator[List[str]]]]:
+    csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+    handle = path.open("r", encoding="utf-8", errors="replace", newline="")
+    sample = handle.read(64 * 1024)
+    handle.seek(0)
+    if path.suffix.lower() == ".tsv":
+        delimiter = "\t"
+    else:
+        try:
+            delimiter = csv.Sniffer().sniff(sample, delimiters=",\t;|").delimiter
+        except csv.Error:
+            delimiter = ","
+
+    def rows() -> Iterator[List[str]]:
+        try:
+            yield from csv.reader(handle, delimiter=delimiter)
+        finally:
+            handle.close()
+
+    yield path.stem, rows()
+
+
+def _xlsx_sheets(path: Path) -> Iterator[Tuple[str, Iterator[List[str]]]]:
+    if importlib.util.find_spec("openpyxl") is None:
+        return
+    from openpyxl import load_workbook  # type: ignore
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            rows = (
+                ["" if cell is None else (cell.isoformat() if hasattr(cell, "isoformat") else str(cell)) for cell in row]
+                for row in sheet.iter_rows(values_only=True)
+            )
+            name = path.stem if len(workbook.worksheets) == 1 else f"{path.stem}_{sheet.title}"
+            yield name, rows
+    finally:
+        workbook.close()
+
+
+def _load_table(conn: sqlite3.Connection, table: str, rows: Iterator[List[str]]) -> Optional[Dict[str, Any]]:
+    header = next(rows, None)
+    if not header:
+        return None
+    columns = _column_names(header)
+    width = len(columns)
+    head: List[List[str]] = []
+    for row in rows:
+        head.append((list(row) + [""] * width)[:width])
+        if len(head) >= _TYPE_SAMPLE_ROWS:
+            break
+    inferred = [_infer_type([row[idx] for row in head]) for idx in range(width)]
+
+    column_sql = ", ".join(f"{_quote(name)} {affinity}" for name, (affinity, _) in zip(columns, inferred))
+    conn.execute(f"CREATE TABLE {_quote(table)} ({column_sql})")
+    insert_sql = f"INSERT INTO {_quote(table)} VALUES ({', '.join('?' for _ in columns)})"
+    affinities = [affinity for affinity, _ in inferred]
+
+    widened: List[str] = []
+
+    def insert(batch: List[List[str]]) -> None:
+        # Types come from the first rows only; a later value that does not fit widens its column to TEXT.
+        converted: List[List[Any]] = []
+        for row in batch:
+            values: List[Any] = []
+            for idx, value in enumerate(row):
+                try:
+                    values.append(_convert(value, affinities[idx]))
+                except ValueError:
+                    _widen(conn, table, columns, affinities, idx)
+                    widened.append(columns[idx])
+                    values.append(value)
+            converted.append(values)
+        conn.executemany(insert_sql, converted)
+
+    row_count = len(head)
+    insert(head)
+    batch: List[List[str]] = []
+    for row in rows:
+        batch.append((list(row) + [""] * width)[:width])
+        if len(batch) >= _BATCH_ROWS:
+            insert(batch)
+            row_count += len(batch)
+            batch = []
+    if batch:
+        insert(batch)
+        row_count += len(batch)
+    inferred = [
+        (affinity, is_date and affinity == "TEXT") for affinity, (_, is_date) in zip(affinities, inferred)
+    ]
+
+    indexes: List[Dict[str, str]] = []
+    for name, (affinity, is_date) in zip(columns, inferred):
+        if len(indexes) >= _MAX_INDEXES_PER_TABLE:
+            break
+        if _KEY_NAME_RE.search(name):
+            reason = "key"
+        elif is_date or (_DATE_NAME_RE.search(name) and affinity != "REAL"):
+            reason = "date"
+        else:
+            continue
+        safe_column = re.sub(r"\W+", "_", name)
+        index_name = f"idx_{table}_{safe_column}"[:120]
+        conn.execute(f"CREATE INDEX {_quote(index_name)} ON {_quote(table)} ({_quote(name)})")
+        indexes.append({"name": index_name, "column": name, "reason": reason})
+
+    return {
+        "table": table,
+        "rows": row_count,
+        "columns": [
+            {"name": name, "type": affinity, "date": is_date} for name, (affinity, is_date) in zip(columns, inferred)
+        ],
+        "widened": widened,
+        "indexes": indexes,
+    }
+
+
+def _fingerprint(paths: Sequence[Path]) -> str:
+    parts = [f"v{_STORE_VERSION}"]
+    for path in sorted(paths, key=lambda p: str(p.resolve())):
+        stat = path.stat()
+        parts.append(f"{path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:32]
+
+
+def tabular_inputs(paths: Sequence[Path]) -> List[Path]:
+    return [path for path in paths if path.suffix.lower() in _TABULAR_SUFFIXES and path.is_file()]
+
+
+def build_store(paths: Sequence[Path], cache_root: Path) -> Optional[Dict[str, Any]]:
+    """Bulk-load tabular inputs into one indexed SQLite database, reused while inputs are unchanged.
+
+    Returns the store facts recorded in descriptions.json: database path, and per
+    table its source file, row count, inferred column types and indexes.
+    """
+    sources = tabular_inputs(paths)
+    if not sources:
+        return None
+    store_dir = cache_root / "sqlite"
+    store_dir.mkdir(parents=True, exist_ok=True)
+    key = _fingerprint(sources)
+    db_path = store_dir / f"inputs_{key}.sqlite"
+    facts_path = store_dir / f"inputs_{key}.json"
+    if db_path.exists() and facts_path.exists():
+        try:
+            facts = json.loads(facts_path.read_text(encoding="utf-8"))
+            facts["cached"] = True
+            log(f"Analyzer: reusing SQLite store {db_path.name}")
+            return facts
+        except (OSError, json.JSONDecodeError):
+            pass
+
+    log(f"Analyzer: loading {len(sources)} tabular input(s) into SQLite")
+    tmp_path = db_path.with_suffix(f".tmp{os.getpid()}")
+    if tmp_path.exists():
+        tmp_path.unlink()
+    conn = sqlite3.connect(str(tmp_path))
+    tables: List[Dict[str, Any]] = []
+    errors: List[str] = []
+    taken: Dict[str, int] = {}
+    try:
+        # MEMORY (not OFF) keeps rollback defined; CREATE/ALTER TABLE still autocommit, hence the drops below.
+        conn.execute("PRAGMA journal_mode=MEMORY")
+        conn.execute("PRAGMA synchronous=OFF")
+        for source in sources:
+            sheets = _xlsx_sheets(source) if source.suffix.lower() in {".xlsx", ".xlsm"} else _csv_sheets(source)
+            table: Optional[str] = None
+            try:
+                for sheet_name, rows in sheets:
+                    table = _table_name(sheet_name, taken)
+                    with conn:
+                        info = _load_table(conn, table, rows)
+                    if info is not None:
+                        info["source"] = str(source.resolve())
+                        tables.append(info)
+                    table = None
+            except Exception as exc:  # pylint: disable=broad-except
+                errors.append(f"{source}: {exc}")
+                if table is not None:
+                    with conn:
+                        conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+                        conn.execute(f"DROP TABLE IF EXISTS {_quote(table + '__narrow')}")
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, db_path)
+
+    facts = {"path": str(db_path.resolve()), "tables": tables, "errors": errors, "cached": False}
+    write_json(facts_path, facts)
+    return facts
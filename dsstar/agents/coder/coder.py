@@ -1,13 +1,57 @@
 from __future__ import annotations
 
+import json
 import py_compile
+import re
+import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from dsstar.llm.base import LLMClient
-from dsstar.prompts import coder_prompt
-from dsstar.tools.log_utils import log, write_text
+from dsstar.llm.usage import estimate_tokens
+from dsstar.prompts import coder_diff_prompt, coder_prompt
+from dsstar.tools.log_utils import log, write_json, write_text
 from dsstar.tools.text_utils import extract_python_code
+from dsstar.utils.diff_utils import PatchError, apply_edits, apply_unified_diff
+
+_FENCE_RE = re.compile(r"```[\w-]*[ \t]*\n(.*?)```", re.DOTALL)
+
+
+def _timed_complete(client: LLMClient, prompt: str, stats: Dict[str, Any], kind: str) -> str:
+    started = time.perf_counter()
+    response = client.complete(prompt)
+    stats["calls"].append(
+        {
+            "kind": kind,
+            "output_chars": len(response),
+            "output_tokens_est": estimate_tokens(response),
+            "seconds": round(time.perf_counter() - started, 4),
+        }
+    )
+    return response
+
+
+def apply_patch_response(previous_code: str, response: str) -> str:
+    """Apply an edit list or unified diff from the LLM to `previous_code`; raises PatchError."""
+    text = response.strip()
+    fenced = _FENCE_RE.search(text)
+    if fenced:
+        text = fenced.group(1).strip()
+    if text.startswith(("[", "{")):
+        try:
+            edits = json.loads(text)
+        except json.JSONDecodeError as exc:
+            raise PatchError(f"edit list is not valid JSON: {exc}") from exc
+        code = apply_edits(previous_code, edits.get("edits") if isinstance(edits, dict) else edits)
+    elif re.search(r"^@@ ", text, flags=re.MULTILINE):
+        code = apply_unified_diff(previous_code, text)
+    else:
+        raise PatchError("response is neither an edit list nor a unified diff")
+    try:
+        compile(code, "<patched>", "exec")
+    except SyntaxError as exc:
+        raise PatchError(f"patched script does not compile: {exc.msg} (line {exc.lineno})") from exc
+    return code
 
 
 def run(
@@ -20,23 +64,51 @@ def run(
     client: LLMClient,
     run_dir: Path,
     round_idx: int,
+    kernel_variables: Optional[Dict[str, str]] = None,
+    incremental: bool = False,
+    reference_code: Optional[str] = None,
 ) -> Path:
-    """Generate Python code and write round_XX_code.py."""
+    """Generate Python code and write round_XX_code.py.
+
+    With `incremental`, the LLM is asked for edits to `previous_code` first and
+    the full script is regenerated only if they do not apply cleanly.
+    `reference_code` is a proven snippet from the solution library.
+    """
     log(f"Coder: generating code for round {round_idx:02d}")
-    prompt = coder_prompt(
-        question=question,
-        descriptions=descriptions,
-        plan=plan,
-        next_step=next_step,
-        previous_code=previous_code,
-        last_exec=last_exec,
-    )
     prompt_path = run_dir / f"round_{round_idx:02d}_prompt.txt"
-    write_text(prompt_path, prompt)
-    raw_code = client.complete(prompt)
-    code = extract_python_code(raw_code)
+    stats: Dict[str, Any] = {"mode": "full", "calls": []}
+    code: Optional[str] = None
+
+    if incremental and previous_code and kernel_variables is None:
+        prompt = coder_diff_prompt(question, descriptions, plan, next_step, previous_code, last_exec)
+        write_text(prompt_path, prompt)
+        response = _timed_complete(client, prompt, stats, "diff")
+        try:
+            code = apply_patch_response(previous_code, response)
+            stats["mode"] = "diff"
+            write_text(run_dir / f"round_{round_idx:02d}_code.diff", response)
+        except PatchError as exc:
+            log(f"Coder: patch for round {round_idx:02d} rejected ({exc}); regenerating the full script")
+            stats.update({"mode": "diff_fallback", "patch_error": str(exc)})
+
+    if code is None:
+        prompt = coder_prompt(
+            question=question,
+            descriptions=descriptions,
+            plan=plan,
+            next_step=next_step,
+            previous_code=previous_code,
+            last_exec=last_exec,
+            kernel_variables=kernel_variables,
+            reference_code=reference_code,
+        )
+        write_text(prompt_path, prompt)
+        code = extract_python_code(_timed_complete(client, prompt, stats, "full"))
     code_path = run_dir / f"round_{round_idx:02d}_code.py"
     write_text(code_path, code)
+    stats["output_tokens_est"] = sum(call["output_tokens_est"] for call in stats["calls"])
+    stats["seconds"] = round(sum(call["seconds"] for call in stats["calls"]), 4)
+    write_json(run_dir / f"round_{round_idx:02d}_coder.json", stats)
 
     try:
         py_compile.compile(str(code_path), doraise=True)
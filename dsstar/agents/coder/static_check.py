@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import ast
+import importlib.machinery
+import importlib.util
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from dsstar.tools.description_facts import columns_by_path, described_paths
+
+# Static validation of generated code before it is executed. A syntax error and
+# a module-level import (a direct statement of the script, not inside a function,
+# `if` or `try`) of a module that is not installed are certain to fail, so they
+# block execution (BLOCKING_CHECKS). Nested or guarded imports of missing modules
+# ("optional_import"), reads of files that are not on disk (nor written by the
+# script itself) and column literals missing from a described input's schema are
+# only likely failures: they never stop the script from running and reach the
+# debugger as hints when it does fail. Reads and column lookups under an `if` or
+# inside a try that catches the relevant error are not checked. Findings are
+# rendered as the traceback the run would have produced, so the fast-fix rules
+# and the debugger consume them unchanged.
+
+BLOCKING_CHECKS = {"syntax", "import"}
+
+_READERS = {
+    "read_csv", "read_table", "read_fwf", "read_json", "read_excel", "read_parquet", "read_feather",
+    "read_orc", "read_pickle", "read_stata", "read_sas", "read_spss", "read_xml", "read_hdf",
+    "ExcelFile", "load_workbook", "loadtxt", "genfromtxt",
+}
+_TABULAR_READERS = {"read_csv", "read_table", "read_excel", "read_parquet", "read_feather"}
+# Reader options that change which names end up as columns, or how the header is split and decoded.
+_RESHAPING_OPTIONS = {
+    "names", "header", "index_col", "skiprows", "prefix", "dtype_backend", "chunksize", "iterator", "usecols",
+    "sep", "delimiter", "delim_whitespace", "encoding", "encoding_errors", "quotechar", "escapechar",
+    "skipinitialspace", "lineterminator", "comment", "dialect", "sheet_name", "columns",
+}
+_WRITERS = {
+    "to_csv", "to_excel", "to_json", "to_parquet", "to_feather", "to_pickle", "to_hdf", "to_html",
+    "to_markdown", "to_string", "savefig", "save", "savetxt", "ExcelWriter",
+}
+_PATH_KEYWORDS = ("filepath_or_buffer", "path_or_buf", "path", "io", "filename", "fname", "file")
+_PATH_GUARDS = {"OSError", "IOError", "EnvironmentError", "FileNotFoundError", "Exception", "BaseException"}
+_COLUMN_GUARDS = {"KeyError", "LookupError", "ValueError", "Exception", "BaseException"}
+_installed_cache: Dict[str, bool] = {}
+
+
+def _finding(check: str, line: int, error_type: str, message: str, detail: str = "") -> Dict[str, Any]:
+    return {"check": check, "line": line, "error_type": error_type, "message": message, "detail": detail}
+
+
+def _call_name(node: ast.Call) -> str:
+    func = node.func
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    return func.id if isinstance(func, ast.Name) else ""
+
+
+def _installed(module: str, run_dir: Path) -> bool:
+    # Scripts run with the run directory as cwd and script directory, so its own modules import too.
+    if importlib.machinery.PathFinder.find_spec(module, [str(run_dir)]) is not None:
+        return True
+    if module not in _installed_cache:
+        try:
+            _installed_cache[module] = importlib.util.find_spec(module) is not None
+        except (ImportError, ValueError):
+            _installed_cache[module] = False
+    return _installed_cache[module]
+
+
+def _guarded_nodes(tree: ast.Module, guards: Set[str]) -> Set[int]:
+    """Nodes that only run conditionally (`if` branches) or inside a try that catches one of `guards`."""
+    guarded: Set[int] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.If, ast.IfExp)):
+            branches = node.body + node.orelse if isinstance(node, ast.If) else [node.body, node.orelse]
+            guarded.update(id(sub) for branch in branches for sub in ast.walk(branch))
+            continue
+        if not isinstance(node, ast.Try):
+            continue
+        caught: Set[str] = set()
+        for handler in node.handlers:
+            if handler.type is None:
+                caught.add("BaseException")
+            for name_node in ast.walk(handler.type) if handler.type is not None else ():
+                if isinstance(name_node, ast.Name):
+                    caught.add(name_node.id)
+                elif isinstance(name_node, ast.Attribute):
+                    caught.add(name_node.attr)
+        if caught & guards:
+            guarded.update(id(sub) for stmt in node.body for sub in ast.walk(stmt))
+    return guarded
+
+
+def _missing_imports(tree: ast.Module, run_dir: Path) -> List[Dict[str, Any]]:
+    top_level = {id(node) for node in tree.body}
+    findings: List[Dict[str, Any]] = []
+    seen: Set[str] = set()
+    # ast.walk is breadth-first, so a module imported at top level is seen there before any nested import.
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules = [alias.name.split(".")[0] for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and not node.level and node.module:
+            modules = [node.module.split(".")[0]]
+        else:
+            continue
+        for module in modules:
+            if module in seen or module == "__future__" or module in sys.builtin_module_names:
+                continue
+            seen.add(module)
+            if _installed(module, run_dir):
+                continue
+            if id(node) in top_level:
+                check, detail = "import", f"{module} is not installed in the execution environment"
+            else:
+                check, detail = "optional_import", f"{module} is not installed; fails only if this import runs"
+            findings.append(_finding(check, node.lineno, "ModuleNotFoundError", f"No module named '{module}'", detail))
+    return findings
+
+
+def _path_value(node: Optional[ast.AST], constants: Dict[str, str]) -> Optional[str]:
+    """The path a literal expression names: "x", NAME, Path("x"), Path(a) / "b", os.path.join(a, "b")."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    if isinstance(node, ast.Name):
+        return constants.get(node.id)
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Div):
+        left, right = _path_value(node.left, constants), _path_value(node.right, constants)
+        return str(Path(left) / right) if left is not None and right is not None else None
+    if isinstance(node, ast.Call) and not node.keywords and node.args:
+        name = _call_name(node)
+        parts = [_path_value(arg, constants) for arg in node.args]
+        if None in parts:
+            return None
+        if name in {"Path", "PurePath"}:
+            return str(Path(*parts))  # type: ignore[arg-type]
+        if name == "join" and isinstance(node.func, ast.Attribute) and isinstance(node.func.value, ast.Attribute):
+            return os.path.join(*parts)  # type: ignore[arg-type]
+    return None
+
+
+def _module_constants(tree: ast.Module) -> Dict[str, str]:
+    constants: Dict[str, str] = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            value = _path_value(node.value, constants)
+            if value is not None:
+                constants[node.targets[0].id] = value
+    return constants
+
+
+def _path_argument(node: ast.Call) -> Optional[ast.AST]:
+    if node.args:
+        return node.args[0]
+    for keyword in node.keywords:
+        if keyword.arg in _PATH_KEYWORDS:
+            return keyword.value
+    return None
+
+
+def _open_mode(node: ast.Call, position: int) -> str:
+    mode: Optional[ast.AST] = node.args[position] if len(node.args) > position else None
+    for keyword in node.keywords:
+        if keyword.arg == "mode":
+            mode = keyword.value
+    if mode is None:
+        return "r"
+    return mode.value if isinstance(mode, ast.Constant) and isinstance(mode.value, str) else "?"
+
+
+def _file_accesses(tree: ast.Module, constants: Dict[str, str]) -> Dict[str, List[Any]]:
+    """Literal paths the script reads (with the call and its line) and the ones it writes."""
+    reads: List[Any] = []
+    writes: Set[str] = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        name = _call_name(node)
+        method_target = node.func.value if isinstance(node.func, ast.Attribute) else None
+        if name == "open" and isinstance(node.func, ast.Name):
+            target, mode = _path_argument(node), _open_mode(node, 1)
+        elif name in {"open", "read_text", "read_bytes", "write_text", "write_bytes"} and method_target is not None:
+            target = method_target
+            mode = "w" if name.startswith("write") else _open_mode(node, 0)
+        elif name in _READERS:
+            target, mode = _path_argument(node), "r"
+        elif name in _WRITERS:
+            target, mode = _path_argument(node), "w"
+        else:
+            continue
+        path = _path_value(target, constants)
+        if path is None:
+            continue
+        if set(mode) & set("wax+?"):
+            writes.add(os.path.normpath(path))
+        else:
+            reads.append((path, node, name))
+    return {"reads": reads, "writes": sorted(writes)}
+
+
+def _missing_inputs(
+    tree: ast.Module, reads: List[Any], writes: List[str], run_dir: Path, descriptions: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    known = described_paths(descriptions)
+    guarded = _guarded_nodes(tree, _PATH_GUARDS)
+    findings: List[Dict[str, Any]] = []
+    for path, node, _ in reads:
+        if id(node) in guarded:
+            continue  # e.g. behind os.path.exists() or try/except FileNotFoundError
+        if not path or path.startswith(("{", "[", "<")) or any(marker in path for marker in ("*", "?", "://", "\n")):
+            continue  # globs, URLs and inline JSON/XML
+        if os.path.normpath(path) in writes:
+            continue
+        candidate = Path(path).expanduser()
+        if (candidate if candidate.is_absolute() else run_dir / candidate).exists():
+            continue
+        same_name = [str(known_path) for known_path in known if known_path.name == candidate.name]
+        detail = f"not an input path; did you mean {same_name[0]!r}?" if len(same_name) == 1 else "not found relative to the run directory"
+        findings.append(
+            _finding("input_path", node.lineno, "FileNotFoundError", f"[Errno 2] No such file or directory: '{path}'", detail)
+        )
+    return findings
+
+
+def _string_items(node: ast.AST) -> Optional[List[str]]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return [node.value]
+    if isinstance(node, (ast.List, ast.Tuple)) and node.elts:
+        if all(isinstance(item, ast.Constant) and isinstance(item.value, str) for item in node.elts):
+            return [item.value for item in node.elts]  # type: ignore[attr-defined]
+    return None
+
+
+def _unknown_columns(
+    tree: ast.Module, reads: List[Any], run_dir: Path, descriptions: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    schemas = columns_by_path(descriptions)
+    if not schemas:
+        return []
+    by_call = {id(node): path for path, node, name in reads if name in _TABULAR_READERS}
+
+    stores: Dict[str, int] = {}
+    rebound: Set[str] = set()
+    created: Set[str] = set()
+    frames: Dict[str, Set[str]] = {}
+    findings: List[Dict[str, Any]] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            stores[node.id] = stores.get(node.id, 0) + 1
+        elif isinstance(node, ast.arg):
+            rebound.add(node.arg)
+        elif isinstance(node, ast.Attribute) and isinstance(node.ctx, ast.Store) and isinstance(node.value, ast.Name):
+            rebound.add(node.value.id)  # df.columns = ...
+        elif isinstance(node, ast.Subscript) and isinstance(node.ctx, ast.Store):
+            created.update(_string_items(node.slice) or [])
+        elif isinstance(node, ast.Call):
+            if any(kw.arg == "inplace" for kw in node.keywords) and isinstance(node.func, ast.Attribute):
+                if isinstance(node.func.value, ast.Name):
+                    rebound.add(node.func.value.id)
+            if _call_name(node) == "assign":
+                created.update(kw.arg for kw in node.keywords if kw.arg)
+            elif _call_name(node) == "insert" and len(node.args) > 1:
+                created.update(_string_items(node.args[1]) or [])
+        elif isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            call = node.value
+            if not isinstance(call, ast.Call) or id(call) not in by_call:
+                continue
+            if any(kw.arg in _RESHAPING_OPTIONS or kw.arg is None for kw in call.keywords):
+                continue
+            path = Path(by_call[id(call)]).expanduser()
+            columns = schemas.get((path if path.is_absolute() else run_dir / path).resolve())
+            if columns is None:
+                continue
+            frames[node.targets[0].id] = columns
+
+    frames = {name: columns for name, columns in frames.items() if stores.get(name) == 1 and name not in rebound}
+    guarded = _guarded_nodes(tree, _COLUMN_GUARDS)
+    for node in ast.walk(tree):
+        if id(node) in guarded:
+            continue
+        if not (isinstance(node, ast.Subscript) and isinstance(node.ctx, ast.Load) and isinstance(node.value, ast.Name)):
+            continue
+        columns = frames.get(node.value.id)
+        keys = _string_items(node.slice) if columns is not None else None
+        missing = [key for key in keys or [] if key not in columns and key not in created]  # type: ignore[operator]
+        if not missing:
+            continue
+        message = repr(missing[0]) if isinstance(node.slice, ast.Constant) else f'"{missing!r} not in index"'
+        findings.append(
+            _finding("column", node.lineno, "KeyError", message,
+                     f"{node.value.id} has described columns: {', '.join(sorted(columns))}")  # type: ignore[arg-type]
+        )
+    return findings
+
+
+def check_code(code: str, descriptions: Dict[str, Any], run_dir: Path) -> List[Dict[str, Any]]:
+    """Findings that make `code` certain (BLOCKING_CHECKS) or likely to fail when run from `run_dir`."""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as exc:
+        return [_finding("syntax", exc.lineno or 1, type(exc).__name__, exc.msg or "invalid syntax")]
+    constants = _module_constants(tree)
+    accesses = _file_accesses(tree, constants)
+    run_dir = run_dir.resolve()
+    findings = _missing_imports(tree, run_dir)
+    findings.extend(_missing_inputs(tree, accesses["reads"], accesses["writes"], run_dir, descriptions))
+    findings.extend(_unknown_columns(tree, accesses["reads"], run_dir, descriptions))
+    return sorted(findings, key=lambda finding: finding["line"])
+
+
+def failure_result(findings: List[Dict[str, Any]], code: str, script_path: Path) -> Dict[str, Any]:
+    """An executor-shaped failed result for `findings`, with the first one as its traceback."""
+    lines = code.splitlines()
+    first = findings[0]
+    source = lines[first["line"] - 1].strip() if 0 < first["line"] <= len(lines) else ""
+    notes = [f"Static check found {len(findings)} problem(s); the script was not executed."]
+    notes.extend(
+        f"  line {f['line']}: {f['error_type']}: {f['message']}" + (f" ({f['detail']})" if f["detail"] else "")
+        for f in findings
+    )
+    frame = f'  File "{script_path}", line {first["line"]}'
+    if first["check"] == "syntax":
+        trace = [frame, f"    {source}", f"{first['error_type']}: {first['message']}"]
+    else:
+        trace = ["Traceback (most recent call last):", f"{frame}, in <module>", f"    {source}",
+                 f"{first['error_type']}: {first['message']}"]
+    return {
+        "exit_code": 1,
+        "stdout": "",
+        "stderr": "\n".join(notes + trace) + "\n",
+        "duration_sec": 0.0,
+        "timeout": False,
+        "cached": False,
+        "static_check": findings,
+    }
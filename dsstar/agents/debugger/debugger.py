@@ -2,16 +2,24 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
+from dsstar.agents.debugger.traceback_parser import parse_traceback, trace_summary
 from dsstar.llm.base import LLMClient
-from dsstar.prompts import debugger_patch_prompt, debugger_trace_summary_prompt
+from dsstar.prompts import debugger_patch_prompt, debugger_perf_prompt, debugger_trace_summary_prompt
 from dsstar.tools.log_utils import log, write_json, write_text
 from dsstar.tools.text_utils import extract_python_code
 
 
-def _default_trace_summary(stderr: str) -> Dict[str, Any]:
+def _default_trace_summary(stderr: str, resource_signal: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     lines = [line for line in stderr.splitlines() if line.strip()]
+    if resource_signal:
+        return {
+            "error_type": "ResourceLimitExceeded",
+            "likely_root_cause": str(resource_signal.get("message", "")),
+            "key_trace_lines": lines[-6:],
+            "suggested_fix_focus": "Reduce memory, CPU time, or output volume (chunked reads, fewer copies, less printing).",
+        }
     return {
         "error_type": "UnknownError",
         "likely_root_cause": lines[-1] if lines else "No stderr provided",
@@ -20,6 +28,24 @@ def _default_trace_summary(stderr: str) -> Dict[str, Any]:
     }
 
 
+def _llm_trace_summary(exec_result: Dict[str, Any], failing_code: str, client: LLMClient) -> Dict[str, Any]:
+    stderr = str(exec_result.get("stderr", ""))
+    summary_prompt = debugger_trace_summary_prompt(
+        exit_code=int(exec_result.get("exit_code", 1)),
+        stderr=stderr,
+        last_command=str(exec_result.get("command", "python round code")),
+        failing_code_tail="\n".join(failing_code.splitlines()[-80:]),
+    )
+    try:
+        summary = json.loads(client.complete(summary_prompt))
+    except json.JSONDecodeError:
+        return _default_trace_summary(stderr)
+    if not isinstance(summary, dict):
+        return _default_trace_summary(stderr)
+    summary["source"] = "llm"
+    return summary
+
+
 def run(
     question: str,
     descriptions: Dict[str, Any],
@@ -29,27 +55,35 @@ def run(
     client: LLMClient,
     run_dir: Path,
     round_idx: int,
+    reference_code: Optional[str] = None,
 ) -> str:
-    """Two-stage debugging: summarize traceback, then generate patched code."""
+    """Two-stage debugging: summarize traceback, then generate patched code.
+
+    The summary comes from the local traceback parser; the summary LLM call is
+    made only when stderr cannot be parsed unambiguously. Likely problems the
+    static check flagged before execution are added to it as `static_hints`.
+    """
     log("Debugger: stage 1 traceback summarization")
     stderr = str(exec_result.get("stderr", ""))
-    exit_code = int(exec_result.get("exit_code", 1))
-    command = str(exec_result.get("command", "python round code"))
-    tail = "\n".join(failing_code.splitlines()[-80:])
+    resource_signal = exec_result.get("limit_exceeded") or None
+    parsed = parse_traceback(stderr, failing_code)
 
-    summary_prompt = debugger_trace_summary_prompt(
-        exit_code=exit_code,
-        stderr=stderr,
-        last_command=command,
-        failing_code_tail=tail,
-    )
-    summary_raw = client.complete(summary_prompt)
-    try:
-        summary = json.loads(summary_raw)
-        if not isinstance(summary, dict):
-            summary = _default_trace_summary(stderr)
-    except json.JSONDecodeError:
-        summary = _default_trace_summary(stderr)
+    if resource_signal:
+        summary = _default_trace_summary(stderr, resource_signal)
+        log("Debugger: resource limit summary built locally, LLM summary skipped")
+    elif not parsed["ambiguous"]:
+        summary = trace_summary(parsed)
+        log(f"Debugger: traceback parsed locally ({summary['error_type']}), LLM summary skipped")
+    else:
+        log(f"Debugger: traceback ambiguous ({parsed['ambiguity']}), asking LLM for a summary")
+        summary = _llm_trace_summary(exec_result, failing_code, client)
+    if resource_signal:
+        summary["resource_signal"] = resource_signal
+    if exec_result.get("static_hints"):
+        summary["static_hints"] = [
+            f"line {hint['line']}: {hint['error_type']}: {hint['message']}" + (f" ({hint['detail']})" if hint["detail"] else "")
+            for hint in exec_result["static_hints"]
+        ]
 
     write_json(run_dir / f"round_{round_idx:02d}_trace_summary.json", summary)
 
@@ -61,6 +95,7 @@ def run(
         failing_code=failing_code,
         trace_summary=summary,
         strict=False,
+        reference_code=reference_code,
     )
     patched = extract_python_code(client.complete(patch_prompt))
 
@@ -73,6 +108,7 @@ def run(
             failing_code=failing_code,
             trace_summary=summary,
             strict=True,
+            reference_code=reference_code,
         )
         patched = extract_python_code(client.complete(patch_prompt))
 
@@ -82,3 +118,35 @@ def run(
 
     write_text(run_dir / f"round_{round_idx:02d}_code_patched.py", patched)
     return patched
+
+
+def run_perf(
+    question: str,
+    descriptions: Dict[str, Any],
+    plan: List[Dict[str, Any]],
+    slow_code: str,
+    exec_result: Dict[str, Any],
+    profile: Optional[Dict[str, Any]],
+    client: LLMClient,
+    run_dir: Path,
+    round_idx: int,
+) -> str:
+    """Performance-focused patch for scripts that timed out or nearly did."""
+    log("Debugger: performance patch from profile hotspots")
+    exec_summary = {
+        "timeout": bool(exec_result.get("timeout")),
+        "duration_sec": exec_result.get("duration_sec"),
+        "exit_code": exec_result.get("exit_code"),
+        "resources": exec_result.get("resources"),
+        "stderr_tail": str(exec_result.get("stderr", ""))[-1000:],
+    }
+    if profile:
+        profile = {key: profile.get(key) for key in ("complete", "elapsed_sec", "hotspots", "allocations", "peak_rss_mb")}
+    prompt = debugger_perf_prompt(question, descriptions, plan, slow_code, exec_summary, profile)
+    patched = extract_python_code(client.complete(prompt))
+    if not patched.strip():
+        log("Debugger: performance patch empty, returning original code")
+        patched = slow_code
+
+    write_text(run_dir / f"round_{round_idx:02d}_code_perf.py", patched)
+    return patched
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import ast
+import io
+import re
+import tokenize
+from pathlib import Path, PurePath
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from dsstar.agents.debugger.traceback_parser import parse_traceback
+from dsstar.tools.description_facts import described_columns, described_paths
+
+# Rule-based repairs for mechanical failures, tried before the LLM debugger.
+# Every rule works from the parsed traceback plus the analyzer's real paths and
+# columns, edits the code textually (token or AST positions, so formatting and
+# comments survive) and returns None unless it is sure of a single fix. The
+# loop re-executes the result, which is what verifies it.
+
+_MISSING_FILE_RE = re.compile(r"No such file or directory: '([^']+)'")
+_MISSING_MODULE_RE = re.compile(r"No module named '([^']+)'")
+_OPTIONAL_DEPENDENCY_RE = re.compile(r"Missing optional dependency '([^']+)'")
+_QUOTED_RE = re.compile(r"'((?:[^'\\]|\\.)*)'")
+_PANDAS_READERS = {"read_csv", "read_table", "read_json", "read_fwf"}
+_TEXT_OPENERS = {"open", "read_text"}
+# Optional modules whose usual call sites have a stdlib/pandas equivalent.
+_MODULE_SHIMS = {
+    "tqdm": "def tqdm(iterable=None, *args, **kwargs):\n    return iterable\n",
+}
+_METHOD_FALLBACKS = {"tabulate": (".to_markdown(", ".to_string(")}
+
+
+def _string_tokens(code: str) -> List[Tuple[Tuple[int, int], Tuple[int, int], Any]]:
+    found = []
+    try:
+        tokens = list(tokenize.generate_tokens(io.StringIO(code).readline))
+    except (tokenize.TokenError, SyntaxError):
+        return []
+    for token in tokens:
+        if token.type != tokenize.STRING:
+            continue
+        try:
+            value = ast.literal_eval(token.string)
+        except (ValueError, SyntaxError):
+            continue  # f-strings and friends
+        found.append((token.start, token.end, value))
+    return found
+
+
+def _line_offsets(code: str) -> List[int]:
+    offsets = [0]
+    for line in code.splitlines(keepends=True):
+        offsets.append(offsets[-1] + len(line))
+    return offsets
+
+
+def replace_string_literals(code: str, replacement: Callable[[Any], Optional[str]]) -> Tuple[str, int]:
+    """Replace every plain string literal for which `replacement(value)` returns a new value."""
+    offsets = _line_offsets(code)
+    edits = []
+    for (start_row, start_col), (end_row, end_col), value in _string_tokens(code):
+        new_value = replacement(value) if isinstance(value, str) else None
+        if new_value is not None and new_value != value:
+            edits.append((offsets[start_row - 1] + start_col, offsets[end_row - 1] + end_col, repr(new_value)))
+    for start, end, text in reversed(edits):
+        code = code[:start] + text + code[end:]
+    return code, len(edits)
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"\s+", " ", name.strip()).casefold()
+
+
+def _fix_missing_path(code: str, parsed: Dict[str, Any], paths: List[Path], columns: Set[str]) -> Optional[Dict[str, Any]]:
+    if parsed["error_type"] != "FileNotFoundError":
+        return None
+    match = _MISSING_FILE_RE.search(parsed["message"])
+    if not match:
+        return None
+    missing = match.group(1)
+    candidates = {path for path in paths if path.name == PurePath(missing).name}
+    if len(candidates) != 1:
+        return None
+    target = str(next(iter(candidates)))
+    fixed, count = replace_string_literals(code, lambda value: target if value == missing else None)
+    if not count:
+        # Path("input") / "sales.csv": an absolute last component replaces the whole join.
+        fixed, count = replace_string_literals(code, lambda value: target if value == PurePath(missing).name else None)
+    if not count:
+        return None
+    return {"rule": "input_path", "detail": f"{missing!r} -> {target!r}", "code": fixed}
+
+
+def _fix_column_name(code: str, parsed: Dict[str, Any], paths: List[Path], columns: Set[str]) -> Optional[Dict[str, Any]]:
+    if parsed["error_type"] != "KeyError" or not columns:
+        return None
+    by_normal: Dict[str, Set[str]] = {}
+    for column in columns:
+        by_normal.setdefault(_normalize(column), set()).add(column)
+    renames: Dict[str, str] = {}
+    for key in _QUOTED_RE.findall(re.sub(r"dtype='[^']*'", "", parsed["message"])):
+        if key in columns:
+            continue
+        matches = by_normal.get(_normalize(key), set())
+        if len(matches) == 1:
+            renames[key] = next(iter(matches))
+    if not renames:
+        return None
+    fixed, count = replace_string_literals(code, renames.get)
+    if not count:
+        return None
+    return {"rule": "column_name", "detail": ", ".join(f"{k!r} -> {v!r}" for k, v in renames.items()), "code": fixed}
+
+
+def _imported_names(tree: ast.Module, module: str) -> Tuple[List[ast.stmt], Set[str]]:
+    statements: List[ast.stmt] = []
+    names: Set[str] = set()
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            hits = [alias for alias in node.names if alias.name.split(".")[0] == module]
+            if hits:
+                statements.append(node)
+                names.update((alias.asname or alias.name.split(".")[0]) for alias in hits)
+        elif isinstance(node, ast.ImportFrom) and (node.module or "").split(".")[0] == module and not node.level:
+            statements.append(node)
+            names.update(alias.asname or alias.name for alias in node.names)
+    return statements, names
+
+
+def _remove_lines(code: str, statements: List[ast.stmt], insert: str = "") -> str:
+    lines = code.splitlines(keepends=True)
+    first = min(node.lineno for node in statements)
+    for node in sorted(statements, key=lambda n: n.lineno, reverse=True):
+        del lines[node.lineno - 1 : (node.end_lineno or node.lineno)]
+    if insert:
+        lines.insert(first - 1, insert)
+    return "".join(lines)
+
+
+def _fix_missing_module(code: str, parsed: Dict[str, Any], paths: List[Path], columns: Set[str]) -> Optional[Dict[str, Any]]:
+    optional = _OPTIONAL_DEPENDENCY_RE.search(parsed["message"])
+    if optional and optional.group(1) in _METHOD_FALLBACKS:
+        old, new = _METHOD_FALLBACKS[optional.group(1)]
+        if old in code:
+            return {"rule": "optional_dependency", "detail": f"{old} -> {new}", "code": code.replace(old, new)}
+        return None
+    if parsed["error_type"] not in {"ModuleNotFoundError", "ImportError"}:
+        return None
+    match = _MISSING_MODULE_RE.search(parsed["message"])
+    if not match:
+        return None
+    module = match.group(1).split(".")[0]
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return None
+    statements, names = _imported_names(tree, module)
+    if not statements or any(isinstance(node, ast.Import) and len(node.names) > 1 for node in statements):
+        return None
+    used = {
+        node.id for node in ast.walk(tree) if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load)
+    }
+    if not names & used:
+        return {"rule": "unused_import", "detail": f"removed unused import of {module}", "code": _remove_lines(code, statements)}
+    shim = _MODULE_SHIMS.get(module)
+    if shim and all(isinstance(node, ast.ImportFrom) for node in statements) and names <= {module}:
+        return {"rule": "module_shim", "detail": f"replaced {module} with a no-op shim", "code": _remove_lines(code, statements, shim)}
+    return None
+
+
+def _call_name(node: ast.Call) -> str:
+    func = node.func
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    return func.id if isinstance(func, ast.Name) else ""
+
+
+def _fix_encoding(code: str, parsed: Dict[str, Any], paths: List[Path], columns: Set[str]) -> Optional[Dict[str, Any]]:
+    if parsed["error_type"] != "UnicodeDecodeError" or not parsed.get("failing_frame"):
+        return None
+    line = int(parsed["failing_frame"]["line"])
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return None
+    calls = [
+        node
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Call)
+        and node.lineno <= line <= (node.end_lineno or node.lineno)
+        and _call_name(node) in _PANDAS_READERS | _TEXT_OPENERS
+    ]
+    if not calls:
+        return None
+    call = max(calls, key=lambda node: (node.lineno, node.col_offset))  # innermost
+    keyword = "encoding_errors" if _call_name(call) in _PANDAS_READERS else "errors"
+    if any(kw.arg == keyword for kw in call.keywords):
+        return None
+    offsets = _line_offsets(code)
+    close = offsets[(call.end_lineno or call.lineno) - 1] + (call.end_col_offset or 0) - 1
+    if code[close] != ")":
+        return None
+    before = code[:close].rstrip()
+    separator = "" if before.endswith(("(", ",")) else ", "
+    fixed = before + f'{separator}{keyword}="replace"' + code[close:]
+    return {"rule": "decode_errors", "detail": f'{_call_name(call)}(..., {keyword}="replace") on line {line}', "code": fixed}
+
+
+_RULES = (_fix_missing_path, _fix_column_name, _fix_missing_module, _fix_encoding)
+
+
+def fast_fix(code: str, exec_result: Dict[str, Any], descriptions: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """First rule that repairs `code` for the failure in `exec_result`, as {"rule", "detail", "code"}.
+
+    Returns None when no rule matches, so the caller falls back to the LLM debugger.
+    """
+    if exec_result.get("limit_exceeded") or exec_result.get("timeout"):
+        return None
+    parsed = parse_traceback(str(exec_result.get("stderr", "")), code)
+    if parsed["ambiguous"]:
+        return None
+    paths = described_paths(descriptions)
+    columns = described_columns(descriptions)
+    for rule in _RULES:
+        fix = rule(code, parsed, paths, columns)
+        if fix is None or fix["code"] == code:
+            continue
+        try:
+            compile(fix["code"], "<fast_fix>", "exec")
+        except SyntaxError:
+            continue
+        fix["error_type"] = parsed["error_type"]
+        return fix
+    return None
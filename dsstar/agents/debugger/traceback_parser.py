@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import re
+import sysconfig
+from pathlib import PurePath
+from typing import Any, Dict, List, Optional
+
+# Deterministic reading of CPython tracebacks from a failed execution's stderr:
+# chained exceptions (oldest first), their frames with source lines, and the
+# frames that belong to the generated script. The debugger uses the result in
+# place of its trace-summary LLM call whenever the parse is unambiguous.
+
+_HEADER = "Traceback (most recent call last):"
+_CHAIN_MARKERS = {
+    "During handling of the above exception, another exception occurred:": "context",
+    "The above exception was the direct cause of the following exception:": "cause",
+}
+_FRAME_RE = re.compile(r'^\s*File "(?P<file>.+)", line (?P<line>\d+)(?:, in (?P<function>.+))?$')
+_EXCEPTION_RE = re.compile(
+    r"^(?P<type>(?:[A-Za-z_]\w*\.)*(?:[A-Za-z_]\w*(?:Error|Exception|Exit|Interrupt|Warning)|StopIteration))"
+    r"(?::\s?(?P<message>.*))?$"
+)
+_CARET_RE = re.compile(r"^\s*[\^~]+\s*$")
+_SCRIPT_NAME_RE = re.compile(r"^(round_\d+_\w+|final_solution\w*)\.py$")
+_HEADERLESS_TYPES = {"SyntaxError", "IndentationError", "TabError"}
+_MAX_MESSAGE_LINES = 5
+_LIBRARY_MARKERS = ("site-packages", "dist-packages")
+_STDLIB = sysconfig.get_paths().get("stdlib", "")
+
+_FIX_FOCUS = {
+    "KeyError": "Check the key or column name against the described schema (case, whitespace) before indexing.",
+    "FileNotFoundError": "Open inputs by the exact paths listed in the descriptions; the script runs inside the run directory.",
+    "ModuleNotFoundError": "Use only installed libraries or guard the optional import with a fallback.",
+    "ImportError": "Use only installed libraries or guard the optional import with a fallback.",
+    "UnicodeDecodeError": "Read the file with the encoding from its description, or with errors='replace'.",
+    "NameError": "Define or import the name before it is used at the failing line.",
+    "AttributeError": "Check the object's type at the failing line; the attribute does not exist on it.",
+    "IndexError": "Guard the index or position against empty or shorter inputs.",
+    "TypeError": "Check argument types and dtypes at the failing line.",
+    "ValueError": "Check value parsing and dtypes at the failing line.",
+    "ZeroDivisionError": "Guard the division against zero or empty denominators.",
+    "SyntaxError": "Fix the syntax at the reported line without changing behavior.",
+    "IndentationError": "Fix the indentation at the reported line without changing behavior.",
+    "MemoryError": "Reduce memory: read in chunks, select only needed columns, avoid copies.",
+}
+
+
+def is_script_frame(filename: str) -> bool:
+    """Whether a frame belongs to generated code rather than the interpreter or a library."""
+    if _SCRIPT_NAME_RE.match(PurePath(filename).name):
+        return True
+    if filename.startswith("<") or any(marker in filename for marker in _LIBRARY_MARKERS):
+        return False
+    return not (_STDLIB and filename.startswith(_STDLIB))
+
+
+def _new_block(link: Optional[str], headerless: bool = False) -> Dict[str, Any]:
+    return {"type": None, "message": "", "frames": [], "link": link, "headerless": headerless}
+
+
+def parse_traceback(stderr: str, code: Optional[str] = None) -> Dict[str, Any]:
+    """Split `stderr` into chained exceptions and locate the failure in the generated script.
+
+    `code` (the failing script) fills in source lines the traceback omits.
+    The result is `ambiguous` (with a reason) when stderr holds no complete
+    traceback, several unrelated ones, or an exception group.
+    """
+    blocks: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    pending_link: Optional[str] = None
+    ambiguity: Optional[str] = None
+    message_lines = 0
+
+    for line in stderr.splitlines():
+        stripped = line.strip()
+        if stripped.startswith(("| ", "+-")) or "Exception Group Traceback" in stripped:
+            ambiguity = ambiguity or "exception group"
+            continue
+        if stripped == _HEADER:
+            if current is not None and current["type"] is None:
+                ambiguity = ambiguity or "traceback without a final exception line"
+            if blocks and pending_link is None:
+                ambiguity = ambiguity or "several unrelated tracebacks"
+            current, pending_link = _new_block(pending_link), None
+            continue
+        if stripped in _CHAIN_MARKERS:
+            pending_link = _CHAIN_MARKERS[stripped]
+            current = None
+            continue
+        frame = _FRAME_RE.match(line)
+        if frame and (current is None or current["type"] is not None):
+            current = _new_block(pending_link, headerless=True)  # e.g. a SyntaxError report
+            pending_link = None
+        if current is None:
+            continue
+        if current["type"] is None:
+            if frame:
+                current["frames"].append(
+                    {
+                        "file": frame.group("file"),
+                        "line": int(frame.group("line")),
+                        "function": frame.group("function"),
+                        "source": None,
+                    }
+                )
+            elif line.startswith(" ") and current["frames"] and not _CARET_RE.match(line):
+                if current["frames"][-1]["source"] is None:
+                    current["frames"][-1]["source"] = stripped
+            elif not line.startswith(" ") and _EXCEPTION_RE.match(stripped):
+                match = _EXCEPTION_RE.match(stripped)
+                current["type"] = match.group("type")
+                current["message"] = (match.group("message") or "").strip()
+                message_lines = 0
+                blocks.append(current)
+        elif stripped and message_lines < _MAX_MESSAGE_LINES:
+            current["message"] = f"{current['message']}\n{stripped}".strip()
+            message_lines += 1
+
+    if current is not None and current["type"] is None and current["frames"]:
+        ambiguity = ambiguity or "traceback without a final exception line"
+    if not blocks:
+        ambiguity = ambiguity or "no traceback found"
+    elif blocks[-1]["headerless"] and blocks[-1]["type"].rsplit(".", 1)[-1] not in _HEADERLESS_TYPES:
+        ambiguity = ambiguity or "exception without a traceback header"
+
+    code_lines = code.splitlines() if code else []
+    for block in blocks:
+        for frame in block["frames"]:
+            frame["in_script"] = is_script_frame(frame["file"])
+            if frame["source"] is None and frame["in_script"] and 0 < frame["line"] <= len(code_lines):
+                frame["source"] = code_lines[frame["line"] - 1].strip()
+
+    last = blocks[-1] if blocks else None
+    script_frames = [frame for frame in last["frames"] if frame["in_script"]] if last else []
+    return {
+        "exceptions": [{key: value for key, value in block.items() if key != "headerless"} for block in blocks],
+        "error_type": last["type"] if last else None,
+        "message": last["message"] if last else "",
+        "script_frames": script_frames,
+        "failing_frame": script_frames[-1] if script_frames else None,
+        "causes": [f"{block['type']}: {block['message']}".rstrip(": ") for block in blocks[:-1]],
+        "ambiguous": ambiguity is not None,
+        "ambiguity": ambiguity,
+    }
+
+
+def _frame_line(frame: Dict[str, Any]) -> str:
+    where = f'File "{PurePath(frame["file"]).name}", line {frame["line"]}'
+    if frame.get("function"):
+        where += f", in {frame['function']}"
+    return f"{where}: {frame['source']}" if frame.get("source") else where
+
+
+def trace_summary(parsed: Dict[str, Any]) -> Dict[str, Any]:
+    """The debugger's trace-summary schema built from `parse_traceback` output."""
+    error_type = str(parsed["error_type"])
+    short_type = error_type.rsplit(".", 1)[-1]
+    final = f"{error_type}: {parsed['message']}".rstrip(": ")
+    # Libraries often re-raise the same error (pandas: KeyError from KeyError).
+    causes = [chained for chained in parsed["causes"] if chained != final]
+    cause = final
+    failing = parsed.get("failing_frame")
+    if failing:
+        cause += f" (line {failing['line']} of {PurePath(failing['file']).name}"
+        cause += f": {failing['source']})" if failing.get("source") else ")"
+    if causes:
+        cause += "; raised while handling " + " <- ".join(reversed(causes))
+
+    last_frames = parsed["exceptions"][-1]["frames"]
+    key_lines = [_frame_line(frame) for frame in parsed["script_frames"][-4:]]
+    if last_frames and not last_frames[-1]["in_script"]:
+        key_lines.append(_frame_line(last_frames[-1]))  # where a library raised it
+    key_lines.extend(causes[-2:])
+    key_lines.append(final)
+    return {
+        "error_type": error_type,
+        "likely_root_cause": cause,
+        "key_trace_lines": key_lines,
+        "suggested_fix_focus": _FIX_FOCUS.get(
+            short_type, "Fix the immediate runtime error at the failing line while preserving behavior."
+        ),
+        "failing_line": failing,
+        "source": "local_traceback_parser",
+    }
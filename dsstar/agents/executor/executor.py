@@ -1,42 +1,101 @@
 from __future__ import annotations
 
+import json
 import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Set
 
+from dsstar.config import ExecutionConfig
+from dsstar.runtime_paths import package_pythonpath, shared_cache_dir
+from dsstar.tools.exec_memo import ExecMemo
+from dsstar.tools.exec_pool import get_worker_pool, pool_supported
 from dsstar.tools.exec_sandbox import run_python_script
+from dsstar.tools.kernel import PersistentKernel
 from dsstar.tools.log_utils import get_repo_root, log, write_json
+from dsstar.tools.resource_limits import ResourceLimits
 
 
-def run(code_path: Path, run_dir: Path, timeout_sec: int, round_idx: int) -> Dict[str, Any]:
-    """Execute generated code and write round_XX_exec.json."""
-    log(f"Executor: running round {round_idx:02d} code")
-    repo_root = get_repo_root().resolve()
-    run_dir = run_dir.resolve()
-    script_path = code_path.resolve()
+def resource_limits(exec_config: Optional[ExecutionConfig]) -> Optional[ResourceLimits]:
+    if exec_config is None:
+        return None
+    limits = ResourceLimits(
+        max_memory_mb=exec_config.max_memory_mb,
+        max_cpu_sec=exec_config.max_cpu_sec,
+        max_output_mb=exec_config.max_output_mb,
+    )
+    return limits if limits.any() else None
+
+
+def warm_up(exec_config: Optional[ExecutionConfig]) -> None:
+    """Start pooled workers early so their imports overlap with analysis/LLM calls."""
+    if exec_config is not None and exec_config.backend == "pool" and pool_supported():
+        get_worker_pool(exec_config.pool_size, exec_config.preload_modules)
+
+
+def _execute(
+    script_path: Path,
+    run_dir: Path,
+    timeout_sec: int,
+    env: Dict[str, str],
+    exec_config: Optional[ExecutionConfig],
+    profile_path: Optional[Path] = None,
+) -> Dict[str, Any]:
+    limits = resource_limits(exec_config)
+    if profile_path is not None:
+        # The profiler wraps a fresh interpreter, so profiled runs bypass the pool.
+        return run_python_script(script_path, run_dir, timeout_sec, env=env, limits=limits, profile_path=profile_path)
+    if exec_config is not None and exec_config.backend == "pool":
+        if pool_supported():
+            pool = get_worker_pool(exec_config.pool_size, exec_config.preload_modules)
+            return pool.run(script_path, run_dir, timeout_sec, env=env, limits=limits)
+        log("Executor: worker pool requires os.fork; using subprocess backend")
+    return run_python_script(script_path, run_dir, timeout_sec, env=env, limits=limits)
+
 
+def load_profile(run_dir: Path, exec_result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Profile written for an execution by --profile-exec, if any."""
+    name = exec_result.get("profile_path")
+    if not name:
+        return None
+    try:
+        return json.loads((run_dir / str(name)).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def build_env(run_dir: Path) -> Dict[str, str]:
+    """Environment contract shared by every way generated code is executed."""
+    run_dir = run_dir.resolve()
     env = os.environ.copy()
-    env["DSSTAR_REPO_ROOT"] = str(repo_root)
+    env["DSSTAR_REPO_ROOT"] = str(get_repo_root().resolve())
     env["DSSTAR_RUN_DIR"] = str(run_dir)
     propose_dir = run_dir / "proposed_changes"
     propose_dir.mkdir(parents=True, exist_ok=True)
     env["DSSTAR_PROPOSE_DIR"] = str(propose_dir)
+    # Shared by every run under the same run root (parsed-input cache for load_input).
+    env["DSSTAR_CACHE_DIR"] = str(shared_cache_dir(run_dir))
+    # Lets generated code `from dsstar.runtime import load_input` without installing the package.
+    env["PYTHONPATH"] = package_pythonpath()
+    return env
+
 
-    before_entries = {
+def _repo_root_entries(repo_root: Path) -> Set[str]:
+    return {
         p.name
         for p in repo_root.iterdir()
         if p.name not in {"runs", ".git", "__pycache__"}
     }
 
-    # Run with cwd=run_dir so any relative writes are contained under this run.
-    exec_result = run_python_script(script_path, run_dir, timeout_sec, env=env)
 
-    after_entries = {
-        p.name
-        for p in repo_root.iterdir()
-        if p.name not in {"runs", ".git", "__pycache__"}
-    }
-    unexpected = sorted(after_entries - before_entries)
+def _finish(
+    exec_result: Dict[str, Any],
+    before_entries: Set[str],
+    repo_root: Path,
+    run_dir: Path,
+    code_path: Path,
+    round_idx: int,
+) -> Dict[str, Any]:
+    unexpected = sorted(_repo_root_entries(repo_root) - before_entries)
     if unexpected:
         log(f"Executor warning: new repo-root entries outside runs/: {unexpected}")
         exec_result["warnings"] = {
@@ -48,3 +107,64 @@ def run(code_path: Path, run_dir: Path, timeout_sec: int, round_idx: int) -> Dic
     exec_path = run_dir / f"round_{round_idx:02d}_exec.json"
     write_json(exec_path, exec_result)
     return exec_result
+
+
+def run(
+    code_path: Path,
+    run_dir: Path,
+    timeout_sec: int,
+    round_idx: int,
+    exec_config: Optional[ExecutionConfig] = None,
+    memo: Optional[ExecMemo] = None,
+    profile_tag: str = "",
+) -> Dict[str, Any]:
+    """Execute generated code and write round_XX_exec.json.
+
+    With --profile-exec the profile goes to round_XX_profile.json, or
+    round_XX_<profile_tag>_profile.json for a re-run of the same round.
+    """
+    repo_root = get_repo_root().resolve()
+    run_dir = run_dir.resolve()
+    script_path = code_path.resolve()
+    before_entries = _repo_root_entries(repo_root)
+
+    code = script_path.read_text(encoding="utf-8") if memo is not None else ""
+    cached = memo.lookup(code) if memo is not None else None
+    if cached is not None:
+        log(f"Executor: round {round_idx:02d} code identical to {cached['cached_from']}; reusing result")
+        return _finish(cached, before_entries, repo_root, run_dir, code_path, round_idx)
+
+    log(f"Executor: running round {round_idx:02d} code")
+    env = build_env(run_dir)
+    # Run with cwd=run_dir so any relative writes are contained under this run.
+    profile_name = f"round_{round_idx:02d}_{profile_tag + '_' if profile_tag else ''}profile.json"
+    profile_path = run_dir / profile_name if exec_config and exec_config.profile else None
+    if profile_path is not None:
+        profile_path.unlink(missing_ok=True)
+    exec_result = _execute(script_path, run_dir, timeout_sec, env, exec_config, profile_path)
+    exec_result["cached"] = False
+    if profile_path is not None and profile_path.exists():
+        exec_result["profile_path"] = profile_path.name
+    if exec_result.get("limit_exceeded"):
+        log(f"Executor: {exec_result['limit_exceeded']['message']}")
+    if memo is not None:
+        memo.store(code, script_path.name, exec_result)
+    return _finish(exec_result, before_entries, repo_root, run_dir, code_path, round_idx)
+
+
+def run_cell(
+    kernel: PersistentKernel,
+    cell_path: Path,
+    run_dir: Path,
+    timeout_sec: int,
+    round_idx: int,
+) -> Dict[str, Any]:
+    """Execute one step's cell in the persistent kernel and write round_XX_exec.json."""
+    log(f"Executor: running round {round_idx:02d} cell in persistent kernel")
+    repo_root = get_repo_root().resolve()
+    run_dir = run_dir.resolve()
+    before_entries = _repo_root_entries(repo_root)
+
+    exec_result = kernel.execute(cell_path.read_text(encoding="utf-8"), cell_path, timeout_sec)
+    exec_result["kernel"] = True
+    return _finish(exec_result, before_entries, repo_root, run_dir, cell_path, round_idx)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from dsstar.llm.base import LLMClient
 from dsstar.prompts import finalyzer_code_prompt, finalyzer_report_prompt
@@ -32,9 +32,11 @@ def finalyzer_report(
     final_exec: Dict[str, Any],
     client: LLMClient,
     run_dir: Path,
+    note: Optional[str] = None,
 ) -> str:
+    """Write final_answer.md; `note` is an extra instruction such as a best-effort caveat."""
     log("Finalyzer: composing final report")
-    prompt = finalyzer_report_prompt(question, plan, artifact_manifest, final_exec)
+    prompt = finalyzer_report_prompt(question, plan, artifact_manifest, final_exec, note)
     answer = client.complete(prompt)
     final_path = run_dir / "final_answer.md"
     write_text(final_path, answer)
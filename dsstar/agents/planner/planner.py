@@ -3,18 +3,25 @@ from __future__ import annotations
 import json
 from typing import Any, Dict, List, Optional
 
+from dsstar.agents.verifier.precheck import step_expectations
 from dsstar.llm.base import LLMClient
-from dsstar.prompts import planner_prompt
+from dsstar.prompts import planner_batch_prompt, planner_prompt
 from dsstar.tools.log_utils import log
 
 
 def _coerce_step(raw: Dict[str, Any], next_id: int) -> Dict[str, Any]:
-    return {
+    step = {
         "id": int(raw.get("id", next_id)),
         "title": str(raw.get("title", "Plan step")),
         "details": str(raw.get("details", "")),
         "status": "todo",
     }
+    expected = step_expectations(raw)
+    if expected["files"] or expected["stdout_patterns"]:
+        step["expected"] = expected
+    if raw.get("final") is True:
+        step["final"] = True
+    return step
 
 
 def run(
@@ -42,3 +49,31 @@ def run(
     step["id"] = next_id
     step["status"] = "todo"
     return step
+
+
+def run_batch(
+    question: str,
+    descriptions: Dict[str, Any],
+    plan: List[Dict[str, Any]],
+    last_exec: Optional[Dict[str, Any]],
+    client: LLMClient,
+    max_steps: int,
+) -> List[Dict[str, Any]]:
+    """Generate up to `max_steps` ordered plan steps to append, in one LLM call."""
+    log(f"Planner: generating up to {max_steps} plan steps")
+    prompt = planner_batch_prompt(question, descriptions, plan, last_exec, max_steps)
+    response = client.complete(prompt)
+    next_id = max([step["id"] for step in plan], default=0) + 1
+    try:
+        parsed: Any = json.loads(response)
+    except json.JSONDecodeError:
+        parsed = None
+    if isinstance(parsed, dict):
+        parsed = parsed.get("steps") if isinstance(parsed.get("steps"), list) else [parsed]
+    raw_steps = [item for item in parsed if isinstance(item, dict)] if isinstance(parsed, list) else []
+    if not raw_steps:
+        return [{"id": next_id, "title": "Plan step", "details": response.strip(), "status": "todo"}]
+    steps = []
+    for offset, raw in enumerate(raw_steps[: max(1, max_steps)]):
+        steps.append(_coerce_step({**raw, "id": next_id + offset}, next_id + offset))
+    return steps
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Local verdicts for successful executions whose outcome is obvious, so the
+# verifier LLM only sees genuinely ambiguous results. Failures to meet a
+# declared expectation, no output, output that is nothing but an empty
+# DataFrame/Series, all-null output and output identical to the step's previous
+# attempt are insufficient; a step the planner marked `final` whose declared
+# outputs all check out is sufficient. Anything else returns None and goes to
+# the LLM.
+
+# Case-sensitive: the spellings pandas/Python print, not the English word "none".
+_NULL_TOKENS = {"nan", "NaN", "None", "<NA>", "NaT", "null", "NULL"}
+# The whole of stdout being pandas' repr of an empty frame or series (anything else printed is the LLM's call).
+_EMPTY_RESULT_RE = re.compile(r"\AEmpty DataFrame\nColumns: \[.*\]\nIndex: \[.*\]\Z|\ASeries\(\[\], .*\)\Z", re.DOTALL)
+_INDEX_RE = re.compile(r"^\d+$")
+# Series/DataFrame footer lines carry no values.
+_META_RE = re.compile(r"^\s*(Name:|dtype:|Length:|Freq:|\[\d+ rows x \d+ columns\])")
+
+
+def step_expectations(step: Optional[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """The step's declared `expected` outputs as {"files": [...], "stdout_patterns": [...]}."""
+    expected = step.get("expected") if isinstance(step, dict) else None
+    if not isinstance(expected, dict):
+        return {"files": [], "stdout_patterns": []}
+    return {
+        key: [str(item) for item in expected.get(key) or [] if str(item).strip()]
+        if isinstance(expected.get(key), list)
+        else []
+        for key in ("files", "stdout_patterns")
+    }
+
+
+def _row_label(line: str) -> bool:
+    tokens = line.split()
+    return len(tokens) > 1 and bool(_INDEX_RE.match(tokens[0]))
+
+
+def only_nulls(stdout: str) -> bool:
+    """Whether printed output has null markers (NaN, None, ...) and no other values.
+
+    Labels (text before ": "), table headers and row labels are not values;
+    every other token is.
+    """
+    lines = [line for line in stdout.splitlines() if line.strip() and not _META_RE.match(line)]
+    nulls = values = 0
+    for idx, line in enumerate(lines):
+        following = lines[idx + 1] if idx + 1 < len(lines) else ""
+        if not _row_label(line) and _row_label(following) and len(following.split()) == len(line.split()) + 1:
+            continue  # DataFrame header above labelled rows
+        if ": " in line or line.rstrip().endswith(":"):
+            tokens = line.rsplit(":", 1)[1].split()
+        else:
+            tokens = line.split()
+            if len(tokens) > 1:
+                tokens = tokens[1:]  # DataFrame/Series row label
+        for token in tokens:
+            token = token.strip(",;()[]{}'\"")
+            if token in _NULL_TOKENS:
+                nulls += 1
+            elif token:
+                values += 1
+    return nulls > 0 and values == 0
+
+
+def _normalized(stdout: str) -> str:
+    return " ".join(stdout.split())
+
+
+def _verdict(sufficient: bool, check: str, reason: str, missing: Optional[List[str]] = None) -> Dict[str, Any]:
+    return {
+        "sufficient": sufficient,
+        "reason": reason,
+        "missing": missing or [],
+        "next_action": "stop" if sufficient else "add_step",
+        "source": f"precheck:{check}",
+    }
+
+
+def precheck(
+    step: Optional[Dict[str, Any]],
+    plan: List[Dict[str, Any]],
+    last_exec: Dict[str, Any],
+    previous_exec: Optional[Dict[str, Any]] = None,
+    run_dir: Optional[Path] = None,
+) -> Optional[Dict[str, Any]]:
+    """Verifier-shaped verdict for a successful execution, or None when the LLM must decide.
+
+    `previous_exec` is the previous execution of this same step; a different
+    step may legitimately print the same thing.
+    """
+    stdout = str(last_exec.get("stdout") or "")
+    expected = step_expectations(step)
+
+    missing_files = []
+    for name in expected["files"]:
+        path = Path(name) if Path(name).is_absolute() or run_dir is None else run_dir / name
+        if not path.is_file() or path.stat().st_size == 0:
+            missing_files.append(name)
+    if missing_files:
+        return _verdict(False, "expected_files", "Declared output files are missing or empty.",
+                        [f"File {name}" for name in missing_files])
+
+    patterns = []
+    for pattern in expected["stdout_patterns"]:
+        try:
+            patterns.append(re.compile(pattern, re.MULTILINE))
+        except re.error:
+            return None  # an unusable declaration is the LLM's call
+    unmatched = [pattern.pattern for pattern in patterns if not pattern.search(stdout)]
+    if unmatched:
+        return _verdict(False, "expected_stdout", "Printed output does not match the declared answer pattern.",
+                        [f"stdout matching {pattern!r}" for pattern in unmatched])
+
+    if not stdout.strip() and not expected["files"]:
+        return _verdict(False, "empty_output", "Execution succeeded but printed nothing.", ["Printed results"])
+    if _EMPTY_RESULT_RE.match(stdout.strip()):
+        return _verdict(False, "empty_result", "The printed result is empty.", ["Non-empty results"])
+    if only_nulls(stdout):
+        return _verdict(False, "null_result", "Every printed value is NaN/None.", ["Non-null results"])
+    if previous_exec and stdout.strip() and _normalized(stdout) == _normalized(str(previous_exec.get("stdout") or "")):
+        return _verdict(False, "repeated_output", "Output is identical to the previous round's; the step made no visible progress.",
+                        ["Output for the new step"])
+
+    # Only an explicit marker counts: with one-step planning every step is the last one planned so far.
+    if isinstance(step, dict) and step.get("final") is True and patterns:
+        return _verdict(True, "expected_outputs", "The final step's declared outputs were all produced.")
+    return None
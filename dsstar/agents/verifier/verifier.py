@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import json
-from typing import Any, Dict, List
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
+from dsstar.agents.verifier.precheck import precheck
 from dsstar.llm.base import LLMClient
 from dsstar.prompts import verifier_prompt
 from dsstar.tools.log_utils import log
@@ -24,12 +26,29 @@ def run(
     last_code: str,
     last_exec: Dict[str, Any],
     client: LLMClient,
+    step: Optional[Dict[str, Any]] = None,
+    previous_exec: Optional[Dict[str, Any]] = None,
+    run_dir: Optional[Path] = None,
 ) -> Dict[str, Any]:
-    """Return a strict JSON dict describing sufficiency."""
+    """Return a strict JSON dict describing sufficiency.
+
+    Obvious outcomes of a successful execution are decided by `precheck`
+    without the LLM; those verdicts carry a `source` of "precheck:<check>".
+    """
     log("Verifier: evaluating result")
 
     if isinstance(last_exec, dict) and int(last_exec.get("exit_code", 0)) != 0:
         log("Verifier: forcing insufficient due to failed execution")
+        signal_info = last_exec.get("limit_exceeded")
+        if isinstance(signal_info, dict):
+            # No next_action: by now the loop has already sent the kill to fast-fix and the
+            # debugger, and it retries the step next round without consulting the router.
+            return {
+                "sufficient": False,
+                "reason": str(signal_info.get("message", "Execution exceeded a resource limit.")),
+                "missing": [f"Execution within the {signal_info.get('kind', 'resource')} limit"],
+                "limit_exceeded": signal_info,
+            }
         return {
             "sufficient": False,
             "reason": "Last code execution failed (non-zero exit code).",
@@ -37,6 +56,11 @@ def run(
             "next_action": "debug",
         }
 
+    local = precheck(step, plan, last_exec, previous_exec, run_dir) if isinstance(last_exec, dict) else None
+    if local is not None:
+        log(f"Verifier: decided locally ({local['source']}): {local['reason']}")
+        return local
+
     prompt = verifier_prompt(question, descriptions, plan, last_code, last_exec)
     response = client.complete(prompt)
     try:
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import argparse
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
-from dsstar.config import load_dotenv_if_available
+from dsstar.config import ExecutionConfig, load_dotenv_if_available
 from dsstar.llm.registry import get_client
 from dsstar.loop import run_loop
+from dsstar.runtime_paths import run_root_cache_dir
+from dsstar.tools.discovery import DiscoveryOptions, discover
 from dsstar.tools.log_utils import log
+from dsstar.tools.run_cache import RunCache
 
 
 SUPPORTED_INPUT_EXTENSIONS = {
@@ -16,28 +19,25 @@ SUPPORTED_INPUT_EXTENSIONS = {
     ".xlsx",
     ".xlsm",
     ".json",
+    ".jsonl",
+    ".ndjson",
     ".txt",
     ".parquet",
     ".db",
     ".sqlite",
     ".sqlite3",
+    ".zip",
 }
 
 
-def _discover_input_files(input_dir: str) -> List[str]:
-    base = Path(input_dir)
-    if not base.exists() or not base.is_dir():
-        return []
-
-    discovered: List[str] = []
-    for child in sorted(base.iterdir(), key=lambda p: p.name.lower()):
-        if not child.is_file():
-            continue
-        if child.name.startswith(".") or child.name == ".gitkeep":
-            continue
-        if child.suffix.lower() in SUPPORTED_INPUT_EXTENSIONS:
-            discovered.append(str(child))
-    return discovered
+def _discover_input_files(
+    input_dir: str,
+    options: Optional[DiscoveryOptions] = None,
+    cache_root: Optional[Path] = None,
+) -> List[str]:
+    options = options or DiscoveryOptions()
+    options.extensions = sorted(SUPPORTED_INPUT_EXTENSIONS)
+    return discover(input_dir, options, cache_root)
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -48,14 +48,120 @@ def build_parser() -> argparse.ArgumentParser:
     run_parser.add_argument("--question", required=True, help="Question or task")
     run_parser.add_argument("--files", nargs="*", default=[], help="Input files")
     run_parser.add_argument("--input-dir", default="input", help="Directory for auto-discovered input files")
+    run_parser.add_argument("--include", action="append", default=[], help="Glob of input paths to keep (repeatable)")
+    run_parser.add_argument("--exclude", action="append", default=[], help="Glob of input paths or dirs to skip (repeatable)")
+    run_parser.add_argument(
+        "--max-depth",
+        type=int,
+        default=0,
+        help="Subdirectory levels of --input-dir to search (0 = top level only, -1 = unlimited)",
+    )
+    run_parser.add_argument("--max-files", type=int, default=None, help="Stop discovery after this many files")
+    run_parser.add_argument("--discovery-workers", type=int, default=8, help="Parallel directory listings")
+    run_parser.add_argument(
+        "--no-discovery-cache",
+        action="store_true",
+        help="Always walk --input-dir instead of reusing the manifest of an unchanged tree",
+    )
     run_parser.add_argument("--max-rounds", type=int, default=12)
     run_parser.add_argument("--provider", default="mock", choices=["mock", "openai", "gemini", "deepseek", "local"])
     run_parser.add_argument("--model", default=None)
-    run_parser.add_argument("--timeout-sec", type=int, default=30)
+    run_parser.add_argument("--timeout-sec", type=int, default=30, help="Timeout for each execution of generated code")
+    run_parser.add_argument("--http-timeout-sec", type=int, default=60, help="Timeout for each LLM provider request")
+    run_parser.add_argument(
+        "--max-wall-sec",
+        type=float,
+        default=None,
+        help="Finish the run within this many seconds: later rounds get shorter timeouts and the finalyzer "
+        "runs on the best script so far when time runs out",
+    )
+    run_parser.add_argument(
+        "--max-tokens",
+        type=int,
+        default=None,
+        help="Estimated LLM tokens (prompt + response) the whole run may use, analyzer included",
+    )
     run_parser.add_argument("--run-dir", default="./runs")
     run_parser.add_argument("--refresh-master", action="store_true", help="Regenerate analyzer master describer")
     run_parser.add_argument("--no-cluster-mode", action="store_true", help="Disable analyzer signature clustering")
+    run_parser.add_argument(
+        "--no-partition-detection",
+        action="store_true",
+        help="Describe every shard of a partitioned dataset separately instead of as one logical table",
+    )
+    run_parser.add_argument(
+        "--zip-budget-mb",
+        type=float,
+        default=None,
+        help="Member data a zip input may stream while being described (default: 64)",
+    )
+    run_parser.add_argument(
+        "--no-master-bench",
+        action="store_true",
+        help="Promote LLM master describer patches without benchmarking them against the current master",
+    )
+    run_parser.add_argument(
+        "--plan-batch-size",
+        type=int,
+        default=1,
+        help="Let the planner propose up to this many ordered steps per call (1 = one step per call)",
+    )
+    run_parser.add_argument(
+        "--coder-mode",
+        default="full",
+        choices=["full", "diff"],
+        help="Regenerate the whole script each round, or ask for edits to the previous round's script",
+    )
+    run_parser.add_argument(
+        "--run-cache",
+        default="off",
+        choices=["off", "rerun", "answer"],
+        help="Answer a question already converged on unchanged inputs from the earlier run: "
+        "re-execute its final_solution.py (rerun) or return its final_answer.md as is (answer)",
+    )
+    run_parser.add_argument("--run-cache-max-entries", type=int, default=100, help="Converged runs kept in the run cache index")
+    run_parser.add_argument("--clear-run-cache", action="store_true", help="Invalidate every run cache entry before running")
+    run_parser.add_argument(
+        "--solution-library",
+        action="store_true",
+        help="Index successful scripts under --run-dir and show the coder/debugger the closest proven one",
+    )
     run_parser.add_argument("--max-failures-to-fix-per-run", type=int, default=5, help="Cap analyzer override LLM fixes")
+    run_parser.add_argument(
+        "--sqlite-store",
+        action="store_true",
+        help="Load tabular inputs into an indexed SQLite database that generated code can query",
+    )
+    run_parser.add_argument(
+        "--exec-backend",
+        default="subprocess",
+        choices=["subprocess", "pool"],
+        help="Run generated code in a fresh interpreter or fork it from pre-warmed workers",
+    )
+    run_parser.add_argument(
+        "--kernel-mode",
+        action="store_true",
+        help="Execute each step incrementally in a persistent Python kernel",
+    )
+    run_parser.add_argument(
+        "--no-exec-memo",
+        action="store_true",
+        help="Always re-execute scripts even when an identical one already ran",
+    )
+    run_parser.add_argument("--exec-pool-size", type=int, default=2, help="Number of pre-warmed workers")
+    run_parser.add_argument(
+        "--exec-preload",
+        default="numpy,pandas",
+        help="Comma-separated modules imported by pre-warmed workers",
+    )
+    run_parser.add_argument("--max-memory-mb", type=int, default=None, help="Kill generated code above this resident memory")
+    run_parser.add_argument("--max-cpu-sec", type=int, default=None, help="Kill generated code after this much CPU time")
+    run_parser.add_argument("--max-output-mb", type=int, default=None, help="Cap stdout/stderr and file output per execution")
+    run_parser.add_argument(
+        "--profile-exec",
+        action="store_true",
+        help="Profile generated code (round_XX_profile.json) and send slow scripts to a performance debugger",
+    )
     return parser
 
 
@@ -67,12 +173,25 @@ def main(argv: List[str] | None = None) -> None:
         parser.print_help()
         return
 
-    client = get_client(args.provider, args.model, args.timeout_sec)
+    client = get_client(args.provider, args.model, args.http_timeout_sec)
+    if args.clear_run_cache:
+        removed = RunCache(Path(args.run_dir), args.run_cache_max_entries).invalidate()
+        log(f"Run cache: invalidated {removed} entries")
     files = args.files
     if files:
         log(f"Using explicit --files ({len(files)}): {files}")
     else:
-        files = _discover_input_files(args.input_dir)
+        files = _discover_input_files(
+            args.input_dir,
+            DiscoveryOptions(
+                include=args.include,
+                exclude=args.exclude,
+                max_depth=None if args.max_depth < 0 else args.max_depth,
+                max_files=args.max_files,
+                workers=args.discovery_workers,
+            ),
+            cache_root=None if args.no_discovery_cache else run_root_cache_dir(Path(args.run_dir)),
+        )
         log(f"Discovered files from {args.input_dir}: {files}")
 
     run_path = run_loop(
@@ -85,6 +204,28 @@ def main(argv: List[str] | None = None) -> None:
         refresh_master=args.refresh_master,
         cluster_mode=not args.no_cluster_mode,
         max_failures_to_fix_per_run=args.max_failures_to_fix_per_run,
+        sqlite_store=args.sqlite_store,
+        partition_detection=not args.no_partition_detection,
+        zip_budget_mb=args.zip_budget_mb,
+        bench_master_patches=not args.no_master_bench,
+        plan_batch_size=args.plan_batch_size,
+        coder_mode=args.coder_mode,
+        run_cache=args.run_cache,
+        run_cache_max_entries=args.run_cache_max_entries,
+        solution_library=args.solution_library,
+        max_wall_sec=args.max_wall_sec,
+        max_tokens=args.max_tokens,
+        exec_config=ExecutionConfig(
+            backend=args.exec_backend,
+            pool_size=args.exec_pool_size,
+            preload_modules=[name.strip() for name in args.exec_preload.split(",") if name.strip()],
+            kernel=args.kernel_mode,
+            memo=not args.no_exec_memo,
+            max_memory_mb=args.max_memory_mb,
+            max_cpu_sec=args.max_cpu_sec,
+            max_output_mb=args.max_output_mb,
+            profile=args.profile_exec,
+        ),
     )
     log(f"Run complete: {run_path}")
     final_answer_path = run_path / "final_answer.md"
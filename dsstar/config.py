@@ -2,8 +2,8 @@ from __future__ import annotations
 
 import importlib.util
 import os
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import List, Optional
 
 
 def load_dotenv_if_available() -> None:
@@ -23,5 +23,18 @@ class ProviderConfig:
     run_dir: str
 
 
+@dataclass
+class ExecutionConfig:
+    backend: str = "subprocess"
+    pool_size: int = 2
+    preload_modules: List[str] = field(default_factory=lambda: ["numpy", "pandas"])
+    kernel: bool = False
+    memo: bool = True
+    max_memory_mb: Optional[int] = None
+    max_cpu_sec: Optional[int] = None
+    max_output_mb: Optional[int] = None
+    profile: bool = False
+
+
 def get_env(key: str, default: Optional[str] = None) -> Optional[str]:
     return os.getenv(key, default)
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
 import csv
-import json
 import sqlite3
+import urllib.parse
 from pathlib import Path
 
 
@@ -10,6 +10,51 @@ def _safe_text(path: Path, max_chars: int = 800) -> str:
     return path.read_text(encoding="utf-8", errors="replace")[:max_chars].replace("\n", " ")
 
 
+def _describe_json(p: Path) -> list:
+    try:
+        from dsstar.tools.json_stream import scan_json, summary_lines
+    except ImportError:
+        # Streaming helper unavailable: report only what a bounded head read shows.
+        with p.open("r", encoding="utf-8", errors="replace") as handle:
+            return ["JSON_HEAD=" + handle.read(800).replace("\n", " ")]
+    return summary_lines(scan_json(p))
+
+
+def _connect_readonly(p: Path) -> sqlite3.Connection:
+    try:
+        from dsstar.tools.sqlite_inspect import connect_readonly
+    except ImportError:
+        return sqlite3.connect("file:" + urllib.parse.quote(str(p.resolve())) + "?mode=ro", uri=True)
+    return connect_readonly(p)
+
+
+def _describe_sqlite(p: Path):
+    # Read-only stats (rows, indexes, sizes); None when the helper is not importable.
+    try:
+        from dsstar.tools.sqlite_inspect import inspect_sqlite, summary_lines
+    except ImportError:
+        return None
+    return summary_lines(inspect_sqlite(p))
+
+
+def _describe_zip(p: Path):
+    # Streams tabular members out of the archive; None when the helper is not importable.
+    try:
+        from dsstar.tools.zip_describe import describe_zip, summary_lines
+    except ImportError:
+        return None
+    return summary_lines(describe_zip(p))
+
+
+def _describe_xlsx_stream(p: Path):
+    # Streams the workbook XML for row counts; None when the helper is not importable.
+    try:
+        from dsstar.tools.xlsx_stream import inspect_xlsx, summary_lines
+    except ImportError:
+        return None
+    return summary_lines(inspect_xlsx(p))
+
+
 def describe_file(path: str) -> str:
     p = Path(path)
     try:
@@ -26,36 +71,42 @@ def describe_file(path: str) -> str:
                 lines.append("ROW_COUNT=" + str(max(len(rows) - 1, 0)))
                 if len(rows) > 1:
                     lines.append("FIRST_DATA_ROW=" + ",".join([str(c) for c in rows[1]]))
-        elif ext in {".json"}:
-            payload = json.loads(p.read_text(encoding="utf-8", errors="replace"))
-            lines.append("JSON_TYPE=" + type(payload).__name__)
-            if isinstance(payload, dict):
-                lines.append("TOP_KEYS=" + ",".join(sorted(payload.keys())[:20]))
-            elif isinstance(payload, list):
-                lines.append("LIST_LEN=" + str(len(payload)))
+        elif ext in {".json", ".jsonl", ".ndjson"}:
+            lines.extend(_describe_json(p))
         elif ext in {".db", ".sqlite", ".sqlite3"}:
-            conn = sqlite3.connect(str(p))
-            cur = conn.cursor()
-            tables = [r[0] for r in cur.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name").fetchall()]
-            lines.append("TABLES=" + ",".join(tables))
-            for t in tables[:3]:
-                cols = [r[1] for r in cur.execute(f"PRAGMA table_info('{t}')").fetchall()]
-                lines.append(f"TABLE_{t}_COLUMNS=" + ",".join(cols))
-            conn.close()
+            inspected = _describe_sqlite(p)
+            if inspected is not None:
+                lines.extend(inspected)
+            else:
+                conn = _connect_readonly(p)
+                cur = conn.cursor()
+                tables = [r[0] for r in cur.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name").fetchall()]
+                lines.append("TABLES=" + ",".join(tables))
+                for t in tables[:3]:
+                    cols = [r[1] for r in cur.execute(f"PRAGMA table_info('{t}')").fetchall()]
+                    lines.append(f"TABLE_{t}_COLUMNS=" + ",".join(cols))
+                conn.close()
         elif ext in {".xlsx", ".xls", ".xlsm"}:
-            try:
-                from openpyxl import load_workbook  # type: ignore
-
-                wb = load_workbook(p, read_only=True, data_only=True)
-                sheets = list(wb.sheetnames)
-                lines.append("SHEETS=" + ",".join(sheets))
-                if sheets:
-                    ws = wb[sheets[0]]
-                    first_row = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
-                    lines.append("FIRST_SHEET_HEADER=" + ",".join([str(v) for v in first_row if v is not None]))
-            except Exception as exc:  # pylint: disable=broad-except
-                lines.append(f"XLSX_PARSE_WARNING={exc}")
-                lines.append("SNIPPET=" + _safe_text(p, 200))
+            streamed = _describe_xlsx_stream(p) if ext != ".xls" else None
+            if streamed is not None:
+                lines.extend(streamed)
+            else:
+                try:
+                    from openpyxl import load_workbook  # type: ignore
+
+                    wb = load_workbook(p, read_only=True, data_only=True)
+                    sheets = list(wb.sheetnames)
+                    lines.append("SHEETS=" + ",".join(sheets))
+                    if sheets:
+                        ws = wb[sheets[0]]
+                        first_row = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
+                        lines.append("FIRST_SHEET_HEADER=" + ",".join([str(v) for v in first_row if v is not None]))
+                except Exception as exc:  # pylint: disable=broad-except
+                    lines.append(f"XLSX_PARSE_WARNING={exc}")
+                    lines.append("SNIPPET=" + _safe_text(p, 200))
+        elif ext == ".zip":
+            zipped = _describe_zip(p)
+            lines.extend(zipped if zipped is not None else ["SNIPPET=" + _safe_text(p, 200)])
         else:
             lines.append("SNIPPET=" + _safe_text(p))
 
@@ -45,7 +45,7 @@ class MockClient(LLMClient):
                     "suggested_fix_focus": "Replace intentional failure with intended output write.",
                 }
             )
-        if "ROLE: DEBUGGER_PATCH" in prompt:
+        if "ROLE: DEBUGGER_PATCH" in prompt or "ROLE: DEBUGGER_PERF" in prompt:
             return (
                 "from pathlib import Path\n"
                 "Path('hello.txt').write_text('hello', encoding='utf-8')\n"
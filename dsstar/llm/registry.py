@@ -15,8 +15,8 @@ def _warn(message: str) -> None:
     print(f"[warn] {message}")
 
 
-def get_client(provider: str, model: Optional[str] = None, timeout_sec: int = 60) -> LLMClient:
-    # Reuse CLI timeout for provider HTTP calls to keep request timing behavior consistent.
+def get_client(provider: str, model: Optional[str] = None, http_timeout_sec: int = 60) -> LLMClient:
+    # HTTP timeout per provider request; separate from the generated-code execution timeout.
     provider = provider.lower()
     if provider == "mock":
         return MockClient()
@@ -25,7 +25,7 @@ def get_client(provider: str, model: Optional[str] = None, timeout_sec: int = 60
         if not api_key:
             _warn("OPENAI_API_KEY missing; falling back to mock provider.")
             return MockClient()
-        return OpenAIClient(api_key=api_key, model=model or get_env("OPENAI_MODEL"), timeout_sec=timeout_sec)
+        return OpenAIClient(api_key=api_key, model=model or get_env("OPENAI_MODEL"), timeout_sec=http_timeout_sec)
     if provider == "deepseek":
         api_key = get_env("DEEPSEEK_API_KEY")
         if not api_key:
@@ -35,14 +35,14 @@ def get_client(provider: str, model: Optional[str] = None, timeout_sec: int = 60
             api_key=api_key,
             model=model or get_env("DEEPSEEK_MODEL"),
             base_url=get_env("DEEPSEEK_BASE_URL"),
-            timeout_sec=timeout_sec,
+            timeout_sec=http_timeout_sec,
         )
     if provider == "gemini":
         api_key = get_env("GEMINI_API_KEY")
         if not api_key:
             _warn("GEMINI_API_KEY missing; falling back to mock provider.")
             return MockClient()
-        return GeminiClient(api_key=api_key, model=model or get_env("GEMINI_MODEL"), timeout_sec=timeout_sec)
+        return GeminiClient(api_key=api_key, model=model or get_env("GEMINI_MODEL"), timeout_sec=http_timeout_sec)
     if provider == "local":
         return LocalStubClient(name="local", model=model or get_env("LOCAL_LLM_MODEL") or "local-stub")
     _warn(f"Unknown provider '{provider}', falling back to mock.")
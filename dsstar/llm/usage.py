@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Dict, List
+
+from dsstar.llm.base import LLMClient
+
+# Per-call accounting around any provider client. Calls are attributed to the
+# prompt's "ROLE: X" header, so a run's llm_usage.json shows which agents the
+# LLM round-trips went to and how many a converged run needed.
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) for comparing prompt and response sizes."""
+    return (len(text) + 3) // 4
+
+
+def prompt_role(prompt: str) -> str:
+    """The role named in a prompt's `ROLE:` header, or "UNKNOWN"."""
+    first = prompt.split("\n", 1)[0]
+    return first[len("ROLE: "):].strip() if first.startswith("ROLE: ") else "UNKNOWN"
+
+
+class UsageTrackingClient(LLMClient):
+    def __init__(self, inner: LLMClient) -> None:
+        super().__init__(name=inner.name, model=inner.model)
+        self.inner = inner
+        self.calls: List[Dict[str, Any]] = []
+
+    def complete(self, prompt: str) -> str:
+        started = time.perf_counter()
+        call: Dict[str, Any] = {"role": prompt_role(prompt), "prompt_chars": len(prompt), "response_chars": 0}
+        try:
+            response = self.inner.complete(prompt)
+        except Exception as exc:
+            call["error"] = type(exc).__name__
+            raise
+        else:
+            call["response_chars"] = len(response)
+            call["response_tokens_est"] = estimate_tokens(response)
+        finally:
+            call["seconds"] = round(time.perf_counter() - started, 4)
+            self.calls.append(call)
+        return response
+
+    def tokens_est(self) -> int:
+        """Estimated prompt plus response tokens of the calls made so far."""
+        return sum((call["prompt_chars"] + 3) // 4 + call.get("response_tokens_est", 0) for call in self.calls)
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals plus a per-role breakdown of the calls made so far."""
+        by_role: Dict[str, Dict[str, Any]] = {}
+        for call in self.calls:
+            role = by_role.setdefault(
+                call["role"],
+                {"calls": 0, "prompt_chars": 0, "response_chars": 0, "response_tokens_est": 0, "seconds": 0.0},
+            )
+            role["calls"] += 1
+            role["prompt_chars"] += call["prompt_chars"]
+            role["response_chars"] += call["response_chars"]
+            role["response_tokens_est"] += call.get("response_tokens_est", 0)
+            role["seconds"] = round(role["seconds"] + call["seconds"], 4)
+        return {
+            "calls": len(self.calls),
+            "errors": sum(1 for call in self.calls if "error" in call),
+            "prompt_chars": sum(call["prompt_chars"] for call in self.calls),
+            "response_chars": sum(call["response_chars"] for call in self.calls),
+            "response_tokens_est": sum(call.get("response_tokens_est", 0) for call in self.calls),
+            "seconds": round(sum(call["seconds"] for call in self.calls), 4),
+            "by_role": dict(sorted(by_role.items())),
+        }
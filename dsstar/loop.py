@@ -1,19 +1,46 @@
 from __future__ import annotations
 
+import json
+import shutil
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from dsstar.agents.analyzer.analyzer import run as run_analyzer
+from dsstar.agents.analyzer.master_manager import MASTER_PATH, master_version_id
 from dsstar.agents.coder.coder import run as run_coder
+from dsstar.agents.coder.static_check import BLOCKING_CHECKS, check_code, failure_result
 from dsstar.agents.debugger.debugger import run as run_debugger
+from dsstar.agents.debugger.debugger import run_perf as run_perf_debugger
+from dsstar.agents.debugger.fast_fix import fast_fix
+from dsstar.agents.executor.executor import build_env, load_profile, resource_limits
 from dsstar.agents.executor.executor import run as run_executor
+from dsstar.agents.executor.executor import run_cell as run_executor_cell
+from dsstar.agents.executor.executor import warm_up as warm_up_executor
 from dsstar.agents.finalyzer.finalyzer import finalyzer_code, finalyzer_report
 from dsstar.agents.planner.planner import run as run_planner
+from dsstar.agents.planner.planner import run_batch as run_batch_planner
 from dsstar.agents.router.router import run as run_router
 from dsstar.agents.verifier.verifier import run as run_verifier
+from dsstar.config import ExecutionConfig
 from dsstar.llm.base import LLMClient
+from dsstar.llm.usage import UsageTrackingClient
+from dsstar.runtime_paths import run_root_cache_dir
 from dsstar.state import RunMetadata
-from dsstar.tools.log_utils import create_run_dir, get_repo_root, log, write_json
+from dsstar.tools.budget import RunBudget
+from dsstar.tools.exec_memo import ExecMemo, inputs_fingerprint
+from dsstar.tools.kernel import PersistentKernel
+from dsstar.tools.log_utils import create_run_dir, get_repo_root, log, write_json, write_text
+from dsstar.tools.run_cache import RUN_CACHE_FILE, RunCache, cache_key
+from dsstar.tools.solution_library import SolutionLibrary
+
+# Successful runs that use this share of the time budget also get a performance pass.
+_NEAR_TIMEOUT_FRACTION = 0.8
+# Rule-based repairs tried in a row (each re-executed) before the LLM debugger.
+_FAST_FIX_ATTEMPTS = 3
+_BEST_EFFORT_NOTE = (
+    "The run stopped at its {limit} budget before the verifier confirmed the answer. Label the answer best-effort "
+    + "and say what is still missing: {missing}"
+)
 
 
 def _next_todo(plan: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
@@ -44,10 +71,166 @@ def _truncate_to_before(plan: List[Dict[str, Any]], target_id: Optional[int]) ->
             step["status"] = "todo"
 
 
+def _extend_plan(
+    question: str,
+    descriptions: Dict[str, Any],
+    plan: List[Dict[str, Any]],
+    last_exec: Optional[Dict[str, Any]],
+    client: LLMClient,
+    plan_batch_size: int,
+) -> None:
+    if plan_batch_size > 1:
+        for step in run_batch_planner(question, descriptions, plan, last_exec, client, plan_batch_size):
+            _append_plan_step(plan, step)
+    else:
+        _append_plan_step(plan, run_planner(question, descriptions, plan, last_exec, client))
+
+
 def _write_plan(run_dir: Path, plan: List[Dict[str, Any]]) -> None:
     write_json(run_dir / "plan.json", plan)
 
 
+def _stage_cell(kernel: PersistentKernel, step: Dict[str, Any], code_path: Path, cell_path: Path, cell: str) -> str:
+    # Kernel mode keeps the step-only cell for execution and a standalone script for
+    # round_XX_code.py, the verifier and the finalyzer.
+    write_text(cell_path, cell)
+    script = kernel.compose_script(int(step.get("id", 0)), cell, str(step.get("title", "")))
+    write_text(code_path, script)
+    return script
+
+
+def _execute_round(
+    kernel: Optional[PersistentKernel],
+    step: Dict[str, Any],
+    code_path: Path,
+    cell_path: Path,
+    run_path: Path,
+    timeout_sec: int,
+    round_idx: int,
+    exec_config: Optional[ExecutionConfig],
+    memo: Optional[ExecMemo],
+    descriptions: Dict[str, Any],
+) -> Dict[str, Any]:
+    script_path = code_path if kernel is None else cell_path
+    code = script_path.read_text(encoding="utf-8")
+    findings = check_code(code, descriptions, run_path)
+    if findings:
+        log(f"Round {round_idx:02d} static check: {findings[0]['error_type']}: {findings[0]['message']}")
+        write_json(run_path / f"round_{round_idx:02d}_static_check.json", findings)
+    blocking = [finding for finding in findings if finding["check"] in BLOCKING_CHECKS]
+    if blocking:
+        # Certain failures skip the subprocess and go straight to fast-fix/debugger.
+        exec_result = failure_result(blocking, code, script_path.resolve())
+        exec_result["cwd"] = str(run_path.resolve())
+        exec_result["script_path"] = str(script_path.resolve())
+        write_json(run_path / f"round_{round_idx:02d}_exec.json", exec_result)
+        return exec_result
+    if kernel is None:
+        exec_result = run_executor(code_path, run_path, timeout_sec, round_idx, exec_config, memo)
+    else:
+        kernel.restore_before(int(step.get("id", 0)))
+        exec_result = run_executor_cell(kernel, cell_path, run_path, timeout_sec, round_idx)
+    if findings and int(exec_result.get("exit_code", 1)) != 0:
+        # Likely path/column problems only become hints for the debugger once the script really failed.
+        exec_result = {**exec_result, "static_hints": findings}
+        write_json(run_path / f"round_{round_idx:02d}_exec.json", exec_result)
+    return exec_result
+
+
+def _is_slow(exec_result: Dict[str, Any], timeout_sec: int) -> bool:
+    if exec_result.get("timeout"):
+        return True
+    return int(exec_result.get("exit_code", 1)) == 0 and float(
+        exec_result.get("duration_sec", 0.0)
+    ) >= _NEAR_TIMEOUT_FRACTION * timeout_sec
+
+
+def _perf_pass(
+    question: str,
+    descriptions: Dict[str, Any],
+    plan: List[Dict[str, Any]],
+    code_path: Path,
+    run_path: Path,
+    timeout_sec: int,
+    round_idx: int,
+    exec_config: Optional[ExecutionConfig],
+    memo: Optional[ExecMemo],
+    exec_result: Dict[str, Any],
+    client: LLMClient,
+) -> Tuple[Dict[str, Any], str]:
+    slow_code = code_path.read_text(encoding="utf-8")
+    perf_code = run_perf_debugger(
+        question=question,
+        descriptions=descriptions,
+        plan=plan,
+        slow_code=slow_code,
+        exec_result=exec_result,
+        profile=load_profile(run_path, exec_result),
+        client=client,
+        run_dir=run_path,
+        round_idx=round_idx,
+    )
+    if perf_code.strip() == slow_code.strip():
+        return exec_result, slow_code
+    code_path.write_text(perf_code, encoding="utf-8")
+    # A distinct profile name keeps the original run's profile next to the rewrite's.
+    perf_exec = run_executor(code_path, run_path, timeout_sec, round_idx, exec_config, memo, profile_tag="perf")
+    faster = int(perf_exec.get("exit_code", 1)) == 0 and float(perf_exec.get("duration_sec", 0.0)) < float(
+        exec_result.get("duration_sec", 0.0)
+    )
+    if exec_result.get("timeout") or faster:
+        return perf_exec, perf_code
+    # The original run succeeded; keep it when the rewrite failed or was not faster.
+    log(f"Round {round_idx:02d} performance patch not better; keeping original code")
+    code_path.write_text(slow_code, encoding="utf-8")
+    write_json(run_path / f"round_{round_idx:02d}_exec.json", exec_result)
+    return exec_result, slow_code
+
+
+def _run_cache_key(question: str, files: List[str], client: LLMClient, run_root: Path) -> str:
+    master_text = MASTER_PATH.read_text(encoding="utf-8") if MASTER_PATH.exists() else ""
+    return cache_key(
+        question, files, client.name, client.model, master_version_id(master_text), run_root_cache_dir(run_root)
+    )
+
+
+def _serve_cached_run(
+    source: Path,
+    run_path: Path,
+    mode: str,
+    question: str,
+    client: LLMClient,
+    timeout_sec: int,
+    exec_config: Optional[ExecutionConfig],
+) -> bool:
+    """Answer from a cached converged run; False when its solution no longer runs."""
+    shutil.copy2(source / "final_solution.py", run_path / "final_solution.py")
+    if mode == "answer":
+        shutil.copy2(source / "final_answer.md", run_path / "final_answer.md")
+        return True
+    final_exec = run_executor(run_path / "final_solution.py", run_path, timeout_sec, 99, exec_config, None)
+    write_json(run_path / "final_solution_exec.json", final_exec)
+    if int(final_exec.get("exit_code", 1)) != 0:
+        log(f"Run cache: cached solution from {source.name} failed; running the full loop")
+        (run_path / "final_solution.py").unlink()
+        return False
+    try:
+        cached_exec = json.loads((source / "final_solution_exec.json").read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        cached_exec = {}
+    if str(cached_exec.get("stdout", "")).strip() == str(final_exec.get("stdout", "")).strip():
+        shutil.copy2(source / "final_answer.md", run_path / "final_answer.md")
+        return True
+    # Same inputs, different output (e.g. the clock): only the report is rewritten.
+    try:
+        plan = json.loads((source / "plan.json").read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        plan = []
+    manifest = {"artifacts": ["final_solution.py", "final_solution_exec.json"], "run_path": str(run_path)}
+    finalyzer_report(question, plan, manifest, final_exec, client, run_path)
+    return True
+
+
 def _collect_proposed_changes(propose_dir: Path) -> List[str]:
     if not propose_dir.exists():
         return []
@@ -68,8 +251,22 @@ def run_loop(
     refresh_master: bool = False,
     cluster_mode: bool = True,
     max_failures_to_fix_per_run: int = 5,
+    exec_config: Optional[ExecutionConfig] = None,
+    sqlite_store: bool = False,
+    partition_detection: bool = True,
+    zip_budget_mb: Optional[float] = None,
+    bench_master_patches: bool = True,
+    plan_batch_size: int = 1,
+    coder_mode: str = "full",
+    run_cache: str = "off",
+    run_cache_max_entries: int = 100,
+    solution_library: bool = False,
+    max_wall_sec: Optional[float] = None,
+    max_tokens: Optional[int] = None,
 ) -> Path:
     run_path = create_run_dir(run_root)
+    client = client if isinstance(client, UsageTrackingClient) else UsageTrackingClient(client)
+    budget = RunBudget(client, max_wall_sec, max_tokens)
     log(f"Run path: {run_path}")
     repo_root = get_repo_root()
 
@@ -94,6 +291,8 @@ def run_loop(
     if not files:
         log("No input files found")
 
+    warm_up_executor(exec_config)
+
     descriptions = run_analyzer(
         files,
         run_path,
@@ -101,8 +300,55 @@ def run_loop(
         refresh_master=refresh_master,
         cluster_mode=cluster_mode,
         max_failures_to_fix_per_run=max_failures_to_fix_per_run,
+        sqlite_store=sqlite_store,
+        partition_detection=partition_detection,
+        zip_budget_mb=zip_budget_mb,
+        bench_master_patches=bench_master_patches,
     )
     artifacts.append("descriptions.json")
+    budget.mark("analyzer")
+
+    cache: Optional[RunCache] = None
+    run_key = ""
+    if run_cache != "off" and not refresh_master:
+        cache = RunCache(run_root, run_cache_max_entries)
+        # Keyed after the analyzer, which may promote a patched master describer during this run.
+        run_key = _run_cache_key(question, files, client, run_root)
+        cached_run = cache.lookup(run_key)
+        if cached_run is not None:
+            log(f"Run cache: question answered before in {cached_run}")
+            if _serve_cached_run(
+                cached_run, run_path, run_cache, question, client, budget.exec_timeout(timeout_sec, final=True), exec_config
+            ):
+                write_json(
+                    run_path / RUN_CACHE_FILE,
+                    {"key": run_key, "hit": True, "cached_from": str(cached_run), "mode": run_cache},
+                )
+                write_json(run_path / "run_status.json", {"terminated_reason": "run_cache_hit"})
+                write_json(run_path / "llm_usage.json", {**client.summary(), "run_cache_hit": True})
+                return run_path
+            cache.invalidate(run_key)
+
+    kernel: Optional[PersistentKernel] = None
+    if exec_config is not None and exec_config.kernel:
+        kernel = PersistentKernel(run_path, build_env(run_path), resource_limits(exec_config))
+
+    library: Optional[SolutionLibrary] = None
+    reference_code: Optional[str] = None
+    if solution_library:
+        library = SolutionLibrary(run_root)
+        hint = library.best(question, descriptions)
+        if hint is not None:
+            log(f"Solution library: warm-starting from {hint['source']} (score {hint['score']})")
+            reference_code = hint["code"]
+            write_json(run_path / "solution_hint.json", {key: value for key, value in hint.items() if key != "code"})
+            artifacts.append("solution_hint.json")
+
+    # Kernel cells depend on in-memory state, so only whole-script runs are memoized.
+    memo: Optional[ExecMemo] = None
+    if kernel is None and (exec_config is None or exec_config.memo):
+        memo = ExecMemo(run_path, inputs_fingerprint(descriptions))
+    profiling = kernel is None and exec_config is not None and exec_config.profile
 
     plan: List[Dict[str, Any]] = []
     last_exec: Optional[Dict[str, Any]] = None
@@ -113,19 +359,37 @@ def run_loop(
         "missing": [],
         "next_action": "add_step",
     }
+    last_cell: str = ""
     terminated_reason: Optional[str] = None
 
+    rounds_run = 0
+    previous_round_exec: Optional[Dict[str, Any]] = None
+    previous_round_step: Optional[Dict[str, Any]] = None
+    any_success = False
+    last_good_code = ""
+    verifier_sources: Dict[str, int] = {}
     for round_idx in range(max_rounds):
+        if not budget.begin_round():
+            terminated_reason = "budget_exhausted"
+            log(f"Run budget: {budget.exhausted} limit leaves no room for round {round_idx:02d}; finalizing")
+            break
+        budget.cap_http_timeout()
+        round_timeout = budget.exec_timeout(timeout_sec)
+        rounds_run = round_idx + 1
         log(f"Round {round_idx:02d} starting")
 
         next_step = _next_todo(plan)
         if not next_step:
             next_step = _next_attempted(plan)
         if not next_step:
-            new_step = run_planner(question, descriptions, plan, last_exec, client)
-            _append_plan_step(plan, new_step)
+            _extend_plan(question, descriptions, plan, last_exec, client, plan_batch_size)
             _write_plan(run_path, plan)
-            next_step = new_step
+            next_step = _next_todo(plan)
+
+        kernel_variables: Optional[Dict[str, str]] = None
+        if kernel is not None:
+            kernel.restore_before(int(next_step.get("id", 0)))
+            kernel_variables = kernel.variables()
 
         code_path = run_coder(
             question=question,
@@ -137,40 +401,113 @@ def run_loop(
             client=client,
             run_dir=run_path,
             round_idx=round_idx,
+            kernel_variables=kernel_variables,
+            incremental=coder_mode == "diff",
+            # The snippet warm-starts the run; once a round has run cleanly the run's own code is the better base.
+            reference_code=reference_code if not any_success else None,
         )
         artifacts.extend([
             f"round_{round_idx:02d}_prompt.txt",
             f"round_{round_idx:02d}_code.py",
+            f"round_{round_idx:02d}_coder.json",
         ])
 
         last_code = code_path.read_text(encoding="utf-8")
+        cell_path = run_path / f"round_{round_idx:02d}_cell.py"
+        if kernel is not None:
+            last_cell = last_code
+            last_code = _stage_cell(kernel, next_step, code_path, cell_path, last_cell)
+            artifacts.append(f"round_{round_idx:02d}_cell.py")
         log(f"Round {round_idx:02d} coder success")
 
-        exec_result = run_executor(code_path, run_path, timeout_sec, round_idx)
+        exec_result = _execute_round(
+            kernel, next_step, code_path, cell_path, run_path, round_timeout, round_idx, exec_config, memo, descriptions
+        )
         artifacts.append(f"round_{round_idx:02d}_exec.json")
         last_exec = exec_result
 
+        if profiling and _is_slow(exec_result, round_timeout):
+            log(f"Round {round_idx:02d} slow execution -> performance debugger")
+            exec_result, last_code = _perf_pass(
+                question, descriptions, plan, code_path, run_path, round_timeout, round_idx,
+                exec_config, memo, exec_result, client,
+            )
+            last_exec = exec_result
+            artifacts.extend(
+                name
+                for name in (
+                    f"round_{round_idx:02d}_profile.json",
+                    f"round_{round_idx:02d}_perf_profile.json",
+                    f"round_{round_idx:02d}_code_perf.py",
+                )
+                if (run_path / name).exists()
+            )
+
+        if exec_result["exit_code"] != 0:
+            failing = last_cell if kernel is not None else last_code
+            fixes: List[Dict[str, Any]] = []
+            for _ in range(_FAST_FIX_ATTEMPTS):
+                fix = fast_fix(failing, exec_result, descriptions)
+                if fix is None:
+                    break
+                log(f"Round {round_idx:02d} fast fix {fix['rule']}: {fix['detail']}")
+                failing = fix["code"]
+                if kernel is not None:
+                    last_cell = failing
+                    last_code = _stage_cell(kernel, next_step, code_path, cell_path, last_cell)
+                else:
+                    code_path.write_text(failing, encoding="utf-8")
+                    last_code = failing
+                exec_result = _execute_round(
+                    kernel, next_step, code_path, cell_path, run_path, round_timeout, round_idx, exec_config, memo,
+                    descriptions,
+                )
+                last_exec = exec_result
+                fixes.append({**{key: fix[key] for key in ("rule", "detail", "error_type")}, "exit_code": exec_result["exit_code"]})
+                if exec_result["exit_code"] == 0:
+                    break
+            if fixes:
+                write_json(run_path / f"round_{round_idx:02d}_fast_fix.json", fixes)
+                artifacts.append(f"round_{round_idx:02d}_fast_fix.json")
+
         if exec_result["exit_code"] != 0:
             log(f"Round {round_idx:02d} executor failed -> debugger route")
             debug_code = run_debugger(
                 question=question,
                 descriptions=descriptions,
                 plan=plan,
-                failing_code=last_code,
+                failing_code=last_cell if kernel is not None else last_code,
                 exec_result=exec_result,
                 client=client,
                 run_dir=run_path,
                 round_idx=round_idx,
+                reference_code=reference_code,
             )
-            code_path.write_text(debug_code, encoding="utf-8")
-            last_code = debug_code
+            if kernel is not None:
+                last_cell = debug_code
+                last_code = _stage_cell(kernel, next_step, code_path, cell_path, last_cell)
+            else:
+                code_path.write_text(debug_code, encoding="utf-8")
+                last_code = debug_code
             artifacts.extend([
                 f"round_{round_idx:02d}_trace_summary.json",
                 f"round_{round_idx:02d}_code_patched.py",
             ])
-            exec_result = run_executor(code_path, run_path, timeout_sec, round_idx)
+            exec_result = _execute_round(
+                kernel, next_step, code_path, cell_path, run_path, round_timeout, round_idx, exec_config, memo,
+                descriptions,
+            )
             last_exec = exec_result
 
+        if (run_path / f"round_{round_idx:02d}_static_check.json").exists():
+            artifacts.append(f"round_{round_idx:02d}_static_check.json")
+
+        any_success = any_success or exec_result["exit_code"] == 0
+        if exec_result["exit_code"] == 0:
+            last_good_code = last_code
+        if kernel is not None and exec_result["exit_code"] == 0:
+            kernel.commit(int(next_step.get("id", 0)), last_cell, str(next_step.get("title", "")))
+
         verifier_state = run_verifier(
             question=question,
             descriptions=descriptions,
@@ -178,7 +515,18 @@ def run_loop(
             last_code=last_code,
             last_exec=last_exec,
             client=client,
+            step=next_step,
+            # Identical output is only "no progress" when the same step was re-attempted.
+            previous_exec=previous_round_exec if previous_round_step is next_step else None,
+            run_dir=run_path,
         )
+        if exec_result["exit_code"] != 0:
+            verdict_source = "failed_execution"
+        else:
+            verdict_source = str(verifier_state.get("source", "llm"))
+        verifier_sources[verdict_source] = verifier_sources.get(verdict_source, 0) + 1
+        previous_round_exec = last_exec
+        previous_round_step = next_step
 
         if exec_result["exit_code"] == 0 and next_step:
             # DS-STAR-faithful semantics: execution success alone is an attempt, not completion.
@@ -210,34 +558,55 @@ def run_loop(
             backtrack_id = router_state.get("backtrack_to_step_id")
             log(f"Router decided backtrack to step_id={backtrack_id}")
             _truncate_to_before(plan, backtrack_id)
+            if kernel is not None and backtrack_id is not None:
+                kernel.drop_from(int(backtrack_id))
             _write_plan(run_path, plan)
+        elif _next_todo(plan):
+            # Batch planning already queued the next step; the verifier's verdict reaches it via last_exec.
+            log(f"Router decided add_step; continuing with planned step {_next_todo(plan)['id']}")
         else:
             log("Router decided add_step")
-            new_step = run_planner(question, descriptions, plan, last_exec, client)
-            _append_plan_step(plan, new_step)
+            _extend_plan(question, descriptions, plan, last_exec, client, plan_batch_size)
             _write_plan(run_path, plan)
 
+    if kernel is not None:
+        kernel.close()
+    budget.mark("loop")
+
+    converged = bool(verifier_state.get("sufficient") and last_exec and int(last_exec.get("exit_code", 1)) == 0)
+    # Out of budget before convergence: finalize the last script that ran cleanly rather than nothing.
+    best_effort = terminated_reason == "budget_exhausted" and not converged and bool(last_good_code)
+
     if terminated_reason:
-        write_json(run_path / "run_status.json", {"terminated_reason": terminated_reason})
+        status: Dict[str, Any] = {"terminated_reason": terminated_reason}
+        if terminated_reason == "budget_exhausted":
+            status.update({"budget_limit": budget.exhausted, "best_effort": best_effort})
+        write_json(run_path / "run_status.json", status)
         artifacts.append("run_status.json")
 
-    if verifier_state.get("sufficient") and last_exec and int(last_exec.get("exit_code", 1)) == 0:
+    if converged or best_effort:
+        budget.cap_http_timeout()
         final_code_path = finalyzer_code(
             question=question,
             plan=plan,
             descriptions=descriptions,
-            last_working_code=last_code,
+            last_working_code=last_code if converged else last_good_code,
             client=client,
             run_dir=run_path,
         )
         artifacts.append("final_solution.py")
 
-        final_exec = run_executor(final_code_path, run_path, timeout_sec, 99)
+        final_exec = run_executor(
+            final_code_path, run_path, budget.exec_timeout(timeout_sec, final=True), 99, exec_config, memo
+        )
         write_json(run_path / "final_solution_exec.json", final_exec)
         artifacts.append("final_solution_exec.json")
 
         if int(final_exec.get("exit_code", 1)) == 0:
             artifact_manifest = {"artifacts": artifacts, "run_path": str(run_path)}
+            note = None
+            if best_effort:
+                note = _BEST_EFFORT_NOTE.format(limit=budget.exhausted, missing=json.dumps(verifier_state.get("missing", [])))
             finalyzer_report(
                 question=question,
                 plan=plan,
@@ -245,10 +614,35 @@ def run_loop(
                 final_exec=final_exec,
                 client=client,
                 run_dir=run_path,
+                note=note,
             )
             artifacts.append("final_answer.md")
-            log("Final answer written")
-
+            log("Best-effort answer written" if best_effort else "Final answer written")
+    budget.mark("finalyzer")
+    if budget.limited:
+        write_json(run_path / "budget.json", budget.summary())
+
+    usage = client.summary()
+    usage.update({
+        "plan_batch_size": plan_batch_size,
+        "rounds": rounds_run,
+        "plan_steps": len(plan),
+        "converged": (run_path / "final_answer.md").exists() and not best_effort,
+        "verifier_verdicts": dict(sorted(verifier_sources.items())),
+        "verifier_llm_calls_skipped": sum(count for source, count in verifier_sources.items() if source != "llm"),
+    })
+    write_json(run_path / "llm_usage.json", usage)
+    by_role = ", ".join(f"{role}={info['calls']}" for role, info in usage["by_role"].items())
+    log(f"LLM calls this run: {usage['calls']} ({by_role})")
+
+    if library is not None:
+        added = library.add_run(run_path, question, descriptions)
+        log(f"Solution library: indexed {added} successful script(s) from this run")
+
+    if cache is not None and (run_path / "final_answer.md").exists() and not best_effort:
+        run_key = _run_cache_key(question, files, client, run_root)
+        write_json(run_path / RUN_CACHE_FILE, {"key": run_key, "question": question, "hit": False})
+        cache.store(run_key, run_path, question)
 
     proposed_changes = _collect_proposed_changes(propose_dir)
     metadata.proposed_changes = proposed_changes
@@ -33,6 +33,13 @@ def description_script_prompt(file_path: str, file_type: str) -> str:
     )
 
 
+_EXPECTED_OUTPUTS_HINT = (
+    'Optionally add "expected": {"files": [run-dir relative paths the step must write], '
+    + '"stdout_patterns": [regexes the printed answer must match]} so obvious results are checked without the verifier.\n'
+    + 'Add "final": true only to the step whose printed output answers the question.\n'
+)
+
+
 def planner_prompt(
     question: str,
     descriptions: Dict[str, Any],
@@ -43,6 +50,7 @@ def planner_prompt(
         _header("PLANNER")
         + "You add exactly one step to the plan.\n"
         + "Plan step format: {\"id\": int, \"title\": str, \"details\": str, \"status\": \"todo\"}.\n"
+        + _EXPECTED_OUTPUTS_HINT
         + f"Question: {question}\n"
         + f"Descriptions:\n{json.dumps(descriptions, indent=2)}\n"
         + f"Current plan:\n{json.dumps(plan, indent=2)}\n"
@@ -51,19 +59,51 @@ def planner_prompt(
     )
 
 
-def coder_prompt(
+def planner_batch_prompt(
     question: str,
     descriptions: Dict[str, Any],
     plan: List[Dict[str, Any]],
-    next_step: Dict[str, Any],
-    previous_code: Optional[str],
     last_exec: Optional[Dict[str, Any]],
+    max_steps: int,
 ) -> str:
     return (
-        _header("CODER")
-        + "Write a full Python script that accomplishes all steps up to the next todo step.\n"
-        + "Output ONLY Python code, no markdown fences.\n"
-        + "Non-negotiable path rules:\n"
+        _header("PLANNER_BATCH")
+        + f"You add the remaining steps to the plan in order, at most {max_steps}.\n"
+        + "Each step should be small enough for one script; stop at the step that answers the question.\n"
+        + "Plan step format: {\"id\": int, \"title\": str, \"details\": str, \"status\": \"todo\"}.\n"
+        + _EXPECTED_OUTPUTS_HINT
+        + f"Question: {question}\n"
+        + f"Descriptions:\n{json.dumps(descriptions, indent=2)}\n"
+        + f"Current plan:\n{json.dumps(plan, indent=2)}\n"
+        + f"Last execution:\n{json.dumps(last_exec, indent=2) if last_exec else 'null'}\n"
+        + "Return only a JSON array of the new steps."
+    )
+
+
+def _sqlite_store_hint(descriptions: Dict[str, Any]) -> str:
+    store = descriptions.get("sqlite_store") if isinstance(descriptions, dict) else None
+    if not isinstance(store, dict) or not store.get("path"):
+        return ""
+    return (
+        f"Indexed SQLite copy of the tabular inputs: {store['path']} (schema under descriptions.sqlite_store). "
+        + "For joins, filters and aggregates, query it with sqlite3 (open with uri=True and mode=ro) or pd.read_sql "
+        + "so filtering runs in SQL instead of scanning whole files; prefer indexed columns in WHERE/JOIN clauses.\n"
+    )
+
+
+def _reference_hint(reference_code: Optional[str]) -> str:
+    if not reference_code:
+        return ""
+    return (
+        "Proven code from an earlier successful run on inputs with the same structure. Reuse its loading, parsing "
+        + "and cleaning approach where it fits; paths, columns and the question may differ, so do not copy it blindly:\n"
+        + f"{reference_code}\n"
+    )
+
+
+def _coder_rules(descriptions: Dict[str, Any]) -> str:
+    return (
+        "Non-negotiable path rules:\n"
         + "- Read repository inputs using os.environ['DSSTAR_REPO_ROOT'] (for example REPO_ROOT / 'input').\n"
         + "- Write ALL outputs/intermediate files under os.environ['DSSTAR_RUN_DIR'].\n"
         + "- Never write outside DSSTAR_RUN_DIR. Relative writes are only allowed when they stay in DSSTAR_RUN_DIR.\n"
@@ -83,12 +123,69 @@ def coder_prompt(
         + "proposed_path = PROPOSE_DIR / target_rel\n"
         + "proposed_path.parent.mkdir(parents=True, exist_ok=True)\n"
         + "# write proposed_path (NOT REPO_ROOT / 'knowledge' / 'master.py')\n"
+        + "Fast input loading: `from dsstar.runtime import load_input` then `df = load_input(INPUT_DIR / 'data.csv')` "
+        + "returns a pandas DataFrame for CSV/TSV/XLSX/JSON/JSONL inputs (extra kwargs such as sheet_name go to the pandas reader). "
+        + "The parsed table is cached by content hash, so prefer it over pd.read_csv/pd.read_excel for repository inputs.\n"
+        + _sqlite_store_hint(descriptions)
+    )
+
+
+def coder_prompt(
+    question: str,
+    descriptions: Dict[str, Any],
+    plan: List[Dict[str, Any]],
+    next_step: Dict[str, Any],
+    previous_code: Optional[str],
+    last_exec: Optional[Dict[str, Any]],
+    kernel_variables: Optional[Dict[str, str]] = None,
+    reference_code: Optional[str] = None,
+) -> str:
+    if kernel_variables is None:
+        task = "Write a full Python script that accomplishes all steps up to the next todo step.\n"
+    else:
+        task = (
+            "Write ONLY the code for the next todo step. It runs in a persistent Python kernel that already "
+            "executed the previous code, so reuse existing variables instead of reloading inputs or recomputing earlier steps.\n"
+            + f"Kernel variables (name -> type):\n{json.dumps(kernel_variables, indent=2)}\n"
+        )
+    return (
+        _header("CODER")
+        + task
+        + "Output ONLY Python code, no markdown fences.\n"
+        + _coder_rules(descriptions)
         + f"Question: {question}\n"
         + f"Next step:\n{json.dumps(next_step, indent=2)}\n"
         + f"Plan:\n{json.dumps(plan, indent=2)}\n"
         + f"Descriptions:\n{json.dumps(descriptions, indent=2)}\n"
         + f"Previous code:\n{previous_code or ''}\n"
         + f"Last execution:\n{json.dumps(last_exec, indent=2) if last_exec else 'null'}\n"
+        + _reference_hint(reference_code)
+    )
+
+
+def coder_diff_prompt(
+    question: str,
+    descriptions: Dict[str, Any],
+    plan: List[Dict[str, Any]],
+    next_step: Dict[str, Any],
+    previous_code: str,
+    last_exec: Optional[Dict[str, Any]],
+) -> str:
+    return (
+        _header("CODER_DIFF")
+        + "Change the previous script so it accomplishes all steps up to the next todo step. "
+        + "Return ONLY the changes, never the full script.\n"
+        + 'Preferred format: a JSON array of edits [{"old": "<exact lines of the previous script>", "new": "<replacement lines>"}]. '
+        + "Each old must appear exactly once in the previous script; an empty old appends new at the end.\n"
+        + "Also accepted: a unified diff of the previous script with @@ hunks whose context lines match it exactly.\n"
+        + "Keep every part of the previous script that still applies unchanged.\n"
+        + _coder_rules(descriptions)
+        + f"Question: {question}\n"
+        + f"Next step:\n{json.dumps(next_step, indent=2)}\n"
+        + f"Plan:\n{json.dumps(plan, indent=2)}\n"
+        + f"Descriptions:\n{json.dumps(descriptions, indent=2)}\n"
+        + f"Previous script:\n{previous_code}\n"
+        + f"Last execution:\n{json.dumps(last_exec, indent=2) if last_exec else 'null'}\n"
     )
 
 
@@ -133,11 +230,18 @@ def debugger_trace_summary_prompt(
     stderr: str,
     last_command: str,
     failing_code_tail: str,
+    resource_signal: Optional[Dict[str, Any]] = None,
 ) -> str:
     return (
         _header("DEBUGGER_TRACE_SUMMARY")
         + "Summarize traceback into strict JSON only: "
         + '{"error_type":"...","likely_root_cause":"...","key_trace_lines":["..."],"suggested_fix_focus":"..."}.\n'
+        + (
+            f"resource_signal: {json.dumps(resource_signal)}\n"
+            + "The process was killed by the sandbox; focus the fix on reducing memory, CPU time, or output volume.\n"
+            if resource_signal
+            else ""
+        )
         + f"exit_code: {exit_code}\n"
         + f"last_command: {last_command}\n"
         + f"stderr:\n{stderr}\n"
@@ -152,6 +256,7 @@ def debugger_patch_prompt(
     failing_code: str,
     trace_summary: Dict[str, Any],
     strict: bool = False,
+    reference_code: Optional[str] = None,
 ) -> str:
     return (
         _header("DEBUGGER_PATCH")
@@ -163,6 +268,31 @@ def debugger_patch_prompt(
         + f"Plan:\n{json.dumps(plan, indent=2)}\n"
         + f"Code:\n{failing_code}\n"
         + f"Trace summary:\n{json.dumps(trace_summary, indent=2)}\n"
+        + _reference_hint(reference_code)
+    )
+
+
+def debugger_perf_prompt(
+    question: str,
+    descriptions: Dict[str, Any],
+    plan: List[Dict[str, Any]],
+    slow_code: str,
+    exec_summary: Dict[str, Any],
+    profile: Optional[Dict[str, Any]],
+) -> str:
+    return (
+        _header("DEBUGGER_PERF")
+        + "The script below is too slow: it timed out or came close to its time budget.\n"
+        + "Rewrite the full script so it produces the same outputs much faster. Focus on the hotspot lines: "
+        + "vectorize Python loops with pandas/numpy, read only needed columns, stream or chunk large inputs, "
+        + "and avoid repeated work inside loops.\n"
+        + "Return ONLY Python code, no markdown.\n"
+        + f"Question: {question}\n"
+        + f"Descriptions:\n{json.dumps(descriptions, indent=2)}\n"
+        + f"Plan:\n{json.dumps(plan, indent=2)}\n"
+        + f"Code:\n{slow_code}\n"
+        + f"Execution:\n{json.dumps(exec_summary, indent=2)}\n"
+        + f"Profile hotspots:\n{json.dumps(profile, indent=2) if profile else 'unavailable'}\n"
     )
 
 
@@ -189,10 +319,15 @@ def finalyzer_report_prompt(
     plan: List[Dict[str, Any]],
     artifact_manifest: Dict[str, Any],
     final_exec: Dict[str, Any],
+    note: Optional[str] = None,
 ) -> str:
     return (
         _header("FINALYZER_REPORT")
-        + "Write a concise markdown report after successful convergence and validation.\n"
+        + (
+            f"Write a concise markdown report of the best answer reached so far.\n{note}\n"
+            if note
+            else "Write a concise markdown report after successful convergence and validation.\n"
+        )
         + "Use only structured inputs. Do not include full source code.\n"
         + f"Question: {question}\n"
         + f"Plan:\n{json.dumps(plan, indent=2)}\n"
@@ -208,6 +343,8 @@ def master_describer_prompt() -> str:
         + "Must define describe_file(path: str) -> str and use progressive strategies across csv/tsv/xlsx/sqlite/json/parquet/zip/text/unknown.\n"
         + "Never crash: on failure return exactly 'FAILED TO DESCRIBE: <error>'.\n"
         + "Avoid heavy full-file loads where possible; emit deterministic plain-text summaries.\n"
+        + "For .json/.jsonl/.ndjson, use the stdlib-only streaming helper when importable: "
+        + "`from dsstar.tools.json_stream import scan_json, summary_lines`; `summary_lines(scan_json(Path(path)))`.\n"
     )
 
 
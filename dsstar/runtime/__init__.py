@@ -0,0 +1,4 @@
+"""Helpers importable from generated code executed by DS-STAR."""
+from dsstar.runtime.inputs import cache_dir, load_input
+
+__all__ = ["cache_dir", "load_input"]
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+# Bump when the cached layout changes so stale entries are ignored.
+_CACHE_VERSION = 1
+_HASH_CHUNK = 1024 * 1024
+
+# suffix -> (pandas reader, default kwargs)
+_PARSED_READERS: Dict[str, Tuple[str, Dict[str, Any]]] = {
+    ".csv": ("read_csv", {}),
+    ".txt": ("read_csv", {}),
+    ".tsv": ("read_csv", {"sep": "\t"}),
+    ".xlsx": ("read_excel", {}),
+    ".xlsm": ("read_excel", {}),
+    ".xls": ("read_excel", {}),
+    ".json": ("read_json", {}),
+    ".jsonl": ("read_json", {"lines": True}),
+    ".ndjson": ("read_json", {"lines": True}),
+}
+# Already columnar on disk; caching would only add a copy.
+_NATIVE_READERS: Dict[str, str] = {
+    ".parquet": "read_parquet",
+    ".feather": "read_feather",
+    ".pkl": "read_pickle",
+    ".pickle": "read_pickle",
+}
+
+
+def cache_dir() -> Path:
+    """Directory holding parsed inputs, shared by every run under the same run root."""
+    configured = os.environ.get("DSSTAR_CACHE_DIR")
+    if configured:
+        path = Path(configured)
+    elif os.environ.get("DSSTAR_RUN_DIR"):
+        path = Path(os.environ["DSSTAR_RUN_DIR"]) / ".dsstar"
+    else:
+        path = Path(tempfile.gettempdir()) / "dsstar_cache"
+    path = path / "inputs"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def resolve_input(path: Union[str, Path]) -> Path:
+    """Resolve `path` against cwd, then DSSTAR_REPO_ROOT, then DSSTAR_REPO_ROOT/input."""
+    candidate = Path(path).expanduser()
+    if candidate.is_absolute():
+        return candidate
+    bases = [Path.cwd()]
+    repo_root = os.environ.get("DSSTAR_REPO_ROOT")
+    if repo_root:
+        bases.extend([Path(repo_root), Path(repo_root) / "input"])
+    for base in bases:
+        if (base / candidate).exists():
+            return (base / candidate).resolve()
+    return candidate.resolve()
+
+
+def _atomic_write(target: Path, write: Any) -> None:
+    fd, tmp = tempfile.mkstemp(dir=str(target.parent), prefix=target.name + ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, target)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+def file_sha256(path: Path, root: Optional[Path] = None) -> str:
+    """Content hash of `path`, remembered per (path, mtime, size) so unchanged files are hashed once."""
+    root = root or cache_dir()
+    stat = path.stat()
+    stat_key = f"{path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+    index_path = root / "sha256_index.json"
+    try:
+        index = json.loads(index_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        index = {}
+    if stat_key in index:
+        return str(index[stat_key])
+
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    index[stat_key] = digest.hexdigest()
+    _atomic_write(index_path, lambda tmp: Path(tmp).write_text(json.dumps(index, indent=2), encoding="utf-8"))
+    return index[stat_key]
+
+
+def _pandas() -> Any:
+    if importlib.util.find_spec("pandas") is None:
+        raise ImportError("load_input requires pandas; install it or parse the file directly.")
+    import pandas as pd
+
+    return pd
+
+
+def _load_cached(pd: Any, base: Path) -> Optional[Any]:
+    feather = base.with_suffix(".feather")
+    if feather.exists() and importlib.util.find_spec("pyarrow") is not None:
+        try:
+            return pd.read_feather(feather)
+        except Exception:  # pylint: disable=broad-except
+            pass
+    pickled = base.with_suffix(".pkl")
+    if pickled.exists():
+        try:
+            with pickled.open("rb") as handle:
+                return pickle.load(handle)
+        except Exception:  # pylint: disable=broad-except
+            pass
+    return None
+
+
+def _store(pd: Any, frame: Any, base: Path) -> None:
+    # Feather (Arrow IPC) is memory-mappable and language-neutral, but only takes
+    # plain frames; anything else (dicts of sheets, custom indexes) is pickled.
+    if isinstance(frame, pd.DataFrame) and importlib.util.find_spec("pyarrow") is not None:
+        try:
+            _atomic_write(base.with_suffix(".feather"), lambda tmp: frame.to_feather(tmp))
+            return
+        except Exception:  # pylint: disable=broad-except
+            pass
+    try:
+        _atomic_write(
+            base.with_suffix(".pkl"),
+            lambda tmp: Path(tmp).write_bytes(pickle.dumps(frame, protocol=pickle.HIGHEST_PROTOCOL)),
+        )
+    except Exception:  # pylint: disable=broad-except
+        pass
+
+
+def load_input(path: Union[str, Path], **read_kwargs: Any) -> Any:
+    """Load a tabular input as a pandas DataFrame, parsing each distinct file only once.
+
+    The parsed result is cached in binary form keyed by the file's sha256 and the
+    reader arguments, so later rounds and later runs skip CSV/Excel/JSON parsing.
+    Extra keyword arguments are passed to the pandas reader (e.g. `sheet_name`).
+    """
+    pd = _pandas()
+    source = resolve_input(path)
+    suffix = source.suffix.lower()
+    if suffix in _NATIVE_READERS:
+        return getattr(pd, _NATIVE_READERS[suffix])(source, **read_kwargs)
+    reader, defaults = _PARSED_READERS.get(suffix, ("read_csv", {}))
+    kwargs = {**defaults, **read_kwargs}
+
+    root = cache_dir()
+    key_parts = [
+        file_sha256(source, root),
+        reader,
+        repr(sorted(kwargs.items())),
+        str(pd.__version__),
+        str(_CACHE_VERSION),
+    ]
+    base = root / hashlib.sha256("\n".join(key_parts).encode("utf-8")).hexdigest()
+    cached = _load_cached(pd, base)
+    if cached is not None:
+        return cached
+
+    frame = getattr(pd, reader)(source, **kwargs)
+    _store(pd, frame, base)
+    return frame
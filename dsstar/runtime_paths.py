@@ -26,3 +26,19 @@ def find_repo_root() -> Path:
 def ensure_dir(p: Path) -> None:
     p.mkdir(parents=True, exist_ok=True)
 
+
+def package_pythonpath() -> str:
+    """PYTHONPATH that makes the installed `dsstar` package importable in child processes."""
+    package_parent = str(Path(__file__).resolve().parents[1])
+    existing = os.environ.get("PYTHONPATH", "")
+    return package_parent + (os.pathsep + existing if existing else "")
+
+
+def run_root_cache_dir(run_root: Path) -> Path:
+    """Cross-run cache directory inside a run root (e.g. `./runs/.dsstar_cache`)."""
+    return run_root.resolve() / ".dsstar_cache"
+
+
+def shared_cache_dir(run_dir: Path) -> Path:
+    """Cross-run cache directory that lives next to the per-run directories."""
+    return run_root_cache_dir(run_dir.resolve().parent)
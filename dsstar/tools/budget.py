@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dsstar.llm.usage import UsageTrackingClient
+
+# Run-level wall-clock and token budget. Time runs from the start of run_loop and
+# tokens are estimated from every LLM call of the run (analyzer included). Part
+# of each limit is held back for the finalyzer, a round is only started when a
+# typical round still fits in front of that reserve, and execution and HTTP
+# timeouts shrink to what is left as the deadline nears.
+
+# Share of each limit held back for finalyzer_code, its execution and the report.
+_RESERVE_FRACTION = 0.15
+# Shortest execution / HTTP timeout handed out however close the deadline is.
+_MIN_EXEC_SEC = 1
+_MIN_HTTP_SEC = 5
+
+
+class RunBudget:
+    """Elapsed time and estimated tokens of one run against optional limits."""
+
+    def __init__(
+        self,
+        usage: UsageTrackingClient,
+        max_wall_sec: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.usage = usage
+        self.max_wall_sec = max_wall_sec if max_wall_sec and max_wall_sec > 0 else None
+        self.max_tokens = max_tokens if max_tokens and max_tokens > 0 else None
+        self.clock = clock
+        self.started = clock()
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self.rounds: List[Dict[str, Any]] = []
+        self.exhausted: Optional[str] = None
+        self._mark = (self.started, 0)
+        self._round: Optional[Tuple[float, int]] = None
+        self._http_base = getattr(usage.inner, "timeout_sec", None)
+
+    @property
+    def limited(self) -> bool:
+        return self.max_wall_sec is not None or self.max_tokens is not None
+
+    def elapsed(self) -> float:
+        return self.clock() - self.started
+
+    def tokens(self) -> int:
+        return self.usage.tokens_est()
+
+    def _reserve_sec(self) -> float:
+        if self.max_wall_sec is None:
+            return 0.0
+        calls = self.usage.calls
+        # Two LLM calls (code, report) plus an execution about as long as a round's.
+        typical = 2 * sum(call["seconds"] for call in calls) / len(calls) if calls else 0.0
+        if self.rounds:
+            typical += sum(entry["seconds"] for entry in self.rounds) / len(self.rounds) / 2
+        return min(max(_RESERVE_FRACTION * self.max_wall_sec, typical), self.max_wall_sec / 2)
+
+    def _reserve_tokens(self) -> float:
+        if self.max_tokens is None:
+            return 0.0
+        calls = self.usage.calls
+        typical = 2 * self.tokens() / len(calls) if calls else 0.0
+        return min(max(_RESERVE_FRACTION * self.max_tokens, typical), self.max_tokens / 2)
+
+    def _close_round(self, now: float) -> None:
+        if self._round is not None:
+            started, tokens = self._round
+            self.rounds.append({"seconds": round(now - started, 3), "tokens": self.tokens() - tokens})
+            self._round = None
+
+    def begin_round(self) -> bool:
+        """Close the previous round; False (and `exhausted` set) when another round would eat into the reserve."""
+        now = self.clock()
+        self._close_round(now)
+        if self.max_wall_sec is not None:
+            expected = sum(entry["seconds"] for entry in self.rounds) / len(self.rounds) if self.rounds else 0.0
+            if self.max_wall_sec - (now - self.started) - self._reserve_sec() <= expected:
+                self.exhausted = "wall_clock"
+                return False
+        if self.max_tokens is not None:
+            expected = sum(entry["tokens"] for entry in self.rounds) / len(self.rounds) if self.rounds else 0.0
+            if self.max_tokens - self.tokens() - self._reserve_tokens() <= expected:
+                self.exhausted = "tokens"
+                return False
+        self._round = (now, self.tokens())
+        return True
+
+    def mark(self, phase: str) -> None:
+        """Attribute the time and tokens since the previous mark to `phase`."""
+        now = self.clock()
+        self._close_round(now)
+        since, tokens = self._mark
+        self.phases[phase] = {"seconds": round(now - since, 3), "tokens": self.tokens() - tokens}
+        self._mark = (now, self.tokens())
+
+    def exec_timeout(self, base: int, final: bool = False) -> int:
+        """`base` cut to the time left before the reserve (or before the deadline, for the final pass)."""
+        if self.max_wall_sec is None:
+            return base
+        left = self.max_wall_sec - self.elapsed() - (0.0 if final else self._reserve_sec())
+        return max(_MIN_EXEC_SEC, min(base, math.floor(left)))
+
+    def cap_http_timeout(self) -> None:
+        """Keep the provider's HTTP timeout within the time left, if the provider has one."""
+        if self.max_wall_sec is None or not self._http_base:
+            return
+        left = self.max_wall_sec - self.elapsed()
+        self.usage.inner.timeout_sec = max(_MIN_HTTP_SEC, min(self._http_base, math.floor(left)))
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "max_wall_sec": self.max_wall_sec,
+            "max_tokens": self.max_tokens,
+            "elapsed_sec": round(self.elapsed(), 3),
+            "tokens_est": self.tokens(),
+            "exhausted": self.exhausted,
+            "phases": self.phases,
+            "rounds": self.rounds,
+        }
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import csv
-import importlib.util
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, TextIO
+
+from dsstar.tools.json_stream import scan_json
+from dsstar.tools.sqlite_inspect import inspect_sqlite
+from dsstar.tools.xlsx_stream import inspect_xlsx
 
 
 def _infer_type(value: str) -> str:
@@ -23,15 +26,15 @@ def _infer_type(value: str) -> str:
     return "str"
 
 
-def _describe_csv(path: Path) -> Dict[str, Any]:
+def describe_csv_handle(handle: TextIO, delimiter: str = ",") -> Dict[str, Any]:
+    """Header, five sample rows and per-column type hints from an open text stream."""
     rows: List[List[str]] = []
-    with path.open(newline="", encoding="utf-8", errors="replace") as handle:
-        reader = csv.reader(handle)
-        for _ in range(6):
-            try:
-                rows.append(next(reader))
-            except StopIteration:
-                break
+    reader = csv.reader(handle, delimiter=delimiter)
+    for _ in range(6):
+        try:
+            rows.append(next(reader))
+        except StopIteration:
+            break
     header = rows[0] if rows else []
     sample_rows = rows[1:6] if rows else []
     type_hints = []
@@ -48,6 +51,11 @@ def _describe_csv(path: Path) -> Dict[str, Any]:
     }
 
 
+def _describe_csv(path: Path) -> Dict[str, Any]:
+    with path.open(newline="", encoding="utf-8", errors="replace") as handle:
+        return describe_csv_handle(handle)
+
+
 def _describe_text(path: Path) -> Dict[str, Any]:
     content = path.read_text(encoding="utf-8", errors="replace")
     snippet = content[:2000]
@@ -55,51 +63,47 @@ def _describe_text(path: Path) -> Dict[str, Any]:
 
 
 def _describe_json(path: Path) -> Dict[str, Any]:
-    content = path.read_text(encoding="utf-8", errors="replace")
-    snippet = content[:2000]
+    with path.open("r", encoding="utf-8", errors="replace") as handle:
+        snippet = handle.read(2000)
     try:
-        parsed = json.loads(content)
-        if isinstance(parsed, dict):
-            summary = {
-                "kind": "object",
-                "keys": list(parsed.keys())[:20],
-            }
-        elif isinstance(parsed, list):
-            summary = {
-                "kind": "list",
-                "length": len(parsed),
-                "sample": parsed[:5],
-            }
-        else:
-            summary = {"kind": type(parsed).__name__}
-    except json.JSONDecodeError:
-        summary = {"kind": "invalid_json"}
+        scanned = scan_json(path)
+    except (ValueError, UnicodeError):
+        return {"type": "json", "summary": {"kind": "invalid_json"}, "length": path.stat().st_size, "snippet": snippet}
+    kind = {"array": "list", "scalar": scanned.get("value_type", "scalar")}.get(scanned["format"], scanned["format"])
+    summary: Dict[str, Any] = {
+        "kind": kind,
+        "records": scanned["records"],
+        "records_estimated": scanned["records_estimated"],
+        "max_depth": scanned["max_depth"],
+        "fields": scanned["fields"][:50],
+    }
+    if scanned.get("top_level_keys"):
+        summary["keys"] = list(scanned["top_level_keys"])[:20]
+    if scanned.get("record_path"):
+        summary["record_path"] = scanned["record_path"]
     return {
         "type": "json",
         "summary": summary,
-        "length": len(content),
+        "length": scanned["size"],
         "snippet": snippet,
     }
 
 
 def _describe_xlsx(path: Path) -> Dict[str, Any]:
-    if importlib.util.find_spec("openpyxl") is None:
-        return {
-            "type": "xlsx",
-            "warning": "openpyxl not installed; cannot read sheets.",
-        }
-    from openpyxl import load_workbook
-
-    wb = load_workbook(path, read_only=True)
+    try:
+        summary = inspect_xlsx(path)
+    except Exception as exc:  # pylint: disable=broad-except
+        return {"type": "xlsx", "warning": f"cannot read workbook XML: {exc}"}
     sheets_info = {}
-    for sheet in wb.sheetnames:
-        ws = wb[sheet]
-        rows = []
-        for idx, row in enumerate(ws.iter_rows(values_only=True)):
-            rows.append([str(cell) if cell is not None else "" for cell in row])
-            if idx >= 4:
-                break
-        sheets_info[sheet] = {"sample_rows": rows}
+    for sheet in summary["sheets"]:
+        header = sheet.get("header", [])
+        sheets_info[sheet["name"]] = {
+            "rows": sheet.get("rows"),
+            "columns": sheet.get("columns"),
+            "rows_source": sheet.get("rows_source"),
+            "header": header,
+            "sample_rows": ([header] if header else []) + sheet.get("sample_rows", [])[:4],
+        }
     return {"type": "xlsx", "sheets": sheets_info}
 
 
@@ -114,9 +118,16 @@ def describe_files(paths: List[str], output_path: Optional[Path] = None) -> Dict
         try:
             if suffix == ".csv":
                 info = _describe_csv(path)
-            elif suffix == ".xlsx":
+            elif suffix in {".xlsx", ".xlsm"}:
                 info = _describe_xlsx(path)
-            elif suffix == ".json":
+            elif suffix in {".db", ".sqlite", ".sqlite3"}:
+                info = inspect_sqlite(path)
+            elif suffix == ".zip":
+                # Imported here: zip_describe reuses describe_csv_handle from this module.
+                from dsstar.tools.zip_describe import describe_zip
+
+                info = describe_zip(path)
+            elif suffix in {".json", ".jsonl", ".ndjson"}:
                 info = _describe_json(path)
             elif suffix in {".txt", ".md"}:
                 info = _describe_text(path)
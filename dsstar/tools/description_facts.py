@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Set
+
+# Input paths and column names recovered from the analyzer payload, for the
+# deterministic repair and validation passes. Columns come both from the
+# heuristic `fallback_facts` and from the master describer's KEY=value text, so
+# either source alone is enough.
+
+_COLUMN_LINE_RE = re.compile(r"^(?:[\w\[\].-]+[._])?(?:COLUMNS|HEADER)=(.*)$")
+_FIELDS_LINE_RE = re.compile(r"^(?:[\w\[\].-]+\.)?FIELDS=(.*)$")
+_MAX_DEPTH = 6
+
+
+def _records(descriptions: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    for record in (descriptions.get("records") or {}).values():
+        if isinstance(record, dict):
+            yield record
+
+
+def described_paths(descriptions: Dict[str, Any]) -> List[Path]:
+    """Absolute paths of the described inputs (dataset roots for partitioned inputs)."""
+    paths: List[Path] = []
+    for record in _records(descriptions):
+        for key in ("file_path", "representative_shard"):
+            if record.get(key):
+                resolved = Path(str(record[key])).resolve()
+                if resolved not in paths:
+                    paths.append(resolved)
+    return paths
+
+
+def _walk_facts(value: Any, columns: Set[str], depth: int = 0) -> None:
+    if depth > _MAX_DEPTH:
+        return
+    if isinstance(value, dict):
+        for key, child in value.items():
+            if key in {"header", "columns"} and isinstance(child, list):
+                for item in child:
+                    if isinstance(item, str):
+                        columns.add(item)
+                    elif isinstance(item, dict) and isinstance(item.get("name"), str):
+                        columns.add(item["name"])
+            elif key == "fields" and isinstance(child, list):
+                columns.update(str(item["path"]) for item in child if isinstance(item, dict) and item.get("path"))
+            else:
+                _walk_facts(child, columns, depth + 1)
+    elif isinstance(value, list):
+        for child in value[:200]:
+            _walk_facts(child, columns, depth + 1)
+
+
+def _text_columns(text: str, columns: Set[str]) -> None:
+    for line in text.splitlines():
+        line = line.strip()
+        match = _COLUMN_LINE_RE.match(line)
+        if match:
+            items = [item.strip() for item in match.group(1).split(",")]
+            if line.startswith("TABLE_"):
+                items = [item.split(" ")[0] for item in items]  # SQLite: "name TYPE PK"
+            columns.update(items)
+            continue
+        match = _FIELDS_LINE_RE.match(line)
+        if match:
+            columns.update(item.split(":")[0] for item in match.group(1).split(","))
+
+
+def record_columns(record: Dict[str, Any]) -> Set[str]:
+    """Columns, header cells and JSON field paths the analyzer reported for one input."""
+    columns: Set[str] = set()
+    _walk_facts(record.get("fallback_facts") or {}, columns)
+    _walk_facts(record.get("partition") or {}, columns)
+    _text_columns(str(record.get("description_text") or ""), columns)
+    columns.discard("")
+    return columns
+
+
+def described_columns(descriptions: Dict[str, Any]) -> Set[str]:
+    """Every column, header cell and JSON field path the analyzer reported."""
+    columns: Set[str] = set()
+    for record in _records(descriptions):
+        columns |= record_columns(record)
+    return columns
+
+
+def columns_by_path(descriptions: Dict[str, Any]) -> Dict[Path, Set[str]]:
+    """Described columns keyed by each input's resolved path (inputs without columns are left out)."""
+    by_path: Dict[Path, Set[str]] = {}
+    for record in _records(descriptions):
+        columns = record_columns(record)
+        if columns and record.get("file_path"):
+            by_path.setdefault(Path(str(record["file_path"])).resolve(), set()).update(columns)
+    return by_path
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from dsstar.tools.log_utils import log, write_json
+
+# Bump when the manifest layout or walk semantics change.
+_MANIFEST_VERSION = 1
+
+
+@dataclass
+class DiscoveryOptions:
+    extensions: List[str] = field(default_factory=list)
+    include: List[str] = field(default_factory=list)
+    exclude: List[str] = field(default_factory=list)
+    # 0 lists only the top level (the historical behavior); None walks the whole tree.
+    max_depth: Optional[int] = 0
+    max_files: Optional[int] = None
+    workers: int = 8
+
+
+def _matches(rel: str, patterns: Sequence[str]) -> bool:
+    name = rel.rsplit("/", 1)[-1]
+    return any(fnmatch.fnmatch(rel, pattern) or fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+
+def _scan(directory: Path) -> Optional[Tuple[int, List[Tuple[str, bool]]]]:
+    """One directory listing: its mtime and (name, is_dir) entries, sorted case-insensitively.
+
+    None when the directory cannot be read (permissions, vanished mid-walk, ...).
+    """
+    try:
+        mtime_ns = directory.stat().st_mtime_ns
+        entries: List[Tuple[str, bool]] = []
+        with os.scandir(directory) as listing:
+            for entry in listing:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if not is_dir and not entry.is_file():
+                        continue
+                except OSError:
+                    continue
+                entries.append((entry.name, is_dir))
+    except OSError as exc:
+        log(f"Discovery: skipping unreadable directory {directory}: {exc}")
+        return None
+    entries.sort(key=lambda item: item[0].lower())
+    return mtime_ns, entries
+
+
+def walk(base: Path, options: DiscoveryOptions) -> Tuple[List[str], Dict[str, int], bool, List[str]]:
+    """Breadth-first walk that lists each level's directories in parallel.
+
+    Returns the matching files (relative posix paths), the mtime of every scanned
+    directory, whether `max_files` cut the walk short, and the directories that
+    could not be read and were skipped.
+    """
+    extensions = {ext.lower() for ext in options.extensions}
+    files: List[str] = []
+    dir_mtimes: Dict[str, int] = {}
+    skipped: List[str] = []
+    frontier: List[str] = [""]
+    depth = 0
+    # Directories listed per parallel batch, so --max-files can stop partway through a wide level.
+    batch = max(1, options.workers) * 4
+    with ThreadPoolExecutor(max_workers=max(1, options.workers)) as pool:
+        while frontier:
+            next_frontier: List[str] = []
+            for start in range(0, len(frontier), batch):
+                rel_dirs = frontier[start : start + batch]
+                listings = pool.map(lambda rel: _scan(base / rel if rel else base), rel_dirs)
+                for rel_dir, listing in zip(rel_dirs, listings):
+                    if listing is None:
+                        skipped.append(rel_dir)
+                        continue
+                    mtime_ns, entries = listing
+                    dir_mtimes[rel_dir] = mtime_ns
+                    for name, is_dir in entries:
+                        if name.startswith("."):
+                            continue
+                        rel = f"{rel_dir}/{name}" if rel_dir else name
+                        if options.exclude and _matches(rel, options.exclude):
+                            continue
+                        if is_dir:
+                            if options.max_depth is None or depth < options.max_depth:
+                                next_frontier.append(rel)
+                            continue
+                        if extensions and Path(name).suffix.lower() not in extensions:
+                            continue
+                        if options.include and not _matches(rel, options.include):
+                            continue
+                        files.append(rel)
+                        if options.max_files is not None and len(files) >= options.max_files:
+                            files.sort(key=str.lower)
+                            return files, dir_mtimes, True, skipped
+            depth += 1
+            frontier = next_frontier
+    files.sort(key=str.lower)
+    return files, dir_mtimes, False, skipped
+
+
+def _manifest_path(cache_root: Path, base: Path, options: DiscoveryOptions) -> Path:
+    key = json.dumps({"root": str(base.resolve()), "options": asdict(options), "v": _MANIFEST_VERSION}, sort_keys=True)
+    return cache_root / "discovery" / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:24]}.json"
+
+
+def _manifest_fresh(base: Path, manifest: Dict[str, object], workers: int) -> bool:
+    dirs = manifest.get("dirs")
+    if not isinstance(dirs, dict) or manifest.get("skipped"):
+        return False  # unreadable directories may have become readable
+
+    def current(rel: str) -> Optional[int]:
+        try:
+            return (base / rel if rel else base).stat().st_mtime_ns
+        except OSError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        observed = list(pool.map(current, list(dirs)))
+    return all(now == then for now, then in zip(observed, dirs.values()))
+
+
+def discover(input_dir: str, options: DiscoveryOptions, cache_root: Optional[Path] = None) -> List[str]:
+    """List input files under `input_dir`, reusing a manifest while no scanned directory changed."""
+    base = Path(input_dir)
+    if not base.exists() or not base.is_dir():
+        return []
+
+    manifest_path = _manifest_path(cache_root, base, options) if cache_root is not None else None
+    if manifest_path is not None and manifest_path.exists():
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            if _manifest_fresh(base, manifest, options.workers):
+                log(f"Discovery: directory tree unchanged, reusing manifest ({len(manifest['files'])} files)")
+                return [str(base / rel) for rel in manifest["files"]]
+        except (OSError, json.JSONDecodeError, KeyError):
+            pass
+
+    files, dir_mtimes, truncated, skipped = walk(base, options)
+    if truncated:
+        log(f"Discovery: stopped at --max-files={options.max_files}")
+    if skipped:
+        log(f"Discovery: skipped {len(skipped)} unreadable director{'y' if len(skipped) == 1 else 'ies'}")
+    if manifest_path is not None:
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        write_json(
+            manifest_path,
+            {"root": str(base.resolve()), "files": files, "dirs": dir_mtimes, "truncated": truncated, "skipped": skipped},
+        )
+    return [str(base / rel) for rel in files]
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import ast
+import copy
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from dsstar.tools.log_utils import write_json
+
+# Run artifacts written by the orchestrator itself; they never feed generated code.
+_BOOKKEEPING = re.compile(
+    r"^(round_\d+_.*|final_solution.*|final_answer\.md|descriptions\.json|plan\.json|run_metadata\.json|run_status\.json)$"
+)
+_SKIP_DIRS = {".dsstar", "__pycache__"}
+_PER_RUN_FIELDS = {"cwd", "script_path", "warnings", "cached", "cached_from", "profile_path"}
+
+
+def inputs_fingerprint(descriptions: Dict[str, Any]) -> str:
+    """Stable digest of the analyzed input files (path, content hash, mtime, size)."""
+    records = descriptions.get("records", {}) if isinstance(descriptions, dict) else {}
+    parts = sorted(
+        f"{rec.get('file_path')}:{rec.get('sha256')}:{rec.get('mtime')}:{rec.get('size')}"
+        for rec in records.values()
+        if isinstance(rec, dict)
+    )
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _string_literals(code: str) -> Set[str]:
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return set(re.findall(r"""['"]([^'"\n]+)['"]""", code))
+    return {
+        node.value
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Constant) and isinstance(node.value, str) and node.value
+    }
+
+
+def _run_dir_state(code: str, run_dir: Path) -> Dict[str, str]:
+    """Fingerprint run-dir files that the script mentions by name or relative path."""
+    literals = _string_literals(code)
+    state: Dict[str, str] = {}
+    if not literals:
+        return state
+    stack = [run_dir]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = list(current.iterdir())
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir():
+                if entry.name not in _SKIP_DIRS:
+                    stack.append(entry)
+                continue
+            rel = entry.relative_to(run_dir).as_posix()
+            if current == run_dir and _BOOKKEEPING.match(entry.name):
+                continue
+            if rel in literals or entry.name in literals:
+                stat = entry.stat()
+                state[rel] = f"{stat.st_size}:{stat.st_mtime_ns}"
+    return state
+
+
+class ExecMemo:
+    """Run-local memo of execution results for byte-identical scripts.
+
+    A hit requires the same script text, the same input fingerprints, and the
+    run-dir files the script refers to still being exactly as the memoized
+    execution left them. Timeouts and limit kills are never memoized.
+    """
+
+    def __init__(self, run_dir: Path, inputs_key: str) -> None:
+        self.run_dir = run_dir.resolve()
+        self.inputs_key = inputs_key
+        self.path = self.run_dir / ".dsstar" / "exec_memo.json"
+        self.entries: Dict[str, Any] = {}
+        if self.path.exists():
+            try:
+                self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                self.entries = {}
+
+    def _key(self, code: str) -> str:
+        return hashlib.sha256(f"{self.inputs_key}\n{code}".encode("utf-8")).hexdigest()
+
+    def lookup(self, code: str) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(self._key(code))
+        if not entry or entry.get("run_dir_state") != _run_dir_state(code, self.run_dir):
+            return None
+        result = copy.deepcopy(entry["result"])
+        result["cached"] = True
+        result["cached_from"] = entry.get("source", "")
+        return result
+
+    def store(self, code: str, source: str, result: Dict[str, Any]) -> None:
+        if result.get("timeout") or result.get("limit_exceeded"):
+            return
+        self.entries[self._key(code)] = {
+            "source": source,
+            "run_dir_state": _run_dir_state(code, self.run_dir),
+            "result": {k: v for k, v in result.items() if k not in _PER_RUN_FIELDS},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_json(self.path, self.entries)
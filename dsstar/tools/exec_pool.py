@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import argparse
+import atexit
+import importlib
+import json
+import os
+import queue
+import select
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from dsstar.runtime_paths import package_pythonpath
+from dsstar.tools.exec_sandbox import build_result, read_capped, run_python_script, wait_with_limits
+from dsstar.tools.resource_limits import (
+    GroupMonitor,
+    ResourceLimits,
+    apply_rlimits,
+    usage_from_rusage,
+)
+from dsstar.tools.log_utils import log
+
+_READY_TIMEOUT_SEC = 120
+_RESPONSE_GRACE_SEC = 10
+_MB = 1024 * 1024
+
+
+def _read_line(stream: Any, timeout_sec: float) -> Optional[str]:
+    ready, _, _ = select.select([stream], [], [], timeout_sec)
+    if not ready:
+        return None
+    line = stream.readline()
+    return line or None
+
+
+class _Worker:
+    """One pre-warmed zygote process that forks a fresh child per script."""
+
+    def __init__(self, preload: Sequence[str]) -> None:
+        env = os.environ.copy()
+        env["PYTHONPATH"] = package_pythonpath()
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "dsstar.tools.exec_pool", "--preload", ",".join(preload)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+            env=env,
+            start_new_session=True,
+        )
+        self.ready = False
+        self.preloaded: List[str] = []
+
+    def wait_ready(self) -> bool:
+        if self.ready:
+            return True
+        line = _read_line(self.proc.stdout, _READY_TIMEOUT_SEC)
+        if not line:
+            return False
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError:
+            return False
+        self.ready = bool(payload.get("ready"))
+        self.preloaded = list(payload.get("preloaded", []))
+        return self.ready
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def execute(self, request: Dict[str, Any], timeout_sec: float) -> Optional[Dict[str, Any]]:
+        """The worker's response; None if the task never reached it, `{"crashed": True}` if it died running it."""
+        if not self.alive() or not self.wait_ready():
+            return None
+        try:
+            assert self.proc.stdin is not None
+            self.proc.stdin.write(json.dumps(request) + "\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            return None
+        line = _read_line(self.proc.stdout, timeout_sec + _RESPONSE_GRACE_SEC)
+        if not line:
+            return {"crashed": True}
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError:
+            return {"crashed": True}
+
+    def close(self) -> None:
+        if self.proc.poll() is not None:
+            return
+        try:
+            os.killpg(self.proc.pid, signal.SIGKILL)
+        except OSError:
+            self.proc.kill()
+        self.proc.wait()
+
+
+class WorkerPool:
+    """Pool of zygote workers with common data libraries already imported.
+
+    Each execution forks a fresh child from an idle zygote, so generated scripts
+    never share state, but skip interpreter startup and heavy imports.
+    """
+
+    def __init__(self, size: int = 2, preload: Sequence[str] = ("numpy", "pandas")) -> None:
+        self.size = max(1, int(size))
+        self.preload = [name for name in preload if name]
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._closed = False
+        for _ in range(self.size):
+            self._idle.put(_Worker(self.preload))
+
+    def run(
+        self,
+        script_path: Path,
+        cwd: Path,
+        timeout_sec: int,
+        env: Dict[str, str] | None = None,
+        limits: Optional[ResourceLimits] = None,
+    ) -> Dict[str, Any]:
+        worker = self._idle.get()
+        out_fd, out_path = tempfile.mkstemp(prefix="dsstar_out_")
+        err_fd, err_path = tempfile.mkstemp(prefix="dsstar_err_")
+        os.close(out_fd)
+        os.close(err_fd)
+        try:
+            request = {
+                "script": str(script_path.resolve()),
+                "cwd": str(cwd),
+                "env": dict(env if env is not None else os.environ),
+                "timeout_sec": timeout_sec,
+                "stdout_path": out_path,
+                "stderr_path": err_path,
+                "limits": limits.to_dict() if limits else None,
+            }
+            started = time.monotonic()
+            response = worker.execute(request, timeout_sec)
+            if response is None:
+                # The script never started, so running it in a subprocess instead cannot repeat side effects.
+                log("Executor: worker pool unavailable, falling back to subprocess")
+                worker.close()
+                worker = _Worker(self.preload)
+                return run_python_script(script_path, cwd, timeout_sec, env=env, limits=limits)
+
+            max_output = int(limits.max_output_mb) * _MB if limits and limits.max_output_mb else None
+            resources = dict(response.get("resources") or {})
+            resources["bytes_written"] = int(resources.get("bytes_written", 0)) + sum(
+                Path(path).stat().st_size for path in (out_path, err_path)
+            )
+            stdout = read_capped(Path(out_path), max_output)
+            stderr = read_capped(Path(err_path), max_output)
+            if response.get("crashed"):
+                # The script may already have written files, so it is reported as failed, never re-run.
+                log("Executor: pool worker died while running the script; not re-running it")
+                worker.close()
+                worker = _Worker(self.preload)
+                stderr = (stderr.rstrip("\n") + "\n" if stderr.strip() else "") + (
+                    "Execution worker crashed while running the script; it was not re-run."
+                )
+                return build_result(
+                    stdout, stderr, 1, time.monotonic() - started, False, timeout_sec, limits, None, resources
+                )
+            return build_result(
+                stdout,
+                stderr,
+                int(response.get("exit_code", 1)),
+                float(response.get("duration_sec", 0.0)),
+                bool(response.get("timeout")),
+                timeout_sec,
+                limits,
+                response.get("violation"),
+                resources,
+            )
+        finally:
+            for path in (out_path, err_path):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            self._idle.put(worker)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_POOLS: Dict[Tuple[int, Tuple[str, ...]], WorkerPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def pool_supported() -> bool:
+    return hasattr(os, "fork") and os.name == "posix"
+
+
+def get_worker_pool(size: int = 2, preload: Sequence[str] = ("numpy", "pandas")) -> WorkerPool:
+    """Return a process-wide pool, starting its workers on first use."""
+    key = (int(size), tuple(preload))
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = WorkerPool(size=size, preload=preload)
+            _POOLS[key] = pool
+        return pool
+
+
+def shutdown_pools() -> None:
+    with _POOLS_LOCK:
+        for pool in _POOLS.values():
+            pool.close()
+        _POOLS.clear()
+
+
+atexit.register(shutdown_pools)
+
+
+# ---------------------------------------------------------------------------
+# Zygote side: runs as `python -m dsstar.tools.exec_pool`.
+# ---------------------------------------------------------------------------
+
+
+def exit_code_from(value: Any) -> int:
+    """Map a SystemExit code to a process exit status the way the interpreter does."""
+    if value is None:
+        return 0
+    if isinstance(value, int):
+        return value
+    sys.stderr.write(f"{value}\n")
+    return 1
+
+
+def _run_child(request: Dict[str, Any]) -> None:
+    code = 1
+    try:
+        os.setsid()
+        apply_rlimits(ResourceLimits.from_dict(request.get("limits")))
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        out_fd = os.open(request["stdout_path"], os.O_WRONLY | os.O_TRUNC)
+        err_fd = os.open(request["stderr_path"], os.O_WRONLY | os.O_TRUNC)
+        os.dup2(devnull, 0)
+        os.dup2(out_fd, 1)
+        os.dup2(err_fd, 2)
+        for fd in (devnull, out_fd, err_fd):
+            os.close(fd)
+        sys.stdin = open(0, "r", closefd=False)
+        sys.stdout = open(1, "w", closefd=False, errors="backslashreplace")
+        sys.stderr = open(2, "w", closefd=False, errors="backslashreplace")
+
+        script = request["script"]
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request.get("env", {}))
+        sys.argv = [script]
+        sys.path[0] = os.path.dirname(script)
+
+        import runpy
+        import traceback
+
+        try:
+            runpy.run_path(script, run_name="__main__")
+            code = 0
+        except SystemExit as exc:
+            code = exit_code_from(exc.code)
+        except BaseException:  # pylint: disable=broad-except
+            traceback.print_exc()
+            code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def _serve(preload: Sequence[str]) -> None:
+    # Keep the protocol channel private so preloaded libraries cannot write into it.
+    proto = os.fdopen(os.dup(1), "w", buffering=1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+
+    preloaded: List[str] = []
+    for name in preload:
+        try:
+            importlib.import_module(name)
+            preloaded.append(name)
+        except Exception:  # pylint: disable=broad-except
+            continue
+    proto.write(json.dumps({"ready": True, "preloaded": preloaded}) + "\n")
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        start = time.time()
+        pid = os.fork()
+        if pid == 0:
+            proto.close()
+            _run_child(request)
+
+        monitor = GroupMonitor(pid, ResourceLimits.from_dict(request.get("limits")))
+        deadline = start + float(request.get("timeout_sec", 30))
+        status, rusage, timed_out = wait_with_limits(pid, deadline, monitor)
+        proto.write(
+            json.dumps(
+                {
+                    "exit_code": os.waitstatus_to_exitcode(status),
+                    "timeout": timed_out,
+                    "duration_sec": time.time() - start,
+                    "violation": monitor.violation,
+                    "resources": usage_from_rusage(rusage, monitor, Path(request["cwd"]), start),
+                }
+            )
+            + "\n"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DS-STAR pre-warmed execution worker")
+    parser.add_argument("--preload", default="")
+    cli_args = parser.parse_args()
+    _serve([name.strip() for name in cli_args.preload.split(",") if name.strip()])
@@ -1,23 +1,110 @@
 from __future__ import annotations
 
+import os
 import subprocess
 import sys
+import tempfile
 import time
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, List, Optional, Tuple
 
+from dsstar.tools.resource_limits import (
+    GroupMonitor,
+    ResourceLimits,
+    apply_rlimits,
+    bytes_written_since,
+    classify_exit,
+    kill_group,
+    limit_exceeded,
+    usage_from_rusage,
+)
 
-def run_python_script(
+_MB = 1024 * 1024
+_PROFILER_PATH = Path(__file__).resolve().with_name("profiler.py")
+
+
+def script_command(script_path: Path, profile_path: Optional[Path] = None) -> List[str]:
+    """Interpreter command for a generated script, optionally under the line profiler."""
+    if profile_path is None:
+        return [sys.executable, str(script_path)]
+    return [sys.executable, str(_PROFILER_PATH), "--out", str(profile_path.resolve()), str(script_path)]
+
+
+def read_capped(path: Path, max_bytes: Optional[int]) -> str:
+    """Read captured output, keeping the head and tail when it exceeds `max_bytes`."""
+    size = path.stat().st_size
+    with path.open("rb") as handle:
+        if not max_bytes or size <= max_bytes:
+            data = handle.read()
+        else:
+            half = max_bytes // 2
+            head = handle.read(half)
+            handle.seek(size - half)
+            data = head + f"\n... [{size - 2 * half} bytes truncated] ...\n".encode("utf-8") + handle.read()
+    return data.decode("utf-8", errors="replace")
+
+
+def build_result(
+    stdout: str,
+    stderr: str,
+    exit_code: int,
+    duration: float,
+    timed_out: bool,
+    timeout_sec: float,
+    limits: Optional[ResourceLimits],
+    violation: Optional[Dict[str, Any]],
+    resources: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Shared result shape for every execution backend."""
+    if timed_out:
+        signal_info: Optional[Dict[str, Any]] = limit_exceeded("timeout", timeout_sec, duration, "s")
+        stderr = stderr or "Execution timed out."
+        exit_code = -1
+    else:
+        signal_info = classify_exit(exit_code, stderr, limits, violation)
+        if signal_info is not None:
+            stderr = (stderr.rstrip("\n") + "\n" if stderr.strip() else "") + signal_info["message"]
+    return {
+        "stdout": stdout,
+        "stderr": stderr,
+        "exit_code": exit_code,
+        "duration_sec": round(duration, 3),
+        "timeout": timed_out,
+        "resources": resources,
+        "limit_exceeded": signal_info,
+    }
+
+
+def wait_with_limits(pid: int, deadline: float, monitor: GroupMonitor) -> Tuple[int, Any, bool]:
+    """Reap `pid`, killing its process group on timeout or a limit violation."""
+    timed_out = False
+    interval = 0.002
+    while True:
+        done_pid, status, rusage = os.wait4(pid, os.WNOHANG)
+        if done_pid == pid:
+            return status, rusage, timed_out
+        if time.time() >= deadline:
+            timed_out = True
+        if timed_out or monitor.check() is not None:
+            kill_group(pid)
+            _, status, rusage = os.wait4(pid, 0)
+            return status, rusage, timed_out
+        time.sleep(interval)
+        interval = min(interval * 2, 0.02)
+
+
+def _run_portable(
     script_path: Path,
     cwd: Path,
     timeout_sec: int,
-    env: Dict[str, str] | None = None,
+    env: Dict[str, str] | None,
+    profile_path: Optional[Path] = None,
 ) -> Dict[str, Any]:
     start = time.time()
     script_abspath = script_path.resolve()
     try:
         proc = subprocess.run(
-            [sys.executable, str(script_abspath)],
+            script_command(script_abspath, profile_path),
             cwd=str(cwd),
             capture_output=True,
             text=True,
@@ -25,20 +112,67 @@ def run_python_script(
             check=False,
             env=env,
         )
-        duration = time.time() - start
-        return {
-            "stdout": proc.stdout,
-            "stderr": proc.stderr,
-            "exit_code": proc.returncode,
-            "duration_sec": round(duration, 3),
-            "timeout": False,
-        }
+        stdout, stderr, exit_code, timed_out = proc.stdout, proc.stderr, proc.returncode, False
     except subprocess.TimeoutExpired as exc:
+        stdout, stderr, exit_code, timed_out = exc.stdout or "", exc.stderr or "", -1, True
+        stdout = stdout.decode("utf-8", errors="replace") if isinstance(stdout, bytes) else stdout
+        stderr = stderr.decode("utf-8", errors="replace") if isinstance(stderr, bytes) else stderr
+    duration = time.time() - start
+    resources = {
+        "peak_rss_mb": None,
+        "user_cpu_sec": None,
+        "sys_cpu_sec": None,
+        "bytes_written": bytes_written_since(cwd, start) + len(stdout) + len(stderr),
+    }
+    return build_result(stdout, stderr, exit_code, duration, timed_out, timeout_sec, None, None, resources)
+
+
+def run_python_script(
+    script_path: Path,
+    cwd: Path,
+    timeout_sec: int,
+    env: Dict[str, str] | None = None,
+    limits: Optional[ResourceLimits] = None,
+    profile_path: Optional[Path] = None,
+) -> Dict[str, Any]:
+    if os.name != "posix" or not hasattr(os, "wait4"):
+        return _run_portable(script_path, cwd, timeout_sec, env, profile_path)
+
+    start = time.time()
+    script_abspath = script_path.resolve()
+    max_output = int(limits.max_output_mb) * _MB if limits and limits.max_output_mb else None
+    with tempfile.TemporaryDirectory(prefix="dsstar_exec_") as tmp:
+        out_path = Path(tmp) / "stdout"
+        err_path = Path(tmp) / "stderr"
+        with out_path.open("wb") as out_handle, err_path.open("wb") as err_handle:
+            proc = subprocess.Popen(
+                script_command(script_abspath, profile_path),
+                cwd=str(cwd),
+                stdin=subprocess.DEVNULL,
+                stdout=out_handle,
+                stderr=err_handle,
+                env=env,
+                start_new_session=True,
+                preexec_fn=(lambda: apply_rlimits(limits)) if limits and limits.any() else None,
+            )
+            monitor = GroupMonitor(proc.pid, limits)
+            status, rusage, timed_out = wait_with_limits(proc.pid, start + timeout_sec, monitor)
+            proc.returncode = os.waitstatus_to_exitcode(status)
         duration = time.time() - start
-        return {
-            "stdout": exc.stdout or "",
-            "stderr": exc.stderr or "Execution timed out.",
-            "exit_code": -1,
-            "duration_sec": round(duration, 3),
-            "timeout": True,
-        }
+        stdout = read_capped(out_path, max_output)
+        stderr = read_capped(err_path, max_output)
+        output_bytes = out_path.stat().st_size + err_path.stat().st_size
+
+    resources = usage_from_rusage(rusage, monitor, cwd, start)
+    resources["bytes_written"] += output_bytes
+    return build_result(
+        stdout,
+        stderr,
+        int(proc.returncode),
+        duration,
+        timed_out,
+        timeout_sec,
+        limits,
+        monitor.violation,
+        resources,
+    )
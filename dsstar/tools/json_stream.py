@@ -0,0 +1,390 @@
+from __future__ import annotations
+
+import codecs
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Set, Tuple
+
+# Stdlib-only so the master describer (run by path in a child process) can import
+# it as well. Values are decoded one record at a time from bounded chunks, so
+# memory stays flat no matter how large the file is; past the scan budget the
+# record count is extrapolated from the bytes consumed so far. A single value
+# (or line) is buffered up to MAX_VALUE_BYTES, and never beyond the scan budget:
+# a larger or malformed one ends the scan instead of pulling in the whole file.
+
+CHUNK_BYTES = 1024 * 1024
+SAMPLE_RECORDS = 500
+MAX_SCAN_BYTES = 256 * 1024 * 1024
+MAX_SCAN_SEC = 5.0
+MAX_VALUE_BYTES = 64 * 1024 * 1024
+_MAX_FIELDS = 200
+_LIST_ITEMS_WALKED = 3
+_MAX_TOP_KEYS = 50
+_WS = re.compile(r"\s*")
+_DECODER = json.JSONDecoder()
+_LINE_FORMATS = {".jsonl", ".ndjson"}
+
+
+def _json_type(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "integer"
+    if isinstance(value, float):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    return "object"
+
+
+class _Schema:
+    """Merged field paths (`a.b`, `items[].sku`) with per-record frequency and observed types."""
+
+    def __init__(self) -> None:
+        self.records = 0
+        self.counts: Dict[str, int] = {}
+        self.types: Dict[str, Set[str]] = {}
+        self.max_depth = 0
+
+    def _walk(self, value: Any, path: str, depth: int, seen: Set[str]) -> None:
+        self.max_depth = max(self.max_depth, depth)
+        if isinstance(value, dict):
+            for key, child in value.items():
+                self._note(f"{path}.{key}" if path else str(key), child, depth, seen)
+        elif isinstance(value, list):
+            for child in value[:_LIST_ITEMS_WALKED]:
+                self._note(f"{path}[]", child, depth, seen)
+
+    def _note(self, path: str, value: Any, depth: int, seen: Set[str]) -> None:
+        if path not in self.counts and len(self.counts) >= _MAX_FIELDS:
+            return
+        self.types.setdefault(path, set()).add(_json_type(value))
+        if path not in seen:
+            seen.add(path)
+            self.counts[path] = self.counts.get(path, 0) + 1
+        self._walk(value, path, depth + 1, seen)
+
+    def add(self, record: Any) -> None:
+        self.records += 1
+        self._walk(record, "", 0, set())
+
+    def fields(self) -> List[Dict[str, Any]]:
+        total = max(self.records, 1)
+        return [
+            {"path": path, "types": sorted(self.types[path]), "frequency": round(count / total, 3)}
+            for path, count in self.counts.items()
+        ]
+
+
+class _ValueTooLarge(ValueError):
+    """A single JSON value did not parse within the reader's buffer cap."""
+
+
+def _value_cap(max_scan_bytes: int) -> int:
+    return max(CHUNK_BYTES, min(MAX_VALUE_BYTES, max_scan_bytes))
+
+
+class _Reader:
+    """Incremental UTF-8 text buffer over a binary handle for `raw_decode`-ing one value at a time."""
+
+    def __init__(self, handle: Any, max_value: int = MAX_VALUE_BYTES) -> None:
+        self.handle = handle
+        self.max_value = max_value
+        self.too_large = False
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.buf = ""
+        self.pos = 0
+        self.bytes_read = 0
+        self.eof = False
+
+    def fill(self, at_least: int = 0) -> bool:
+        if self.eof:
+            return False
+        raw = self.handle.read(max(CHUNK_BYTES, at_least))
+        self.bytes_read += len(raw)
+        if not raw:
+            self.eof = True
+            self.buf = self.buf[self.pos :] + self.decoder.decode(b"", final=True)
+            self.pos = 0
+            return False
+        self.buf = self.buf[self.pos :] + self.decoder.decode(raw)
+        self.pos = 0
+        return True
+
+    @property
+    def consumed(self) -> int:
+        # Characters still buffered approximate their bytes; exact enough for budgeting.
+        return self.bytes_read - (len(self.buf) - self.pos)
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def decode(self) -> Any:
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                pending = len(self.buf) - self.pos
+                if pending >= self.max_value:
+                    self.too_large = True
+                    raise _ValueTooLarge(f"JSON value exceeds {self.max_value} bytes") from None
+                # Grow geometrically so one large value is not re-parsed per chunk, up to the cap.
+                if not self.fill(min(pending, self.max_value - pending)):
+                    raise
+                continue
+            if end == len(self.buf) and not self.eof and self.fill():
+                continue  # a number or literal may continue in the next chunk
+            self.pos = end
+            return value
+
+
+def _stream_array(reader: _Reader, on_item: Callable[[Any], None], over_budget: Callable[[], bool]) -> Tuple[int, bool]:
+    """Consume array items after the opening `[`; returns (items seen, stopped by budget)."""
+    count = 0
+    while True:
+        char = reader.peek()
+        if char in {"]", ""}:
+            reader.pos += 1
+            return count, False
+        if char == ",":
+            reader.pos += 1
+            continue
+        if over_budget():
+            return count, True
+        try:
+            item = reader.decode()
+        except _ValueTooLarge:
+            return count, True
+        on_item(item)
+        count += 1
+
+
+def _looks_like_lines(opener: Callable[[], BinaryIO]) -> bool:
+    with opener() as handle:
+        first = handle.readline(CHUNK_BYTES).strip()
+        second = b""
+        while not second:
+            line = handle.readline(CHUNK_BYTES)
+            if not line:
+                break
+            second = line.strip()
+    if not first or not second or first[:1] not in {b"{", b"["}:
+        return False
+    try:
+        json.loads(first)
+    except ValueError:
+        return False
+    return second[:1] in {b"{", b"["}
+
+
+def _scan_lines(
+    opener: Callable[[], BinaryIO],
+    schema: _Schema,
+    sample_records: int,
+    over_budget: Callable[[int], bool],
+    max_value: int = MAX_VALUE_BYTES,
+) -> Dict[str, Any]:
+    records = 0
+    invalid = 0
+    consumed = 0
+    stopped = False
+    with opener() as handle:
+        while records < sample_records and not over_budget(consumed):
+            line = handle.readline(max_value)
+            if not line:
+                break
+            consumed += len(line)
+            if not line.strip():
+                continue
+            records += 1
+            if len(line) >= max_value and not line.endswith(b"\n"):
+                # Too long to parse in memory: skip to the end of the line and count it as invalid.
+                invalid += 1
+                while line and not line.endswith(b"\n") and not over_budget(consumed):
+                    line = handle.readline(CHUNK_BYTES)
+                    consumed += len(line)
+                continue
+            try:
+                schema.add(json.loads(line))
+            except ValueError:
+                invalid += 1
+        # Past the sample only newlines are counted, in C, chunk by chunk.
+        tail = b"\n"
+        while True:
+            if over_budget(consumed):
+                stopped = True
+                break
+            chunk = handle.read(CHUNK_BYTES)
+            if not chunk:
+                break
+            consumed += len(chunk)
+            # Blank lines (mostly a trailing one) are not records.
+            blank = chunk.count(b"\n\n") + (1 if tail == b"\n" and chunk[:1] == b"\n" else 0)
+            records += chunk.count(b"\n") - blank
+            tail = chunk[-1:]
+        if tail != b"\n" and not stopped:
+            records += 1
+    return {"format": "ndjson", "records": records, "invalid_sampled_lines": invalid, "bytes_scanned": consumed, "stopped": stopped}
+
+
+def scan_json(
+    path: Path,
+    sample_records: int = SAMPLE_RECORDS,
+    max_scan_bytes: int = MAX_SCAN_BYTES,
+    max_scan_sec: float = MAX_SCAN_SEC,
+) -> Dict[str, Any]:
+    """Streaming summary of a JSON, JSON Lines or NDJSON file.
+
+    Reports the layout (`ndjson`, `array`, `object`, `scalar`), the record count
+    (extrapolated and flagged `records_estimated` once the scan budget runs out),
+    the key holding the records for `{"data": [...]}` style dumps, and a merged
+    schema of the first `sample_records` records with field frequencies.
+    """
+    return scan_json_stream(
+        lambda: path.open("rb"), path.stat().st_size, path.name, sample_records, max_scan_bytes, max_scan_sec
+    )
+
+
+def scan_json_stream(
+    opener: Callable[[], BinaryIO],
+    size: int,
+    name: str,
+    sample_records: int = SAMPLE_RECORDS,
+    max_scan_bytes: int = MAX_SCAN_BYTES,
+    max_scan_sec: float = MAX_SCAN_SEC,
+) -> Dict[str, Any]:
+    """`scan_json` over any re-openable binary stream (e.g. a zip member); `name` picks the format."""
+    started = time.perf_counter()
+    schema = _Schema()
+
+    def over_budget(consumed: int) -> bool:
+        return consumed >= max_scan_bytes or time.perf_counter() - started >= max_scan_sec
+
+    result: Dict[str, Any] = {"size": size}
+    if Path(name).suffix.lower() in _LINE_FORMATS or _looks_like_lines(opener):
+        scanned = _scan_lines(opener, schema, sample_records, over_budget, _value_cap(max_scan_bytes))
+    else:
+        with opener() as handle:
+            reader = _Reader(handle, _value_cap(max_scan_bytes))
+            scanned = _scan_document(reader, schema, sample_records, lambda: over_budget(reader.consumed))
+            scanned["bytes_scanned"] = reader.consumed
+            if reader.too_large:
+                scanned["value_too_large"] = True
+
+    stopped = bool(scanned.pop("stopped", False))
+    consumed = max(int(scanned.get("bytes_scanned", 0)), 1)
+    if stopped and scanned.get("records"):
+        scanned["records"] = int(scanned["records"] * size / consumed)
+    result.update(scanned)
+    result["records_estimated"] = stopped
+    result["sampled_records"] = schema.records
+    result["max_depth"] = schema.max_depth
+    result["fields"] = schema.fields()
+    result["scan_sec"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def _scan_document(reader: _Reader, schema: _Schema, sample_records: int, over_budget: Callable[[], bool]) -> Dict[str, Any]:
+    def sample(item: Any) -> None:
+        if schema.records < sample_records:
+            schema.add(item)
+
+    first = reader.peek()
+    if first == "[":
+        reader.pos += 1
+        count, stopped = _stream_array(reader, sample, over_budget)
+        return {"format": "array", "records": count, "stopped": stopped}
+    if first != "{":
+        try:
+            value_type = _json_type(reader.decode())
+        except _ValueTooLarge:
+            value_type = "unknown"
+        return {"format": "scalar", "records": 1, "value_type": value_type}
+
+    # Top-level object: stream the first array-valued key as the record list
+    # and summarize the remaining keys without keeping their values.
+    reader.pos += 1
+    top_level: Dict[str, str] = {}
+    key_count = 0
+    record_path: Optional[str] = None
+    count = 0
+    stopped = False
+    envelope = _Schema()
+    envelope_seen: Set[str] = set()
+    while True:
+        char = reader.peek()
+        if char in {"}", ""}:
+            break
+        if char == ",":
+            reader.pos += 1
+            continue
+        key = str(reader.decode())
+        key_count += 1
+        if reader.peek() == ":":
+            reader.pos += 1
+        if reader.peek() == "[" and record_path is None:
+            reader.pos += 1
+            record_path = key
+            top_level[key] = "array"
+            count, stopped = _stream_array(reader, sample, over_budget)
+            if stopped:
+                break
+            continue
+        if over_budget():
+            stopped = True
+            break
+        try:
+            value = reader.decode()
+        except _ValueTooLarge:
+            stopped = True
+            break
+        if len(top_level) < _MAX_TOP_KEYS:
+            top_level[key] = _json_type(value)
+        envelope._note(key, value, 0, envelope_seen)
+    if record_path is None:
+        # A plain object is its own single record.
+        schema.records, schema.counts, schema.types = 1, envelope.counts, envelope.types
+        schema.max_depth = envelope.max_depth
+        count = 1
+    return {
+        "format": "object",
+        "records": count,
+        "record_path": record_path,
+        "top_level_keys": top_level,
+        "top_level_key_count": key_count,
+        "stopped": stopped and record_path is not None,
+    }
+
+
+def summary_lines(summary: Dict[str, Any], max_fields: int = 40) -> List[str]:
+    """KEY=value lines in the master describer's output format."""
+    lines = [
+        f"JSON_FORMAT={summary.get('format')}",
+        f"RECORDS={summary.get('records')}" + (" (estimated)" if summary.get("records_estimated") else ""),
+    ]
+    if summary.get("record_path"):
+        lines.append(f"RECORD_PATH={summary['record_path']}")
+    if summary.get("top_level_keys"):
+        keys = summary["top_level_keys"]
+        lines.append("TOP_KEYS=" + ",".join(f"{k}:{v}" for k, v in list(keys.items())[:20]))
+    lines.append(f"MAX_DEPTH={summary.get('max_depth', 0)}")
+    fields = summary.get("fields", [])
+    if fields:
+        lines.append(
+            "FIELDS="
+            + ",".join(f"{f['path']}:{'|'.join(f['types'])}:{f['frequency']}" for f in fields[:max_fields])
+        )
+        if len(fields) > max_fields:
+            lines.append(f"FIELDS_TRUNCATED={len(fields) - max_fields}")
+    return lines
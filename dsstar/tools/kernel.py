@@ -0,0 +1,437 @@
+from __future__ import annotations
+
+import atexit
+import builtins
+import importlib
+import importlib.util
+import json
+import os
+import pickle
+import select
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+import types
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from dsstar.runtime_paths import package_pythonpath
+from dsstar.tools.exec_pool import exit_code_from
+from dsstar.tools.exec_sandbox import build_result, read_capped
+from dsstar.tools.log_utils import log
+from dsstar.tools.resource_limits import GroupMonitor, ResourceLimits, bytes_written_since, maxrss_mb
+
+_READY_TIMEOUT_SEC = 60
+_CONTROL_TIMEOUT_SEC = 120
+_EMPTY_STATE = -1
+_MB = 1024 * 1024
+_MONITOR_INTERVAL_SEC = 0.05
+
+
+def _read_line(stream: Any, timeout_sec: float) -> Optional[str]:
+    ready, _, _ = select.select([stream], [], [], timeout_sec)
+    if not ready:
+        return None
+    line = stream.readline()
+    return line or None
+
+
+class PersistentKernel:
+    """Notebook-style Python process that keeps variables between plan steps.
+
+    Each committed step is snapshotted to `.dsstar/kernel/` so the kernel can be
+    reset to the state before any step when the router backtracks, or rebuilt
+    after a timeout kills the process. Snapshots that could not capture every
+    variable fall back to replaying the committed cells.
+    """
+
+    def __init__(self, run_dir: Path, env: Dict[str, str], limits: Optional[ResourceLimits] = None) -> None:
+        self.run_dir = run_dir.resolve()
+        # The kernel outlives each cell, so cumulative CPU and file-size rlimits do
+        # not apply; resident memory is watched per cell and the budget is the timeout.
+        self.limits = ResourceLimits(max_memory_mb=limits.max_memory_mb) if limits else None
+        self.env = dict(env)
+        self.env["PYTHONPATH"] = package_pythonpath()
+        self.snapshot_dir = self.run_dir / ".dsstar" / "kernel"
+        self.cells: Dict[int, str] = {}
+        self.step_titles: Dict[int, str] = {}
+        self._complete_snapshots: Dict[int, bool] = {}
+        self._proc: Optional[subprocess.Popen] = None
+        self._timeout_sec = 60
+        # Step id whose post-state the kernel currently holds untouched (None when dirty).
+        self._clean_at: Optional[int] = None
+        atexit.register(self.close)
+
+    # -- process management -------------------------------------------------
+
+    def _start(self) -> bool:
+        self._proc = subprocess.Popen(
+            [sys.executable, "-m", "dsstar.tools.kernel"],
+            cwd=str(self.run_dir),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+            env=self.env,
+            start_new_session=True,
+        )
+        line = _read_line(self._proc.stdout, _READY_TIMEOUT_SEC)
+        if not line:
+            self._kill()
+            return False
+        return True
+
+    def _alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def _kill(self) -> None:
+        if self._proc is None:
+            return
+        if self._proc.poll() is None:
+            try:
+                os.killpg(self._proc.pid, signal.SIGKILL)
+            except OSError:
+                self._proc.kill()
+            self._proc.wait()
+        self._proc = None
+        self._clean_at = None
+
+    def _request(
+        self,
+        payload: Dict[str, Any],
+        timeout_sec: float,
+        monitor: Optional[GroupMonitor] = None,
+    ) -> Optional[Dict[str, Any]]:
+        if not self._alive() and not self._start():
+            return None
+        assert self._proc is not None and self._proc.stdin is not None
+        try:
+            self._proc.stdin.write(json.dumps(payload) + "\n")
+            self._proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            return None
+        if monitor is None:
+            line = _read_line(self._proc.stdout, timeout_sec)
+        else:
+            monitor.pgid = self._proc.pid
+            deadline = time.time() + timeout_sec
+            line = None
+            while line is None and time.time() < deadline and monitor.check() is None:
+                line = _read_line(self._proc.stdout, min(_MONITOR_INTERVAL_SEC, max(0.0, deadline - time.time())))
+                if line is None and not self._alive():
+                    break
+        if not line:
+            return None
+        return json.loads(line)
+
+    def close(self) -> None:
+        self._kill()
+
+    # -- execution ----------------------------------------------------------
+
+    def execute(self, code: str, filename: Path, timeout_sec: int) -> Dict[str, Any]:
+        self._timeout_sec = timeout_sec
+        self._clean_at = None
+        out_fd, out_path = tempfile.mkstemp(prefix="dsstar_kout_")
+        err_fd, err_path = tempfile.mkstemp(prefix="dsstar_kerr_")
+        os.close(out_fd)
+        os.close(err_fd)
+        monitor = GroupMonitor(0, self.limits)
+        max_output = int(self.limits.max_output_mb) * _MB if self.limits and self.limits.max_output_mb else None
+        start = time.time()
+        try:
+            response = self._request(
+                {
+                    "op": "exec",
+                    "code": code,
+                    "filename": str(filename.resolve()),
+                    "stdout_path": out_path,
+                    "stderr_path": err_path,
+                },
+                timeout_sec,
+                monitor,
+            )
+            duration = time.time() - start
+            stdout = read_capped(Path(out_path), max_output)
+            stderr = read_capped(Path(err_path), max_output)
+            output_bytes = sum(Path(path).stat().st_size for path in (out_path, err_path))
+        finally:
+            for path in (out_path, err_path):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+        resources = dict((response or {}).get("resources") or {})
+        resources.setdefault("user_cpu_sec", None)
+        resources.setdefault("sys_cpu_sec", None)
+        resources["peak_rss_mb"] = max(
+            float(resources.get("peak_rss_mb") or 0.0), round(monitor.peak_rss_bytes / _MB, 2)
+        )
+        resources["bytes_written"] = bytes_written_since(self.run_dir, start) + output_bytes
+        if response is None:
+            # The cell outlived its budget, hit a limit, or took the kernel down with
+            # it; all lose in-memory state, which restore_before() rebuilds from disk.
+            timed_out = self._alive() and monitor.violation is None
+            exit_code = self._proc.returncode if self._proc is not None and not self._alive() else None
+            self._kill()
+            if not timed_out and monitor.violation is None:
+                stderr = stderr or "Kernel process exited unexpectedly."
+            return build_result(
+                stdout,
+                stderr,
+                int(exit_code) if exit_code not in (None, 0) else 1,
+                duration,
+                timed_out,
+                timeout_sec,
+                self.limits,
+                monitor.violation,
+                resources,
+            )
+        return build_result(
+            stdout,
+            stderr,
+            int(response.get("exit_code", 1)),
+            duration,
+            False,
+            timeout_sec,
+            self.limits,
+            None,
+            resources,
+        )
+
+    def variables(self) -> Dict[str, str]:
+        response = self._request({"op": "inspect"}, _CONTROL_TIMEOUT_SEC)
+        return dict(response.get("variables", {})) if response else {}
+
+    # -- step snapshots -----------------------------------------------------
+
+    def _snapshot_path(self, step_id: int) -> Path:
+        return self.snapshot_dir / f"step_{int(step_id):03d}.pkl"
+
+    def commit(self, step_id: int, cell: str, title: str = "") -> None:
+        """Record a successful step and snapshot the kernel state after it.
+
+        Later steps were computed from the previous version of this step, so they
+        are dropped and will be re-executed.
+        """
+        self.drop_from(int(step_id) + 1)
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        self.cells[int(step_id)] = cell
+        self.step_titles[int(step_id)] = title
+        response = self._request({"op": "snapshot", "path": str(self._snapshot_path(step_id))}, _CONTROL_TIMEOUT_SEC)
+        skipped = list(response.get("skipped", [])) if response else ["<snapshot failed>"]
+        if skipped:
+            log(f"Kernel: snapshot for step {step_id} will replay cells (unpicklable: {skipped[:5]})")
+        self._complete_snapshots[int(step_id)] = bool(response) and not skipped
+        self._clean_at = int(step_id)
+
+    def drop_from(self, step_id: int) -> None:
+        """Forget committed steps at or after `step_id` (router backtrack)."""
+        for sid in [sid for sid in self.cells if sid >= int(step_id)]:
+            self.cells.pop(sid, None)
+            self.step_titles.pop(sid, None)
+            self._complete_snapshots.pop(sid, None)
+            try:
+                self._snapshot_path(sid).unlink()
+            except OSError:
+                pass
+
+    def restore_before(self, step_id: int) -> None:
+        """Reset kernel state to just after the latest committed step before `step_id`."""
+        earlier = [sid for sid in self.cells if sid < int(step_id)]
+        target = max(earlier) if earlier else _EMPTY_STATE
+        if self._clean_at == target and self._alive():
+            return
+        if target == _EMPTY_STATE:
+            if self._request({"op": "reset"}, _CONTROL_TIMEOUT_SEC):
+                self._clean_at = _EMPTY_STATE
+            return
+        if self._complete_snapshots.get(target) and self._snapshot_path(target).exists():
+            response = self._request({"op": "restore", "path": str(self._snapshot_path(target))}, _CONTROL_TIMEOUT_SEC)
+            if response and response.get("ok"):
+                self._clean_at = target
+                return
+        self._replay(upto=target)
+
+    def _replay(self, upto: int) -> None:
+        log(f"Kernel: replaying committed cells up to step {upto}")
+        self._request({"op": "reset"}, _CONTROL_TIMEOUT_SEC)
+        for sid in sorted(self.cells):
+            if sid > upto:
+                break
+            result = self.execute(self.cells[sid], self.run_dir / f"kernel_step_{sid:03d}.py", self._timeout_sec)
+            if int(result.get("exit_code", 1)) != 0:
+                log(f"Kernel: replay of step {sid} failed: {str(result.get('stderr', ''))[-200:]}")
+                return
+        self._clean_at = upto
+
+    def compose_script(self, step_id: int, cell: str, title: str = "") -> str:
+        """Standalone script equivalent to the committed steps before `step_id` plus `cell`."""
+        parts: List[str] = []
+        for sid in sorted(self.cells):
+            if sid >= int(step_id):
+                break
+            parts.append(f"# --- Step {sid}: {self.step_titles.get(sid, '')} ---\n{self.cells[sid].rstrip()}\n")
+        parts.append(f"# --- Step {step_id}: {title} ---\n{cell.rstrip()}\n")
+        return "\n".join(parts)
+
+
+# ---------------------------------------------------------------------------
+# Kernel side: runs as `python -m dsstar.tools.kernel` with cwd=run_dir.
+# ---------------------------------------------------------------------------
+
+_DEVNULL_FD = -1
+
+
+def _fresh_namespace() -> Dict[str, Any]:
+    return {"__name__": "__main__", "__builtins__": builtins}
+
+
+def _dumps(value: Any) -> bytes:
+    if importlib.util.find_spec("cloudpickle") is not None:
+        import cloudpickle  # type: ignore
+
+        return cloudpickle.dumps(value)
+    return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _cpu_times() -> Tuple[float, float, float]:
+    try:
+        import resource
+    except ImportError:
+        times = os.times()
+        return times.user, times.system, 0.0
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return (
+        usage.ru_utime + children.ru_utime,
+        usage.ru_stime + children.ru_stime,
+        maxrss_mb(max(usage.ru_maxrss, children.ru_maxrss)),
+    )
+
+
+def _exec_cell(namespace: Dict[str, Any], request: Dict[str, Any]) -> Dict[str, Any]:
+    out_fd = os.open(request["stdout_path"], os.O_WRONLY | os.O_TRUNC)
+    err_fd = os.open(request["stderr_path"], os.O_WRONLY | os.O_TRUNC)
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.dup2(out_fd, 1)
+    os.dup2(err_fd, 2)
+    os.close(out_fd)
+    os.close(err_fd)
+    exit_code = 0
+    before = _cpu_times()
+    try:
+        code = compile(request["code"], request["filename"], "exec")
+        namespace["__file__"] = request["filename"]
+        sys.argv = [request["filename"]]
+        exec(code, namespace)  # pylint: disable=exec-used
+    except SystemExit as exc:
+        exit_code = exit_code_from(exc.code)
+    except BaseException as exc:  # pylint: disable=broad-except
+        tb = exc.__traceback__
+        if tb is not None and tb.tb_frame.f_code is _exec_cell.__code__:
+            tb = tb.tb_next
+        traceback.print_exception(type(exc), exc, tb)
+        exit_code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(_DEVNULL_FD, 1)
+        os.dup2(_DEVNULL_FD, 2)
+    after = _cpu_times()
+    return {
+        "exit_code": exit_code,
+        "resources": {
+            "user_cpu_sec": round(after[0] - before[0], 3),
+            "sys_cpu_sec": round(after[1] - before[1], 3),
+            "peak_rss_mb": after[2],
+        },
+    }
+
+
+def _snapshot(namespace: Dict[str, Any], path: str) -> Dict[str, Any]:
+    values: Dict[str, bytes] = {}
+    modules: Dict[str, str] = {}
+    skipped: List[str] = []
+    for name, value in namespace.items():
+        if name.startswith("__"):
+            continue
+        if isinstance(value, types.ModuleType):
+            modules[name] = value.__name__
+            continue
+        try:
+            values[name] = _dumps(value)
+        except Exception:  # pylint: disable=broad-except
+            skipped.append(name)
+    with open(path, "wb") as handle:
+        pickle.dump({"values": values, "modules": modules}, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    return {"ok": True, "skipped": skipped}
+
+
+def _restore(path: str) -> Optional[Dict[str, Any]]:
+    namespace = _fresh_namespace()
+    try:
+        with open(path, "rb") as handle:
+            payload = pickle.load(handle)
+        for name, module_name in payload.get("modules", {}).items():
+            namespace[name] = importlib.import_module(module_name)
+        for name, blob in payload.get("values", {}).items():
+            namespace[name] = pickle.loads(blob)
+    except Exception:  # pylint: disable=broad-except
+        return None
+    return namespace
+
+
+def _serve() -> None:
+    global _DEVNULL_FD  # pylint: disable=global-statement
+    # Keep the protocol channels private so cell code cannot read or corrupt them.
+    proto_in = os.fdopen(os.dup(0), "r")
+    proto_out = os.fdopen(os.dup(1), "w", buffering=1)
+    _DEVNULL_FD = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(_DEVNULL_FD, fd)
+    sys.stdin = open(0, "r", closefd=False)
+    sys.stdout = open(1, "w", closefd=False, errors="backslashreplace")
+    sys.stderr = open(2, "w", closefd=False, errors="backslashreplace")
+    sys.path[0] = os.getcwd()
+
+    namespace = _fresh_namespace()
+    proto_out.write(json.dumps({"ready": True}) + "\n")
+    for line in proto_in:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        op = request.get("op")
+        if op == "exec":
+            response = _exec_cell(namespace, request)
+        elif op == "reset":
+            namespace = _fresh_namespace()
+            response = {"ok": True}
+        elif op == "snapshot":
+            response = _snapshot(namespace, request["path"])
+        elif op == "restore":
+            restored = _restore(request["path"])
+            if restored is not None:
+                namespace = restored
+            response = {"ok": restored is not None}
+        elif op == "inspect":
+            response = {
+                "variables": {
+                    name: type(value).__name__
+                    for name, value in list(namespace.items())[:200]
+                    if not name.startswith("__") and not isinstance(value, types.ModuleType)
+                }
+            }
+        else:
+            response = {"ok": False, "error": f"unknown op: {op}"}
+        proto_out.write(json.dumps(response) + "\n")
+
+
+if __name__ == "__main__":
+    _serve()
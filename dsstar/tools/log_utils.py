@@ -19,9 +19,17 @@ def timestamp_slug() -> str:
 
 def create_run_dir(root: Path) -> Path:
     root.mkdir(parents=True, exist_ok=True)
-    run_path = root / timestamp_slug()
-    run_path.mkdir(parents=True, exist_ok=True)
-    return run_path
+    slug = timestamp_slug()
+    run_path = root / slug
+    suffix = 1
+    # Cache hits finish within a second, so consecutive runs can share a timestamp.
+    while True:
+        try:
+            run_path.mkdir(parents=True)
+            return run_path
+        except FileExistsError:
+            suffix += 1
+            run_path = root / f"{slug}_{suffix}"
 
 
 def write_json(path: Path, payload: Any) -> None:
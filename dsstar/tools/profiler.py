@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import argparse
+import json
+import linecache
+import os
+import runpy
+import signal
+import sys
+import time
+import traceback
+from typing import Any, Dict, List, Optional, Tuple
+
+SAMPLE_INTERVAL_SEC = 0.005
+_FLUSH_INTERVAL_SEC = 1.0
+_TOP_N = 15
+_MB = 1024 * 1024
+
+# Runs as `python dsstar/tools/profiler.py --out PROFILE.json SCRIPT`, by path and
+# stdlib-only, so the script sees the same sys.path and environment as a plain run.
+# Allocations are traced by sampling resident memory and charging growth to the
+# running line; tracemalloc slows pure-Python loops by an order of magnitude.
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm", "rb") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        try:
+            import resource
+        except ImportError:
+            return 0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return int(peak) * (1 if sys.platform == "darwin" else 1024)
+
+
+class _Sampler:
+    """Wall-clock line sampler; flushes periodically so killed scripts keep their hotspots."""
+
+    def __init__(self, script: str, out_path: str) -> None:
+        self.script = os.path.realpath(script)
+        self.out_path = out_path
+        self.start = time.perf_counter()
+        self.last_tick = self.start
+        self.last_flush = self.start
+        self.samples = 0
+        self.line_weights: Dict[Tuple[int, str], float] = {}
+        self.line_growth: Dict[int, int] = {}
+        self.last_rss = self.start_rss = self.peak_rss = _rss_bytes()
+        self._is_script: Dict[str, bool] = {}
+        self._flushing = False
+
+    def _matches(self, filename: str) -> bool:
+        hit = self._is_script.get(filename)
+        if hit is None:
+            hit = self._is_script[filename] = os.path.realpath(filename) == self.script
+        return hit
+
+    def _script_frame(self, frame: Any) -> Optional[Any]:
+        while frame is not None:
+            if self._matches(frame.f_code.co_filename):
+                return frame
+            frame = frame.f_back
+        return None
+
+    def on_signal(self, _signum: int, frame: Any) -> None:
+        if self._flushing:
+            return
+        now = time.perf_counter()
+        # Signals are deferred while C code runs, so weight by elapsed time, not count.
+        elapsed = now - self.last_tick
+        self.last_tick = now
+        rss = _rss_bytes()
+        growth = rss - self.last_rss
+        self.last_rss = rss
+        self.peak_rss = max(self.peak_rss, rss)
+        target = self._script_frame(frame)
+        if target is not None:
+            key = (target.f_lineno, target.f_code.co_name)
+            self.line_weights[key] = self.line_weights.get(key, 0.0) + elapsed
+            if growth > 0:
+                self.line_growth[target.f_lineno] = self.line_growth.get(target.f_lineno, 0) + growth
+            self.samples += 1
+        if now - self.last_flush >= _FLUSH_INTERVAL_SEC:
+            self._flushing = True
+            try:
+                self.flush(complete=False)
+            except OSError:
+                pass
+            finally:
+                self._flushing = False
+                self.last_flush = self.last_tick = time.perf_counter()
+
+    def flush(self, complete: bool) -> None:
+        now = time.perf_counter()
+        total = sum(self.line_weights.values()) or 1.0
+        ranked = sorted(self.line_weights.items(), key=lambda item: item[1], reverse=True)[:_TOP_N]
+        growth = sorted(self.line_growth.items(), key=lambda item: item[1], reverse=True)[:_TOP_N]
+        payload = {
+            "script": self.script,
+            "complete": complete,
+            "sampler": "wall_clock" if hasattr(signal, "setitimer") else "unavailable",
+            "interval_sec": SAMPLE_INTERVAL_SEC,
+            "samples": self.samples,
+            "elapsed_sec": round(now - self.start, 3),
+            "hotspots": [
+                {
+                    "line": line,
+                    "function": func,
+                    "code": linecache.getline(self.script, line).strip(),
+                    "seconds": round(weight, 3),
+                    "share": round(weight / total, 3),
+                }
+                for (line, func), weight in ranked
+            ],
+            "allocations": [
+                {
+                    "line": line,
+                    "code": linecache.getline(self.script, line).strip(),
+                    "rss_growth_mb": round(size / _MB, 3),
+                }
+                for line, size in growth
+            ],
+            "start_rss_mb": round(self.start_rss / _MB, 3),
+            "peak_rss_mb": round(self.peak_rss / _MB, 3),
+        }
+        tmp_path = self.out_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            handle.write(json.dumps(payload, indent=2))
+        os.replace(tmp_path, self.out_path)
+
+
+def _print_script_traceback(exc: BaseException, script: str) -> None:
+    # Drop the wrapper and runpy frames so tracebacks match a plain `python script.py`.
+    tb = exc.__traceback__
+    while tb is not None and os.path.realpath(tb.tb_frame.f_code.co_filename) != script:
+        tb = tb.tb_next
+    traceback.print_exception(type(exc), exc, tb or exc.__traceback__)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="DS-STAR generated-code profiler")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("script")
+    args = parser.parse_args()
+
+    script = os.path.realpath(args.script)
+    sys.argv = [args.script]
+    sys.path[0] = os.path.dirname(script)
+
+    sampler = _Sampler(script, os.path.abspath(args.out))
+    sampling = hasattr(signal, "setitimer")
+    if sampling:
+        signal.signal(signal.SIGALRM, sampler.on_signal)
+        signal.setitimer(signal.ITIMER_REAL, SAMPLE_INTERVAL_SEC, SAMPLE_INTERVAL_SEC)
+    exit_code: Any = 0
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as exc:
+        exit_code = exc.code
+    except BaseException as exc:  # pylint: disable=broad-except
+        _print_script_traceback(exc, script)
+        exit_code = 1
+    finally:
+        if sampling:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        sampler.flush(complete=True)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import os
+import signal
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+_MB = 1024 * 1024
+_SAMPLE_INTERVAL_SEC = 0.1
+
+
+@dataclass
+class ResourceLimits:
+    max_memory_mb: Optional[int] = None
+    max_cpu_sec: Optional[int] = None
+    max_output_mb: Optional[int] = None
+
+    def any(self) -> bool:
+        return bool(self.max_memory_mb or self.max_cpu_sec or self.max_output_mb)
+
+    def to_dict(self) -> Dict[str, Optional[int]]:
+        return {
+            "max_memory_mb": self.max_memory_mb,
+            "max_cpu_sec": self.max_cpu_sec,
+            "max_output_mb": self.max_output_mb,
+        }
+
+    @classmethod
+    def from_dict(cls, raw: Optional[Dict[str, Any]]) -> "ResourceLimits":
+        raw = raw or {}
+        return cls(
+            max_memory_mb=raw.get("max_memory_mb"),
+            max_cpu_sec=raw.get("max_cpu_sec"),
+            max_output_mb=raw.get("max_output_mb"),
+        )
+
+
+def apply_rlimits(limits: Optional[ResourceLimits]) -> None:
+    """Per-process backstops, inherited by every process the script spawns.
+
+    Runs in the child between fork and exec. Memory is not capped with
+    RLIMIT_AS on Linux because data libraries reserve far more address space
+    than they touch; the group monitor enforces resident memory instead.
+    """
+    if limits is None or not limits.any():
+        return
+    try:
+        import resource
+    except ImportError:
+        return
+    if limits.max_cpu_sec:
+        soft = int(limits.max_cpu_sec)
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, soft + 1))
+    if limits.max_output_mb:
+        size = int(limits.max_output_mb) * _MB
+        resource.setrlimit(resource.RLIMIT_FSIZE, (size, size))
+    if limits.max_memory_mb and not Path("/proc").is_dir():
+        size = int(limits.max_memory_mb) * _MB
+        resource.setrlimit(resource.RLIMIT_AS, (size, size))
+
+
+def _group_pids(pgid: int) -> list:
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as handle:
+                fields = handle.read().rsplit(b")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[2]) == pgid:
+            pids.append((int(entry), fields))
+    return pids
+
+
+def sample_process_group(pgid: int) -> Optional[Dict[str, float]]:
+    """Resident memory, CPU seconds and bytes written across a process group (Linux)."""
+    if not Path("/proc").is_dir():
+        return None
+    page = os.sysconf("SC_PAGE_SIZE")
+    ticks = os.sysconf("SC_CLK_TCK")
+    rss = 0
+    cpu = 0.0
+    written = 0
+    for pid, fields in _group_pids(pgid):
+        # Fields after the command name: state=0, ppid=1, pgrp=2, utime=11, stime=12, rss=21.
+        cpu += (int(fields[11]) + int(fields[12])) / ticks
+        rss += int(fields[21]) * page
+        try:
+            with open(f"/proc/{pid}/io", "r", encoding="ascii") as handle:
+                for line in handle:
+                    if line.startswith("wchar:"):
+                        written += int(line.split()[1])
+        except OSError:
+            pass
+    return {"rss_bytes": float(rss), "cpu_sec": cpu, "wchar_bytes": float(written)}
+
+
+class GroupMonitor:
+    """Enforces group-wide limits by sampling and killing the whole process group."""
+
+    def __init__(self, pgid: int, limits: Optional[ResourceLimits]) -> None:
+        self.pgid = pgid
+        self.limits = limits or ResourceLimits()
+        self.peak_rss_bytes = 0.0
+        self.violation: Optional[Dict[str, Any]] = None
+        self._next_sample = 0.0
+
+    def check(self) -> Optional[Dict[str, Any]]:
+        if self.violation is not None or not self.limits.any():
+            return self.violation
+        now = time.monotonic()
+        if now < self._next_sample:
+            return None
+        self._next_sample = now + _SAMPLE_INTERVAL_SEC
+        sample = sample_process_group(self.pgid)
+        if sample is None:
+            return None
+        self.peak_rss_bytes = max(self.peak_rss_bytes, sample["rss_bytes"])
+        if self.limits.max_memory_mb and sample["rss_bytes"] > self.limits.max_memory_mb * _MB:
+            self.violation = limit_exceeded("memory", self.limits.max_memory_mb, sample["rss_bytes"] / _MB, "MB")
+        elif self.limits.max_cpu_sec and sample["cpu_sec"] > self.limits.max_cpu_sec:
+            self.violation = limit_exceeded("cpu", self.limits.max_cpu_sec, sample["cpu_sec"], "s")
+        elif self.limits.max_output_mb and sample["wchar_bytes"] > self.limits.max_output_mb * _MB:
+            self.violation = limit_exceeded("output", self.limits.max_output_mb, sample["wchar_bytes"] / _MB, "MB")
+        if self.violation is not None:
+            kill_group(self.pgid)
+        return self.violation
+
+
+def kill_group(pgid: int) -> None:
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except OSError:
+        pass
+
+
+def limit_exceeded(kind: str, limit: float, observed: Optional[float], unit: str) -> Dict[str, Any]:
+    observed_text = f"{observed:.1f}{unit}" if observed is not None else "n/a"
+    return {
+        "kind": kind,
+        "limit": limit,
+        "observed": round(observed, 3) if observed is not None else None,
+        "unit": unit,
+        "message": f"Killed for exceeding the {kind} limit ({limit}{unit}; observed {observed_text}).",
+    }
+
+
+def classify_exit(
+    exit_code: int,
+    stderr: str,
+    limits: Optional[ResourceLimits],
+    violation: Optional[Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
+    """Map a finished execution to a structured limit signal, if a limit killed it."""
+    if violation is not None:
+        return violation
+    limits = limits or ResourceLimits()
+    if limits.max_cpu_sec and exit_code == -getattr(signal, "SIGXCPU", 24):
+        return limit_exceeded("cpu", limits.max_cpu_sec, None, "s")
+    if limits.max_output_mb and exit_code == -getattr(signal, "SIGXFSZ", 25):
+        return limit_exceeded("output", limits.max_output_mb, None, "MB")
+    if limits.max_memory_mb and exit_code != 0 and "MemoryError" in stderr:
+        return limit_exceeded("memory", limits.max_memory_mb, None, "MB")
+    return None
+
+
+def maxrss_mb(ru_maxrss: float) -> float:
+    # ru_maxrss is kilobytes on Linux and bytes on macOS.
+    scale = 1 if os.uname().sysname == "Darwin" else 1024
+    return round(ru_maxrss * scale / _MB, 2)
+
+
+def usage_from_rusage(rusage: Any, monitor: GroupMonitor, cwd: Path, since: float) -> Dict[str, Any]:
+    """Resource summary for a reaped child: peak RSS, CPU split, and bytes written under `cwd`."""
+    return {
+        "peak_rss_mb": max(maxrss_mb(rusage.ru_maxrss), round(monitor.peak_rss_bytes / _MB, 2)),
+        "user_cpu_sec": round(rusage.ru_utime, 3),
+        "sys_cpu_sec": round(rusage.ru_stime, 3),
+        "bytes_written": bytes_written_since(cwd, since),
+    }
+
+
+def bytes_written_since(root: Path, since: float) -> int:
+    """Size of files under `root` created or modified since `since` (epoch seconds)."""
+    total = 0
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = list(os.scandir(current))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                    continue
+                stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            if stat.st_mtime >= since:
+                total += int(stat.st_size)
+    return total
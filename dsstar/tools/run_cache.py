@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from dsstar.runtime.inputs import file_sha256
+from dsstar.runtime_paths import run_root_cache_dir
+from dsstar.tools.log_utils import write_json
+
+# Cross-run cache of converged runs under one run root. A run is keyed by its
+# normalized question, the content hashes of its input files, the provider and
+# model, and the describer master version; every converged run leaves its key in
+# run_cache.json next to final_answer.md and final_solution.py, so the index can
+# always be rebuilt by scanning the run root.
+
+RUN_CACHE_FILE = "run_cache.json"
+_INDEX_NAME = "run_cache_index.json"
+_REQUIRED = ("final_answer.md", "final_solution.py", RUN_CACHE_FILE)
+
+
+def normalize_question(question: str) -> str:
+    """Case-, whitespace- and trailing-punctuation-insensitive form of a question."""
+    text = unicodedata.normalize("NFKC", question).casefold()
+    return re.sub(r"\s+", " ", text).strip().rstrip("?.! ")
+
+
+def cache_key(question: str, files: List[str], provider: str, model: str, master_version: str, hash_root: Path) -> str:
+    """Digest of everything a converged run's answer depends on."""
+    hash_root.mkdir(parents=True, exist_ok=True)
+    fingerprints = []
+    for name in sorted({str(Path(name).resolve()) for name in files}):
+        path = Path(name)
+        fingerprints.append(f"{name}:{file_sha256(path, hash_root) if path.is_file() else 'missing'}")
+    parts = [normalize_question(question), provider, model, master_version, *fingerprints]
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+class RunCache:
+    """Index of converged runs by cache key, capped at `max_entries` (least recently used go first)."""
+
+    def __init__(self, run_root: Path, max_entries: int = 100) -> None:
+        self.run_root = run_root.resolve()
+        self.max_entries = max(1, max_entries)
+        self.path = run_root_cache_dir(self.run_root) / _INDEX_NAME
+        try:
+            self.entries: Dict[str, Dict[str, Any]] = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            self.entries = self.rebuild()
+
+    def _save(self) -> None:
+        if len(self.entries) > self.max_entries:
+            keep = sorted(self.entries.items(), key=lambda item: item[1].get("last_used", 0), reverse=True)
+            self.entries = dict(keep[: self.max_entries])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_json(self.path, self.entries)
+
+    def rebuild(self) -> Dict[str, Dict[str, Any]]:
+        """Re-index every converged run directory under the run root (newest wins per key)."""
+        entries: Dict[str, Dict[str, Any]] = {}
+        run_dirs = sorted(path for path in self.run_root.iterdir() if path.is_dir()) if self.run_root.is_dir() else []
+        for run_dir in run_dirs:
+            if not all((run_dir / name).is_file() for name in _REQUIRED):
+                continue
+            try:
+                info = json.loads((run_dir / RUN_CACHE_FILE).read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                continue
+            if info.get("key") and not info.get("hit") and not info.get("invalidated"):
+                entries[info["key"]] = {
+                    "run_dir": str(run_dir.resolve()),
+                    "question": info.get("question", ""),
+                    "last_used": (run_dir / "final_answer.md").stat().st_mtime,
+                }
+        return entries
+
+    def lookup(self, key: str) -> Optional[Path]:
+        """Run directory holding the cached answer for `key`; stale entries are dropped."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        run_dir = Path(entry["run_dir"])
+        if not all((run_dir / name).is_file() for name in _REQUIRED):
+            self.invalidate(key)
+            return None
+        entry["last_used"] = time.time()
+        self._save()
+        return run_dir
+
+    def store(self, key: str, run_dir: Path, question: str) -> None:
+        self.entries[key] = {"run_dir": str(run_dir.resolve()), "question": question, "last_used": time.time()}
+        self._save()
+
+    def invalidate(self, key: Optional[str] = None) -> int:
+        """Drop one key, or every entry when `key` is None; returns how many were removed.
+
+        The runs are marked invalidated too, so a rebuilt index does not bring them back.
+        """
+        keys = list(self.entries) if key is None else [key] if key in self.entries else []
+        for dropped in keys:
+            marker = Path(self.entries.pop(dropped)["run_dir"]) / RUN_CACHE_FILE
+            try:
+                info = json.loads(marker.read_text(encoding="utf-8"))
+                write_json(marker, {**info, "invalidated": True})
+            except (OSError, json.JSONDecodeError):
+                pass
+        self._save()
+        return len(keys)
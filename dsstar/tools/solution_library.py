@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from dsstar.runtime_paths import run_root_cache_dir
+from dsstar.tools.description_facts import described_columns
+from dsstar.tools.log_utils import write_json
+
+# Library of code that already ran successfully under a run root, for warm-
+# starting the coder and debugger on recurring data sources. Entries are indexed
+# by the inputs' analyzer signatures, their described columns and the question's
+# words; retrieval returns the single best match, cut to a bounded size.
+
+SNIPPET_CHARS = 4000
+_STORED_CHARS = 20000
+_MIN_SCORE = 0.35
+_INDEX_NAME = "solution_library.json"
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {"the", "a", "an", "of", "in", "on", "for", "to", "and", "or", "by", "is", "are", "what", "which", "with", "per", "each"}
+_ROUND_CODE_RE = re.compile(r"^round_(\d+)_code\.py$")
+
+
+def _words(text: str) -> Set[str]:
+    return {word for word in _WORD_RE.findall(text.casefold()) if word not in _STOPWORDS}
+
+
+def _jaccard(left: Set[str], right: Set[str]) -> float:
+    return len(left & right) / len(left | right) if left and right else 0.0
+
+
+def _family(signature: str) -> str:
+    # The size bucket changes as a source grows; structure is what carries over.
+    return "|".join(part for part in signature.split("|") if not part.startswith("size="))
+
+
+def input_profile(descriptions: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Signatures and described columns of the analyzed inputs."""
+    records = (descriptions.get("records") or {}).values() if isinstance(descriptions, dict) else []
+    signatures = {str(record["signature"]) for record in records if isinstance(record, dict) and record.get("signature")}
+    return {"signatures": sorted(signatures), "columns": sorted(described_columns(descriptions))}
+
+
+def bounded(code: str, max_chars: int) -> str:
+    """`code` cut at a line boundary to at most `max_chars`, marked when truncated."""
+    if len(code) <= max_chars:
+        return code
+    cut = code.rfind("\n", 0, max_chars)
+    return code[: cut if cut > 0 else max_chars].rstrip() + "\n# ... (truncated)\n"
+
+
+def _exit_code(exec_path: Path) -> Optional[int]:
+    try:
+        return int(json.loads(exec_path.read_text(encoding="utf-8")).get("exit_code", 1))
+    except (OSError, ValueError, TypeError, json.JSONDecodeError):
+        return None
+
+
+class SolutionLibrary:
+    """Successful scripts from earlier runs under one run root, at most `max_entries` (oldest dropped)."""
+
+    def __init__(self, run_root: Path, max_entries: int = 500) -> None:
+        self.path = run_root_cache_dir(run_root.resolve()) / _INDEX_NAME
+        self.max_entries = max(1, max_entries)
+        try:
+            self.entries: Dict[str, Dict[str, Any]] = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            self.entries = {}
+
+    def _save(self) -> None:
+        if len(self.entries) > self.max_entries:
+            newest = sorted(self.entries.items(), key=lambda item: item[1].get("added", 0), reverse=True)
+            self.entries = dict(newest[: self.max_entries])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_json(self.path, self.entries)
+
+    def add(self, code: str, question: str, descriptions: Dict[str, Any], source: str, kind: str) -> bool:
+        """Index one successful script; False when it is empty or already indexed."""
+        if not code.strip():
+            return False
+        key = hashlib.sha256(code.encode("utf-8")).hexdigest()[:24]
+        if key in self.entries:
+            return False
+        self.entries[key] = {
+            "source": source,
+            "kind": kind,
+            "question": question,
+            **input_profile(descriptions),
+            "code": bounded(code, _STORED_CHARS),
+            "added": time.time(),
+        }
+        return True
+
+    def add_run(self, run_dir: Path, question: str, descriptions: Dict[str, Any]) -> int:
+        """Index a run's final solution and every round script whose last execution succeeded."""
+        scripts = []
+        if _exit_code(run_dir / "final_solution_exec.json") == 0:
+            scripts.append((run_dir / "final_solution.py", "final"))
+        for path in sorted(run_dir.glob("round_*_code.py")):
+            match = _ROUND_CODE_RE.match(path.name)
+            if match and _exit_code(run_dir / f"round_{match.group(1)}_exec.json") == 0:
+                scripts.append((path, "round"))
+        added = 0
+        for path, kind in scripts:
+            added += self.add(path.read_text(encoding="utf-8"), question, descriptions, str(path.resolve()), kind)
+        if added:
+            self._save()
+        return added
+
+    def best(self, question: str, descriptions: Dict[str, Any], max_chars: int = SNIPPET_CHARS) -> Optional[Dict[str, Any]]:
+        """The most relevant indexed script for these inputs and question, or None below the relevance bar."""
+        profile = input_profile(descriptions)
+        signatures = set(profile["signatures"])
+        families = {_family(signature) for signature in signatures}
+        columns = set(profile["columns"])
+        words = _words(question)
+        ranked = []
+        for entry in self.entries.values():
+            exact = len(signatures & set(entry["signatures"])) / len(signatures) if signatures else 0.0
+            family = len(families & {_family(s) for s in entry["signatures"]}) / len(families) if families else 0.0
+            data = max(exact, 0.7 * family)
+            column_overlap = _jaccard(columns, set(entry["columns"]))
+            if data == 0 and column_overlap < 0.5:
+                continue  # a different data source
+            score = 0.5 * data + 0.3 * column_overlap + 0.2 * _jaccard(words, _words(entry["question"]))
+            score += 0.05 if entry["kind"] == "final" else 0.0
+            ranked.append((round(score, 4), entry.get("added", 0), entry))
+        if not ranked:
+            return None
+        score, _, entry = max(ranked, key=lambda item: (item[0], item[1]))
+        if score < _MIN_SCORE:
+            return None
+        return {
+            "source": entry["source"],
+            "kind": entry["kind"],
+            "question": entry["question"],
+            "score": score,
+            "code": bounded(entry["code"], max_chars),
+        }
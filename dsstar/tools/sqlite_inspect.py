@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Stdlib-only SQLite inspection for the analyzer and the master describer (which
+# imports it from a child process). Connections are read-only, and immutable (no
+# locks, no journal reads) unless a -wal/-journal file shows a writer may be
+# active, in which case plain read-only mode sees its committed changes.
+# Exact COUNT(*) runs only when sqlite_stat1 has no estimate, and is interrupted
+# through the progress handler once its time budget is spent.
+
+COUNT_BUDGET_SEC = 2.0
+TOTAL_BUDGET_SEC = 10.0
+WORKERS = 4
+_PROGRESS_OPCODES = 10_000
+
+
+def connect_readonly(path: Path) -> sqlite3.Connection:
+    """Read-only connection; immutable only when no -wal/-journal file shows the database may be live."""
+    resolved = path.resolve()
+    live = any(resolved.with_name(resolved.name + suffix).exists() for suffix in ("-wal", "-journal"))
+    uri = "file:" + urllib.parse.quote(str(resolved)) + ("?mode=ro" if live else "?mode=ro&immutable=1")
+    return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _bounded(conn: sqlite3.Connection, sql: str, params: Tuple[Any, ...], budget_sec: float) -> Optional[List[Any]]:
+    """Run `sql`, returning None if it is still running after `budget_sec`."""
+    deadline = time.perf_counter() + max(budget_sec, 0.0)
+    conn.set_progress_handler(lambda: 1 if time.perf_counter() > deadline else 0, _PROGRESS_OPCODES)
+    try:
+        return conn.execute(sql, params).fetchall()
+    except sqlite3.OperationalError as exc:
+        if "interrupt" in str(exc).lower():
+            return None
+        raise
+    finally:
+        conn.set_progress_handler(None, 0)
+
+
+def _stat1_rows(conn: sqlite3.Connection) -> Dict[str, int]:
+    try:
+        rows = conn.execute("SELECT tbl, stat FROM sqlite_stat1").fetchall()
+    except sqlite3.DatabaseError:
+        return {}
+    estimates: Dict[str, int] = {}
+    for table, stat in rows:
+        try:
+            estimates[str(table)] = max(estimates.get(str(table), 0), int(str(stat).split()[0]))
+        except (ValueError, IndexError):
+            continue
+    return estimates
+
+
+def _table_stats(
+    path: Path,
+    table: str,
+    stat1: Dict[str, int],
+    local: threading.local,
+    deadline: float,
+    count_budget_sec: float,
+) -> Dict[str, Any]:
+    conn = getattr(local, "conn", None)
+    if conn is None:
+        conn = local.conn = connect_readonly(path)
+    quoted = _quote(table)
+    columns = [
+        {"name": row[1], "type": row[2] or "", "notnull": bool(row[3]), "pk": int(row[5])}
+        for row in conn.execute(f"PRAGMA table_info({quoted})").fetchall()
+    ]
+    indexes = []
+    for row in conn.execute(f"PRAGMA index_list({quoted})").fetchall():
+        name, unique, origin = row[1], bool(row[2]), row[3] if len(row) > 3 else "c"
+        indexed = [info[2] for info in conn.execute(f"PRAGMA index_info({_quote(name)})").fetchall()]
+        indexes.append({"name": name, "columns": indexed, "unique": unique, "origin": origin})
+
+    info: Dict[str, Any] = {"table": table, "columns": columns, "indexes": indexes}
+    if table in stat1:
+        info["rows"], info["rows_source"] = stat1[table], "sqlite_stat1"
+    else:
+        remaining = min(count_budget_sec, deadline - time.perf_counter())
+        counted = _bounded(conn, f"SELECT COUNT(*) FROM {quoted}", (), remaining) if remaining > 0 else None
+        info["rows"] = int(counted[0][0]) if counted else None
+        info["rows_source"] = "count" if counted else "count_timeout"
+    try:
+        remaining = min(count_budget_sec, deadline - time.perf_counter())
+        sized = _bounded(
+            conn, "SELECT SUM(pgsize) FROM dbstat WHERE name = ? AND aggregate = 1", (table,), remaining
+        ) if remaining > 0 else None
+        info["size_bytes"] = int(sized[0][0]) if sized and sized[0][0] is not None else None
+    except sqlite3.DatabaseError:
+        info["size_bytes"] = None  # dbstat not compiled in
+    return info
+
+
+def inspect_sqlite(
+    path: Path,
+    count_budget_sec: float = COUNT_BUDGET_SEC,
+    total_budget_sec: float = TOTAL_BUDGET_SEC,
+    workers: int = WORKERS,
+) -> Dict[str, Any]:
+    """Tables, columns, indexes, row counts and sizes of a SQLite database, read-only.
+
+    Row counts come from `sqlite_stat1` when ANALYZE has run, otherwise from a
+    COUNT(*) capped at `count_budget_sec` per table (`rows` is None past it).
+    Tables are inspected on `workers` threads, each with its own connection.
+    """
+    started = time.perf_counter()
+    conn = connect_readonly(path)
+    try:
+        page_size = int(conn.execute("PRAGMA page_size").fetchone()[0])
+        page_count = int(conn.execute("PRAGMA page_count").fetchone()[0])
+        freelist = int(conn.execute("PRAGMA freelist_count").fetchone()[0])
+        objects = conn.execute(
+            "SELECT type, name FROM sqlite_master WHERE type IN ('table', 'view') AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        ).fetchall()
+        stat1 = _stat1_rows(conn)
+    finally:
+        conn.close()
+
+    tables = [str(name) for kind, name in objects if kind == "table"]
+    deadline = started + total_budget_sec
+    local = threading.local()
+    opened: List[sqlite3.Connection] = []
+
+    def task(table: str) -> Dict[str, Any]:
+        info = _table_stats(path, table, stat1, local, deadline, count_budget_sec)
+        if local.conn not in opened:
+            opened.append(local.conn)
+        return info
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(tables) or 1))) as pool:
+            table_info = list(pool.map(task, tables))
+    finally:
+        for handle in opened:
+            handle.close()
+    return {
+        "type": "sqlite",
+        "page_size": page_size,
+        "page_count": page_count,
+        "freelist_pages": freelist,
+        "file_size": path.stat().st_size,
+        "analyzed": bool(stat1),
+        "tables": table_info,
+        "views": [str(name) for kind, name in objects if kind == "view"],
+        "scan_sec": round(time.perf_counter() - started, 3),
+    }
+
+
+def summary_lines(summary: Dict[str, Any], max_tables: int = 30) -> List[str]:
+    """KEY=value lines in the master describer's output format."""
+    tables = summary.get("tables", [])
+    lines = [
+        "TABLES=" + ",".join(t["table"] for t in tables),
+        f"PAGES={summary.get('page_count')}x{summary.get('page_size')}B,FREELIST={summary.get('freelist_pages')}",
+    ]
+    if summary.get("views"):
+        lines.append("VIEWS=" + ",".join(summary["views"]))
+    for table in tables[:max_tables]:
+        name = table["table"]
+        columns = ",".join(
+            f"{c['name']} {c['type']}".strip() + (" PK" if c["pk"] else "") for c in table["columns"]
+        )
+        lines.append(f"TABLE_{name}_COLUMNS={columns}")
+        lines.append(
+            f"TABLE_{name}_ROWS={table.get('rows') if table.get('rows') is not None else 'unknown'}"
+            f" ({table.get('rows_source')}),SIZE_BYTES={table.get('size_bytes')}"
+        )
+        if table["indexes"]:
+            lines.append(
+                f"TABLE_{name}_INDEXES="
+                + ";".join(
+                    f"{ix['name']}({','.join(str(col) for col in ix['columns'])}){' UNIQUE' if ix['unique'] else ''}"
+                    for ix in table["indexes"]
+                )
+            )
+    if len(tables) > max_tables:
+        lines.append(f"TABLES_TRUNCATED={len(tables) - max_tables}")
+    return lines
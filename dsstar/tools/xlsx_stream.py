@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import copy
+import functools
+import posixpath
+import re
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Stdlib-only XLSX inspection straight from the zip's XML parts, so the master
+# describer (run in a child process) can import it and no workbook is ever fully
+# loaded. Sheet sizes come from <dimension>; rows are streamed with iterparse
+# only for the header/sample (or for counting when <dimension> is missing), and
+# shared strings are parsed just far enough to resolve the sampled cells.
+
+SAMPLE_ROWS = 5
+MAX_COUNT_SEC = 5.0
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_CELL_REF = re.compile(r"^([A-Z]+)(\d+)$")
+
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for char in letters:
+        index = index * 26 + (ord(char) - 64)
+    return index - 1
+
+
+def _parse_ref(ref: str) -> Optional[Tuple[int, int]]:
+    match = _CELL_REF.match(ref.upper())
+    if not match:
+        return None
+    return int(match.group(2)), _column_index(match.group(1)) + 1
+
+
+class _SharedStrings:
+    """Shared-string table read incrementally up to the highest index asked for."""
+
+    def __init__(self, archive: zipfile.ZipFile) -> None:
+        self._items: List[str] = []
+        self._events: Optional[Iterator[Tuple[str, ET.Element]]] = None
+        if "xl/sharedStrings.xml" in archive.namelist():
+            self._events = ET.iterparse(archive.open("xl/sharedStrings.xml"), events=("end",))
+
+    def get(self, index: int) -> str:
+        while index >= len(self._items) and self._events is not None:
+            try:
+                _, elem = next(self._events)
+            except StopIteration:
+                self._events = None
+                break
+            if elem.tag == f"{_NS}si":
+                self._items.append("".join(node.text or "" for node in elem.iter(f"{_NS}t")))
+                elem.clear()
+        return self._items[index] if index < len(self._items) else ""
+
+
+def _sheet_parts(archive: zipfile.ZipFile) -> List[Tuple[str, str]]:
+    workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+    targets: Dict[str, str] = {}
+    if "xl/_rels/workbook.xml.rels" in archive.namelist():
+        for rel in ET.fromstring(archive.read("xl/_rels/workbook.xml.rels")).iter(f"{_PKG_REL_NS}Relationship"):
+            target = rel.get("Target", "")
+            targets[rel.get("Id", "")] = target.lstrip("/") if target.startswith("/") else posixpath.normpath(f"xl/{target}")
+    sheets: List[Tuple[str, str]] = []
+    for position, sheet in enumerate(workbook.iter(f"{_NS}sheet"), start=1):
+        part = targets.get(sheet.get(f"{_REL_NS}id", ""), f"xl/worksheets/sheet{position}.xml")
+        sheets.append((sheet.get("name", f"Sheet{position}"), part))
+    return sheets
+
+
+def _cell_value(cell: ET.Element, strings: _SharedStrings) -> str:
+    kind = cell.get("t", "n")
+    if kind == "inlineStr":
+        return "".join(node.text or "" for node in cell.iter(f"{_NS}t"))
+    raw = cell.findtext(f"{_NS}v") or ""
+    if kind == "s" and raw:
+        try:
+            return strings.get(int(raw))
+        except ValueError:
+            return raw
+    if kind == "b":
+        return "TRUE" if raw == "1" else "FALSE"
+    return raw
+
+
+def _inspect_sheet(
+    archive: zipfile.ZipFile, part: str, strings: _SharedStrings, sample_rows: int, max_count_sec: float
+) -> Dict[str, Any]:
+    info: Dict[str, Any] = {"dimension": None, "rows": None, "columns": None, "rows_source": None}
+    head: List[List[str]] = []
+    seen_rows = 0
+    max_columns = 0
+    started = time.perf_counter()
+    complete = True
+    sheet_data: Optional[ET.Element] = None
+    with archive.open(part) as handle:
+        for event, elem in ET.iterparse(handle, events=("start", "end")):
+            if event == "start":
+                if elem.tag == f"{_NS}sheetData":
+                    sheet_data = elem
+                continue
+            if elem.tag == f"{_NS}dimension":
+                info["dimension"] = elem.get("ref")
+                bounds = [_parse_ref(ref) for ref in str(info["dimension"] or "").split(":")]
+                if len(bounds) == 2 and all(bounds):
+                    (first_row, first_col), (last_row, last_col) = bounds  # type: ignore[misc]
+                    info["rows"], info["columns"] = last_row - first_row + 1, last_col - first_col + 1
+                    info["rows_source"] = "dimension"
+            elif elem.tag == f"{_NS}row":
+                seen_rows += 1
+                if len(head) <= sample_rows:
+                    values: List[str] = []
+                    for cell in elem.iter(f"{_NS}c"):
+                        ref = _parse_ref(cell.get("r", ""))
+                        column = ref[1] - 1 if ref else len(values)
+                        values.extend([""] * (column - len(values)))
+                        values.append(_cell_value(cell, strings))
+                    max_columns = max(max_columns, len(values))
+                    head.append(values)
+                if sheet_data is not None:
+                    sheet_data.clear()  # drop finished rows so memory stays flat
+                if len(head) > sample_rows:
+                    if info["rows_source"] == "dimension":
+                        break
+                    if time.perf_counter() - started >= max_count_sec:
+                        complete = False
+                        break
+    if info["rows_source"] is None:
+        info["rows"], info["columns"] = seen_rows, max_columns
+        info["rows_source"] = "scan" if complete else "scan_partial"
+    info["header"] = head[0] if head else []
+    info["sample_rows"] = head[1:]
+    return info
+
+
+def inspect_archive(
+    archive: zipfile.ZipFile, sample_rows: int = SAMPLE_ROWS, max_count_sec: float = MAX_COUNT_SEC
+) -> Dict[str, Any]:
+    """`inspect_xlsx` for an already opened workbook archive (e.g. one nested in a zip)."""
+    strings = _SharedStrings(archive)
+    sheets = []
+    for name, part in _sheet_parts(archive):
+        info = _inspect_sheet(archive, part, strings, sample_rows, max_count_sec) if part in archive.namelist() else {}
+        sheets.append({"name": name, **info})
+    return {"type": "xlsx", "sheet_count": len(sheets), "sheets": sheets}
+
+
+@functools.lru_cache(maxsize=64)
+def _inspect_cached(resolved: str, _mtime_ns: int, _size: int, sample_rows: int, max_count_sec: float) -> Dict[str, Any]:
+    with zipfile.ZipFile(resolved) as archive:
+        return inspect_archive(archive, sample_rows, max_count_sec)
+
+
+def inspect_xlsx(path: Path, sample_rows: int = SAMPLE_ROWS, max_count_sec: float = MAX_COUNT_SEC) -> Dict[str, Any]:
+    """Per-sheet row/column counts, header row and sample rows of an .xlsx/.xlsm workbook.
+
+    Results are memoized per (path, mtime, size), so the signature probe and the
+    heuristic description of the same file share one pass over the archive.
+    Raises `zipfile.BadZipFile` or `KeyError` for files that are not OOXML workbooks.
+    """
+    stat = path.stat()
+    return copy.deepcopy(_inspect_cached(str(path.resolve()), stat.st_mtime_ns, stat.st_size, sample_rows, max_count_sec))
+
+
+def summary_lines(summary: Dict[str, Any]) -> List[str]:
+    """KEY=value lines in the master describer's output format."""
+    sheets = summary.get("sheets", [])
+    lines = ["SHEETS=" + ",".join(str(sheet["name"]) for sheet in sheets)]
+    for sheet in sheets:
+        lines.append(
+            f"SHEET_{sheet['name']}=rows={sheet.get('rows')},columns={sheet.get('columns')},"
+            f"source={sheet.get('rows_source')}"
+        )
+        if sheet.get("header"):
+            lines.append(f"SHEET_{sheet['name']}_HEADER=" + ",".join(sheet["header"]))
+        for idx, row in enumerate(sheet.get("sample_rows", [])[:3], start=1):
+            lines.append(f"SHEET_{sheet['name']}_ROW{idx}=" + ",".join(row))
+    return lines
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import io
+import os
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, List, Optional
+
+from dsstar.tools.describe_files import describe_csv_handle
+from dsstar.tools.json_stream import scan_json_stream
+from dsstar.tools.json_stream import summary_lines as json_summary_lines
+from dsstar.tools.xlsx_stream import inspect_archive
+from dsstar.tools.xlsx_stream import summary_lines as xlsx_summary_lines
+
+# Describes zip inputs member by member, streaming each one out of the archive
+# (nothing is extracted to disk). Listing is free; describing charges bytes read
+# against a budget: CSV heads are always sampled, row counting and JSON scans
+# stop at the remaining budget, and XLSX / nested zip members (which need their
+# whole body decompressed to reach the central directory) are skipped once
+# their size no longer fits. An XLSX is charged its size; a nested zip is
+# charged only through the members it describes.
+
+DEFAULT_BUDGET_MB = 64
+BUDGET_ENV = "DSSTAR_ZIP_BUDGET_MB"
+MAX_LISTED = 200
+MAX_DESCRIBED = 20
+MAX_DEPTH = 2
+_COUNT_CHUNK = 1024 * 1024
+_DELIMITED = {".csv": ",", ".tsv": "\t"}
+_JSON = {".json", ".jsonl", ".ndjson"}
+_WORKBOOKS = {".xlsx", ".xlsm"}
+
+
+def default_budget_bytes() -> int:
+    try:
+        return int(float(os.environ.get(BUDGET_ENV, DEFAULT_BUDGET_MB)) * 1024 * 1024)
+    except ValueError:
+        return DEFAULT_BUDGET_MB * 1024 * 1024
+
+
+class _Budget:
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.used = 0
+
+    @property
+    def remaining(self) -> int:
+        return max(self.limit - self.used, 0)
+
+
+def _describe_delimited(archive: zipfile.ZipFile, info: zipfile.ZipInfo, delimiter: str, budget: _Budget) -> Dict[str, Any]:
+    with archive.open(info) as raw:
+        facts = describe_csv_handle(io.TextIOWrapper(raw, encoding="utf-8", errors="replace", newline=""), delimiter)
+    facts["type"] = "tsv" if delimiter == "\t" else "csv"
+    lines = 0
+    consumed = 0
+    last = b"\n"
+    with archive.open(info) as raw:
+        while consumed < budget.remaining:
+            chunk = raw.read(min(_COUNT_CHUNK, budget.remaining - consumed))
+            if not chunk:
+                break
+            consumed += len(chunk)
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    budget.used += consumed
+    complete = consumed >= info.file_size
+    if complete:
+        lines += 0 if last == b"\n" or not consumed else 1
+        facts["rows"] = max(lines - 1, 0)
+    else:
+        facts["rows"] = int(lines * info.file_size / max(consumed, 1))
+    facts["rows_estimated"] = not complete
+    return facts
+
+
+def _describe_member(archive: zipfile.ZipFile, info: zipfile.ZipInfo, budget: _Budget, depth: int) -> Optional[Dict[str, Any]]:
+    suffix = PurePosixPath(info.filename).suffix.lower()
+    if suffix in _DELIMITED:
+        return _describe_delimited(archive, info, _DELIMITED[suffix], budget)
+    if suffix in _JSON:
+        facts = scan_json_stream(lambda: archive.open(info), info.file_size, info.filename, max_scan_bytes=max(budget.remaining, 1))
+        budget.used += min(int(facts.get("bytes_scanned") or 0), info.file_size)
+        return {"type": "json", **facts}
+    if suffix in _WORKBOOKS or (suffix == ".zip" and depth < MAX_DEPTH):
+        if info.file_size > budget.remaining:
+            return {"type": suffix.lstrip("."), "skipped": "byte budget exhausted"}
+        with archive.open(info) as raw, zipfile.ZipFile(raw) as nested:
+            if suffix == ".zip":
+                # Charged through the inner members it describes, not its own size as well.
+                return _describe_archive(nested, budget, depth + 1)
+            budget.used += info.file_size
+            return inspect_archive(nested)
+    return None
+
+
+def _describe_archive(archive: zipfile.ZipFile, budget: _Budget, depth: int) -> Dict[str, Any]:
+    members = [info for info in archive.infolist() if not info.is_dir()]
+    described: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    skipped: List[str] = []
+    for info in members:
+        if PurePosixPath(info.filename).name.startswith(".") or info.filename.startswith("__MACOSX/"):
+            continue
+        if len(described) >= MAX_DESCRIBED or budget.remaining <= 0:
+            skipped.append(info.filename)
+            continue
+        try:
+            facts = _describe_member(archive, info, budget, depth)
+        except Exception as exc:  # pylint: disable=broad-except
+            errors[info.filename] = str(exc)
+            continue
+        if facts is not None:
+            described[info.filename] = facts
+    return {
+        "type": "zip",
+        "member_count": len(members),
+        "total_uncompressed": sum(info.file_size for info in members),
+        "members": [
+            {"name": info.filename, "size": info.file_size, "compressed_size": info.compress_size}
+            for info in members[:MAX_LISTED]
+        ],
+        "described": described,
+        "skipped_for_budget": skipped,
+        "errors": errors,
+    }
+
+
+def describe_zip(path: Path, budget_bytes: Optional[int] = None) -> Dict[str, Any]:
+    """List a zip's members and describe its tabular ones straight from the archive.
+
+    CSV/TSV, JSON/JSONL and XLSX members (and members of nested zips, up to
+    `MAX_DEPTH`) are described while `budget_bytes` of member data remain;
+    the default comes from `DSSTAR_ZIP_BUDGET_MB` (64 MB).
+    """
+    budget = _Budget(default_budget_bytes() if budget_bytes is None else budget_bytes)
+    with zipfile.ZipFile(path) as archive:
+        summary = _describe_archive(archive, budget, 0)
+    summary["budget_bytes"] = budget.limit
+    summary["budget_used"] = budget.used
+    return summary
+
+
+def _member_lines(prefix: str, facts: Dict[str, Any]) -> List[str]:
+    kind = facts.get("type")
+    if facts.get("skipped"):
+        return [f"{prefix}SKIPPED={facts['skipped']}"]
+    if kind in {"csv", "tsv"}:
+        rows = f"{facts.get('rows')}" + (" (estimated)" if facts.get("rows_estimated") else "")
+        lines = [f"{prefix}COLUMNS=" + ",".join(facts.get("header", [])), f"{prefix}ROW_COUNT={rows}"]
+        if facts.get("sample_rows"):
+            lines.append(f"{prefix}FIRST_DATA_ROW=" + ",".join(facts["sample_rows"][0]))
+        return lines
+    if kind == "json":
+        return [prefix + line for line in json_summary_lines(facts, max_fields=20)]
+    if kind == "xlsx":
+        return [prefix + line for line in xlsx_summary_lines(facts)]
+    if kind == "zip":
+        return [prefix + line for line in summary_lines(facts)]
+    return []
+
+
+def summary_lines(summary: Dict[str, Any], max_members: int = 30) -> List[str]:
+    """KEY=value lines in the master describer's output format."""
+    lines = [
+        f"ZIP_MEMBERS={summary.get('member_count')}",
+        f"ZIP_UNCOMPRESSED_BYTES={summary.get('total_uncompressed')}",
+    ]
+    for member in summary.get("members", [])[:max_members]:
+        lines.append(f"MEMBER={member['name']},size={member['size']}")
+    for name, facts in summary.get("described", {}).items():
+        lines.extend(_member_lines(f"MEMBER[{name}].", facts))
+    if summary.get("skipped_for_budget"):
+        lines.append(f"NOT_DESCRIBED={len(summary['skipped_for_budget'])} member(s) past the byte budget")
+    if summary.get("described"):
+        lines.append("READ_MEMBERS_WITH=zipfile.ZipFile(path).open(member) (pandas.read_csv accepts the handle)")
+    return lines
@@ -1,3 +1,3 @@
-from dsstar.utils.diff_utils import write_unified_diff
+from dsstar.utils.diff_utils import PatchError, apply_edits, apply_unified_diff, write_unified_diff
 
-__all__ = ["write_unified_diff"]
+__all__ = ["PatchError", "apply_edits", "apply_unified_diff", "write_unified_diff"]
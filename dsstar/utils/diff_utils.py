@@ -1,7 +1,15 @@
 from __future__ import annotations
 
 import difflib
+import re
 from pathlib import Path
+from typing import Any, List, Sequence, Tuple
+
+_HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class PatchError(ValueError):
+    """A patch or edit list that does not apply cleanly to the text it targets."""
 
 
 def write_unified_diff(old_text: str, new_text: str, out_path: Path, rel_path: str) -> None:
@@ -15,3 +23,83 @@ def write_unified_diff(old_text: str, new_text: str, out_path: Path, rel_path: s
         tofile=f"b/{rel_path}",
     )
     out_path.write_text("".join(diff), encoding="utf-8")
+
+
+def _parse_hunks(diff_text: str) -> List[Tuple[int, List[str], List[str]]]:
+    hunks: List[Tuple[int, List[str], List[str]]] = []
+    current = None
+    for line in diff_text.splitlines():
+        match = _HUNK_RE.match(line)
+        if match:
+            current = (int(match.group(1)), [], [])
+            hunks.append(current)
+            continue
+        if current is None or line.startswith(("--- ", "+++ ", "\\ No newline")):
+            continue
+        marker, body = (line[:1], line[1:]) if line else (" ", "")
+        if marker == " ":
+            current[1].append(body)
+            current[2].append(body)
+        elif marker == "-":
+            current[1].append(body)
+        elif marker == "+":
+            current[2].append(body)
+        else:
+            raise PatchError(f"unexpected line in hunk: {line!r}")
+    if not hunks:
+        raise PatchError("no @@ hunks found")
+    return hunks
+
+
+def _find_block(lines: Sequence[str], block: Sequence[str], hint: int, start: int) -> int:
+    size = len(block)
+    if lines[hint : hint + size] == list(block) and hint >= start:
+        return hint
+    found = [at for at in range(start, len(lines) - size + 1) if lines[at : at + size] == list(block)]
+    if len(found) != 1:
+        raise PatchError(f"hunk context {'not found' if not found else 'is ambiguous'}: {block[:1]!r}")
+    return found[0]
+
+
+def apply_unified_diff(old_text: str, diff_text: str) -> str:
+    """Apply a unified diff to `old_text`; context and removed lines must match exactly.
+
+    The hunk header's line number is only a hint: a hunk whose old lines are not
+    there is placed at their single later occurrence, and rejected if there is
+    none or more than one. Header line counts are not trusted.
+    """
+    lines = old_text.splitlines()
+    out: List[str] = []
+    cursor = 0
+    for old_start, old_block, new_block in _parse_hunks(diff_text):
+        if not old_block:
+            at = min(max(old_start, cursor), len(lines))  # pure insertion after line old_start
+        else:
+            at = _find_block(lines, old_block, max(old_start - 1, 0), cursor)
+        out.extend(lines[cursor:at])
+        out.extend(new_block)
+        cursor = at + len(old_block)
+    out.extend(lines[cursor:])
+    return "\n".join(out) + "\n"
+
+
+def apply_edits(old_text: str, edits: Any) -> str:
+    """Apply [{"old": ..., "new": ...}] replacements; each `old` must occur exactly once.
+
+    An empty `old` appends `new` to the end of the text.
+    """
+    if not isinstance(edits, list) or not edits:
+        raise PatchError("edits must be a non-empty list")
+    text = old_text
+    for edit in edits:
+        if not isinstance(edit, dict) or not isinstance(edit.get("old"), str) or not isinstance(edit.get("new"), str):
+            raise PatchError(f"malformed edit: {edit!r}")
+        old, new = edit["old"], edit["new"]
+        if not old:
+            text = text.rstrip("\n") + "\n" + new.rstrip("\n") + "\n"
+            continue
+        count = text.count(old)
+        if count != 1:
+            raise PatchError(f"edit target occurs {count} times: {old.splitlines()[0][:80]!r}")
+        text = text.replace(old, new, 1)
+    return text
@@ -0,0 +1,75 @@
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+from dsstar.agents.planner.planner import run_batch
+from dsstar.llm.base import LLMClient
+from dsstar.loop import run_loop
+
+
+@dataclass
+class _FixedClient(LLMClient):
+    name: str = "test"
+    model: str = "test-model"
+    response: str = ""
+
+    def complete(self, prompt: str) -> str:
+        return self.response
+
+
+def test_run_batch_numbers_steps_after_the_plan_and_caps_them() -> None:
+    plan = [{"id": 4, "title": "Load", "details": "", "status": "done"}]
+    steps = [{"id": 1, "title": f"Step {n}", "details": f"do {n}"} for n in range(5)]
+
+    out = run_batch("q", {}, plan, None, _FixedClient(response=json.dumps(steps)), max_steps=3)
+    assert [(step["id"], step["title"], step["status"]) for step in out] == [
+        (5, "Step 0", "todo"), (6, "Step 1", "todo"), (7, "Step 2", "todo"),
+    ]
+    wrapped = run_batch("q", {}, [], None, _FixedClient(response=json.dumps({"steps": steps[:1]})), max_steps=3)
+    assert [step["title"] for step in wrapped] == ["Step 0"]
+    single = run_batch("q", {}, [], None, _FixedClient(response=json.dumps(steps[2])), max_steps=3)
+    assert [step["title"] for step in single] == ["Step 2"]
+    prose = run_batch("q", {}, [], None, _FixedClient(response="Load the file, then sum."), max_steps=3)
+    assert prose == [{"id": 1, "title": "Plan step", "details": "Load the file, then sum.", "status": "todo"}]
+
+
+@dataclass
+class _ThreeStepClient(LLMClient):
+    name: str = "test"
+    model: str = "test-model"
+    roles: List[str] = field(default_factory=list)
+
+    def complete(self, prompt: str) -> str:
+        role = prompt.split("ROLE: ", 1)[1].split("\n", 1)[0].strip()
+        self.roles.append(role)
+        if role == "PLANNER_BATCH":
+            return json.dumps([{"title": name, "details": name} for name in ("Load", "Clean", "Sum")])
+        if role == "PLANNER":
+            return json.dumps({"title": "Next", "details": "next"})
+        if role == "CODER":
+            return "print('ok')\n"
+        if role == "VERIFIER":
+            done = self.roles.count("VERIFIER") >= 3
+            return json.dumps({"sufficient": done, "reason": "", "missing": [], "next_action": "stop" if done else "add_step"})
+        if role == "ROUTER":
+            return json.dumps({"action": "add_step", "backtrack_to_step_id": None})
+        if role == "FINALYZER_CODE":
+            return "print('answer')\n"
+        return "The answer."
+
+
+def test_batch_plan_needs_one_planner_call_and_usage_is_recorded(tmp_path: Path) -> None:
+    batch_client, step_client = _ThreeStepClient(), _ThreeStepClient()
+
+    batch_run = run_loop("q", [], batch_client, max_rounds=5, timeout_sec=20, run_root=tmp_path / "a", plan_batch_size=4)
+    step_run = run_loop("q", [], step_client, max_rounds=5, timeout_sec=20, run_root=tmp_path / "b")
+
+    plan = json.loads((batch_run / "plan.json").read_text(encoding="utf-8"))
+    assert [step["title"] for step in plan] == ["Load", "Clean", "Sum"]
+    batch_usage = json.loads((batch_run / "llm_usage.json").read_text(encoding="utf-8"))
+    step_usage = json.loads((step_run / "llm_usage.json").read_text(encoding="utf-8"))
+    assert batch_usage["converged"] and step_usage["converged"]
+    assert batch_usage["by_role"]["PLANNER_BATCH"]["calls"] == 1 and "PLANNER" not in batch_usage["by_role"]
+    assert step_usage["by_role"]["PLANNER"]["calls"] == 3
+    assert batch_usage["calls"] == step_usage["calls"] - 2 == len(batch_client.roles)
@@ -0,0 +1,85 @@
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+from dsstar.llm.base import LLMClient
+from dsstar.llm.usage import UsageTrackingClient
+from dsstar.loop import run_loop
+from dsstar.tools.budget import RunBudget
+
+
+@dataclass
+class _HttpClient(LLMClient):
+    name: str = "test"
+    model: str = "test-model"
+    timeout_sec: int = 60
+
+    def complete(self, prompt: str) -> str:
+        return "x" * 400
+
+
+def test_timeouts_shrink_and_rounds_stop_before_the_reserve() -> None:
+    now = [0.0]
+    usage = UsageTrackingClient(_HttpClient())
+    budget = RunBudget(usage, max_wall_sec=100, clock=lambda: now[0])
+
+    assert budget.exec_timeout(30) == 30 and budget.begin_round()
+    now[0] = 30.0
+    assert budget.begin_round() and budget.rounds == [{"seconds": 30.0, "tokens": 0}]
+    now[0] = 70.0
+    # 30s left and 15s reserved for the finalyzer: only the final pass may use the rest.
+    assert budget.exec_timeout(30) == 15 and budget.exec_timeout(30, final=True) == 30
+    budget.cap_http_timeout()
+    assert usage.inner.timeout_sec == 30
+    assert not budget.begin_round() and budget.exhausted == "wall_clock"
+    budget.mark("loop")
+    assert budget.summary()["phases"]["loop"]["seconds"] == 70.0
+
+    tokens = RunBudget(UsageTrackingClient(_HttpClient()), max_tokens=1000)
+    assert tokens.begin_round()
+    tokens.usage.complete("p" * 400)  # about 200 tokens
+    assert tokens.begin_round()
+    for _ in range(2):
+        tokens.usage.complete("p" * 400)
+    assert not tokens.begin_round() and tokens.exhausted == "tokens"
+    assert RunBudget(usage).exec_timeout(30) == 30 and not RunBudget(usage).limited
+
+
+@dataclass
+class _NeverSufficientClient(LLMClient):
+    name: str = "test"
+    model: str = "test-model"
+    roles: List[str] = field(default_factory=list)
+    report_prompt: str = ""
+
+    def complete(self, prompt: str) -> str:
+        role = prompt.split("ROLE: ", 1)[1].split("\n", 1)[0].strip() if "ROLE: " in prompt else ""
+        self.roles.append(role)
+        if role == "PLANNER":
+            return json.dumps({"title": f"Step {self.roles.count(role)}", "details": "Count rows."})
+        if role in {"CODER", "FINALYZER_CODE"}:
+            return f"print('rows=', {self.roles.count(role)})\n"
+        if role == "VERIFIER":
+            return json.dumps({"sufficient": False, "reason": "needs more", "missing": ["per-group counts"], "next_action": "add_step"})
+        if role == "ROUTER":
+            return json.dumps({"action": "add_step"})
+        if role == "FINALYZER_REPORT":
+            self.report_prompt = prompt
+        return "Rows counted."
+
+
+def test_exhausted_token_budget_ends_with_a_best_effort_answer(tmp_path: Path) -> None:
+    client = _NeverSufficientClient()
+
+    run_path = run_loop("How many rows?", [], client, max_rounds=50, timeout_sec=20, run_root=tmp_path, max_tokens=6000)
+
+    status = json.loads((run_path / "run_status.json").read_text(encoding="utf-8"))
+    assert status == {"terminated_reason": "budget_exhausted", "budget_limit": "tokens", "best_effort": True}
+    assert 1 <= client.roles.count("CODER") < 50
+    assert (run_path / "final_answer.md").exists() and "best-effort" in client.report_prompt
+    assert "per-group counts" in client.report_prompt
+    assert "successful convergence" not in client.report_prompt
+    budget = json.loads((run_path / "budget.json").read_text(encoding="utf-8"))
+    assert budget["tokens_est"] <= 6000 and set(budget["phases"]) == {"analyzer", "loop", "finalyzer"}
+    assert not json.loads((run_path / "llm_usage.json").read_text(encoding="utf-8"))["converged"]
@@ -0,0 +1,67 @@
+import difflib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from dsstar.agents.coder.coder import run as run_coder
+from dsstar.llm.base import LLMClient
+from dsstar.utils.diff_utils import PatchError, apply_edits, apply_unified_diff
+
+_OLD = "import pandas as pd\ndf = pd.read_csv('a.csv')\nprint(df.shape)\n"
+_NEW = "import pandas as pd\ndf = pd.read_csv('a.csv')\ndf = df.dropna()\nprint(df.shape)\nprint(df.sum())\n"
+
+
+def test_unified_diff_and_edit_lists_apply_strictly() -> None:
+    diff = "".join(difflib.unified_diff(_OLD.splitlines(True), _NEW.splitlines(True), "a/x.py", "b/x.py"))
+    assert apply_unified_diff(_OLD, diff) == _NEW
+    # A wrong line number is tolerated when the context occurs exactly once.
+    assert apply_unified_diff("# header\n" + _OLD, diff.replace("@@ -1,3", "@@ -7,3")) == "# header\n" + _NEW
+    with pytest.raises(PatchError):
+        apply_unified_diff(_OLD, diff.replace(" df = pd.read_csv('a.csv')", " df = pd.read_csv('b.csv')"))
+    with pytest.raises(PatchError):
+        apply_unified_diff(_OLD, "just prose")
+
+    edits = [{"old": "print(df.shape)\n", "new": "df = df.dropna()\nprint(df.shape)\n"}, {"old": "", "new": "print(df.sum())"}]
+    assert apply_edits(_OLD, edits) == _NEW
+    with pytest.raises(PatchError):
+        apply_edits(_OLD + "print(df.shape)\n", edits)
+
+
+@dataclass
+class _DiffClient(LLMClient):
+    name: str = "test"
+    model: str = "test-model"
+    diff_response: str = ""
+    roles: List[str] = field(default_factory=list)
+
+    def complete(self, prompt: str) -> str:
+        role = prompt.split("ROLE: ", 1)[1].split("\n", 1)[0].strip()
+        self.roles.append(role)
+        return self.diff_response if role == "CODER_DIFF" else _NEW
+
+
+def _coder(tmp_path: Path, client: LLMClient, previous_code: str = _OLD) -> dict:
+    code_path = run_coder("q", {}, [], {"id": 2, "title": "Clean"}, previous_code, None, client, tmp_path, 1, incremental=True)
+    stats = json.loads((tmp_path / "round_01_coder.json").read_text(encoding="utf-8"))
+    return {"code": code_path.read_text(encoding="utf-8"), "stats": stats}
+
+
+def test_incremental_coder_applies_edits_and_falls_back_to_full_script(tmp_path: Path) -> None:
+    edits = [{"old": "print(df.shape)\n", "new": "df = df.dropna()\nprint(df.shape)\nprint(df.sum())\n"}]
+    client = _DiffClient(diff_response="```json\n" + json.dumps(edits) + "\n```")
+    out = _coder(tmp_path, client)
+    assert out["code"] == _NEW and client.roles == ["CODER_DIFF"]
+    assert out["stats"]["mode"] == "diff" and out["stats"]["output_tokens_est"] < len(_NEW) // 4 + 40
+    assert (tmp_path / "round_01_code.diff").exists()
+
+    broken = _DiffClient(diff_response=json.dumps([{"old": "print(df.shape)\n", "new": "print(df.shape\n"}]))
+    out = _coder(tmp_path, broken)
+    assert out["code"].strip() == _NEW.strip() and broken.roles == ["CODER_DIFF", "CODER"]
+    assert out["stats"]["mode"] == "diff_fallback" and "does not compile" in out["stats"]["patch_error"]
+    assert [call["kind"] for call in out["stats"]["calls"]] == ["diff", "full"]
+
+    first_round = _DiffClient()
+    assert _coder(tmp_path, first_round, previous_code="")["stats"]["mode"] == "full" and first_round.roles == ["CODER"]
@@ -0,0 +1,120 @@
+import json
+import sqlite3
+from pathlib import Path
+
+from dsstar.agents.analyzer import budgets
+from dsstar.agents.analyzer.analyzer import _history
+from dsstar.agents.analyzer.analyzer import run as run_analyzer
+
+
+def test_time_budget_scales_with_size_and_history() -> None:
+    small = budgets.time_budget("csv", 1024)
+    large = budgets.time_budget("csv", 2 * 1024**3)
+    assert small == budgets.MIN_SEC
+    assert small < large <= budgets.MAX_SEC
+    assert budgets.time_budget("xlsx", 100 * 1024**2) > budgets.time_budget("parquet", 100 * 1024**2)
+
+    timed_out = [{"mode": "full", "runtime_ms": 20000, "budget_sec": 20.0, "timed_out": True}]
+    assert budgets.time_budget("csv", 1024, history=timed_out) == 40.0
+    finished = [{"mode": "full", "runtime_ms": 10000, "budget_sec": 40.0, "timed_out": False}]
+    assert budgets.time_budget("csv", 1024, history=finished) == budgets.STARTUP_SEC + 30.0
+    # A file that doubled since its last description gets a proportionally larger budget.
+    measured = [{**finished[0], "size_bytes": 1024**2}]
+    assert budgets.time_budget("csv", 2 * 1024**2, history=measured) == budgets.STARTUP_SEC + 60.0
+    assert budgets.time_budget("csv", 1024**2, history=measured) == budgets.STARTUP_SEC + 30.0
+
+    records = [{"file_type": "csv", "size": 200 * 1024**2, "timings": finished}]
+    assert budgets.observed_throughput(records) == {"csv": 20.0}
+    assert budgets.time_budget("csv", 200 * 1024**2, throughput={"csv": 20.0}) == budgets.STARTUP_SEC + 30.0
+
+
+def test_timed_out_csv_is_described_from_a_sample(tmp_path: Path, monkeypatch) -> None:
+    data = tmp_path / "big.csv"
+    data.write_text("id,value\n" + "".join(f"{i},{i * 2}\n" for i in range(5000)), encoding="utf-8")
+    real_budget = budgets.time_budget
+    monkeypatch.setattr(budgets, "SAMPLE_BYTES", 4096)
+    # Only the full pass gets an impossible budget; the 4 KB sample gets the real one.
+    monkeypatch.setattr(
+        budgets, "time_budget", lambda file_type, size, *a, **k: 0.01 if size > 4096 else real_budget(file_type, size)
+    )
+
+    out = run_analyzer([str(data)], tmp_path / "run", client=None, partition_detection=False)
+
+    record = next(iter(out["records"].values()))
+    assert record["status"] == "sampled"
+    assert [t["mode"] for t in record["timings"]] == ["full", "sample"]
+    assert record["timings"][0]["timed_out"] is True
+    assert "COLUMNS=id,value" in record["description_text"]
+    assert "PARTIAL=full description timed out" in record["description_text"]
+    assert "desc_samples" not in record["description_text"]
+    assert "ROW_COUNT=5000" not in record["description_text"]
+    estimated = int(record["description_text"].rsplit("ESTIMATED_TOTAL_LINES=", 1)[1])
+    assert 4000 < estimated < 8000  # early rows are shorter, so extrapolation overshoots
+
+
+def test_timed_out_binary_input_keeps_partial_marker(tmp_path: Path, monkeypatch) -> None:
+    db = tmp_path / "data.sqlite"
+    conn = sqlite3.connect(db)
+    conn.execute("CREATE TABLE t (a INTEGER)")
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(budgets, "time_budget", lambda *args, **kwargs: 0.01)
+
+    out = run_analyzer([str(db)], tmp_path / "run", client=None)
+
+    record = next(iter(out["records"].values()))
+    assert record["status"] == "partial"
+    assert record["exec"]["timed_out"] is True
+    assert record["description_text"].endswith("PARTIAL=describer timed out after 0.01s")
+
+
+def test_sampled_description_is_retried_with_a_larger_budget(tmp_path: Path, monkeypatch) -> None:
+    data = tmp_path / "big.csv"
+    data.write_text("id,value\n" + "".join(f"{i},{i}\n" for i in range(2000)), encoding="utf-8")
+    real_budget = budgets.time_budget
+    monkeypatch.setattr(budgets, "SAMPLE_BYTES", 4096)
+    monkeypatch.setattr(
+        budgets, "time_budget", lambda file_type, size, *a, **k: 0.01 if size > 4096 else real_budget(file_type, size)
+    )
+    first = next(iter(run_analyzer([str(data)], tmp_path / "run", client=None)["records"].values()))
+    assert first["status"] == "sampled"
+
+    monkeypatch.setattr(budgets, "time_budget", real_budget)
+    second = next(iter(run_analyzer([str(data)], tmp_path / "run", client=None)["records"].values()))
+
+    assert second["status"] == "master_ok" and "PARTIAL" not in second["description_text"]
+    assert [t["mode"] for t in second["timings"]] == ["full", "sample", "full"]
+
+
+def test_partition_budget_history_carries_shard_sizes(tmp_path: Path, monkeypatch) -> None:
+    shards = []
+    for day in ("2024-01-01", "2024-01-02"):
+        shard = tmp_path / "sales" / f"date={day}" / "part-0.csv"
+        shard.parent.mkdir(parents=True)
+        shard.write_text("id,value\n" + "".join(f"{i},{i}\n" for i in range(200)), encoding="utf-8")
+        shards.append(str(shard))
+    real_budget = budgets.time_budget
+    histories = []
+
+    def recording_budget(file_type, size, history=None, throughput=None):
+        histories.append(history)
+        return 0.01
+
+    monkeypatch.setattr(budgets, "time_budget", recording_budget)
+    first = next(iter(run_analyzer(shards, tmp_path / "run", client=None)["records"].values()))
+    assert first["file_type"] == "partitioned" and first["status"] != "master_ok"
+
+    # Timings stored before sizes were recorded are back-filled with the average shard size.
+    store = tmp_path / "run" / ".dsstar" / "descriptions.jsonl"
+    lines = [json.loads(line) for line in store.read_text(encoding="utf-8").splitlines() if line.strip()]
+    for line in lines:
+        for timing in line.get("timings") or []:
+            timing.pop("size_bytes", None)
+    store.write_text("".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8")
+
+    monkeypatch.setattr(budgets, "time_budget", lambda *a, **k: (recording_budget(*a, **k), real_budget(*a, **k))[1])
+    run_analyzer(shards, tmp_path / "run", client=None)
+    assert histories[-1] and all(timing["size_bytes"] == Path(shards[0]).stat().st_size for timing in histories[-1])
+
+    legacy = {"size": 1000, "partition": {"shard_count": 4, "total_size": 1000}, "timings": [{"mode": "full"}]}
+    assert _history(legacy) == [{"size_bytes": 250, "mode": "full"}]
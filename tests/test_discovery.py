@@ -0,0 +1,99 @@
+import json
+import os
+from pathlib import Path
+
+from dsstar.cli import _discover_input_files
+from dsstar.tools import discovery
+from dsstar.tools.discovery import DiscoveryOptions
+
+
+def _tree(base: Path) -> None:
+    for rel in [
+        "top.csv",
+        "notes.md",
+        ".hidden.csv",
+        "sales/date=2024-01-01/part-0.csv",
+        "sales/date=2024-01-02/part-0.csv",
+        "sales/_tmp/scratch.csv",
+        "ref/deep/er/lookup.xlsx",
+    ]:
+        path = base / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("a\n1\n", encoding="utf-8")
+
+
+def _rel(base: Path, files) -> list:
+    return [Path(f).relative_to(base).as_posix() for f in files]
+
+
+def test_discovery_depth_globs_and_caps(tmp_path: Path) -> None:
+    base = tmp_path / "input"
+    _tree(base)
+
+    assert _rel(base, _discover_input_files(str(base))) == ["top.csv"]
+
+    everything = _discover_input_files(str(base), DiscoveryOptions(max_depth=None, exclude=["*/_tmp"]))
+    assert _rel(base, everything) == [
+        "ref/deep/er/lookup.xlsx",
+        "sales/date=2024-01-01/part-0.csv",
+        "sales/date=2024-01-02/part-0.csv",
+        "top.csv",
+    ]
+
+    sales_only = _discover_input_files(str(base), DiscoveryOptions(max_depth=2, include=["sales/*"]))
+    assert _rel(base, sales_only) == [
+        "sales/_tmp/scratch.csv",
+        "sales/date=2024-01-01/part-0.csv",
+        "sales/date=2024-01-02/part-0.csv",
+    ]
+
+    capped = _discover_input_files(str(base), DiscoveryOptions(max_depth=None, max_files=2))
+    assert len(capped) == 2
+
+
+def test_discovery_manifest_reused_until_tree_changes(tmp_path: Path) -> None:
+    base = tmp_path / "input"
+    _tree(base)
+    cache = tmp_path / "cache"
+    options = DiscoveryOptions(max_depth=None)
+
+    first = _discover_input_files(str(base), options, cache)
+    manifests = list((cache / "discovery").glob("*.json"))
+    assert len(manifests) == 1
+
+    # A stale manifest with unchanged directory mtimes is trusted without walking.
+    manifest = manifests[0]
+    manifest.write_text(manifest.read_text(encoding="utf-8").replace("top.csv", "cached.csv"), encoding="utf-8")
+    assert "cached.csv" in _rel(base, _discover_input_files(str(base), options, cache))
+
+    (base / "sales" / "date=2024-01-03").mkdir()
+    (base / "sales" / "date=2024-01-03" / "part-0.csv").write_text("a\n", encoding="utf-8")
+    refreshed = _rel(base, _discover_input_files(str(base), options, cache))
+    assert "sales/date=2024-01-03/part-0.csv" in refreshed
+    assert len(refreshed) == len(first) + 1
+
+
+def test_unreadable_directory_is_skipped_and_cap_stops_mid_level(tmp_path: Path, monkeypatch) -> None:
+    base = tmp_path / "input"
+    _tree(base)
+    real_scandir = os.scandir
+
+    def scandir(path):
+        if Path(path).name == "ref":
+            raise PermissionError(13, "Permission denied", str(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(discovery.os, "scandir", scandir)
+    cache = tmp_path / "cache"
+    options = DiscoveryOptions(max_depth=None)
+    found = _rel(base, _discover_input_files(str(base), options, cache))
+    assert "ref/deep/er/lookup.xlsx" not in found and "sales/date=2024-01-01/part-0.csv" in found
+    manifest = next((cache / "discovery").glob("*.json"))
+    assert json.loads(manifest.read_text(encoding="utf-8"))["skipped"] == ["ref"]
+
+    wide = tmp_path / "wide"
+    wide.mkdir()
+    for idx in range(50):
+        (wide / f"f{idx:02d}.csv").write_text("a\n", encoding="utf-8")
+    files, _, truncated, _ = discovery.walk(wide, DiscoveryOptions(max_files=3))
+    assert truncated and files == ["f00.csv", "f01.csv", "f02.csv"]
@@ -0,0 +1,42 @@
+import json
+from pathlib import Path
+
+from dsstar.agents.executor.executor import run as run_executor
+from dsstar.tools.exec_memo import ExecMemo
+
+
+def test_identical_script_reuses_result(tmp_path: Path) -> None:
+    memo = ExecMemo(tmp_path, "inputs-v1")
+    first = tmp_path / "round_00_code.py"
+    first.write_text("print('computed')\n", encoding="utf-8")
+    second = tmp_path / "final_solution.py"
+    second.write_text("print('computed')\n", encoding="utf-8")
+
+    fresh = run_executor(first, tmp_path, 10, 0, memo=memo)
+    reused = run_executor(second, tmp_path, 10, 99, memo=memo)
+
+    assert fresh["cached"] is False
+    assert reused["cached"] is True
+    assert reused["cached_from"] == "round_00_code.py"
+    assert reused["stdout"] == "computed\n"
+    assert reused["script_path"] == str(second.resolve())
+    assert json.loads((tmp_path / "round_99_exec.json").read_text(encoding="utf-8"))["cached"] is True
+
+
+def test_memo_misses_when_inputs_or_referenced_files_change(tmp_path: Path) -> None:
+    code = "from pathlib import Path\nprint(Path('notes.txt').read_text())\n"
+    (tmp_path / "notes.txt").write_text("v1", encoding="utf-8")
+    memo = ExecMemo(tmp_path, "inputs-v1")
+    memo.store(code, "round_00_code.py", {"exit_code": 0, "stdout": "v1\n", "stderr": "", "duration_sec": 0.1, "timeout": False})
+
+    assert memo.lookup(code) is not None
+    assert ExecMemo(tmp_path, "inputs-v2").lookup(code) is None
+
+    (tmp_path / "notes.txt").write_text("version two", encoding="utf-8")
+    assert memo.lookup(code) is None
+
+
+def test_timeouts_are_not_memoized(tmp_path: Path) -> None:
+    memo = ExecMemo(tmp_path, "inputs")
+    memo.store("x = 1\n", "round_00_code.py", {"exit_code": -1, "stdout": "", "stderr": "", "duration_sec": 5, "timeout": True})
+    assert memo.lookup("x = 1\n") is None
@@ -0,0 +1,75 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from dsstar.tools.exec_pool import WorkerPool, pool_supported
+
+pytestmark = pytest.mark.skipif(not pool_supported(), reason="worker pool requires os.fork")
+
+
+@pytest.fixture
+def pool():
+    worker_pool = WorkerPool(size=1, preload=["json"])
+    yield worker_pool
+    worker_pool.close()
+
+
+def test_pool_matches_subprocess_contract(tmp_path: Path, pool: WorkerPool) -> None:
+    script = tmp_path / "script.py"
+    script.write_text(
+        "import os, sys\n"
+        "from pathlib import Path\n"
+        "Path('out.txt').write_text(os.environ['DSSTAR_RUN_DIR'], encoding='utf-8')\n"
+        "print('hello')\n"
+        "print('warn', file=sys.stderr)\n"
+        "raise SystemExit(3)\n",
+        encoding="utf-8",
+    )
+    env = {**os.environ, "DSSTAR_RUN_DIR": str(tmp_path)}
+
+    result = pool.run(script, tmp_path, timeout_sec=10, env=env)
+
+    assert result["exit_code"] == 3
+    assert result["stdout"] == "hello\n"
+    assert result["stderr"] == "warn\n"
+    assert result["timeout"] is False
+    assert (tmp_path / "out.txt").read_text(encoding="utf-8") == str(tmp_path)
+
+
+def test_pool_reports_tracebacks_and_timeouts(tmp_path: Path, pool: WorkerPool) -> None:
+    failing = tmp_path / "fail.py"
+    failing.write_text("raise RuntimeError('boom')\n", encoding="utf-8")
+    result = pool.run(failing, tmp_path, timeout_sec=10)
+    assert result["exit_code"] == 1
+    assert "RuntimeError: boom" in result["stderr"]
+
+    slow = tmp_path / "slow.py"
+    slow.write_text("import time\ntime.sleep(30)\n", encoding="utf-8")
+    result = pool.run(slow, tmp_path, timeout_sec=1)
+    assert result["timeout"] is True
+    assert result["exit_code"] == -1
+    assert result["stderr"] == "Execution timed out."
+
+
+def test_worker_crash_mid_task_is_a_failure_not_a_rerun(tmp_path: Path, pool: WorkerPool) -> None:
+    script = tmp_path / "crash.py"
+    # Append a line, then (first run only) kill the zygote worker that forked this script.
+    script.write_text(
+        "import os, signal\n"
+        "first = not os.path.exists('log.txt')\n"
+        "with open('log.txt', 'a', encoding='utf-8') as handle:\n"
+        "    handle.write('ran\\n')\n"
+        "if first:\n"
+        "    os.kill(os.getppid(), signal.SIGKILL)\n",
+        encoding="utf-8",
+    )
+
+    result = pool.run(script, tmp_path, timeout_sec=10)
+
+    assert result["exit_code"] == 1 and "worker crashed" in result["stderr"]
+    assert (tmp_path / "log.txt").read_text(encoding="utf-8") == "ran\n"
+    # The replacement worker serves the next script.
+    ok = tmp_path / "ok.py"
+    ok.write_text("print('fine')\n", encoding="utf-8")
+    assert pool.run(ok, tmp_path, timeout_sec=10)["stdout"] == "fine\n"
@@ -0,0 +1,108 @@
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from dsstar.agents.debugger.debugger import _default_trace_summary
+from dsstar.agents.verifier.verifier import run as run_verifier
+from dsstar.llm.base import LLMClient
+from dsstar.loop import run_loop
+from dsstar.tools.exec_sandbox import run_python_script
+from dsstar.tools.resource_limits import ResourceLimits
+
+posix_only = pytest.mark.skipif(not hasattr(os, "wait4"), reason="resource accounting requires os.wait4")
+
+
+@posix_only
+def test_execution_records_resource_usage(tmp_path: Path) -> None:
+    script = tmp_path / "script.py"
+    script.write_text(
+        "from pathlib import Path\n"
+        "Path('out.bin').write_bytes(b'x' * 4096)\n"
+        "print('done')\n",
+        encoding="utf-8",
+    )
+
+    result = run_python_script(script, tmp_path, timeout_sec=10)
+
+    assert result["exit_code"] == 0
+    assert result["limit_exceeded"] is None
+    resources = result["resources"]
+    assert resources["peak_rss_mb"] > 0
+    assert resources["user_cpu_sec"] >= 0
+    assert resources["bytes_written"] >= 4096
+
+
+@posix_only
+def test_cpu_limit_kill_is_reported(tmp_path: Path) -> None:
+    script = tmp_path / "spin.py"
+    script.write_text("while True:\n    pass\n", encoding="utf-8")
+
+    result = run_python_script(script, tmp_path, timeout_sec=20, limits=ResourceLimits(max_cpu_sec=1))
+
+    assert result["timeout"] is False
+    assert result["exit_code"] != 0
+    assert result["limit_exceeded"]["kind"] == "cpu"
+    assert "Killed for exceeding the cpu limit" in result["stderr"]
+
+
+@pytest.mark.skipif(not Path("/proc").is_dir(), reason="memory monitoring reads /proc")
+def test_memory_limit_kill_reaches_verifier_and_debugger(tmp_path: Path) -> None:
+    script = tmp_path / "hog.py"
+    script.write_text(
+        "import time\n"
+        "blocks = []\n"
+        "for _ in range(400):\n"
+        "    blocks.append(bytearray(8 * 1024 * 1024))\n"
+        "    time.sleep(0.01)\n",
+        encoding="utf-8",
+    )
+
+    result = run_python_script(script, tmp_path, timeout_sec=30, limits=ResourceLimits(max_memory_mb=200))
+
+    assert result["limit_exceeded"]["kind"] == "memory"
+    verdict = run_verifier("q", {}, [], "", result, client=None)  # type: ignore[arg-type]
+    assert "next_action" not in verdict and verdict["limit_exceeded"]["kind"] == "memory"
+    assert verdict["reason"].startswith("Killed for exceeding the memory limit")
+    summary = _default_trace_summary(result["stderr"], result["limit_exceeded"])
+    assert summary["error_type"] == "ResourceLimitExceeded"
+
+
+def test_timeout_is_reported_as_limit(tmp_path: Path) -> None:
+    script = tmp_path / "slow.py"
+    script.write_text("import time\ntime.sleep(30)\n", encoding="utf-8")
+
+    result = run_python_script(script, tmp_path, timeout_sec=1)
+
+    assert result["timeout"] is True
+    assert result["exit_code"] == -1
+    assert result["limit_exceeded"]["kind"] == "timeout"
+
+
+@dataclass
+class _HogClient(LLMClient):
+    name: str = "test"
+    model: str = "test-model"
+    roles: List[str] = field(default_factory=list)
+
+    def complete(self, prompt: str) -> str:
+        role = prompt.split("ROLE: ", 1)[1].split("\n", 1)[0].strip() if "ROLE: " in prompt else ""
+        self.roles.append(role)
+        if role == "PLANNER":
+            return json.dumps({"title": "Slow", "details": "Sleep."})
+        if role in {"CODER", "DEBUGGER_PATCH", "FINALYZER_CODE"}:
+            return "import time\ntime.sleep(30)\n"
+        return json.dumps({"action": "add_step"}) if role == "ROUTER" else "final"
+
+
+def test_limit_killed_round_is_debugged_and_skips_the_router(tmp_path: Path) -> None:
+    client = _HogClient()
+
+    run_path = run_loop("Be slow", [], client, max_rounds=1, timeout_sec=1, run_root=tmp_path / "runs")
+
+    summary = json.loads((run_path / "round_00_trace_summary.json").read_text(encoding="utf-8"))
+    assert summary["error_type"] == "ResourceLimitExceeded"
+    assert "DEBUGGER_PATCH" in client.roles and "ROUTER" not in client.roles and "VERIFIER" not in client.roles
@@ -0,0 +1,98 @@
+import json
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+from dsstar.agents.debugger.fast_fix import fast_fix
+from dsstar.llm.base import LLMClient
+from dsstar.loop import run_loop
+
+
+def _run(code: str, cwd: Path) -> dict:
+    script = cwd / "round_00_code.py"
+    script.write_text(code, encoding="utf-8")
+    proc = subprocess.run([sys.executable, str(script)], capture_output=True, text=True, cwd=cwd)
+    return {"exit_code": proc.returncode, "stderr": proc.stderr, "stdout": proc.stdout}
+
+
+def _descriptions(data: Path) -> dict:
+    return {
+        "records": {
+            "sales": {
+                "file_path": str(data),
+                "fallback_facts": {"type": "csv", "header": ["Order ID", "Amount"]},
+                "description_text": "COLUMNS=Order ID,Amount\nROW_COUNT=2",
+            }
+        }
+    }
+
+
+def test_path_and_column_rules_chain_until_the_script_runs(tmp_path: Path) -> None:
+    data = tmp_path / "input" / "sales.csv"
+    data.parent.mkdir()
+    data.write_text("Order ID,Amount\n1,2.5\n2,4\n", encoding="utf-8")
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    code = (
+        "import pandas as pd\n"
+        "df = pd.read_csv('input/sales.csv')  # relative to the repo, not the run dir\n"
+        "print(df['amount '].sum())\n"
+    )
+
+    first = fast_fix(code, _run(code, run_dir), _descriptions(data))
+    assert first["rule"] == "input_path"
+    assert repr(str(data)) in first["code"] and "# relative to the repo" in first["code"]
+    second = fast_fix(first["code"], _run(first["code"], run_dir), _descriptions(data))
+    assert second["rule"] == "column_name"
+    assert "df['Amount'].sum()" in second["code"]
+    assert _run(second["code"], run_dir)["stdout"].strip() == "6.5"
+
+
+def test_module_and_encoding_rules(tmp_path: Path) -> None:
+    latin = tmp_path / "notes.txt"
+    latin.write_bytes("café\n".encode("latin-1"))
+    code = f"import surely_not_installed_mod\ntext = open({str(latin)!r}, encoding='utf-8').read()\nprint(len(text))\n"
+
+    fix = fast_fix(code, _run(code, tmp_path), {})
+    assert fix["rule"] == "unused_import" and "surely_not_installed_mod" not in fix["code"]
+    fix = fast_fix(fix["code"], _run(fix["code"], tmp_path), {})
+    assert fix["rule"] == "decode_errors"
+    assert "encoding='utf-8', errors=\"replace\")" in fix["code"]
+    assert _run(fix["code"], tmp_path)["exit_code"] == 0
+
+    assert fast_fix("print(1 / 0)\n", _run("print(1 / 0)\n", tmp_path), {}) is None
+
+
+@dataclass
+class _WrongPathClient(LLMClient):
+    name: str = "test"
+    model: str = "test-model"
+    roles: List[str] = field(default_factory=list)
+
+    def complete(self, prompt: str) -> str:
+        role = prompt.split("ROLE: ", 1)[1].split("\n", 1)[0].strip() if "ROLE: " in prompt else ""
+        self.roles.append(role)
+        if role == "PLANNER":
+            return json.dumps({"id": 1, "title": "Sum", "details": "Sum amounts.", "status": "todo"})
+        if role == "CODER":
+            return "import pandas as pd\nprint(pd.read_csv('sales.csv')['Amount'].sum())\n"
+        if role == "VERIFIER":
+            return json.dumps({"sufficient": True, "reason": "ok", "missing": [], "next_action": "stop"})
+        if role == "FINALYZER_CODE":
+            return "print('done')\n"
+        return "final"
+
+
+def test_loop_applies_fast_fix_without_llm_debugger(tmp_path: Path) -> None:
+    data = tmp_path / "sales.csv"
+    data.write_text("Amount\n1\n2\n", encoding="utf-8")
+    client = _WrongPathClient()
+
+    run_path = run_loop("Sum amounts", [str(data)], client, max_rounds=1, timeout_sec=20, run_root=tmp_path / "runs")
+
+    fixes = json.loads((run_path / "round_00_fast_fix.json").read_text(encoding="utf-8"))
+    assert [fix["rule"] for fix in fixes] == ["input_path"] and fixes[0]["exit_code"] == 0
+    assert not any(role.startswith("DEBUGGER") for role in client.roles)
+    assert json.loads((run_path / "round_00_exec.json").read_text(encoding="utf-8"))["stdout"].strip() == "3"
@@ -0,0 +1,70 @@
+import json
+from pathlib import Path
+
+from dsstar.agents.analyzer.analyzer import run as run_analyzer
+from dsstar.tools import json_stream
+from dsstar.tools.json_stream import scan_json
+
+
+def test_scan_ndjson_merges_schema_with_frequencies(tmp_path: Path) -> None:
+    path = tmp_path / "events.jsonl"
+    lines = [{"id": i, "user": {"name": "a"}, **({"tags": ["x"]} if i % 2 else {})} for i in range(10)]
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\n\n", encoding="utf-8")
+
+    summary = scan_json(path, sample_records=4)
+
+    assert summary["format"] == "ndjson"
+    assert summary["records"] == 10
+    fields = {f["path"]: f for f in summary["fields"]}
+    assert fields["user.name"]["types"] == ["string"]
+    assert fields["tags"]["frequency"] == 0.5
+    assert fields["tags[]"]["types"] == ["string"]
+    assert summary["max_depth"] == 2
+
+
+def test_scan_object_streams_record_array_across_chunks(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(json_stream, "CHUNK_BYTES", 16)
+    path = tmp_path / "dump.json"
+    records = [{"sku": f"s{i}", "qty": i * 1000} for i in range(50)]
+    path.write_text(json.dumps({"meta": {"page": 1}, "data": records, "next": None}), encoding="utf-8")
+
+    summary = scan_json(path, sample_records=5)
+
+    assert summary["format"] == "object"
+    assert summary["record_path"] == "data"
+    assert summary["records"] == 50 and not summary["records_estimated"]
+    assert summary["top_level_keys"] == {"meta": "object", "data": "array", "next": "null"}
+    assert [f["path"] for f in summary["fields"]] == ["sku", "qty"]
+
+    estimated = scan_json(path, max_scan_bytes=200)
+    assert estimated["records_estimated"] and estimated["records"] > 0
+
+
+def test_oversized_value_stops_the_scan_instead_of_buffering_the_file(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(json_stream, "CHUNK_BYTES", 16)
+    monkeypatch.setattr(json_stream, "MAX_VALUE_BYTES", 256)
+    path = tmp_path / "dump.json"
+    items = [{"id": i} for i in range(5)] + [{"blob": "x" * 5000}] + [{"id": i} for i in range(500)]
+    path.write_text(json.dumps(items), encoding="utf-8")
+
+    summary = scan_json(path)
+
+    assert summary["value_too_large"] and summary["records_estimated"]
+    assert summary["sampled_records"] == 5 and summary["bytes_scanned"] < 1024
+
+    lines = tmp_path / "log.jsonl"
+    lines.write_text('{"a": 1}\n{"blob": "' + "x" * 5000 + '"}\n{"a": 2}\n', encoding="utf-8")
+    scanned = scan_json(lines)
+    assert scanned["records"] == 3 and scanned["invalid_sampled_lines"] == 1 and scanned["sampled_records"] == 2
+
+
+def test_master_describer_streams_jsonl(tmp_path: Path) -> None:
+    path = tmp_path / "log.ndjson"
+    path.write_text('{"a": 1}\n{"a": 2, "b": true}\n', encoding="utf-8")
+
+    out = run_analyzer([str(path)], tmp_path, client=None)
+
+    record = next(iter(out["records"].values()))
+    assert record["file_type"] == "json"
+    assert "JSON_FORMAT=ndjson" in record["description_text"]
+    assert "RECORDS=2" in record["description_text"]
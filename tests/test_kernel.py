@@ -0,0 +1,63 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from dsstar.tools.kernel import PersistentKernel
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="kernel uses POSIX process groups")
+
+
+@pytest.fixture
+def kernel(tmp_path: Path):
+    kern = PersistentKernel(tmp_path, dict(os.environ))
+    yield kern
+    kern.close()
+
+
+def test_kernel_keeps_state_between_steps(tmp_path: Path, kernel: PersistentKernel) -> None:
+    first = kernel.execute("data = [1, 2, 3]\nprint(len(data))\n", tmp_path / "cell_1.py", 10)
+    assert first["exit_code"] == 0
+    assert first["stdout"] == "3\n"
+    kernel.commit(1, "data = [1, 2, 3]\n", "load")
+
+    second = kernel.execute("print(sum(data))\n", tmp_path / "cell_2.py", 10)
+    assert second["exit_code"] == 0
+    assert second["stdout"] == "6\n"
+    assert kernel.variables() == {"data": "list"}
+
+
+def test_kernel_restores_snapshot_on_backtrack(tmp_path: Path, kernel: PersistentKernel) -> None:
+    kernel.execute("total = 1\n", tmp_path / "cell_1.py", 10)
+    kernel.commit(1, "total = 1\n", "init")
+    kernel.execute("total += 10\n", tmp_path / "cell_2.py", 10)
+    kernel.commit(2, "total += 10\n", "add")
+
+    kernel.drop_from(2)
+    kernel.restore_before(2)
+    result = kernel.execute("print(total)\n", tmp_path / "cell_2.py", 10)
+    assert result["stdout"] == "1\n"
+
+    script = kernel.compose_script(2, "print(total)\n", "show")
+    assert "total = 1" in script and "total += 10" not in script
+
+
+def test_kernel_timeout_recovers_from_snapshot(tmp_path: Path, kernel: PersistentKernel) -> None:
+    kernel.execute("value = 42\n", tmp_path / "cell_1.py", 10)
+    kernel.commit(1, "value = 42\n", "init")
+
+    slow = kernel.execute("import time\ntime.sleep(30)\n", tmp_path / "cell_2.py", 1)
+    assert slow["timeout"] is True
+    assert slow["exit_code"] == -1
+
+    kernel.restore_before(2)
+    result = kernel.execute("print(value)\n", tmp_path / "cell_2.py", 10)
+    assert result["stdout"] == "42\n"
+
+
+def test_kernel_reports_tracebacks_for_cell(tmp_path: Path, kernel: PersistentKernel) -> None:
+    cell = tmp_path / "cell_1.py"
+    result = kernel.execute("raise ValueError('bad step')\n", cell, 10)
+    assert result["exit_code"] == 1
+    assert "ValueError: bad step" in result["stderr"]
+    assert str(cell) in result["stderr"]
@@ -0,0 +1,78 @@
+import json
+from pathlib import Path
+
+from dsstar.agents.analyzer import master_bench
+from dsstar.agents.analyzer.analyzer import run as run_analyzer
+from dsstar.llm.base import LLMClient
+
+_MASTER = '''from pathlib import Path
+
+
+def describe_file(path):
+    p = Path(path)
+    if p.suffix == ".weird":
+        return "FAILED TO DESCRIBE: unsupported"
+    return f"FILE={p}\\nSIZE={p.stat().st_size}"
+'''
+
+_SLOW_PATCH = '''import time
+from pathlib import Path
+
+
+def describe_file(path):
+    time.sleep(0.15)
+    p = Path(path)
+    return f"FILE={p}\\nSIZE={p.stat().st_size}"
+'''
+
+
+class _PatchingClient(LLMClient):
+    def __init__(self) -> None:
+        super().__init__(name="fake", model="fake-1")
+
+    def complete(self, prompt: str) -> str:
+        if "ROLE: ANALYZER_MASTER_DESCRIBER" in prompt:
+            return _MASTER
+        if "ROLE: ANALYZER_OVERRIDE" in prompt:
+            return "def describe_file(path):\n    return 'FILE=' + path + '\\nKIND=weird'\n"
+        if "ROLE: ANALYZER_PROMOTE_JUDGE" in prompt:
+            return json.dumps({"promote": True, "reason": "generic", "patch_strategy": "master"})
+        if "ROLE: ANALYZER_MASTER_PATCH" in prompt:
+            return _SLOW_PATCH
+        raise AssertionError(prompt[:80])
+
+
+def _summary(files):
+    return {
+        "passed": [name for name, ok, _ in files if ok],
+        "files": [{"file": name, "ok": ok, "sec": sec} for name, ok, sec in files],
+        "peak_memory_growth_mb": 10.0,
+    }
+
+
+def test_compare_rejects_broken_files_and_slowdowns() -> None:
+    baseline = _summary([("a.csv", True, 1.0), ("b.json", True, 1.0), ("c.xlsx", False, 0.0)])
+
+    assert master_bench.compare(baseline, _summary([("a.csv", True, 1.1), ("b.json", True, 1.0), ("c.xlsx", True, 5.0)]))["accepted"]
+    broken = master_bench.compare(baseline, _summary([("a.csv", True, 1.0), ("b.json", False, 0.0), ("c.xlsx", True, 1.0)]))
+    assert not broken["accepted"] and "b.json" in broken["reasons"][0]
+    slower = master_bench.compare(baseline, _summary([("a.csv", True, 3.0), ("b.json", True, 3.0), ("c.xlsx", False, 0.0)]))
+    assert not slower["accepted"] and "exceeds" in slower["reasons"][0]
+
+
+def test_slow_master_patch_is_not_promoted(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(master_bench, "DEFAULT_SIZES", ("small",))
+    weird = tmp_path / "data.weird"
+    weird.write_text("x", encoding="utf-8")
+
+    out = run_analyzer([str(weird)], tmp_path / "runs" / "r1", client=_PatchingClient())
+
+    record = next(iter(out["records"].values()))
+    assert "describe time" in record["master_patch_rejected"]
+    assert record["status"] == "override_ok"
+    assert (tmp_path / "dsstar" / "knowledge" / "describe_master.py").read_text(encoding="utf-8").strip() == _MASTER.strip()
+    report = json.loads(next((tmp_path / "runs" / "r1" / ".dsstar" / "master_bench").glob("*.json")).read_text())
+    assert report["accepted"] is False
+    assert len(report["baseline"]["passed"]) == len(master_bench.KINDS)
+    assert report["candidate"]["files_per_sec"] < report["baseline"]["files_per_sec"]
@@ -0,0 +1,75 @@
+from pathlib import Path
+
+from dsstar.agents.analyzer.analyzer import run as run_analyzer
+from dsstar.agents.analyzer.partitions import detect_partitions, summarize
+
+
+def _write_shards(root: Path, days: int) -> list:
+    paths = []
+    for day in range(1, days + 1):
+        shard = root / "sales" / f"date=2024-01-{day:02d}" / "part-0.csv"
+        shard.parent.mkdir(parents=True)
+        extra = ",channel" if day == days else ""
+        rows = "".join(f"{day},{i}{',web' if extra else ''}\n" for i in range(day))
+        shard.write_text(f"store,amount{extra}\n{rows}", encoding="utf-8")
+        paths.append(shard)
+    return paths
+
+
+def test_detect_partitions_builds_logical_table(tmp_path: Path) -> None:
+    shards = _write_shards(tmp_path, 4)
+    lone = tmp_path / "lookup.csv"
+    lone.write_text("id\n1\n", encoding="utf-8")
+
+    groups, singles = detect_partitions([*shards, lone])
+
+    assert singles == [lone]
+    assert len(groups) == 1
+    summary = summarize(groups[0])
+    assert summary["shard_count"] == 4
+    assert summary["total_rows"] == 1 + 2 + 3 + 4
+    assert summary["partition_keys"]["date"] == {"distinct": 4, "min": "2024-01-01", "max": "2024-01-04"}
+    assert summary["columns"] == ["store", "amount", "channel"]
+    assert summary["columns_missing_in_shards"] == {"channel": 3}
+    assert len(summary["sample_shards"]) <= 3
+
+
+def test_analyzer_describes_shards_as_one_record(tmp_path: Path) -> None:
+    shards = _write_shards(tmp_path / "in", 5)
+
+    out = run_analyzer([str(p) for p in shards], tmp_path, client=None)
+
+    assert len(out["records"]) == 1
+    record = next(iter(out["records"].values()))
+    assert record["file_type"] == "partitioned"
+    assert record["partition"]["total_rows"] == 15
+    assert "LOGICAL TABLE" in record["description_text"]
+    assert len(list((tmp_path / ".dsstar" / "desc_scripts").glob("*.py"))) == 1
+
+    again = run_analyzer([str(p) for p in shards], tmp_path, client=None, partition_detection=False)
+    assert sum(1 for r in again["records"].values() if r["file_type"] == "csv") == 5
+
+
+def test_unrelated_shards_are_not_merged(tmp_path: Path) -> None:
+    # The whole input tree sits below a date-like directory that is not part of any layout.
+    root = tmp_path / "2024-05" / "inputs"
+    files = []
+    for day in ("2024-01-01", "2024-01-02"):
+        for name, header in (("orders.csv", "order_id,amount"), ("customers.csv", "customer_id,name")):
+            path = root / f"date={day}" / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(f"{header}\n1,x\n", encoding="utf-8")
+            files.append(path)
+    for name, header in (("chunk1.csv", "id,value"), ("chunk2.csv", "sku,price")):
+        (root / name).write_text(f"{header}\n1,2\n", encoding="utf-8")
+        files.append(root / name)
+    notes = [root / "a.txt", root / "b.txt"]
+    for path in notes:
+        path.write_text("free text\n", encoding="utf-8")
+
+    groups, singles = detect_partitions([*files, *notes])
+
+    assert sorted(group.name_glob for group in groups) == ["customers.csv", "orders.csv"]
+    assert all(group.root == root.resolve() and group.keys == ["date"] for group in groups)
+    assert summarize(groups[0])["shard_glob"] in {"*/orders.csv", "*/customers.csv"}
+    assert sorted(path.name for path in singles) == ["a.txt", "b.txt", "chunk1.csv", "chunk2.csv"]
@@ -0,0 +1,99 @@
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+from dsstar.config import ExecutionConfig
+from dsstar.llm.base import LLMClient
+from dsstar.loop import run_loop
+from dsstar.tools.exec_sandbox import run_python_script
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "wait4"), reason="profiling requires POSIX timers")
+
+
+def test_profile_reports_line_hotspots(tmp_path: Path) -> None:
+    script = tmp_path / "script.py"
+    script.write_text(
+        "import time\n"
+        "def work():\n"
+        "    time.sleep(0.4)\n"
+        "work()\n"
+        "raise SystemExit(2)\n",
+        encoding="utf-8",
+    )
+    profile_path = tmp_path / "round_00_profile.json"
+
+    result = run_python_script(script, tmp_path, timeout_sec=10, profile_path=profile_path)
+
+    assert result["exit_code"] == 2
+    profile = json.loads(profile_path.read_text(encoding="utf-8"))
+    assert profile["complete"] is True
+    top = profile["hotspots"][0]
+    assert (top["line"], top["function"]) == (3, "work")
+    assert top["code"] == "time.sleep(0.4)"
+
+
+def test_profile_survives_timeout_and_keeps_plain_tracebacks(tmp_path: Path) -> None:
+    slow = tmp_path / "slow.py"
+    slow.write_text("while True:\n    pass\n", encoding="utf-8")
+    profile_path = tmp_path / "profile.json"
+    result = run_python_script(slow, tmp_path, timeout_sec=2, profile_path=profile_path)
+    assert result["timeout"] is True
+    assert json.loads(profile_path.read_text(encoding="utf-8"))["hotspots"][0]["line"] in (1, 2)
+
+    failing = tmp_path / "fail.py"
+    failing.write_text("raise RuntimeError('boom')\n", encoding="utf-8")
+    result = run_python_script(failing, tmp_path, timeout_sec=10, profile_path=profile_path)
+    assert result["exit_code"] == 1
+    assert "runpy" not in result["stderr"]
+    assert 'File "' + str(failing.resolve()) + '", line 1' in result["stderr"]
+
+
+@dataclass
+class _SlowLoopClient(LLMClient):
+    name: str = "test"
+    model: str = "test-model"
+    perf_prompts: int = 0
+
+    def complete(self, prompt: str) -> str:
+        if "ROLE: PLANNER" in prompt:
+            return json.dumps({"id": 1, "title": "Slow step", "details": "Sleep.", "status": "todo"})
+        if "ROLE: CODER" in prompt:
+            return "import time\ntime.sleep(30)\n"
+        if "ROLE: DEBUGGER_PERF" in prompt:
+            self.perf_prompts += 1
+            assert "time.sleep(30)" in prompt.split("Profile hotspots:")[1]
+            return "print('fast')\n"
+        if "ROLE: VERIFIER" in prompt:
+            return json.dumps({"sufficient": True, "reason": "ok", "missing": [], "next_action": "stop"})
+        if "ROLE: FINALYZER_CODE" in prompt:
+            return "def main():\n    print('fast')\n\nif __name__ == '__main__':\n    main()\n"
+        if "ROLE: FINALYZER_REPORT" in prompt:
+            return "final"
+        return "Unsupported prompt."
+
+
+def test_timeout_routes_to_performance_debugger(tmp_path: Path) -> None:
+    client = _SlowLoopClient()
+    run_path = run_loop(
+        question="Be fast.",
+        files=[],
+        client=client,
+        max_rounds=1,
+        timeout_sec=2,
+        run_root=tmp_path / "runs",
+        exec_config=ExecutionConfig(profile=True),
+    )
+
+    assert client.perf_prompts == 1
+    assert (run_path / "round_00_code_perf.py").exists()
+    exec_result = json.loads((run_path / "round_00_exec.json").read_text(encoding="utf-8"))
+    assert exec_result["exit_code"] == 0
+    assert exec_result["stdout"] == "fast\n"
+    # The slow run's profile is not overwritten by the rewrite's.
+    slow_profile = json.loads((run_path / "round_00_profile.json").read_text(encoding="utf-8"))
+    assert "time.sleep(30)" in json.dumps(slow_profile)
+    assert exec_result["profile_path"] == "round_00_perf_profile.json"
+    assert (run_path / "round_00_perf_profile.json").exists()
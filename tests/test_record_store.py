@@ -0,0 +1,59 @@
+import json
+from pathlib import Path
+
+from dsstar.agents.analyzer.analyzer import run as run_analyzer
+from dsstar.agents.analyzer.record_store import RecordStore
+
+
+def _record(file_id: str, stdout: str) -> dict:
+    exec_info = {"exit_code": 0, "stdout": stdout, "stderr": ""}
+    return {
+        "file_path": file_id.split("::")[0],
+        "file_id": file_id,
+        "wrapper_path": f"w_{stdout}.py",
+        "exec": exec_info,
+        "desc_exec": exec_info,
+        "desc_script": {"path": f"w_{stdout}.py"},
+    }
+
+
+def test_store_survives_torn_append_and_exports_compat_json(tmp_path: Path) -> None:
+    path = tmp_path / "descriptions.jsonl"
+    store = RecordStore(path)
+    store.put(_record("a.csv::1:1", "one"))
+    store.put(_record("b.csv::1:1", "two"))
+    store.put(_record("a.csv::1:1", "three"))
+    assert "desc_exec" not in path.read_text(encoding="utf-8")
+    with path.open("ab") as handle:
+        handle.write(b'{"file_id": "c.csv::1:1", "exec"')  # crash mid-append
+
+    reopened = RecordStore(path)
+    assert reopened.file_ids() == ["a.csv::1:1", "b.csv::1:1"]
+    assert reopened.get("a.csv::1:1")["exec"]["stdout"] == "three"
+    assert reopened.latest_for_path("b.csv")["desc_script"] == {"path": "w_two.py"}
+    reopened.put(_record("c.csv::1:1", "four"))
+    assert len(RecordStore(path)) == 3
+
+    exported = tmp_path / "descriptions.json"
+    reopened.export(exported, {"warnings": ["w"]})
+    payload = json.loads(exported.read_text(encoding="utf-8"))
+    assert payload == reopened.to_payload({"warnings": ["w"]})
+    assert payload["records"]["a.csv::1:1"]["desc_exec"]["stdout"] == "three"
+
+
+def test_analyzer_resumes_from_stored_records(tmp_path: Path) -> None:
+    first = tmp_path / "first.csv"
+    second = tmp_path / "second.csv"
+    first.write_text("a\n1\n", encoding="utf-8")
+    second.write_text("b\n2\n", encoding="utf-8")
+
+    run_analyzer([str(first)], tmp_path, client=None)
+    scripts = tmp_path / ".dsstar" / "desc_scripts"
+    stored = next(scripts.glob("*first*.py"))
+    stored.unlink()
+
+    out = run_analyzer([str(first), str(second)], tmp_path, client=None)
+
+    assert len(out["records"]) == 2
+    assert not stored.exists()  # first.csv was not described again
+    assert json.loads((tmp_path / "descriptions.json").read_text(encoding="utf-8")) == out
@@ -0,0 +1,107 @@
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+from dsstar.llm.base import LLMClient
+from dsstar import loop
+from dsstar.loop import run_loop
+from dsstar.tools.run_cache import RUN_CACHE_FILE, RunCache, cache_key, normalize_question
+
+
+def _converged_run(root: Path, name: str, key: str) -> Path:
+    run_dir = root / name
+    run_dir.mkdir(parents=True)
+    for artifact in ("final_answer.md", "final_solution.py"):
+        (run_dir / artifact).write_text(name, encoding="utf-8")
+    (run_dir / RUN_CACHE_FILE).write_text(json.dumps({"key": key, "question": name, "hit": False}), encoding="utf-8")
+    return run_dir
+
+
+def test_keys_index_eviction_and_invalidation(tmp_path: Path) -> None:
+    data = tmp_path / "data.csv"
+    data.write_text("a\n1\n", encoding="utf-8")
+    key = cache_key("What is the total?", [str(data)], "p", "m", "v1", tmp_path / "hashes")
+    assert normalize_question("  WHAT is   the total ") == "what is the total"
+    assert cache_key("what is the TOTAL", [str(data)], "p", "m", "v1", tmp_path / "hashes") == key
+    assert cache_key("What is the total?", [str(data)], "p", "m", "v2", tmp_path / "hashes") != key
+    data.write_text("a\n2\n", encoding="utf-8")
+    assert cache_key("What is the total?", [str(data)], "p", "m", "v1", tmp_path / "hashes") != key
+
+    root = tmp_path / "runs"
+    first, second = _converged_run(root, "run_a", "k1"), _converged_run(root, "run_b", "k2")
+    cache = RunCache(root, max_entries=2)  # no index yet: rebuilt from the run directories
+    assert cache.lookup("k1") == first.resolve() and cache.lookup("k2") == second.resolve()
+    cache.store("k3", _converged_run(root, "run_c", "k3"), "q")
+    assert set(cache.entries) == {"k2", "k3"}  # k1 was least recently used
+
+    (second / "final_answer.md").unlink()
+    assert cache.lookup("k2") is None and set(cache.entries) == {"k3"}
+    assert cache.invalidate() == 1 and cache.lookup("k3") is None
+    (root / ".dsstar_cache" / "run_cache_index.json").unlink()
+    assert RunCache(root).entries.keys() == {"k1"}  # invalidated runs stay out of a rebuilt index
+
+
+@dataclass
+class _TotalClient(LLMClient):
+    name: str = "test"
+    model: str = "test-model"
+    data: str = ""
+    roles: List[str] = field(default_factory=list)
+
+    def complete(self, prompt: str) -> str:
+        role = prompt.split("ROLE: ", 1)[1].split("\n", 1)[0].strip() if "ROLE: " in prompt else ""
+        self.roles.append(role)
+        script = f"print('total=' + str(sum(int(x) for x in open({self.data!r}))))\n"
+        if role == "PLANNER":
+            return json.dumps({"title": "Total", "details": "Sum the numbers."})
+        if role in {"CODER", "FINALYZER_CODE"}:
+            return script
+        if role == "VERIFIER":
+            return json.dumps({"sufficient": True, "reason": "ok", "missing": [], "next_action": "stop"})
+        if role == "FINALYZER_REPORT":
+            return f"Report #{self.roles.count(role)}"
+        return "final"
+
+
+def test_repeated_question_is_answered_from_the_run_cache(tmp_path: Path) -> None:
+    data = tmp_path / "data.txt"
+    data.write_text("1\n2\n", encoding="utf-8")
+    runs = tmp_path / "runs"
+    client = _TotalClient(data=str(data))
+
+    first = run_loop("What is the total?", [str(data)], client, 2, 20, runs, run_cache="rerun")
+    assert (first / "final_answer.md").read_text(encoding="utf-8") == "Report #1"
+
+    client.roles.clear()
+    hit = run_loop("what is the total", [str(data)], client, 2, 20, runs, run_cache="rerun")
+    assert client.roles == [] and (hit / "final_answer.md").read_text(encoding="utf-8") == "Report #1"
+    assert json.loads((hit / RUN_CACHE_FILE).read_text(encoding="utf-8"))["cached_from"] == str(first.resolve())
+    assert json.loads((hit / "final_solution_exec.json").read_text(encoding="utf-8"))["stdout"].strip() == "total=3"
+
+    data.write_text("1\n2\n4\n", encoding="utf-8")
+    miss = run_loop("What is the total?", [str(data)], client, 2, 20, runs, run_cache="rerun")
+    assert "PLANNER" in client.roles and not json.loads((miss / RUN_CACHE_FILE).read_text(encoding="utf-8"))["hit"]
+
+
+def test_master_promoted_during_analysis_keys_the_stored_run(tmp_path: Path, monkeypatch) -> None:
+    data = tmp_path / "data.txt"
+    data.write_text("1\n2\n", encoding="utf-8")
+    runs = tmp_path / "runs"
+    master = tmp_path / "master.py"
+    master.write_text("# master v1\n", encoding="utf-8")
+    monkeypatch.setattr(loop, "MASTER_PATH", master)
+    real_analyzer = loop.run_analyzer
+
+    def promoting_analyzer(*args, **kwargs):
+        master.write_text("# master v2\n", encoding="utf-8")  # as a benchmarked patch promotion would
+        return real_analyzer(*args, **kwargs)
+
+    monkeypatch.setattr(loop, "run_analyzer", promoting_analyzer)
+    client = _TotalClient(data=str(data))
+    first = run_loop("What is the total?", [str(data)], client, 2, 20, runs, run_cache="rerun")
+
+    client.roles.clear()
+    hit = run_loop("What is the total?", [str(data)], client, 2, 20, runs, run_cache="rerun")
+    assert "PLANNER" not in client.roles
+    assert json.loads((hit / RUN_CACHE_FILE).read_text(encoding="utf-8"))["cached_from"] == str(first.resolve())
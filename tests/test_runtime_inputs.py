@@ -0,0 +1,63 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from dsstar.agents.executor.executor import build_env
+from dsstar.runtime.inputs import file_sha256, resolve_input
+
+
+def test_generated_code_can_import_runtime_helpers(tmp_path: Path) -> None:
+    run_dir = tmp_path / "runs" / "run_1"
+    run_dir.mkdir(parents=True)
+    env = build_env(run_dir)
+
+    proc = subprocess.run(
+        [sys.executable, "-c", "from dsstar.runtime import cache_dir; print(cache_dir())"],
+        cwd=str(run_dir),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert Path(proc.stdout.strip()) == (tmp_path / "runs" / ".dsstar_cache" / "inputs").resolve()
+
+
+def test_inputs_resolve_against_repo_root_and_hash_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    (tmp_path / "input").mkdir()
+    data = tmp_path / "input" / "data.csv"
+    data.write_text("a,b\n1,2\n", encoding="utf-8")
+    monkeypatch.setenv("DSSTAR_REPO_ROOT", str(tmp_path))
+    monkeypatch.setenv("DSSTAR_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.chdir(tmp_path / "input")
+
+    assert resolve_input("data.csv") == data.resolve()
+    monkeypatch.chdir(tmp_path)
+    assert resolve_input("data.csv") == data.resolve()
+
+    root = tmp_path / "cache"
+    root.mkdir()
+    digest = file_sha256(data, root)
+    assert len(digest) == 64
+    assert digest in (root / "sha256_index.json").read_text(encoding="utf-8")
+
+
+def test_load_input_reuses_parsed_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    pd = pytest.importorskip("pandas")
+    from dsstar.runtime import load_input
+
+    data = tmp_path / "data.csv"
+    data.write_text("a,b\n1,x\n2,y\n", encoding="utf-8")
+    monkeypatch.setenv("DSSTAR_CACHE_DIR", str(tmp_path / "cache"))
+
+    first = load_input(data)
+
+    def _no_parse(*_args, **_kwargs):
+        raise AssertionError("cached input was parsed again")
+
+    monkeypatch.setattr(pd, "read_csv", _no_parse)
+    second = load_input(data)
+    assert second.equals(first)
+    assert list(second.columns) == ["a", "b"]
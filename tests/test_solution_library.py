@@ -0,0 +1,67 @@
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+from dsstar.llm.base import LLMClient
+from dsstar.loop import run_loop
+from dsstar.tools.solution_library import SolutionLibrary
+
+
+def _descriptions(signature: str, columns: List[str]) -> dict:
+    return {"records": {"data.csv": {"signature": signature, "fallback_facts": {"header": columns}}}}
+
+
+def test_best_match_prefers_same_structure_and_bounds_the_snippet(tmp_path: Path) -> None:
+    sales = "ext=.csv|size=s|delim=,|cols=3|header=1"
+    library = SolutionLibrary(tmp_path)
+    library.add("print('sales')\n" * 50, "Total revenue by region", _descriptions(sales, ["region", "revenue", "date"]), "a", "final")
+    library.add("print('logs')\n", "Total revenue by region", _descriptions("ext=.log|size=m|delim=|cols=1|header=0", ["line"]), "b", "final")
+
+    # A grown copy of the same source (different size bucket) still matches on structure and columns.
+    grown = _descriptions(sales.replace("size=s", "size=l"), ["region", "revenue", "date"])
+    hint = library.best("Average revenue per region", grown, max_chars=100)
+    assert hint["source"] == "a" and len(hint["code"]) <= 100 + len("\n# ... (truncated)\n")
+    assert hint["code"].endswith("# ... (truncated)\n")
+    # Same structure and question: the script written against the same columns wins.
+    library.add("print('stock')\n", "Total revenue by region", _descriptions(sales, ["sku", "qty", "price"]), "c", "final")
+    assert library.best("Total revenue by region", grown)["source"] == "a"
+    assert library.best("Total revenue by region", _descriptions(sales, ["sku", "qty", "price"]))["source"] == "c"
+    # Same question wording alone never pulls in code for an unrelated data source.
+    assert library.best("Total revenue by region", _descriptions("ext=.json|size=s|delim=|cols=2|header=0", ["id", "x"])) is None
+
+
+@dataclass
+class _RecordingClient(LLMClient):
+    name: str = "test"
+    model: str = "test-model"
+    data: str = ""
+    coder_prompts: List[str] = field(default_factory=list)
+
+    def complete(self, prompt: str) -> str:
+        role = prompt.split("ROLE: ", 1)[1].split("\n", 1)[0].strip() if "ROLE: " in prompt else ""
+        if role == "PLANNER":
+            return json.dumps({"title": "Total", "details": "Sum the values."})
+        if role in {"CODER", "FINALYZER_CODE"}:
+            if role == "CODER":
+                self.coder_prompts.append(prompt)
+            return f"import pandas as pd\nprint('total=', pd.read_csv({self.data!r})['value'].sum())  # run {len(self.coder_prompts)}\n"
+        if role == "VERIFIER":
+            return json.dumps({"sufficient": True, "reason": "ok", "missing": [], "next_action": "stop"})
+        return "The total is 3."
+
+
+def test_second_run_on_the_same_source_is_warm_started(tmp_path: Path) -> None:
+    data = tmp_path / "data.csv"
+    data.write_text("value\n1\n2\n", encoding="utf-8")
+    runs = tmp_path / "runs"
+    client = _RecordingClient(data=str(data))
+
+    first = run_loop("What is the total value?", [str(data)], client, 1, 30, runs, solution_library=True)
+    assert "Proven code" not in client.coder_prompts[0]
+    assert not (first / "solution_hint.json").exists()
+
+    second = run_loop("Sum of value?", [str(data)], client, 1, 30, runs, solution_library=True)
+    assert "Proven code" in client.coder_prompts[1] and "# run 1" in client.coder_prompts[1]
+    hint = json.loads((second / "solution_hint.json").read_text(encoding="utf-8"))
+    assert hint["source"].startswith(str(first.resolve())) and "code" not in hint
@@ -0,0 +1,73 @@
+import sqlite3
+from pathlib import Path
+
+from dsstar.agents.analyzer.analyzer import run as run_analyzer
+from dsstar.knowledge import describe_master
+from dsstar.tools.sqlite_inspect import _bounded, connect_readonly, inspect_sqlite
+
+
+def _make_db(path: Path) -> None:
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY, customer_id INTEGER, placed_at TEXT)")
+    conn.execute("CREATE INDEX idx_orders_customer ON orders (customer_id)")
+    conn.execute("CREATE TABLE customers (id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+    conn.execute("CREATE VIEW big_orders AS SELECT * FROM orders")
+    conn.executemany("INSERT INTO orders VALUES (?, ?, ?)", [(i, i % 7, "2024-01-01") for i in range(300)])
+    conn.executemany("INSERT INTO customers VALUES (?, ?)", [(i, f"c{i}") for i in range(7)])
+    conn.execute("ANALYZE orders")
+    conn.commit()
+    conn.close()
+
+
+def test_inspect_sqlite_reports_rows_indexes_and_sizes_read_only(tmp_path: Path) -> None:
+    db = tmp_path / "shop.sqlite"
+    _make_db(db)
+    before = db.stat().st_mtime_ns
+
+    summary = inspect_sqlite(db, workers=2)
+
+    tables = {t["table"]: t for t in summary["tables"]}
+    assert (tables["orders"]["rows"], tables["orders"]["rows_source"]) == (300, "sqlite_stat1")
+    assert (tables["customers"]["rows"], tables["customers"]["rows_source"]) == (7, "count")
+    assert {"name": "idx_orders_customer", "columns": ["customer_id"], "unique": False, "origin": "c"} in tables["orders"]["indexes"]
+    assert any(ix["unique"] and ix["columns"] == ["name"] for ix in tables["customers"]["indexes"])
+    assert tables["orders"]["size_bytes"] and tables["orders"]["size_bytes"] % summary["page_size"] == 0
+    assert summary["views"] == ["big_orders"]
+    assert db.stat().st_mtime_ns == before
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["shop.sqlite"]
+
+
+def test_bounded_query_gives_up_after_budget(tmp_path: Path) -> None:
+    db = tmp_path / "empty.sqlite"
+    sqlite3.connect(str(db)).close()
+    endless = "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) SELECT COUNT(*) FROM n"
+    assert _bounded(connect_readonly(db), endless, (), 0.05) is None
+
+
+def test_master_describer_lists_row_counts_and_indexes(tmp_path: Path) -> None:
+    db = tmp_path / "shop.db"
+    _make_db(db)
+
+    out = run_analyzer([str(db)], tmp_path, client=None)
+
+    text = next(iter(out["records"].values()))["description_text"]
+    assert "TABLE_orders_ROWS=300 (sqlite_stat1)" in text
+    assert "TABLE_orders_INDEXES=idx_orders_customer(customer_id)" in text
+
+
+def test_live_wal_database_is_read_without_immutable(tmp_path: Path) -> None:
+    db = tmp_path / "live #1?%.sqlite"
+    writer = sqlite3.connect(str(db))
+    writer.execute("PRAGMA journal_mode=WAL")
+    writer.execute("CREATE TABLE events (id INTEGER)")
+    writer.executemany("INSERT INTO events VALUES (?)", [(i,) for i in range(5)])
+    writer.commit()  # committed rows stay in the -wal file while the writer is open
+    try:
+        reader = connect_readonly(db)
+        assert reader.execute("SELECT COUNT(*) FROM events").fetchone() == (5,)
+        reader.close()
+        fallback = describe_master._connect_readonly(db)
+        assert fallback.execute("SELECT name FROM sqlite_master").fetchall() == [("events",)]
+        fallback.close()
+    finally:
+        writer.close()
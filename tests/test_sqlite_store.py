@@ -0,0 +1,93 @@
+import sqlite3
+from pathlib import Path
+
+from dsstar.agents.analyzer.analyzer import run as run_analyzer
+from dsstar.agents.analyzer import sqlite_store
+from dsstar.agents.analyzer.sqlite_store import build_store
+
+
+def _write_inputs(base: Path) -> None:
+    (base / "orders.csv").write_text(
+        "order_id,customer_id,order_date,amount\n"
+        "1,10,2024-01-05,12.5\n"
+        "2,11,2024-02-01,7\n"
+        "3,10,2024-02-09,\n",
+        encoding="utf-8",
+    )
+    (base / "customers.tsv").write_text("customer_id\tname\n10\tAda\n11\tBo\n", encoding="utf-8")
+
+
+def test_store_infers_types_indexes_and_supports_joins(tmp_path: Path) -> None:
+    _write_inputs(tmp_path)
+    paths = [tmp_path / "orders.csv", tmp_path / "customers.tsv", tmp_path / "notes.json"]
+    (tmp_path / "notes.json").write_text("{}", encoding="utf-8")
+
+    facts = build_store(paths, tmp_path / "cache")
+
+    assert facts is not None and facts["cached"] is False
+    tables = {table["table"]: table for table in facts["tables"]}
+    assert set(tables) == {"orders", "customers"}
+    orders = tables["orders"]
+    assert orders["rows"] == 3
+    types = {col["name"]: (col["type"], col["date"]) for col in orders["columns"]}
+    assert types == {
+        "order_id": ("INTEGER", False),
+        "customer_id": ("INTEGER", False),
+        "order_date": ("TEXT", True),
+        "amount": ("REAL", False),
+    }
+    assert {idx["column"] for idx in orders["indexes"]} == {"order_id", "customer_id", "order_date"}
+
+    conn = sqlite3.connect(f"file:{facts['path']}?mode=ro", uri=True)
+    rows = conn.execute(
+        "SELECT c.name, SUM(o.amount) FROM orders o JOIN customers c USING (customer_id) "
+        "WHERE o.order_date >= '2024-01-01' GROUP BY c.name ORDER BY c.name"
+    ).fetchall()
+    conn.close()
+    assert rows == [("Ada", 12.5), ("Bo", 7.0)]
+
+    again = build_store(paths, tmp_path / "cache")
+    assert again is not None and again["cached"] is True and again["path"] == facts["path"]
+
+
+def test_analyzer_records_store_facts(tmp_path: Path) -> None:
+    _write_inputs(tmp_path)
+    run_dir = tmp_path / "runs" / "run_1"
+    run_dir.mkdir(parents=True)
+
+    out = run_analyzer([str(tmp_path / "orders.csv")], run_dir, client=None, sqlite_store=True)
+
+    assert out["sqlite_store"]["tables"][0]["table"] == "orders"
+    assert Path(out["sqlite_store"]["path"]).parent == (tmp_path / "runs" / ".dsstar_cache" / "sqlite").resolve()
+    record = next(iter(out["records"].values()))
+    assert record["sqlite_tables"] == ["orders"]
+
+
+def test_late_misfit_widens_column_and_failed_source_leaves_no_table(tmp_path: Path, monkeypatch) -> None:
+    rows = "".join(f"{idx},{idx * 2}\n" for idx in range(1500))
+    (tmp_path / "codes.csv").write_text("row_id,code\n" + rows + "1500,A-17\n", encoding="utf-8")
+    (tmp_path / "broken.csv").write_text("a,b\n1,2\n", encoding="utf-8")
+
+    def broken_rows():
+        yield ["a", "b"]
+        for idx in range(10):
+            yield [str(idx), str(idx)]
+        raise OSError("read failed")
+
+    real_sheets = sqlite_store._csv_sheets
+    monkeypatch.setattr(
+        sqlite_store,
+        "_csv_sheets",
+        lambda path: iter([("broken", broken_rows())]) if path.stem == "broken" else real_sheets(path),
+    )
+    facts = build_store([tmp_path / "codes.csv", tmp_path / "broken.csv"], tmp_path / "cache")
+
+    assert facts is not None and len(facts["errors"]) == 1 and "read failed" in facts["errors"][0]
+    (codes,) = facts["tables"]
+    assert codes["rows"] == 1501 and codes["widened"] == ["code"]
+    assert {col["name"]: col["type"] for col in codes["columns"]} == {"row_id": "INTEGER", "code": "TEXT"}
+    conn = sqlite3.connect(f"file:{facts['path']}?mode=ro", uri=True)
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    values = conn.execute("SELECT code FROM codes WHERE row_id IN (2, 1500) ORDER BY row_id").fetchall()
+    conn.close()
+    assert names == {"codes", "sqlite_stat1"} and values == [("4",), ("A-17",)]
@@ -0,0 +1,151 @@
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+from dsstar.agents.coder.static_check import BLOCKING_CHECKS, check_code, failure_result
+from dsstar.agents.debugger.fast_fix import fast_fix
+from dsstar.agents.debugger.traceback_parser import parse_traceback
+from dsstar.llm.base import LLMClient
+from dsstar.loop import run_loop
+
+
+def _descriptions(data: Path) -> dict:
+    return {
+        "records": {
+            "sales": {
+                "file_path": str(data),
+                "fallback_facts": {"type": "csv", "header": ["Order ID", "Amount"]},
+                "description_text": "COLUMNS=Order ID,Amount",
+            }
+        }
+    }
+
+
+def test_findings_cover_syntax_imports_paths_and_columns(tmp_path: Path) -> None:
+    data = tmp_path / "sales.csv"
+    data.write_text("Order ID,Amount\n1,2\n", encoding="utf-8")
+    descriptions = _descriptions(data)
+
+    assert check_code("print(1\n", descriptions, tmp_path)[0]["error_type"] == "SyntaxError"
+
+    code = (
+        "import pandas as pd\n"
+        "import surely_not_installed_mod\n"
+        "try:\n    import other_missing_mod\nexcept ImportError:\n    other_missing_mod = None\n"
+        f"DATA = {str(data)!r}\n"
+        "df = pd.read_csv(DATA)\n"
+        "df['total'] = df['Amount'] * 2\n"
+        "print(df[['Order ID', 'total']], df['amount'])\n"
+        "df.to_csv('clean.csv')\n"
+        "again = pd.read_csv('clean.csv')\n"
+        "other = pd.read_csv('input/sales.csv')\n"
+    )
+    findings = check_code(code, descriptions, tmp_path)
+    assert [(f["check"], f["line"]) for f in findings] == [
+        ("import", 2), ("optional_import", 4), ("column", 10), ("input_path", 13)
+    ]
+    assert findings[2]["message"] == "'amount'"
+    assert repr(str(data)) in findings[3]["detail"]
+
+    fixed = code.replace("'amount'", "'Amount'").replace("input/", "").replace("surely", "json #")
+    assert [f["check"] for f in check_code(fixed, descriptions, tmp_path)] == ["optional_import"]
+
+    # Conditional or guarded reads and lookups, reshaping reader options and modules local to the run dir
+    # are not flagged; a conditional import of a missing module is only a hint.
+    (tmp_path / "helpers.py").write_text("X = 1\n", encoding="utf-8")
+    guarded = (
+        "import os, sys\nimport pandas as pd\nimport helpers\n"
+        "if sys.platform == 'win32':\n    import winreg_like_missing_mod\n"
+        "try:\n    cache = pd.read_csv('cache.csv')\nexcept FileNotFoundError:\n    cache = None\n"
+        "p = 'maybe.csv'\nif os.path.exists(p):\n    open(p).read()\n"
+        f"semi = pd.read_csv({str(data)!r}, sep=';')\nprint(semi['Order ID;Amount'])\n"
+        f"df = pd.read_csv({str(data)!r})\nif 'extra' in df.columns:\n    print(df['extra'])\n"
+    )
+    assert [(f["check"], f["line"]) for f in check_code(guarded, descriptions, tmp_path)] == [("optional_import", 5)]
+
+
+def test_nested_and_guarded_imports_are_hints_not_blocking(tmp_path: Path) -> None:
+    lazy = 'def plot():\n    import notamodule_xyz\n    return 1\n\nprint("ok")\n'
+    findings = check_code(lazy, {}, tmp_path)
+    assert [(f["check"], f["line"]) for f in findings] == [("optional_import", 2)]
+    assert not [f for f in findings if f["check"] in BLOCKING_CHECKS]
+
+    optional = "try:\n    import notamodule_xyz\nexcept ImportError:\n    notamodule_xyz = None\nprint('ok')\n"
+    findings = check_code(optional, {}, tmp_path)
+    assert [(f["check"], f["line"]) for f in findings] == [("optional_import", 2)]
+    assert not [f for f in findings if f["check"] in BLOCKING_CHECKS]
+
+
+def test_failure_result_reads_like_the_real_traceback(tmp_path: Path) -> None:
+    data = tmp_path / "sales.csv"
+    data.write_text("Order ID,Amount\n1,2\n", encoding="utf-8")
+    code = f"import pandas as pd\ndf = pd.read_csv({str(data)!r})\nprint(df['amount '].sum())\n"
+    script = tmp_path / "round_00_code.py"
+
+    result = failure_result(check_code(code, _descriptions(data), tmp_path), code, script)
+    parsed = parse_traceback(result["stderr"], code)
+    assert not parsed["ambiguous"] and parsed["error_type"] == "KeyError"
+    assert parsed["failing_frame"]["line"] == 3 and parsed["failing_frame"]["source"] == "print(df['amount '].sum())"
+
+    fix = fast_fix(code, result, _descriptions(data))
+    assert fix["rule"] == "column_name" and "df['Amount'].sum()" in fix["code"]
+
+
+@dataclass
+class _MissingModuleClient(LLMClient):
+    name: str = "test"
+    model: str = "test-model"
+    roles: List[str] = field(default_factory=list)
+
+    def complete(self, prompt: str) -> str:
+        role = prompt.split("ROLE: ", 1)[1].split("\n", 1)[0].strip() if "ROLE: " in prompt else ""
+        self.roles.append(role)
+        if role == "PLANNER":
+            return json.dumps({"id": 1, "title": "Count", "details": "Count rows.", "status": "todo"})
+        if role == "CODER":
+            return "open('ran.txt', 'w').write('x')\nimport surely_not_installed_mod\nprint(surely_not_installed_mod.rows)\n"
+        if role == "DEBUGGER_PATCH":
+            return "print(2)\n"
+        if role == "VERIFIER":
+            return json.dumps({"sufficient": True, "reason": "ok", "missing": [], "next_action": "stop"})
+        if role == "FINALYZER_CODE":
+            return "print(2)\n"
+        return "final"
+
+
+def test_loop_sends_static_findings_to_debugger_without_executing(tmp_path: Path) -> None:
+    data = tmp_path / "rows.csv"
+    data.write_text("a\n1\n2\n", encoding="utf-8")
+    client = _MissingModuleClient()
+
+    run_path = run_loop("Count rows", [str(data)], client, max_rounds=1, timeout_sec=20, run_root=tmp_path / "runs")
+
+    findings = json.loads((run_path / "round_00_static_check.json").read_text(encoding="utf-8"))
+    assert findings[0]["message"] == "No module named 'surely_not_installed_mod'"
+    assert not (run_path / "ran.txt").exists()
+    summary = json.loads((run_path / "round_00_trace_summary.json").read_text(encoding="utf-8"))
+    assert summary["error_type"] == "ModuleNotFoundError" and summary["source"] == "local_traceback_parser"
+    assert "DEBUGGER_TRACE_SUMMARY" not in client.roles
+    assert json.loads((run_path / "round_00_exec.json").read_text(encoding="utf-8"))["stdout"].strip() == "2"
+
+
+@dataclass
+class _MissingPathClient(_MissingModuleClient):
+    def complete(self, prompt: str) -> str:
+        role = prompt.split("ROLE: ", 1)[1].split("\n", 1)[0].strip() if "ROLE: " in prompt else ""
+        if role == "CODER":
+            self.roles.append(role)
+            return "open('ran.txt', 'w').write('x')\nprint(open('elsewhere/notes.txt').read())\n"
+        return super().complete(prompt)
+
+
+def test_likely_failures_still_run_and_reach_the_debugger_as_hints(tmp_path: Path) -> None:
+    client = _MissingPathClient()
+
+    run_path = run_loop("Count rows", [], client, max_rounds=1, timeout_sec=20, run_root=tmp_path / "runs")
+
+    assert (run_path / "ran.txt").exists() and (run_path / "round_00_static_check.json").exists()
+    summary = json.loads((run_path / "round_00_trace_summary.json").read_text(encoding="utf-8"))
+    assert summary["error_type"] == "FileNotFoundError"
+    assert summary["static_hints"] == ["line 2: FileNotFoundError: [Errno 2] No such file or directory: 'elsewhere/notes.txt' (not found relative to the run directory)"]
@@ -0,0 +1,86 @@
+import json
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+from dsstar.agents.debugger.debugger import run as run_debugger
+from dsstar.agents.debugger.traceback_parser import parse_traceback, trace_summary
+from dsstar.llm.base import LLMClient
+
+
+def _stderr_of(tmp_path: Path, code: str) -> str:
+    script = tmp_path / "round_03_code.py"
+    script.write_text(code, encoding="utf-8")
+    proc = subprocess.run([sys.executable, str(script)], capture_output=True, text=True, cwd=tmp_path)
+    assert proc.returncode != 0
+    return proc.stderr
+
+
+def test_chained_exception_is_located_in_the_script(tmp_path: Path) -> None:
+    code = (
+        "import json\n"
+        "row = {'Amount': 1}\n"
+        "def total(r):\n"
+        "    try:\n"
+        "        return r['amount']\n"
+        "    except KeyError as exc:\n"
+        "        raise ValueError('missing amount column') from exc\n"
+        "print(json.dumps(total(row)))\n"
+    )
+    parsed = parse_traceback(_stderr_of(tmp_path, code), code)
+
+    assert not parsed["ambiguous"]
+    assert parsed["error_type"] == "ValueError"
+    assert parsed["message"] == "missing amount column"
+    assert parsed["causes"] == ["KeyError: 'amount'"]
+    assert [frame["line"] for frame in parsed["script_frames"]] == [8, 7]
+    assert parsed["failing_frame"]["source"] == "raise ValueError('missing amount column') from exc"
+    summary = trace_summary(parsed)
+    assert summary["error_type"] == "ValueError"
+    assert "line 7 of round_03_code.py" in summary["likely_root_cause"]
+    assert "KeyError: 'amount'" in summary["likely_root_cause"]
+
+
+def test_syntax_errors_parse_and_noise_is_ambiguous(tmp_path: Path) -> None:
+    code = "x = 1\nif x >\n    print(x)\n"
+    parsed = parse_traceback(_stderr_of(tmp_path, code), code)
+    assert not parsed["ambiguous"]
+    assert parsed["error_type"] == "SyntaxError"
+    assert parsed["failing_frame"]["line"] == 2
+
+    assert parse_traceback("Execution timed out.")["ambiguity"] == "no traceback found"
+    two = "Traceback (most recent call last):\n  File \"a.py\", line 1, in <module>\nKeyError: 'a'\n"
+    assert parse_traceback(two + two)["ambiguity"] == "several unrelated tracebacks"
+    assert parse_traceback("Traceback (most recent call last):\n  File \"a.py\", line 1\n")["ambiguous"]
+
+
+@dataclass
+class _RecordingClient(LLMClient):
+    name: str = "test"
+    model: str = "test-model"
+    prompts: List[str] = field(default_factory=list)
+
+    def complete(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        if "ROLE: DEBUGGER_TRACE_SUMMARY" in prompt:
+            return json.dumps({"error_type": "X", "likely_root_cause": "y", "key_trace_lines": [], "suggested_fix_focus": "z"})
+        return "print('fixed')\n"
+
+
+def test_debugger_skips_summary_call_for_parseable_tracebacks(tmp_path: Path) -> None:
+    code = "import pandas_missing_lib\n"
+    stderr = _stderr_of(tmp_path, code)
+    client = _RecordingClient()
+
+    run_debugger("q", {}, [], code, {"stderr": stderr, "exit_code": 1}, client, tmp_path, 3)
+
+    assert not any("ROLE: DEBUGGER_TRACE_SUMMARY" in prompt for prompt in client.prompts)
+    summary = json.loads((tmp_path / "round_03_trace_summary.json").read_text(encoding="utf-8"))
+    assert summary["error_type"] == "ModuleNotFoundError"
+    assert summary["source"] == "local_traceback_parser"
+    assert "guard the optional import" in summary["suggested_fix_focus"]
+
+    run_debugger("q", {}, [], code, {"stderr": "Segmentation fault", "exit_code": -11}, client, tmp_path, 4)
+    assert sum("ROLE: DEBUGGER_TRACE_SUMMARY" in prompt for prompt in client.prompts) == 1
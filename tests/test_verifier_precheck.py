@@ -0,0 +1,74 @@
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+from dsstar.agents.verifier.precheck import only_nulls, precheck
+from dsstar.llm.base import LLMClient
+from dsstar.loop import run_loop
+
+
+def _exec(stdout: str) -> dict:
+    return {"exit_code": 0, "stdout": stdout, "stderr": ""}
+
+
+def test_precheck_decides_obvious_outcomes_and_defers_the_rest(tmp_path: Path) -> None:
+    step = {"id": 1, "title": "Total", "final": True, "expected": {"files": ["out.csv"], "stdout_patterns": [r"^total=\d+$"]}}
+    plan = [step]
+
+    assert precheck(step, plan, _exec("total=3\n"), run_dir=tmp_path)["source"] == "precheck:expected_files"
+    (tmp_path / "out.csv").write_text("a\n1\n", encoding="utf-8")
+    assert precheck(step, plan, _exec("total is 3\n"), run_dir=tmp_path)["source"] == "precheck:expected_stdout"
+    verdict = precheck(step, plan, _exec("total=3\n"), run_dir=tmp_path)
+    assert verdict["sufficient"] and verdict["source"] == "precheck:expected_outputs"
+    # Declared outputs on a step not marked final still need the LLM's judgement, even as the only step.
+    unmarked = {key: value for key, value in step.items() if key != "final"}
+    assert precheck(unmarked, [unmarked], _exec("total=3\n"), run_dir=tmp_path) is None
+
+    plain = {"id": 1, "title": "Explore"}
+    assert precheck(plain, [plain], _exec("  \n"))["source"] == "precheck:empty_output"
+    assert precheck(plain, [plain], _exec("Empty DataFrame\nColumns: [a]\nIndex: []\n"))["source"] == "precheck:empty_result"
+    assert precheck(plain, [plain], _exec("Series([], Name: total, dtype: float64)\n"))["source"] == "precheck:empty_result"
+    # An empty frame printed next to a real answer is the LLM's call.
+    mixed = "Rows with missing ids:\nEmpty DataFrame\nColumns: [id]\nIndex: []\nAnswer: 42\n"
+    assert precheck(plain, [plain], _exec(mixed)) is None
+    assert precheck(plain, [plain], _exec("     a    b\n0  NaN  NaN\n1  NaN  None\n"))["source"] == "precheck:null_result"
+    repeated = precheck(plain, [plain], _exec("rows: 10\n"), previous_exec=_exec("rows:  10"))
+    assert repeated["source"] == "precheck:repeated_output" and not repeated["sufficient"]
+    assert precheck(plain, [plain], _exec("rows: 10\nmean: 2.5\n"), previous_exec=_exec("rows: 9\n")) is None
+
+    assert only_nulls("mean_price: nan") and not only_nulls("   a\n0  1.0\n1  NaN\n")
+    assert only_nulls("a    NaN\nb    NaN\ndtype: float64\n") and only_nulls("[nan, None]")
+    assert not only_nulls("0 Alice NaN\n1 Bob NaN\n") and not only_nulls("Customers with no orders: none")
+
+
+@dataclass
+class _DeclaredAnswerClient(LLMClient):
+    name: str = "test"
+    model: str = "test-model"
+    roles: List[str] = field(default_factory=list)
+
+    def complete(self, prompt: str) -> str:
+        role = prompt.split("ROLE: ", 1)[1].split("\n", 1)[0].strip()
+        self.roles.append(role)
+        if role == "PLANNER":
+            return json.dumps(
+                {"title": "Total", "details": "Print the total.", "final": True, "expected": {"stdout_patterns": [r"^total=\d+$"]}}
+            )
+        if role == "CODER":
+            return "print('total=3')\n"
+        if role == "FINALYZER_CODE":
+            return "print('total=3')\n"
+        return "The total is 3."
+
+
+def test_loop_skips_the_llm_verifier_for_a_declared_answer(tmp_path: Path) -> None:
+    client = _DeclaredAnswerClient()
+
+    run_path = run_loop("Total?", [], client, max_rounds=2, timeout_sec=20, run_root=tmp_path)
+
+    assert "VERIFIER" not in client.roles and (run_path / "final_answer.md").exists()
+    plan = json.loads((run_path / "plan.json").read_text(encoding="utf-8"))
+    assert plan[0]["expected"] == {"files": [], "stdout_patterns": [r"^total=\d+$"]} and plan[0]["status"] == "done"
+    usage = json.loads((run_path / "llm_usage.json").read_text(encoding="utf-8"))
+    assert usage["verifier_verdicts"] == {"precheck:expected_outputs": 1} and usage["verifier_llm_calls_skipped"] == 1
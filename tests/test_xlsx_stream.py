@@ -0,0 +1,72 @@
+import zipfile
+from pathlib import Path
+
+from dsstar.agents.analyzer.analyzer import run as run_analyzer
+from dsstar.agents.analyzer.signature import compute_signature
+from dsstar.tools import xlsx_stream
+from dsstar.tools.xlsx_stream import inspect_xlsx
+
+_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+
+def _sheet(rows, dimension=None) -> str:
+    body = "".join(f'<row r="{idx}">{cells}</row>' for idx, cells in enumerate(rows, start=1))
+    dim = f'<dimension ref="{dimension}"/>' if dimension else ""
+    return f'<worksheet xmlns="{_MAIN}">{dim}<sheetData>{body}</sheetData></worksheet>'
+
+
+def _write_workbook(path: Path, data_rows: int) -> None:
+    sales = ['<c r="A1" t="s"><v>0</v></c><c r="C1" t="s"><v>1</v></c>']
+    sales += [f'<c r="A{i}"><v>{i}</v></c><c r="C{i}" t="inlineStr"><is><t>n{i}</t></is></c>' for i in range(2, data_rows + 2)]
+    notes = ['<c r="A1" t="s"><v>2</v></c>', '<c r="A2" t="b"><v>1</v></c>']
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(
+            "xl/workbook.xml",
+            f'<workbook xmlns="{_MAIN}" xmlns:r="{_REL}"><sheets>'
+            '<sheet name="Sales" sheetId="1" r:id="rId1"/><sheet name="Notes" sheetId="2" r:id="rId2"/>'
+            "</sheets></workbook>",
+        )
+        archive.writestr(
+            "xl/_rels/workbook.xml.rels",
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Target="worksheets/sheet1.xml"/>'
+            '<Relationship Id="rId2" Target="/xl/worksheets/sheet2.xml"/></Relationships>',
+        )
+        archive.writestr(
+            "xl/sharedStrings.xml",
+            f'<sst xmlns="{_MAIN}"><si><t>id</t></si><si><r><t>na</t></r><r><t>me</t></r></si><si><t>flag</t></si></sst>',
+        )
+        archive.writestr("xl/worksheets/sheet1.xml", _sheet(sales, dimension=f"A1:C{data_rows + 1}"))
+        archive.writestr("xl/worksheets/sheet2.xml", _sheet(notes))
+
+
+def test_inspect_xlsx_streams_sheets_without_loading_them(tmp_path: Path) -> None:
+    path = tmp_path / "book.xlsx"
+    _write_workbook(path, data_rows=40)
+
+    summary = inspect_xlsx(path, sample_rows=3)
+
+    sales, notes = summary["sheets"]
+    assert (sales["name"], sales["rows"], sales["columns"], sales["rows_source"]) == ("Sales", 41, 3, "dimension")
+    assert sales["header"] == ["id", "", "name"]
+    assert sales["sample_rows"] == [["2", "", "n2"], ["3", "", "n3"], ["4", "", "n4"]]
+    assert (notes["rows"], notes["columns"], notes["rows_source"]) == (2, 1, "scan")
+    assert notes["sample_rows"] == [["TRUE"]]
+
+
+def test_signature_and_description_share_one_inspection(tmp_path: Path, monkeypatch) -> None:
+    path = tmp_path / "book.xlsx"
+    _write_workbook(path, data_rows=5)
+    xlsx_stream._inspect_cached.cache_clear()
+    opened = []
+    real_zipfile = xlsx_stream.zipfile.ZipFile
+    monkeypatch.setattr(xlsx_stream.zipfile, "ZipFile", lambda *a, **k: opened.append(a) or real_zipfile(*a, **k))
+
+    assert "sheet_count=2" in compute_signature(path)
+    out = run_analyzer([str(path)], tmp_path, client=None)
+
+    assert len(opened) == 1
+    record = next(iter(out["records"].values()))
+    assert record["fallback_facts"]["sheets"]["Sales"]["rows"] == 6
+    assert "SHEET_Sales=rows=6,columns=3,source=dimension" in record["description_text"]
@@ -0,0 +1,70 @@
+import io
+import json
+import zipfile
+from pathlib import Path
+
+from dsstar.agents.analyzer.analyzer import run as run_analyzer
+from dsstar.tools.zip_describe import describe_zip
+
+
+def _write_drop(path: Path) -> None:
+    inner = io.BytesIO()
+    with zipfile.ZipFile(inner, "w") as nested:
+        nested.writestr("nested.tsv", "k\tv\n1\t2\n")
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("vendor/orders.csv", "id,amount\n" + "".join(f"{i},{i * 2}\n" for i in range(1000)))
+        archive.writestr("vendor/events.jsonl", "\n".join(json.dumps({"e": i}) for i in range(30)) + "\n")
+        archive.writestr("vendor/readme.pdf", b"%PDF-1.4 binary")
+        archive.writestr("vendor/more.zip", inner.getvalue())
+        archive.writestr("__MACOSX/vendor/._orders.csv", b"junk")
+
+
+def test_describe_zip_streams_tabular_members(tmp_path: Path) -> None:
+    path = tmp_path / "drop.zip"
+    _write_drop(path)
+
+    summary = describe_zip(path)
+
+    assert summary["member_count"] == 5
+    described = summary["described"]
+    assert set(described) == {"vendor/orders.csv", "vendor/events.jsonl", "vendor/more.zip"}
+    orders = described["vendor/orders.csv"]
+    assert orders["header"] == ["id", "amount"] and orders["rows"] == 1000 and not orders["rows_estimated"]
+    assert described["vendor/events.jsonl"]["records"] == 30
+    assert described["vendor/more.zip"]["described"]["nested.tsv"]["header"] == ["k", "v"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["drop.zip"]
+
+
+def test_describe_zip_stops_at_byte_budget(tmp_path: Path) -> None:
+    path = tmp_path / "drop.zip"
+    _write_drop(path)
+
+    summary = describe_zip(path, budget_bytes=2000)
+
+    orders = summary["described"]["vendor/orders.csv"]
+    assert orders["header"] == ["id", "amount"]
+    assert orders["rows_estimated"] and orders["rows"] > 100
+    assert summary["budget_used"] <= 2000
+    assert "vendor/events.jsonl" in summary["skipped_for_budget"]
+
+
+def test_analyzer_describes_zip_members(tmp_path: Path) -> None:
+    path = tmp_path / "drop.zip"
+    _write_drop(path)
+
+    out = run_analyzer([str(path)], tmp_path, client=None)
+
+    text = next(iter(out["records"].values()))["description_text"]
+    assert "MEMBER[vendor/orders.csv].ROW_COUNT=1000" in text
+    assert "MEMBER[vendor/events.jsonl].JSON_FORMAT=ndjson" in text
+
+
+def test_nested_zip_is_charged_once(tmp_path: Path) -> None:
+    inner = tmp_path / "inner.zip"
+    with zipfile.ZipFile(inner, "w") as nested:
+        nested.writestr("nested.tsv", "k\tv\n" + "".join(f"{i}\t{i}\n" for i in range(200)))
+    outer = tmp_path / "outer.zip"
+    with zipfile.ZipFile(outer, "w") as archive:
+        archive.write(inner, "more.zip")
+
+    assert describe_zip(outer)["budget_used"] == describe_zip(inner)["budget_used"] > 0